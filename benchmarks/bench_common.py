@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Benchmarks: utilidades comunes
+Medición con timeit/perf_counter, guardado de resultados en JSON y
+comparación entre commits con umbral de regresión.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Agregar src al path
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+class BenchResult:
+    """
+    Resultado de un benchmark individual.
+
+    Los tiempos se expresan en segundos por operación.
+    """
+
+    def __init__(self, name: str, times: List[float], number: int, extra: Optional[Dict] = None):
+        self.name = name
+        self.number = number
+        self.times = [t / number for t in times]
+        self.extra = extra or {}
+
+    @property
+    def best(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    def to_dict(self) -> Dict:
+        """Convierte el resultado a un diccionario serializable."""
+        data = {
+            "name": self.name,
+            "number": self.number,
+            "repeat": len(self.times),
+            "best": self.best,
+            "median": self.median,
+            "mean": statistics.mean(self.times),
+            "ops_per_sec": (1.0 / self.best) if self.best > 0 else 0.0,
+        }
+        data.update(self.extra)
+        return data
+
+
+def run_benchmark(name: str, func: Callable[[], object], number: int = 1000,
+                  repeat: int = 5, extra: Optional[Dict] = None) -> BenchResult:
+    """
+    Ejecuta un benchmark con timeit.
+
+    Args:
+        name: Nombre del benchmark (clave estable entre commits)
+        func: Función sin argumentos a medir
+        number: Ejecuciones por repetición
+        repeat: Cantidad de repeticiones
+        extra: Datos adicionales a incluir en el resultado
+
+    Returns:
+        Resultado del benchmark
+    """
+    timer = timeit.Timer(func, timer=timeit.default_timer)
+    times = timer.repeat(repeat=repeat, number=number)
+    result = BenchResult(name, times, number, extra)
+    print(f"  {name:<45} {result.best * 1e6:12.2f} µs/op  (mediana {result.median * 1e6:.2f})")
+    return result
+
+
+def _git_commit() -> str:
+    """Obtiene el commit actual, si el árbol es un repositorio git."""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        if result.returncode == 0:
+            return result.stdout.strip()
+    except OSError:
+        pass
+    return "unknown"
+
+
+def save_results(results: List[BenchResult], output_path: str) -> Dict:
+    """
+    Guarda los resultados en un archivo JSON.
+
+    Args:
+        results: Lista de resultados
+        output_path: Ruta del archivo de salida
+
+    Returns:
+        Diccionario guardado
+    """
+    data = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "commit": _git_commit(),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": {r.name: r.to_dict() for r in results},
+    }
+
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+    return data
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[Dict]:
+    """
+    Compara dos ejecuciones y detecta regresiones.
+
+    Se compara el mejor tiempo (``best``) de cada benchmark presente en
+    ambas ejecuciones, que es la medida menos sensible al ruido.
+
+    Args:
+        baseline: Resultados de referencia (formato de save_results)
+        current: Resultados actuales
+        threshold: Aumento relativo tolerado (0.10 = 10%)
+
+    Returns:
+        Lista de comparaciones con la clave 'regression' marcada
+    """
+    comparisons = []
+    base_results = baseline.get("results", {})
+
+    for name, cur in current.get("results", {}).items():
+        base = base_results.get(name)
+        if not base or base.get("best", 0) <= 0:
+            continue
+
+        ratio = cur["best"] / base["best"]
+        comparisons.append({
+            "name": name,
+            "baseline": base["best"],
+            "current": cur["best"],
+            "ratio": ratio,
+            "regression": ratio > 1.0 + threshold,
+        })
+
+    return comparisons
+
+
+def print_comparison(comparisons: List[Dict], threshold: float):
+    """Imprime una tabla con la comparación contra la referencia."""
+    print("\n" + "=" * 60)
+    print(f"Comparación con referencia (umbral {threshold:.0%})")
+    print("=" * 60)
+    for comp in comparisons:
+        mark = "✗" if comp["regression"] else "✓"
+        print(f"  {mark} {comp['name']:<45} x{comp['ratio']:.2f}")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Benchmarks del generador de códigos
+"""
+
+import random
+import string
+from typing import List
+
+from bench_common import BenchResult, run_benchmark
+from normalizer import HAS_NUMPY
+from unlock_generator import UnlockCodeGenerator
+
+VALID_HW = "TEST123ABC-4567_XY"
+VALID_BM = "456789XYZ"
+INVALID_HW = "ABC 123"
+INVALID_BM = "12"
+
+BATCH_ROWS = 100000
+
+
+def _inventory(rows: int):
+    """Genera un inventario sintético con formato realista."""
+    rng = random.Random(2023)
+    alphabet = string.ascii_uppercase + string.digits
+    hardware_ids = [
+        "-".join("".join(rng.choice(alphabet) for _ in range(4)) for _ in range(4))
+        for _ in range(rows)
+    ]
+    boot_marks = ["".join(rng.choice(string.digits) for _ in range(10)) for _ in range(rows)]
+    return hardware_ids, boot_marks
+
+
+def run(quick: bool = False) -> List[BenchResult]:
+    """
+    Ejecuta los benchmarks del generador.
+
+    Args:
+        quick: Reducir iteraciones (útil en CI)
+
+    Returns:
+        Lista de resultados
+    """
+    number = 2000 if quick else 20000
+    results = []
+
+    gen_citd = UnlockCodeGenerator(year="2021")
+    gen_tds = UnlockCodeGenerator(year="2023")
+
+    results.append(run_benchmark(
+        "generator.citd_v1",
+        lambda: gen_citd.generate_code_citd_v1(VALID_HW, VALID_BM),
+        number=number
+    ))
+    results.append(run_benchmark(
+        "generator.tds_v2",
+        lambda: gen_tds.generate_code_tds_v2(VALID_HW, VALID_BM),
+        number=number
+    ))
+    results.append(run_benchmark(
+        "generator.unlock_code.valid.2021",
+        lambda: gen_citd.generate_unlock_code(VALID_HW, VALID_BM),
+        number=number
+    ))
+    results.append(run_benchmark(
+        "generator.unlock_code.valid.2023",
+        lambda: gen_tds.generate_unlock_code(VALID_HW, VALID_BM),
+        number=number
+    ))
+    results.append(run_benchmark(
+        "generator.unlock_code.invalid_hw",
+        lambda: gen_tds.generate_unlock_code(INVALID_HW, VALID_BM),
+        number=number
+    ))
+    results.append(run_benchmark(
+        "generator.unlock_code.invalid_bm",
+        lambda: gen_tds.generate_unlock_code(VALID_HW, INVALID_BM),
+        number=number
+    ))
+
+    # Lote completo: costo por fila del camino escalar y de los vectorizados
+    rows = BATCH_ROWS // 10 if quick else BATCH_ROWS
+    hardware_ids, boot_marks = _inventory(rows)
+    engines = [("scalar", None), ("python", False)]
+    if HAS_NUMPY:
+        engines.append(("numpy", True))
+
+    for name, use_numpy in engines:
+        if use_numpy is None:
+            func = lambda: [gen_tds.generate_unlock_code(hw, bm) for hw, bm in zip(hardware_ids, boot_marks)]
+        else:
+            func = lambda: gen_tds.generate_codes_batch(hardware_ids, boot_marks, use_numpy=use_numpy)
+        result = run_benchmark(f"generator.batch.{name}", func, number=1, repeat=3, extra={"rows": rows})
+        result.extra["rows_per_sec"] = rows / result.best
+        results.append(result)
+
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Benchmarks de E/S (hash y copia de imágenes, dispositivos USB)
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Callable, List
+
+from bench_common import BenchResult, run_benchmark
+from utils import calculate_file_hash, copy_file, get_usb_devices
+
+
+def _create_sparse_file(size: int) -> str:
+    """Crea un archivo disperso del tamaño indicado con algunos datos reales."""
+    fd, path = tempfile.mkstemp(prefix="desblock-bench-", suffix=".iso")
+    with os.fdopen(fd, 'wb') as f:
+        f.truncate(size)
+        # Algunas regiones con datos para que no sea solo un hueco
+        for offset in range(0, size, 64 * 1024 * 1024):
+            f.seek(offset)
+            f.write(os.urandom(1024 * 1024))
+    return path
+
+
+def _create_data_file(size: int) -> str:
+    """Crea un archivo con datos reales (sin huecos) del tamaño indicado."""
+    fd, path = tempfile.mkstemp(prefix="desblock-bench-", suffix=".iso")
+    block = os.urandom(1024 * 1024)
+    with os.fdopen(fd, 'wb') as f:
+        for _ in range(size // len(block)):
+            f.write(block)
+    return path
+
+
+def _copy_benchmark(name: str, copy: Callable[[str, str], object], source: str, size: int,
+                    repeat: int) -> BenchResult:
+    """Mide una función de copia: bytes/s y tiempo de CPU (usuario + sistema) por copia."""
+    destination = source + ".copy"
+    try:
+        before = os.times()
+        result = run_benchmark(name, lambda: copy(source, destination), number=1, repeat=repeat,
+                               extra={"file_size": size})
+        after = os.times()
+        result.extra["bytes_per_sec"] = size / result.best
+        result.extra["cpu_user_sec"] = (after.user - before.user) / repeat
+        result.extra["cpu_system_sec"] = (after.system - before.system) / repeat
+        return result
+    finally:
+        if os.path.exists(destination):
+            os.unlink(destination)
+
+
+def run(quick: bool = False, large_size: int = 0) -> List[BenchResult]:
+    """
+    Ejecuta los benchmarks de E/S.
+
+    Args:
+        quick: Reducir tamaños e iteraciones (útil en CI)
+        large_size: Tamaño del archivo disperso en bytes (0 = por defecto)
+
+    Returns:
+        Lista de resultados
+    """
+    results = []
+    size = large_size or (64 if quick else 512) * 1024 * 1024
+
+    path = _create_sparse_file(size)
+    try:
+        for algorithm in ('md5', 'sha256'):
+            result = run_benchmark(
+                f"io.calculate_file_hash.{algorithm}",
+                lambda: calculate_file_hash(path, algorithm),
+                number=1,
+                repeat=3,
+                extra={"file_size": size}
+            )
+            result.extra["bytes_per_sec"] = size / result.best
+            results.append(result)
+    finally:
+        os.unlink(path)
+
+    copy_size = (64 if quick else 512) * 1024 * 1024
+    path = _create_data_file(copy_size)
+    try:
+        for name, copy in (("shutil_copyfile", shutil.copyfile), ("utils_copy_file", copy_file)):
+            results.append(_copy_benchmark(f"io.copy.{name}", copy, path, copy_size, 3))
+    finally:
+        os.unlink(path)
+
+    results.append(run_benchmark(
+        "io.get_usb_devices",
+        get_usb_devices,
+        number=5 if quick else 20,
+        repeat=3
+    ))
+
+    return results
+
+
+if __name__ == "__main__":
+    run()
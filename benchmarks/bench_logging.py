@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Benchmarks del registro de desbloqueos
+Mide save_unlock_log con logs mensuales de distintos tamaños y formatos,
+y las consultas por rango de fechas con y sin el índice.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from typing import List
+
+from bench_common import BenchResult, run_benchmark
+from log_index import range_keys, read_range, time_key, update_index
+from log_store import iter_log
+from unlock_generator import UnlockCodeGenerator
+
+LOG_SIZES = (1000, 10000, 100000)
+# jsonl: agregado con O_APPEND; json: reescritura del arreglo (formato anterior)
+LOG_FORMATS = ("jsonl", "json")
+
+
+def _prefill_log(log_dir: str, entries: int, log_format: str = "jsonl"):
+    """Crea el log del mes actual con la cantidad de entradas indicada."""
+    log_filename = os.path.join(log_dir, f"unlock_log_{datetime.now().strftime('%Y%m')}.{log_format}")
+    entry = {
+        "timestamp": datetime.now().isoformat(),
+        "year": "2023",
+        "server": "tds.educacion.gob.ar",
+        "hardware_id": "7ABC",
+        "boot_mark": "6789",
+        "unlock_code": "A1B2C-D3E4F-56789",
+        "version": "tds_v2"
+    }
+    with open(log_filename, 'w', encoding='utf-8') as f:
+        if log_format == "jsonl":
+            line = json.dumps(entry, ensure_ascii=False) + "\n"
+            f.writelines(line for _ in range(entries))
+        else:
+            json.dump([entry] * entries, f, indent=2, ensure_ascii=False)
+    if log_format == "jsonl":
+        # El índice ya existe, como en un log escrito con append_entries
+        update_index(log_filename)
+
+
+def _prefill_month(log_dir: str, entries: int) -> str:
+    """Log de mayo de 2023 con las entradas repartidas a lo largo del mes."""
+    path = os.path.join(log_dir, "unlock_log_202305.jsonl")
+    start = datetime(2023, 5, 1)
+    step = timedelta(days=31) / entries
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(entries):
+            entry = {"timestamp": (start + step * i).isoformat(), "year": "2023",
+                     "server": "tds.educacion.gob.ar", "hardware_id": "7ABC", "boot_mark": "6789",
+                     "unlock_code": "A1B2C-D3E4F-56789", "version": "tds_v2"}
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    update_index(path)
+    return path
+
+
+def _scan_range(path: str, since: str, until: str) -> int:
+    """Consulta sin índice: recorre el mes completo y filtra."""
+    low, high = range_keys(since, until)
+    return sum(1 for entry in iter_log(path) if low <= (time_key(entry["timestamp"]) or low - 1) <= high)
+
+
+def run(quick: bool = False) -> List[BenchResult]:
+    """
+    Ejecuta los benchmarks de escritura de logs.
+
+    Args:
+        quick: Reducir iteraciones (útil en CI)
+
+    Returns:
+        Lista de resultados
+    """
+    results = []
+    gen = UnlockCodeGenerator(year="2023")
+
+    for log_format in LOG_FORMATS:
+        for size in LOG_SIZES:
+            log_dir = tempfile.mkdtemp(prefix="desblock-bench-log-")
+            try:
+                _prefill_log(log_dir, size, log_format)
+                if log_format == "json" and size >= 100000:
+                    number, repeat = 1, 3
+                elif log_format == "json":
+                    number = max(1, (20 if quick else 200) * 1000 // size)
+                    repeat = 3 if quick else 5
+                else:
+                    # Agregar una línea no depende del tamaño del log
+                    number = 20 if quick else 200
+                    repeat = 3 if quick else 5
+
+                results.append(run_benchmark(
+                    f"logging.save_unlock_log.{log_format}.{size}",
+                    lambda: gen.save_unlock_log("TEST123ABC", "456789XYZ", "A1B2C-D3E4F-56789",
+                                                log_dir, log_format),
+                    number=number,
+                    repeat=repeat,
+                    extra={"existing_entries": size, "format": log_format}
+                ))
+            finally:
+                shutil.rmtree(log_dir, ignore_errors=True)
+
+    # "Del 14 al 18": cinco días de un mes con 100000 entradas
+    log_dir = tempfile.mkdtemp(prefix="desblock-bench-log-")
+    try:
+        path = _prefill_month(log_dir, 100000)
+        since, until = "2023-05-14", "2023-05-18"
+        expected = _scan_range(path, since, until)
+        for name, query in (("scan", lambda: _scan_range(path, since, until)),
+                            ("index", lambda: sum(1 for _ in read_range(path, since, until)))):
+            assert query() == expected
+            results.append(run_benchmark(
+                f"logging.range_query.{name}.100000",
+                query,
+                number=1 if quick else 3,
+                repeat=3 if quick else 5,
+                extra={"existing_entries": 100000, "matching_entries": expected}
+            ))
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+    return results
+
+
+if __name__ == "__main__":
+    run()
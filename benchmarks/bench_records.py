@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Benchmarks de registros compactos
+Compara memoria por entrada y costo de creación de LogEntry/UnlockResult
+contra los diccionarios y tuplas usados anteriormente.
+"""
+
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List
+
+from bench_common import BenchResult, run_benchmark
+from records import LogEntry, UnlockResult
+from unlock_generator import UnlockCodeGenerator
+
+ENTRIES = 100000
+
+
+def _legacy_log_dict(gen: UnlockCodeGenerator, i: int) -> dict:
+    """Entrada de log tal como se armaba antes (un dict de 7 claves)."""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "year": gen.year,
+        "server": gen.server_config["server"],
+        "hardware_id": f"{i:04d}"[-4:],
+        "boot_mark": f"{i:06d}"[-4:],
+        "unlock_code": f"A1B2C-D3E4F-{i:05d}",
+        "version": gen.version
+    }
+
+
+def _bytes_per_entry(factory: Callable[[int], object], count: int) -> float:
+    """Mide la memoria asignada por entrada al crear `count` objetos."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        items = [factory(i) for i in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def run(quick: bool = False) -> List[BenchResult]:
+    """
+    Ejecuta los benchmarks de registros.
+
+    Args:
+        quick: Reducir la cantidad de entradas
+
+    Returns:
+        Lista de resultados
+    """
+    count = ENTRIES // 10 if quick else ENTRIES
+    gen = UnlockCodeGenerator(year="2023")
+    results = []
+
+    cases = (
+        ("records.log_entry.dict", lambda i: _legacy_log_dict(gen, i)),
+        ("records.log_entry.slots", lambda i: gen.create_log_entry(
+            f"{i:04d}", f"{i:06d}", f"A1B2C-D3E4F-{i:05d}")),
+        ("records.unlock_result.tuple", lambda i: (True, "mensaje", f"A1B2C-D3E4F-{i:05d}")),
+        ("records.unlock_result.namedtuple", lambda i: UnlockResult(
+            True, "mensaje", f"A1B2C-D3E4F-{i:05d}")),
+    )
+
+    for name, factory in cases:
+        per_entry = _bytes_per_entry(factory, count)
+        counter = iter(range(10 ** 9))
+        result = run_benchmark(
+            name,
+            lambda: factory(next(counter)),
+            number=count,
+            repeat=3,
+            extra={"bytes_per_entry": per_entry, "entries": count}
+        )
+        print(f"  {'':<45} {per_entry:12.1f} bytes/entrada")
+        results.append(result)
+
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Benchmarks de inicio en frío
+Compara cargar la aplicación desde los ``.py`` sueltos (como hoy
+``python3 gui_app.py`` desde el pendrive) contra el paquete
+``desblock-net.pyz``. Cada medición es un proceso nuevo con ``-B``: igual
+que en el sistema live, no hay ``__pycache__`` que reutilizar.
+
+Se mide hasta tener importado el módulo de entrada (gui_app, o
+unlock_generator si no hay tkinter); crear la ventana cuesta lo mismo en
+los dos casos.
+
+Uso (sobre un pendrive ya preparado, con caché de disco vacía):
+    sudo python3 benchmarks/bench_startup.py --stick /media/usuario/USB/DESBLOCK-NET --drop-caches
+"""
+
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+from bench_common import SRC_DIR, BenchResult
+from build_zipapp import DEFAULT_OUTPUT, build_zipapp
+
+ZIPAPP_NAME = DEFAULT_OUTPUT
+
+
+def _entry_module() -> str:
+    return "gui_app" if importlib.util.find_spec("tkinter") else "unlock_generator"
+
+
+def _drop_caches():
+    """Vacía la caché de páginas del kernel (requiere root)."""
+    os.sync()
+    with open("/proc/sys/vm/drop_caches", 'w') as f:
+        f.write("3\n")
+
+
+def measure_startup(name: str, path_entry: str, module: str, repeat: int = 5,
+                    drop_caches: bool = False) -> BenchResult:
+    """
+    Mide el inicio de un intérprete nuevo que importa ``module``.
+
+    Args:
+        name: Nombre del benchmark
+        path_entry: Directorio o ``.pyz`` agregado a sys.path (None = solo el intérprete)
+        module: Módulo de entrada
+        repeat: Cantidad de procesos medidos
+        drop_caches: Vaciar la caché de disco antes de cada proceso
+    """
+    code = "pass" if path_entry is None else \
+        f"import sys; sys.path.insert(0, {path_entry!r}); import {module}"
+    command = [sys.executable, "-B", "-c", code]
+    times = []
+    for _ in range(repeat):
+        if drop_caches:
+            _drop_caches()
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    result = BenchResult(name, times, 1, {"module": module, "cold_cache": drop_caches})
+    print(f"  {name:<45} {result.best * 1e3:12.2f} ms     (mediana {result.median * 1e3:.2f})")
+    return result
+
+
+def run_stick(stick_dir: str, repeat: int = 5, drop_caches: bool = False) -> List[BenchResult]:
+    """
+    Mide un pendrive preparado (``src/`` y ``desblock-net.pyz`` en su carpeta).
+
+    Args:
+        stick_dir: Carpeta DESBLOCK-NET del pendrive
+        repeat: Procesos medidos por variante
+        drop_caches: Vaciar la caché de disco antes de cada proceso
+    """
+    module = _entry_module()
+    bare = measure_startup("startup.python_bare", None, module, repeat, drop_caches)
+    source = measure_startup("startup.source", os.path.join(stick_dir, "src"), module, repeat,
+                             drop_caches)
+    zipapp = measure_startup("startup.zipapp", os.path.join(stick_dir, ZIPAPP_NAME), module, repeat,
+                             drop_caches)
+    zipapp.extra["speedup_vs_source"] = source.best / zipapp.best
+    print(f"  {'startup.zipapp / startup.source':<45} x{zipapp.best / source.best:.2f}")
+    return [bare, source, zipapp]
+
+
+def run(quick: bool = False) -> List[BenchResult]:
+    """
+    Ejecuta los benchmarks de inicio sobre una copia temporal del proyecto.
+
+    Args:
+        quick: Reducir iteraciones (útil en CI)
+
+    Returns:
+        Lista de resultados
+    """
+    tmp = tempfile.mkdtemp(prefix="desblock-bench-")
+    try:
+        # Copia sin __pycache__, como la que hace usb_sync en el pendrive
+        shutil.copytree(SRC_DIR, os.path.join(tmp, "src"),
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        build_zipapp(os.path.join(tmp, ZIPAPP_NAME))
+        return run_stick(tmp, repeat=3 if quick else 10)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    """Función principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inicio en frío: código fuente vs desblock-net.pyz")
+    parser.add_argument("--stick", help="Carpeta DESBLOCK-NET de un pendrive ya preparado")
+    parser.add_argument("--repeat", type=int, default=5, help="Procesos medidos por variante")
+    parser.add_argument("--drop-caches", action="store_true",
+                        help="Vaciar la caché de disco antes de cada proceso (requiere root)")
+
+    args = parser.parse_args()
+
+    try:
+        if args.stick:
+            run_stick(args.stick, args.repeat, args.drop_caches)
+        else:
+            run()
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"✗ Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Suite de Benchmarks
+Ejecuta todos los benchmarks, guarda los resultados en JSON y,
+opcionalmente, los compara con una ejecución anterior.
+
+Uso:
+    python3 benchmarks/run_benchmarks.py --output bench.json
+    python3 benchmarks/run_benchmarks.py --baseline bench_main.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bench_common  # noqa: E402
+import bench_generator  # noqa: E402
+import bench_io  # noqa: E402
+import bench_logging  # noqa: E402
+import bench_records  # noqa: E402
+import bench_startup  # noqa: E402
+
+SUITES = {
+    "generator": bench_generator.run,
+    "logging": bench_logging.run,
+    "io": bench_io.run,
+    "records": bench_records.run,
+    "startup": bench_startup.run,
+}
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(
+        description="Benchmarks de DESBLOCK-NET"
+    )
+    parser.add_argument(
+        "--output",
+        default="bench_results.json",
+        help="Archivo JSON de salida (por defecto: bench_results.json)"
+    )
+    parser.add_argument(
+        "--baseline",
+        help="Archivo JSON de una ejecución anterior para comparar"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Aumento relativo tolerado antes de marcar regresión (por defecto: 0.10)"
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=sorted(SUITES.keys()),
+        help="Ejecutar solo las suites indicadas (se puede repetir)"
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Menos iteraciones y archivos más chicos"
+    )
+
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("DESBLOCK-NET - Benchmarks")
+    print("=" * 60)
+
+    results = []
+    for name in args.only or list(SUITES.keys()):
+        print(f"\n[{name}]")
+        results.extend(SUITES[name](quick=args.quick))
+
+    data = bench_common.save_results(results, args.output)
+    print(f"\n✓ Resultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        comparisons = bench_common.compare_results(baseline, data, args.threshold)
+        bench_common.print_comparison(comparisons, args.threshold)
+
+        regressions = [c for c in comparisons if c["regression"]]
+        if regressions:
+            print(f"\n✗ {len(regressions)} regresión(es) detectada(s)\n")
+            return 1
+        print("\n✓ Sin regresiones\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -151,13 +151,23 @@ download_iso() {
     print_info "URL: $ISO_URL" >&2
     print_warning "Esto puede tardar varios minutos dependiendo de su conexión" >&2
     
-    if wget --progress=bar:force -O "$iso_path" "$ISO_URL" >&2; then
+    # Descarga en paralelo y reanudable (espejos en usb_creation.iso_mirrors),
+    # verificada con el sha256sum.txt publicado junto a ISO_URL;
+    # si se corta, volver a ejecutar continúa donde quedó
+    local downloaded=1
+    if command -v python3 &> /dev/null; then
+        python3 "$PROJECT_DIR/src/iso_download.py" "$ISO_URL" "$iso_path" >&2 && downloaded=0
+    else
+        wget --continue --progress=bar:force -O "$iso_path.part" "$ISO_URL" >&2 \
+            && mv "$iso_path.part" "$iso_path" && downloaded=0
+    fi
+    
+    if [ $downloaded -eq 0 ]; then
         print_success "ISO descargada exitosamente" >&2
         echo "$iso_path"
         return 0
     else
-        print_error "Error al descargar la ISO" >&2
-        rm -f "$iso_path"
+        print_error "Error al descargar la ISO (se reanudará en el próximo intento)" >&2
         return 1
     fi
 }
@@ -191,10 +201,17 @@ create_bootable_usb() {
     # Desmontar dispositivo
     unmount_device "$device"
     
-    # Escribir ISO al USB usando dd
+    # Escribir ISO al USB (omitiendo las zonas en cero; dd si no hay Python)
     print_info "Escribiendo imagen al USB (esto puede tardar varios minutos)..."
     
-    if dd if="$iso_path" of="$device" bs=4M status=progress oflag=sync; then
+    local written=1
+    if command -v python3 &> /dev/null; then
+        python3 "$PROJECT_DIR/src/image_writer.py" "$iso_path" "$device" --verify skipped && written=0
+    else
+        dd if="$iso_path" of="$device" bs=4M status=progress oflag=sync && written=0
+    fi
+    
+    if [ $written -eq 0 ]; then
         sync
         print_success "Imagen escrita exitosamente"
         return 0
@@ -122,18 +122,28 @@ create_portable_usb() {
     mkdir -p "$desblock_dir/logs"
     mkdir -p "$desblock_dir/docs"
     
-    # Copiar archivos
+    # Copiar archivos (solo los que cambiaron desde la última vez; logs/ no se toca)
     print_info "Copiando DESBLOCK-NET al USB..."
     
-    cp -r "$PROJECT_DIR/src" "$desblock_dir/" 2>/dev/null || true
-    cp -r "$PROJECT_DIR/config" "$desblock_dir/" 2>/dev/null || true
-    cp "$PROJECT_DIR/README.md" "$desblock_dir/" 2>/dev/null || true
-    cp "$PROJECT_DIR/QUICKSTART.md" "$desblock_dir/" 2>/dev/null || true
-    cp "$PROJECT_DIR/LICENSE" "$desblock_dir/" 2>/dev/null || true
+    if ! python3 "$PROJECT_DIR/src/usb_sync.py" "$mount_point"; then
+        print_warning "Sincronización incremental falló, copiando todo"
+        
+        cp -r "$PROJECT_DIR/src" "$desblock_dir/" 2>/dev/null || true
+        cp -r "$PROJECT_DIR/config" "$desblock_dir/" 2>/dev/null || true
+        cp "$PROJECT_DIR/README.md" "$desblock_dir/" 2>/dev/null || true
+        cp "$PROJECT_DIR/QUICKSTART.md" "$desblock_dir/" 2>/dev/null || true
+        cp "$PROJECT_DIR/LICENSE" "$desblock_dir/" 2>/dev/null || true
+        
+        # Copiar documentación
+        cp "$PROJECT_DIR/docs/MANUAL_USUARIO.md" "$desblock_dir/docs/" 2>/dev/null || true
+        cp "$PROJECT_DIR/docs/FAQ.md" "$desblock_dir/docs/" 2>/dev/null || true
+    fi
     
-    # Copiar documentación
-    cp "$PROJECT_DIR/docs/MANUAL_USUARIO.md" "$desblock_dir/docs/" 2>/dev/null || true
-    cp "$PROJECT_DIR/docs/FAQ.md" "$desblock_dir/docs/" 2>/dev/null || true
+    # Paquete de un solo archivo: en FAT32 inicia más rápido que src/
+    print_info "Generando desblock-net.pyz..."
+    if ! python3 "$PROJECT_DIR/src/build_zipapp.py" "$desblock_dir/desblock-net.pyz"; then
+        print_warning "No se pudo generar desblock-net.pyz, se usará src/"
+    fi
     
     # Crear script de inicio
     print_info "Creando script de inicio..."
@@ -142,7 +152,14 @@ create_portable_usb() {
 #!/bin/bash
 # DESBLOCK-NET - Launcher
 
-cd "$(dirname "$0")/src"
+cd "$(dirname "$0")"
+
+# Paquete de un solo archivo si está; si no, el código fuente
+if [ -f desblock-net.pyz ]; then
+    APP="desblock-net.pyz"
+else
+    APP="src"
+fi
 
 # Verificar Python
 if ! command -v python3 &> /dev/null; then
@@ -152,8 +169,8 @@ if ! command -v python3 &> /dev/null; then
     exit 1
 fi
 
-# Verificar tkinter
-if ! python3 -c "import tkinter" 2>/dev/null; then
+# Verificar tkinter (sin importarlo; el resultado se cachea para la sesión)
+if ! python3 "$APP" probe --require gui > /dev/null 2>&1; then
     echo "ERROR: Python Tkinter no está instalado"
     echo "Instala tkinter con: sudo apt install python3-tk"
     read -p "Presiona Enter para cerrar..."
@@ -161,7 +178,7 @@ if ! python3 -c "import tkinter" 2>/dev/null; then
 fi
 
 # Ejecutar GUI
-python3 gui_app.py
+python3 "$APP" gui
 
 EOF
     
@@ -172,7 +189,13 @@ EOF
 #!/bin/bash
 # DESBLOCK-NET - Generador CLI
 
-cd "$(dirname "$0")/src"
+cd "$(dirname "$0")"
+
+if [ -f desblock-net.pyz ]; then
+    APP="desblock-net.pyz"
+else
+    APP="src"
+fi
 
 echo "╔═══════════════════════════════════════════════════════════╗"
 echo "║                                                           ║"
@@ -196,7 +219,7 @@ echo "Generando código..."
 echo ""
 
 # Generar código
-python3 unlock_generator.py \
+python3 "$APP" cli \
     --year "$year" \
     --hardware-id "$hardware_id" \
     --boot-mark "$boot_mark" \
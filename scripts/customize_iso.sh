@@ -20,6 +20,7 @@ PROJECT_DIR="$(dirname "$SCRIPT_DIR")"
 WORK_DIR="/tmp/desblock-iso-work"
 MOUNT_DIR="$WORK_DIR/mount"
 EXTRACT_DIR="$WORK_DIR/extract"
+MD5_CACHE="${XDG_CACHE_HOME:-$HOME/.cache}/desblock-net/md5cache.json"
 
 print_header() {
     echo -e "${BLUE}"
@@ -99,14 +100,23 @@ extract_iso() {
     # Crear directorios
     mkdir -p "$MOUNT_DIR" "$EXTRACT_DIR"
     
-    # Montar ISO
-    mount -o loop "$iso_path" "$MOUNT_DIR"
-    
-    # Copiar contenido
-    rsync -av "$MOUNT_DIR/" "$EXTRACT_DIR/"
-    
-    # Desmontar
-    umount "$MOUNT_DIR"
+    # Leer la ISO directamente (sin montar); si falla, montar y copiar
+    if ! python3 "$PROJECT_DIR/src/iso9660.py" "$iso_path" --extract "$EXTRACT_DIR"; then
+        print_warning "Lector ISO 9660 falló, usando mount + rsync"
+        
+        # Descartar lo extraído a medias
+        rm -rf "$EXTRACT_DIR"
+        mkdir -p "$EXTRACT_DIR"
+        
+        # Montar ISO
+        mount -o loop "$iso_path" "$MOUNT_DIR"
+        
+        # Copiar contenido
+        rsync -av "$MOUNT_DIR/" "$EXTRACT_DIR/"
+        
+        # Desmontar
+        umount "$MOUNT_DIR"
+    fi
     
     print_success "ISO extraída exitosamente"
 }
@@ -228,17 +238,22 @@ repack_squashfs() {
     # Eliminar squashfs anterior
     rm -f "$output_path"
     
+    # Opciones del perfil configurado en settings.json (usb_creation.squashfs_profile)
+    local options
+    if ! options=$(python3 "$PROJECT_DIR/src/squashfs_profile.py" --options); then
+        options="-comp xz -b 1M -Xdict-size 100% -no-recovery"
+    fi
+    print_info "Opciones de compresión: $options"
+    
     # Crear nuevo squashfs
-    mksquashfs "$squashfs_dir" "$output_path" \
-        -comp xz \
-        -b 1M \
-        -Xdict-size 100% \
-        -no-recovery
+    mksquashfs "$squashfs_dir" "$output_path" $options
     
     print_success "Sistema reempaquetado"
 }
 
 update_iso_metadata() {
+    local iso_path=$1
+    
     print_info "Actualizando metadatos de ISO..."
     
     # Actualizar tamaño del filesystem
@@ -252,16 +267,17 @@ update_iso_metadata() {
         echo "$size" > "$(dirname "$squashfs_path")/filesystem.size"
     fi
     
-    # Actualizar checksums
-    cd "$EXTRACT_DIR"
-    find . -type f -print0 | xargs -0 md5sum | grep -v "\./md5sum.txt" > md5sum.txt
-    cd - > /dev/null
+    # Actualizar checksums (en paralelo, reutilizando los de la compilación anterior)
+    # (la caché se descarta si la ISO de origen es otra)
+    python3 "$PROJECT_DIR/src/iso_manifest.py" "$EXTRACT_DIR" --cache "$MD5_CACHE" --source-iso "$iso_path"
     
     print_success "Metadatos actualizados"
 }
 
 create_iso() {
     local output_iso=$1
+    local input_iso=$2
+    shift 2
     
     print_info "Creando nueva ISO..."
     print_warning "Esto puede tardar varios minutos..."
@@ -269,30 +285,15 @@ create_iso() {
     # Eliminar ISO anterior si existe
     rm -f "$output_iso"
     
-    # Crear ISO
-    cd "$EXTRACT_DIR"
-    
-    genisoimage \
-        -r -V "DESBLOCK-NET" \
-        -cache-inodes \
-        -J -l \
-        -b isolinux/isolinux.bin \
-        -c isolinux/boot.cat \
-        -no-emul-boot \
-        -boot-load-size 4 \
-        -boot-info-table \
-        -eltorito-alt-boot \
-        -e boot/grub/efi.img \
-        -no-emul-boot \
-        -o "$output_iso" \
-        .
-    
-    cd - > /dev/null
-    
-    # Hacer ISO híbrida (booteable en USB)
-    isohybrid --uefi "$output_iso" 2>/dev/null || true
+    # Generar la ISO y escribirla en el archivo y en los pendrives (--target)
+    # en el mismo flujo; la parte híbrida BIOS/UEFI usa el MBR de la ISO
+    # original (con genisoimage se aplica isohybrid y un fallo es un error)
+    python3 "$PROJECT_DIR/src/image_stream.py" "$EXTRACT_DIR" "$output_iso" "$@" --mbr "$input_iso"
     
     print_success "ISO creada: $output_iso"
+    for target in "$@"; do
+        print_success "ISO escrita en $target"
+    done
 }
 
 show_completion() {
@@ -330,10 +331,34 @@ main() {
     # Verificar dependencias
     check_dependencies
     
+    # Modo incremental: reutiliza la extracción en caché (ver src/iso_remaster.py)
+    # --target /dev/sdX: escribe la ISO también en el pendrive mientras se crea
+    local incremental=false
+    local targets=()
+    while [ $# -gt 0 ]; do
+        case "$1" in
+            --incremental)
+                incremental=true
+                shift
+                ;;
+            --target)
+                if [ -z "$2" ]; then
+                    print_error "--target requiere un dispositivo"
+                    exit 1
+                fi
+                targets+=("$2")
+                shift 2
+                ;;
+            *)
+                break
+                ;;
+        esac
+    done
+    
     # Obtener ISO de entrada
     if [ -z "$1" ]; then
-        print_error "Uso: $0 <iso-original> [iso-salida]"
-        print_info "Ejemplo: $0 linuxmint-22-cinnamon-64bit.iso desblock-net-v1.iso"
+        print_error "Uso: $0 [--incremental] [--target /dev/sdX]... <iso-original> [iso-salida]"
+        print_info "Ejemplo: $0 --target /dev/sdb linuxmint-22-cinnamon-64bit.iso desblock-net-v1.iso"
         exit 1
     fi
     
@@ -350,6 +375,18 @@ main() {
     print_info "ISO de salida: $output_iso"
     echo ""
     
+    local target_args=()
+    for target in "${targets[@]}"; do
+        print_info "Pendrive destino: $target"
+        target_args+=(--target "$target")
+    done
+    
+    if [ "$incremental" = true ]; then
+        python3 "$PROJECT_DIR/src/iso_remaster.py" "$input_iso" "$output_iso" "${target_args[@]}" || exit 1
+        show_completion "$output_iso"
+        exit 0
+    fi
+    
     # Configurar trap para limpieza
     trap cleanup EXIT
     
@@ -374,10 +411,10 @@ main() {
     repack_squashfs "$squashfs_dir" "$squashfs_output"
     
     # Paso 5: Actualizar metadatos
-    update_iso_metadata
+    update_iso_metadata "$input_iso"
     
     # Paso 6: Crear ISO final
-    create_iso "$output_iso"
+    create_iso "$output_iso" "$input_iso" "${targets[@]}"
     
     # Completado
     show_completion "$output_iso"
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Punto de entrada único
+Elige el modo de la aplicación según el primer argumento. Es el
+``__main__`` del paquete ``desblock-net.pyz`` (ver build_zipapp), y
+también funciona desde el código fuente.
+
+Uso:
+    python3 desblock-net.pyz [gui]
+    python3 desblock-net.pyz cli --year 2022 --hardware-id ... --boot-mark ...
+    python3 desblock-net.pyz batch inventario.csv --output codigos.csv --year 2022
+    python3 desblock-net.pyz probe --require gui
+"""
+
+import os
+import sys
+
+
+def _run_gui(args):
+    import gui_app
+    return gui_app.main()
+
+
+def _run_cli(args):
+    import unlock_generator
+    return unlock_generator.main()
+
+
+def _run_batch(args):
+    import unlock_generator
+    # "batch CSV ..." equivale a "--batch CSV ..."
+    if args and not args[0].startswith("-"):
+        sys.argv[1:] = ["--batch"] + args
+    return unlock_generator.main()
+
+
+def _run_probe(args):
+    import env_probe
+    return env_probe.main()
+
+
+# Modo: (función, descripción)
+MODES = {
+    "gui": (_run_gui, "Interfaz gráfica (por defecto)"),
+    "cli": (_run_cli, "Generar un código desde la línea de comandos"),
+    "batch": (_run_batch, "Procesar un inventario CSV"),
+    "probe": (_run_probe, "Diagnóstico del entorno"),
+}
+
+
+def main():
+    """Función principal."""
+    program = os.path.basename(sys.argv[0]) or "desblock-net"
+    args = sys.argv[1:]
+    mode = "gui"
+    if args and not args[0].startswith("-"):
+        mode = args.pop(0)
+    elif args and args[0] in ("-h", "--help"):
+        print(f"Uso: {program} [MODO] [OPCIONES]\n\nModos:")
+        for name, (_, description) in MODES.items():
+            print(f"  {name:<8} {description}")
+        return 0
+
+    if mode not in MODES:
+        print(f"✗ Error: modo desconocido '{mode}' (opciones: {', '.join(MODES)})")
+        return 1
+
+    # Cada modo ve solo sus propios argumentos (y su nombre en la ayuda)
+    sys.argv = [f"{program} {mode}"] + args
+    return MODES[mode][0](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
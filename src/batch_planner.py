@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Planificador de lotes con deduplicación
+Los inventarios exportados por las escuelas suelen repetir el mismo par
+ID de Hardware / Marca de Arranque en varias hojas. El planificador
+identifica cada fila normalizada con una clave hash, calcula cada par
+distinto una sola vez y reparte el resultado a todas sus posiciones
+originales, manteniendo el orden de entrada.
+
+Las claves ya resueltas se guardan en memoria hasta un límite
+configurable; a partir de ahí se vuelcan a una tabla SQLite temporal en
+disco, de modo que el consumo de memoria queda acotado aunque el
+inventario no entre en RAM.
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Claves en memoria antes de empezar a usar disco (~50 MB)
+DEFAULT_MAX_MEMORY_KEYS = 250000
+
+# Cantidad de parámetros por consulta SQLite
+_SQLITE_BATCH = 500
+
+
+def row_key(version: bytes, hardware_id: bytes, boot_mark: bytes) -> bytes:
+    """
+    Calcula la clave de deduplicación de una fila normalizada.
+
+    Incluye la versión del algoritmo, ya que 2021 y 2022 comparten
+    códigos pero 2023 no.
+
+    Args:
+        version: Versión del algoritmo (ej: b"tds_v2")
+        hardware_id: ID de hardware normalizado
+        boot_mark: Marca de arranque normalizada
+
+    Returns:
+        Clave de 16 bytes
+    """
+    return hashlib.blake2b(version + b"\x00" + hardware_id + b"\x00" + boot_mark, digest_size=16).digest()
+
+
+class ResultCache:
+    """
+    Caché de códigos por clave, en memoria con desborde a SQLite.
+    """
+
+    def __init__(self, max_memory_keys: int = DEFAULT_MAX_MEMORY_KEYS, spill_dir: Optional[str] = None):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_memory_keys: Claves en memoria antes de usar disco
+            spill_dir: Directorio del archivo SQLite temporal (por defecto, TMPDIR)
+        """
+        self.max_memory_keys = max_memory_keys
+        self.spill_dir = spill_dir
+        self._memory: Dict[bytes, str] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
+        self._disk_keys = 0
+
+    @property
+    def spilled(self) -> bool:
+        """Indica si la caché empezó a usar disco."""
+        return self._db is not None
+
+    def __len__(self) -> int:
+        return len(self._memory) + self._disk_keys
+
+    def _open_spill(self):
+        """Crea la base SQLite temporal."""
+        fd, self._db_path = tempfile.mkstemp(prefix="desblock-dedupe-", suffix=".sqlite", dir=self.spill_dir)
+        os.close(fd)
+        self._db = sqlite3.connect(self._db_path)
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute("CREATE TABLE results (key BLOB PRIMARY KEY, code TEXT NOT NULL) WITHOUT ROWID")
+
+    def get_many(self, keys: Sequence[bytes]) -> List[Optional[str]]:
+        """
+        Busca varias claves.
+
+        Args:
+            keys: Claves a buscar
+
+        Returns:
+            Código de cada clave o None si no se conoce
+        """
+        memory = self._memory
+        codes = [memory.get(key) for key in keys]
+
+        if self._db is not None:
+            missing = list({key for key, code in zip(keys, codes) if code is None})
+            found: Dict[bytes, str] = {}
+            for start in range(0, len(missing), _SQLITE_BATCH):
+                part = missing[start:start + _SQLITE_BATCH]
+                query = f"SELECT key, code FROM results WHERE key IN ({','.join('?' * len(part))})"
+                found.update(self._db.execute(query, part).fetchall())
+            if found:
+                codes = [found.get(key) if code is None else code for key, code in zip(keys, codes)]
+
+        return codes
+
+    def put_many(self, items: Iterable[Tuple[bytes, str]]):
+        """
+        Guarda códigos nuevos.
+
+        Args:
+            items: Pares (clave, código) que no estaban en la caché
+        """
+        overflow = []
+        memory = self._memory
+        room = self.max_memory_keys - len(memory)
+
+        for key, code in items:
+            if room > 0:
+                memory[key] = code
+                room -= 1
+            else:
+                overflow.append((key, code))
+
+        if overflow:
+            if self._db is None:
+                self._open_spill()
+            self._db.executemany("INSERT OR IGNORE INTO results (key, code) VALUES (?, ?)", overflow)
+            self._disk_keys += len(overflow)
+
+    def close(self):
+        """Libera la memoria y elimina el archivo temporal."""
+        self._memory.clear()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        if self._db_path:
+            try:
+                os.unlink(self._db_path)
+            except OSError:
+                pass
+            self._db_path = None
+
+
+class BatchPlanner:
+    """
+    Resuelve filas normalizadas calculando cada par distinto una sola vez.
+    """
+
+    def __init__(self, max_memory_keys: int = DEFAULT_MAX_MEMORY_KEYS, spill_dir: Optional[str] = None):
+        """
+        Inicializa el planificador.
+
+        Args:
+            max_memory_keys: Claves en memoria antes de usar disco
+            spill_dir: Directorio para el desborde a disco
+        """
+        self.cache = ResultCache(max_memory_keys, spill_dir)
+        self.rows = 0
+        self.unique = 0
+
+    @property
+    def duplicates(self) -> int:
+        """Filas resueltas sin recalcular."""
+        return self.rows - self.unique
+
+    @property
+    def duplicate_ratio(self) -> float:
+        """Proporción de filas duplicadas sobre las filas válidas."""
+        return self.duplicates / self.rows if self.rows else 0.0
+
+    def resolve(self, generator, hardware_ids: Sequence[bytes], boot_marks: Sequence[bytes]) -> List[str]:
+        """
+        Obtiene los códigos de un bloque de filas válidas y normalizadas.
+
+        Args:
+            generator: UnlockCodeGenerator del año de las filas
+            hardware_ids: IDs de hardware normalizados
+            boot_marks: Marcas de arranque normalizadas
+
+        Returns:
+            Códigos en el mismo orden que la entrada
+        """
+        version = generator.version.encode()
+        keys = [row_key(version, hw, bm) for hw, bm in zip(hardware_ids, boot_marks)]
+        codes = self.cache.get_many(keys)
+
+        # Agrupar las posiciones de cada clave pendiente (orden de aparición)
+        pending: Dict[bytes, List[int]] = {}
+        for i, code in enumerate(codes):
+            if code is None:
+                pending.setdefault(keys[i], []).append(i)
+
+        if pending:
+            firsts = [positions[0] for positions in pending.values()]
+            generated = generator.generate_codes_normalized(
+                [hardware_ids[i] for i in firsts],
+                [boot_marks[i] for i in firsts]
+            )
+            for positions, code in zip(pending.values(), generated):
+                for i in positions:
+                    codes[i] = code
+            self.cache.put_many(zip(pending.keys(), generated))
+            self.unique += len(pending)
+
+        self.rows += len(keys)
+        return codes
+
+    def report(self) -> Dict:
+        """
+        Resumen de la deduplicación.
+
+        Returns:
+            Diccionario con filas, únicas, duplicadas y proporción
+        """
+        return {
+            "rows": self.rows,
+            "unique": self.unique,
+            "duplicates": self.duplicates,
+            "duplicate_ratio": self.duplicate_ratio,
+            "spilled_to_disk": self.cache.spilled,
+        }
+
+    def close(self):
+        """Libera los recursos de la caché."""
+        self.cache.close()
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Procesamiento por lotes
+Genera códigos de desbloqueo para inventarios completos en CSV.
+
+El archivo de entrada debe tener encabezado con las columnas
+``hardware_id`` y ``boot_mark``; la columna ``year`` es opcional (si falta
+se usa el año indicado). El resto de las columnas se copian tal cual y se
+agregan ``unlock_code`` y ``error`` al final.
+
+El archivo se procesa por bloques, así que el consumo de memoria no
+depende del tamaño del inventario. Los pares repetidos se calculan una
+sola vez (ver batch_planner).
+
+Después de cada bloque se guarda un checkpoint (``SALIDA.checkpoint.json``)
+con el desplazamiento en bytes de la entrada ya procesada y el tamaño y
+CRC-32 de la salida escrita hasta ese punto. Si el lote se corta (se
+desconecta el pendrive, se corta la luz), ``run(..., resume=True)``
+descarta lo escrito después del último checkpoint y continúa desde ahí:
+la salida termina siendo idéntica a la de una ejecución sin cortes. Si la
+entrada cambió o la salida no coincide con el checkpoint, empieza de cero.
+
+Con ``partition_by`` la salida es un directorio con un CSV por escuela,
+provincia u otra columna (ver partition_writer), en la misma pasada.
+"""
+
+import csv
+import io
+import json
+import os
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from batch_planner import DEFAULT_MAX_MEMORY_KEYS, BatchPlanner
+from normalizer import ERROR_BOOT_MARK, ERROR_HARDWARE_ID, normalize_batch
+from partition_writer import DEFAULT_MAX_OPEN, PartitionedWriter, partition_name, province_resolver
+from unlock_generator import UnlockCodeGenerator
+
+HARDWARE_ID_COLUMN = "hardware_id"
+BOOT_MARK_COLUMN = "boot_mark"
+YEAR_COLUMN = "year"
+RESULT_COLUMNS = ("unlock_code", "error")
+
+# Error para filas con un año de entrega no soportado
+ERROR_YEAR = "year"
+
+DEFAULT_CHUNK_SIZE = 50000
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+_CHECKPOINT_VERSION = 2
+_BOM = b"\xef\xbb\xbf"
+_READ_SIZE = 1024 * 1024
+
+
+class BatchStats:
+    """
+    Estadísticas de una ejecución por lotes.
+    """
+
+    __slots__ = ("rows", "generated", "errors", "elapsed", "dedupe", "resumed", "partitions")
+
+    def __init__(self):
+        self.rows = 0
+        self.generated = 0
+        self.errors: Dict[str, int] = {}
+        self.elapsed = 0.0
+        self.dedupe: Dict = {}
+        # Filas tomadas de una ejecución anterior (con resume)
+        self.resumed = 0
+        # Archivos de salida con partition_by
+        self.partitions = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        """Convierte las estadísticas a un diccionario serializable."""
+        return {
+            "rows": self.rows,
+            "generated": self.generated,
+            "errors": dict(self.errors),
+            "elapsed": self.elapsed,
+            "rows_per_second": self.rows_per_second,
+            "dedupe": dict(self.dedupe),
+            "resumed": self.resumed,
+            "partitions": self.partitions,
+        }
+
+
+def _column_index(header: List[str], name: str, required: bool = True) -> Optional[int]:
+    """Busca una columna en el encabezado (sin distinguir mayúsculas)."""
+    normalized = [column.strip().lower() for column in header]
+    if name in normalized:
+        return normalized.index(name)
+    if required:
+        raise ValueError(f"Falta la columna '{name}' en el encabezado")
+    return None
+
+
+class _LineReader:
+    """Líneas UTF-8 de un archivo binario, con la posición en bytes ya leída."""
+
+    __slots__ = ("f", "position")
+
+    def __init__(self, f, position: int):
+        self.f = f
+        self.position = position
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = self.f.readline()
+        if not line:
+            raise StopIteration
+        self.position += len(line)
+        return line.decode("utf-8")
+
+
+def iter_chunks(input_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                offset: Optional[int] = None) -> Iterator[Tuple[List[str], List[List[str]], int]]:
+    """
+    Lee un CSV por bloques, informando hasta qué byte llega cada uno.
+
+    Args:
+        input_path: Ruta del CSV de entrada
+        chunk_size: Filas por bloque
+        offset: Byte desde el que seguir leyendo (un fin de bloque anterior);
+            None para empezar después del encabezado
+
+    Yields:
+        Tuplas (encabezado, filas del bloque, byte siguiente al bloque)
+    """
+    with open(input_path, 'rb') as f:
+        if f.read(len(_BOM)) != _BOM:
+            f.seek(0)
+        lines = _LineReader(f, f.tell())
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+        if offset is not None:
+            f.seek(offset)
+            lines.position = offset
+
+        chunk: List[List[str]] = []
+        emitted = False
+        for row in reader:
+            if not row:
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield header, chunk, lines.position
+                chunk = []
+                emitted = True
+        if chunk or not emitted:
+            yield header, chunk, lines.position
+
+
+def read_chunks(input_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[List[str], List[List[str]]]]:
+    """
+    Lee un CSV por bloques.
+
+    Args:
+        input_path: Ruta del CSV de entrada
+        chunk_size: Filas por bloque
+
+    Yields:
+        Tuplas (encabezado, filas del bloque)
+    """
+    for header, chunk, _ in iter_chunks(input_path, chunk_size):
+        yield header, chunk
+
+
+def _format_rows(rows: List[List[str]]) -> bytes:
+    """Filas en CSV (mismo formato que csv.writer sobre un archivo)."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _file_crc(path: str, size: int) -> Optional[int]:
+    """CRC-32 de los primeros size bytes de un archivo (None si es más corto)."""
+    crc = 0
+    try:
+        with open(path, 'rb') as f:
+            while size > 0:
+                data = f.read(min(_READ_SIZE, size))
+                if not data:
+                    return None
+                crc = zlib.crc32(data, crc)
+                size -= len(data)
+    except OSError:
+        return None
+    return crc
+
+
+def _input_identity(input_path: str, year: str) -> Dict:
+    st = os.stat(input_path)
+    return {"input": os.path.abspath(input_path), "input_size": st.st_size,
+            "input_mtime_ns": st.st_mtime_ns, "year": year}
+
+
+def _load_checkpoint(path: str) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return checkpoint if checkpoint.get("version") == _CHECKPOINT_VERSION else {}
+
+
+def _save_checkpoint(path: str, checkpoint: Dict):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _remove(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _output_matches(output_path: str, state: Dict) -> bool:
+    """Verifica que la salida siga siendo la registrada en un checkpoint."""
+    if "partitions" in state:
+        return all(_file_crc(os.path.join(output_path, partition["file"]), partition["size"])
+                   == partition["crc"] for partition in state["partitions"])
+    return _file_crc(output_path, state["size"]) == state["crc"]
+
+
+class _FileOutput:
+    """Salida en un solo CSV (misma interfaz que PartitionedWriter)."""
+
+    def __init__(self, path: str, state: Optional[Dict] = None):
+        if state:
+            self.f = open(path, 'r+b')
+            self.f.truncate(state["size"])
+            self.f.seek(0, os.SEEK_END)
+            self.size, self.crc = state["size"], state["crc"]
+        else:
+            self.f = open(path, 'wb')
+            self.size, self.crc = 0, 0
+
+    def write(self, header: List[str], rows: List[List[str]]):
+        data = _format_rows([header]) if self.size == 0 else b""
+        data += _format_rows(rows)
+        self.f.write(data)
+        self.size += len(data)
+        self.crc = zlib.crc32(data, self.crc)
+
+    def sync(self) -> Dict:
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        return {"size": self.size, "crc": self.crc}
+
+    def finish(self) -> Optional[Dict]:
+        self.sync()
+        return None
+
+    def close(self):
+        self.f.close()
+
+
+class BatchProcessor:
+    """
+    Procesador de inventarios por lotes.
+    """
+
+    def __init__(self, year: str = "2023", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 use_numpy: Optional[bool] = None, max_memory_keys: int = DEFAULT_MAX_MEMORY_KEYS,
+                 spill_dir: Optional[str] = None):
+        """
+        Inicializa el procesador.
+
+        Args:
+            year: Año por defecto para filas sin columna 'year'
+            chunk_size: Filas por bloque
+            use_numpy: Forzar o evitar NumPy (None = automático)
+            max_memory_keys: Pares distintos en memoria antes de usar disco
+            spill_dir: Directorio para el desborde a disco (por defecto, TMPDIR)
+
+        Raises:
+            ValueError: Si el año no es válido
+        """
+        self.default_year = year
+        self.chunk_size = chunk_size
+        self.use_numpy = use_numpy
+        self.max_memory_keys = max_memory_keys
+        self.spill_dir = spill_dir
+        self.planner = BatchPlanner(max_memory_keys, spill_dir)
+        self._generators: Dict[str, UnlockCodeGenerator] = {year: UnlockCodeGenerator(year)}
+
+    def _generator(self, year: str) -> Optional[UnlockCodeGenerator]:
+        """Obtiene (y cachea) el generador de un año, o None si no es válido."""
+        generator = self._generators.get(year)
+        if generator is None and year in UnlockCodeGenerator.SERVERS:
+            generator = self._generators[year] = UnlockCodeGenerator(year)
+        return generator
+
+    def generate(self, hardware_ids: List[str], boot_marks: List[str],
+                 years: List[str]) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+        """
+        Genera los códigos de un bloque de filas.
+
+        Args:
+            hardware_ids: IDs de hardware
+            boot_marks: Marcas de arranque
+            years: Año de cada fila
+
+        Returns:
+            Tupla (códigos, errores) en el orden de la entrada
+        """
+        codes: List[Optional[str]] = [None] * len(hardware_ids)
+        errors: List[Optional[str]] = [None] * len(hardware_ids)
+
+        # Agrupar por año para generar cada grupo vectorizado
+        groups: Dict[str, List[int]] = {}
+        for i, year in enumerate(years):
+            groups.setdefault(year, []).append(i)
+
+        for year, indices in groups.items():
+            generator = self._generator(year)
+            if generator is None:
+                for i in indices:
+                    errors[i] = ERROR_YEAR
+                continue
+
+            batch = normalize_batch(
+                [hardware_ids[i] for i in indices],
+                [boot_marks[i] for i in indices],
+                use_numpy=self.use_numpy
+            )
+            valid = [j for j, error in enumerate(batch.errors) if error is None]
+            resolved = self.planner.resolve(
+                generator,
+                [batch.hardware_ids[j] for j in valid],
+                [batch.boot_marks[j] for j in valid]
+            )
+
+            for i, error in zip(indices, batch.errors):
+                errors[i] = error
+            for j, code in zip(valid, resolved):
+                codes[indices[j]] = code
+
+        return codes, errors
+
+    def process_chunk(self, header: List[str], rows: List[List[str]], stats: BatchStats) -> List[List[str]]:
+        """
+        Procesa un bloque de filas y agrega las columnas de resultado.
+
+        Args:
+            header: Encabezado del CSV de entrada
+            rows: Filas del bloque
+            stats: Estadísticas a actualizar
+
+        Returns:
+            Filas de salida (entrada + unlock_code + error)
+        """
+        hw_index = _column_index(header, HARDWARE_ID_COLUMN)
+        bm_index = _column_index(header, BOOT_MARK_COLUMN)
+        year_index = _column_index(header, YEAR_COLUMN, required=False)
+        width = len(header)
+
+        # Completar filas cortas para que las columnas queden alineadas
+        for row in rows:
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+
+        hardware_ids = [row[hw_index].strip() for row in rows]
+        boot_marks = [row[bm_index].strip() for row in rows]
+        if year_index is None:
+            years = [self.default_year] * len(rows)
+        else:
+            years = [row[year_index].strip() or self.default_year for row in rows]
+
+        codes, errors = self.generate(hardware_ids, boot_marks, years)
+
+        stats.rows += len(rows)
+        output = []
+        for row, code, error in zip(rows, codes, errors):
+            if error is None:
+                stats.generated += 1
+            else:
+                stats.errors[error] = stats.errors.get(error, 0) + 1
+            row.append(code or "")
+            row.append(error or "")
+            output.append(row)
+
+        return output
+
+    def run(self, input_path: str, output_path: str, resume: bool = False,
+            partition_by: Optional[str] = None, by_province: bool = False,
+            max_open_files: int = DEFAULT_MAX_OPEN) -> BatchStats:
+        """
+        Procesa un inventario completo.
+
+        Args:
+            input_path: CSV de entrada
+            output_path: CSV de salida (directorio si se usa partition_by)
+            resume: Continuar desde el checkpoint de una ejecución interrumpida
+                (sin checkpoint válido se empieza de cero)
+            partition_by: Columna por la que repartir la salida en un CSV
+                por valor, con manifest.json (ver partition_writer)
+            by_province: Agrupar los valores de partition_by según las
+                provincias de servers.json
+            max_open_files: Archivos de partición abiertos a la vez
+
+        Returns:
+            Estadísticas de la ejecución (las filas reanudadas incluidas)
+        """
+        stats = BatchStats()
+        start = time.perf_counter()
+        self.planner = BatchPlanner(self.max_memory_keys, self.spill_dir)
+        checkpoint_path = output_path + CHECKPOINT_SUFFIX
+        identity = _input_identity(input_path, self.default_year)
+        identity.update(partition_by=partition_by, by_province=by_province)
+
+        checkpoint = _load_checkpoint(checkpoint_path) if resume else {}
+        if checkpoint and (any(checkpoint.get(key) != value for key, value in identity.items())
+                           or not _output_matches(output_path, checkpoint["output"])):
+            # La entrada cambió o la salida no es la del checkpoint
+            checkpoint = {}
+        if checkpoint:
+            offset = checkpoint["input_offset"]
+            stats.rows = stats.resumed = checkpoint["rows"]
+            stats.generated = checkpoint["generated"]
+            stats.errors = dict(checkpoint["errors"])
+        else:
+            _remove(checkpoint_path)
+            offset = None
+
+        # Lo escrito después del checkpoint se descarta y se vuelve a generar
+        state = checkpoint.get("output")
+        if partition_by:
+            key, labels = partition_name, None
+            if by_province:
+                from settings import get_servers
+                provinces = get_servers().provinces
+                key = province_resolver(provinces)
+                labels = {name: province.name for name, province in provinces.items()}
+            output = PartitionedWriter(output_path, partition_by, key, state, max_open_files, labels)
+        else:
+            output = _FileOutput(output_path, state)
+
+        try:
+            for header, rows, end in iter_chunks(input_path, self.chunk_size, offset):
+                output.write(header + list(RESULT_COLUMNS), self.process_chunk(header, rows, stats))
+                _save_checkpoint(checkpoint_path, {
+                    "version": _CHECKPOINT_VERSION, **identity, "input_offset": end,
+                    "output": output.sync(), "rows": stats.rows, "generated": stats.generated,
+                    "errors": stats.errors,
+                })
+            manifest = output.finish()
+            if manifest:
+                stats.partitions = len(manifest["partitions"])
+            _remove(checkpoint_path)
+
+            stats.dedupe = self.planner.report()
+        finally:
+            output.close()
+            self.planner.close()
+
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+
+def describe_error(error: str) -> str:
+    """
+    Describe un código de error del lote.
+
+    Args:
+        error: Código de error (hardware_id, boot_mark o year)
+
+    Returns:
+        Mensaje legible
+    """
+    return {
+        ERROR_HARDWARE_ID: "ID de Hardware inválido",
+        ERROR_BOOT_MARK: "Marca de Arranque inválida",
+        ERROR_YEAR: "Año de entrega no soportado",
+    }.get(error, error)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Paquete de un solo archivo (zipapp)
+Genera ``desblock-net.pyz`` para los pendrives portables: en un FAT32
+lento, abrir un solo archivo es mucho más rápido que leer y compilar
+decenas de ``.py`` sueltos en cada inicio (el sistema live no puede
+guardar el bytecode).
+
+- Cada módulo de ``src/`` se incluye ya compilado (``.pyc`` con
+  optimización ``-OO``, sin docstrings ni asserts), validado por hash y
+  no por fecha: el contenido del paquete no depende de cuándo se generó.
+- Se incluye también el ``.py`` de cada módulo (salvo ``--no-source``):
+  con otra versión de Python, donde el ``.pyc`` no sirve, se usa el
+  fuente; además las trazas de error muestran las líneas.
+- ``config/*.json`` va dentro como configuración por defecto; la carpeta
+  ``config/`` junto al ``.pyz`` sigue teniendo prioridad (ver settings).
+- El punto de entrada es ``__main__.py`` (modos gui, cli, batch, probe).
+
+Uso:
+    python3 src/build_zipapp.py /media/usuario/USB/DESBLOCK-NET/desblock-net.pyz
+    python3 /media/usuario/USB/DESBLOCK-NET/desblock-net.pyz gui
+"""
+
+import glob
+import os
+import py_compile
+import sys
+import tempfile
+import zipfile
+from typing import List, Optional
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_DIR = os.path.join(os.path.dirname(SRC_DIR), "config")
+
+DEFAULT_OUTPUT = "desblock-net.pyz"
+INTERPRETER = "/usr/bin/env python3"
+
+# Módulos de src/ que no van en el paquete
+EXCLUDED_MODULES = ("build_zipapp.py",)
+
+# Fecha fija de las entradas: el mismo código produce el mismo archivo
+# (y usb_sync no lo vuelve a copiar)
+_ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+class ZipappError(Exception):
+    """Error al generar el paquete."""
+
+
+def _entry(name: str, compress: bool) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=_ZIP_DATE)
+    info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def compile_module(path: str, archive_name: str, optimize: int = 2) -> bytes:
+    """
+    Compila un módulo a bytecode ``.pyc`` sin validación por fecha.
+
+    Args:
+        path: Archivo fuente
+        archive_name: Nombre mostrado en las trazas de error
+        optimize: Nivel de optimización (0, 1 o 2)
+
+    Returns:
+        Contenido del ``.pyc``
+    """
+    with tempfile.TemporaryDirectory(prefix="desblock-pyz-") as tmp:
+        cfile = os.path.join(tmp, "module.pyc")
+        try:
+            py_compile.compile(path, cfile=cfile, dfile=archive_name, doraise=True,
+                               optimize=optimize,
+                               invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+        except py_compile.PyCompileError as e:
+            raise ZipappError(f"No se pudo compilar {path}: {e.msg}") from e
+        with open(cfile, 'rb') as f:
+            return f.read()
+
+
+def build_zipapp(output: str, source_dir: str = SRC_DIR, config_dir: str = CONFIG_DIR,
+                 optimize: int = 2, include_source: bool = True, compress: bool = True,
+                 interpreter: Optional[str] = INTERPRETER) -> List[str]:
+    """
+    Genera el paquete ``.pyz``.
+
+    Args:
+        output: Archivo de salida
+        source_dir: Directorio con los módulos (debe tener ``__main__.py``)
+        config_dir: Directorio con la configuración por defecto (``*.json``)
+        optimize: Nivel de optimización del bytecode
+        include_source: Incluir también los ``.py``
+        compress: Comprimir las entradas (menos lecturas del pendrive)
+        interpreter: Línea ``#!`` del archivo (None para omitirla)
+
+    Returns:
+        Nombres de las entradas del paquete
+
+    Raises:
+        ZipappError: Si falta el punto de entrada o un módulo no compila
+    """
+    modules = sorted(
+        path for path in glob.glob(os.path.join(source_dir, "*.py"))
+        if os.path.basename(path) not in EXCLUDED_MODULES
+    )
+    if not any(os.path.basename(path) == "__main__.py" for path in modules):
+        raise ZipappError(f"No hay __main__.py en {source_dir}")
+
+    archive_base = os.path.basename(output)
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".pyz", dir=directory)
+    names = []
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if interpreter:
+                f.write(b"#!" + interpreter.encode("utf-8") + b"\n")
+            with zipfile.ZipFile(f, 'w') as archive:
+                for path in modules:
+                    name = os.path.basename(path)
+                    # __main__ queda como fuente: es mínimo y siempre puede
+                    # ejecutarse, aunque el bytecode no sirva en este Python
+                    if name != "__main__.py":
+                        pyc = compile_module(path, f"{archive_base}/{name}", optimize)
+                        archive.writestr(_entry(name + "c", compress), pyc)
+                        names.append(name + "c")
+                    if include_source or name == "__main__.py":
+                        with open(path, 'rb') as src:
+                            archive.writestr(_entry(name, compress), src.read())
+                        names.append(name)
+
+                for path in sorted(glob.glob(os.path.join(config_dir, "*.json"))):
+                    name = f"config/{os.path.basename(path)}"
+                    with open(path, 'rb') as src:
+                        archive.writestr(_entry(name, compress), src.read())
+                    names.append(name)
+        os.chmod(tmp_path, 0o755)
+        os.replace(tmp_path, output)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return names
+
+
+def main():
+    """Función principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Genera el paquete desblock-net.pyz")
+    parser.add_argument("output", nargs="?", default=DEFAULT_OUTPUT,
+                        help=f"Archivo de salida (por defecto: {DEFAULT_OUTPUT})")
+    parser.add_argument("--no-source", action="store_true",
+                        help="Solo bytecode (más chico; requiere la misma versión de Python)")
+    parser.add_argument("--store", action="store_true", help="No comprimir las entradas")
+    parser.add_argument("--optimize", type=int, choices=(0, 1, 2), default=2,
+                        help="Nivel de optimización del bytecode (por defecto: 2)")
+
+    args = parser.parse_args()
+
+    try:
+        names = build_zipapp(args.output, optimize=args.optimize,
+                             include_source=not args.no_source, compress=not args.store)
+    except (ZipappError, OSError) as e:
+        print(f"✗ Error: {e}")
+        return 1
+
+    size = os.path.getsize(args.output)
+    print(f"✓ {args.output}: {len(names)} entradas, {size / 1024:.1f} KB "
+          f"(Python {sys.version_info.major}.{sys.version_info.minor})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
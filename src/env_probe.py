@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Diagnóstico del entorno al iniciar
+Reúne información del sistema, las dependencias de Python y los
+pendrives conectados, para los lanzadores y ``utils.main``.
+
+- Las dependencias se buscan con ``importlib.util.find_spec``, sin
+  importarlas (importar tkinter solo para verificarlo cuesta más que
+  buscarlo).
+- Las verificaciones son independientes y corren en paralelo (lsblk es
+  un proceso aparte).
+- Los resultados se guardan para la sesión en ``$XDG_RUNTIME_DIR``
+  (o ``~/.cache``) y se reutilizan mientras no cambie el arranque ni el
+  intérprete de Python. Además, la lista de pendrives se vuelve a
+  consultar si cambian los dispositivos de bloque, y una dependencia
+  faltante se vuelve a buscar en cada inicio (puede haberse instalado).
+
+Uso:
+    python3 src/env_probe.py --require gui
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+_CACHE_VERSION = 1
+
+# Módulos requeridos por cada parte de la aplicación
+REQUIREMENTS: Dict[str, Tuple[str, ...]] = {
+    "cli": ("hashlib", "json"),
+    "gui": ("tkinter", "_tkinter"),
+}
+
+
+def default_cache_path() -> str:
+    """Archivo de caché de la sesión."""
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("XDG_CACHE_HOME") \
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "desblock-net", "env_probe.json")
+
+
+def _boot_id() -> str:
+    try:
+        with open("/proc/sys/kernel/random/boot_id", 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def session_key() -> Dict[str, str]:
+    """Datos que, si cambian, invalidan toda la caché."""
+    return {"boot_id": _boot_id(), "python": sys.executable, "version": sys.version}
+
+
+def probe_modules(modules: Sequence[str] = ()) -> Dict[str, bool]:
+    """
+    Indica qué módulos están instalados, sin importarlos.
+
+    Args:
+        modules: Nombres de módulos (por defecto, todos los de REQUIREMENTS)
+    """
+    modules = modules or sorted({name for names in REQUIREMENTS.values() for name in names})
+    available = {}
+    for name in modules:
+        try:
+            available[name] = importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            available[name] = False
+    return available
+
+
+# utils y concurrent.futures se importan solo si hay que verificar algo:
+# con todo en caché, el inicio no paga esas importaciones
+
+def probe_system() -> Dict[str, str]:
+    """Información del sistema operativo (ver utils.get_system_info)."""
+    from utils import get_system_info
+    return get_system_info()
+
+
+def probe_usb() -> List[Dict[str, str]]:
+    """Pendrives conectados (ver utils.get_usb_devices)."""
+    from utils import get_usb_devices
+    return get_usb_devices()
+
+
+def _block_devices_signature() -> List[str]:
+    """Cambia al conectar o quitar un dispositivo de bloque."""
+    try:
+        return sorted(os.listdir("/sys/block"))
+    except OSError:
+        return []
+
+
+class Probe:
+    """
+    Verificación del entorno con su regla de validez en caché.
+    """
+
+    __slots__ = ("name", "run", "signature", "cacheable")
+
+    def __init__(self, name: str, run: Callable[[], object],
+                 signature: Optional[Callable[[], object]] = None,
+                 cacheable: Optional[Callable[[object], bool]] = None):
+        """
+        Args:
+            name: Nombre del resultado
+            run: Función que hace la verificación
+            signature: Valor que invalida el resultado cuando cambia
+            cacheable: Indica si un resultado se puede guardar
+        """
+        self.name = name
+        self.run = run
+        self.signature = signature
+        self.cacheable = cacheable
+
+
+PROBES: Tuple[Probe, ...] = (
+    Probe("system", probe_system),
+    Probe("modules", probe_modules, cacheable=lambda available: all(available.values())),
+    Probe("usb", probe_usb, signature=_block_devices_signature),
+)
+
+
+def _load_cache(path: str) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != _CACHE_VERSION or data.get("key") != session_key():
+        return {}
+    return data.get("probes", {})
+
+
+def _save_cache(path: str, probes: Dict):
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": _CACHE_VERSION, "key": session_key(), "probes": probes}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        # La caché es opcional (por ejemplo, en un sistema de solo lectura)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def probe_environment(names: Sequence[str] = (), refresh: bool = False,
+                      cache_path: Optional[str] = None,
+                      probes: Sequence[Probe] = PROBES) -> Dict[str, object]:
+    """
+    Obtiene el diagnóstico del entorno, usando la caché de la sesión.
+
+    Args:
+        names: Verificaciones a obtener (por defecto, todas)
+        refresh: Ignorar la caché
+        cache_path: Archivo de caché (por defecto, default_cache_path())
+        probes: Verificaciones disponibles
+
+    Returns:
+        {nombre: resultado}
+    """
+    cache_path = cache_path or default_cache_path()
+    selected = [probe for probe in probes if not names or probe.name in names]
+    cached = {} if refresh else _load_cache(cache_path)
+
+    results: Dict[str, object] = {}
+    signatures: Dict[str, object] = {}
+    pending = []
+    for probe in selected:
+        signature = probe.signature() if probe.signature else None
+        signatures[probe.name] = signature
+        entry = cached.get(probe.name)
+        if entry is not None and entry.get("signature") == signature:
+            results[probe.name] = entry["value"]
+        else:
+            pending.append(probe)
+
+    if len(pending) == 1:
+        results[pending[0].name] = pending[0].run()
+    elif pending:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            futures = [(probe, executor.submit(probe.run)) for probe in pending]
+            for probe, future in futures:
+                results[probe.name] = future.result()
+
+    if pending:
+        updated = dict(cached)
+        for probe in pending:
+            value = results[probe.name]
+            if probe.cacheable is None or probe.cacheable(value):
+                updated[probe.name] = {"value": value, "signature": signatures[probe.name],
+                                       "time": time.time()}
+            else:
+                updated.pop(probe.name, None)
+        _save_cache(cache_path, updated)
+
+    return {probe.name: results[probe.name] for probe in selected}
+
+
+def missing_modules(requirement: str, refresh: bool = False, cache_path: Optional[str] = None) -> List[str]:
+    """
+    Módulos faltantes para una parte de la aplicación.
+
+    Args:
+        requirement: Clave de REQUIREMENTS (cli, gui)
+
+    Returns:
+        Nombres de los módulos no instalados
+    """
+    # Un resultado con faltantes no se guarda: se vuelve a buscar en cada inicio
+    available = probe_environment(("modules",), refresh, cache_path)["modules"]
+    return [name for name in REQUIREMENTS[requirement] if not available.get(name)]
+
+
+def main():
+    """Función principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Diagnóstico del entorno de DESBLOCK-NET")
+    parser.add_argument("--require", choices=sorted(REQUIREMENTS),
+                        help="Solo verificar las dependencias de una parte (código de salida 1 si faltan)")
+    parser.add_argument("--refresh", action="store_true", help="Ignorar la caché de la sesión")
+    parser.add_argument("--json", action="store_true", help="Mostrar en JSON")
+
+    args = parser.parse_args()
+
+    if args.require:
+        missing = missing_modules(args.require, args.refresh)
+        if missing:
+            print(f"✗ Error: faltan módulos de Python: {', '.join(missing)}")
+            return 1
+        return 0
+
+    results = probe_environment(refresh=args.refresh)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return 0
+
+    print("\n📊 Información del Sistema:")
+    for key, value in results["system"].items():
+        print(f"  {key}: {value}")
+    print("\n🔍 Dependencias:")
+    for name, available in results["modules"].items():
+        print(f"  {'✓' if available else '✗'} {name}")
+    print("\n💾 Dispositivos USB:")
+    for device in results["usb"] or []:
+        print(f"  • {device['name']} ({device['size']}) - {device['path']}")
+    if not results["usb"]:
+        print("  No se encontraron dispositivos USB")
+    print("")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
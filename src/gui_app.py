@@ -6,6 +6,7 @@ Aplicación GUI para desbloqueo de equipos Conectar Igualdad
 
 import sys
 import os
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
 
@@ -25,16 +26,24 @@ except ImportError:
     sys.path.insert(0, os.path.dirname(__file__))
     from unlock_generator import UnlockCodeGenerator
 
+import log_stats
+import metrics
+from settings import get_settings
+
 
 class DesblockNetGUI:
     """
     Interfaz gráfica para el sistema de desbloqueo DESBLOCK-NET.
     """
     
-    def __init__(self, root):
+    def __init__(self, root, profiler=None):
         self.root = root
+        # Con --profile se perfila cada generación (ver profiling)
+        self.profiler = profiler or nullcontext()
+        self.settings = get_settings()
+        window_size = self.settings.gui.window_size
         self.root.title("DESBLOCK-NET - Desbloqueador Conectar Igualdad")
-        self.root.geometry("700x650")
+        self.root.geometry(f"{window_size.width}x{window_size.height}")
         self.root.resizable(False, False)
         
         # Variables
@@ -64,12 +73,26 @@ class DesblockNetGUI:
         style = ttk.Style()
         style.theme_use('clam')
         
-        # Colores
-        self.bg_color = "#2c3e50"
-        self.fg_color = "#ecf0f1"
-        self.accent_color = "#3498db"
-        self.success_color = "#27ae60"
-        self.error_color = "#e74c3c"
+        # Colores (config/settings.json)
+        colors = self.settings.gui.colors
+        self.bg_color = colors.background
+        self.fg_color = colors.foreground
+        self.accent_color = colors.accent
+        self.success_color = colors.success
+        self.error_color = colors.error
+        self.warning_color = colors.warning
+        
+        # Fuentes (config/settings.json)
+        fonts = self.settings.gui.fonts
+        small = fonts.normal.size - 1
+        self.font_title = fonts.title.tk()
+        self.font_subtitle = fonts.subtitle.tk()
+        self.font_normal = fonts.normal.tk()
+        self.font_bold = fonts.normal.tk(style="bold")
+        self.font_small = fonts.normal.tk(size=small)
+        self.font_hint = fonts.normal.tk(size=small, style="italic")
+        self.font_button = fonts.normal.tk(size=fonts.normal.size + 2, style="bold")
+        self.font_code = fonts.code.tk()
         
         # Configurar root
         self.root.configure(bg=self.bg_color)
@@ -84,7 +107,7 @@ class DesblockNetGUI:
         title_label = tk.Label(
             header_frame,
             text="🔓 DESBLOCK-NET",
-            font=("Arial", 24, "bold"),
+            font=self.font_title,
             bg=self.accent_color,
             fg="white"
         )
@@ -94,7 +117,7 @@ class DesblockNetGUI:
         subtitle_label = tk.Label(
             header_frame,
             text="Sistema de Desbloqueo - Conectar Igualdad 2021-2023",
-            font=("Arial", 11),
+            font=self.font_subtitle,
             bg=self.accent_color,
             fg="white"
         )
@@ -105,7 +128,7 @@ class DesblockNetGUI:
         info_frame = tk.LabelFrame(
             self.root,
             text="📡 Información del Sistema",
-            font=("Arial", 10, "bold"),
+            font=self.font_bold,
             bg=self.bg_color,
             fg=self.fg_color,
             padx=15,
@@ -124,7 +147,7 @@ class DesblockNetGUI:
         tk.Label(
             year_frame,
             text="Año de entrega del equipo:",
-            font=("Arial", 10, "bold"),
+            font=self.font_bold,
             bg=self.bg_color,
             fg=self.fg_color
         ).pack(side=tk.LEFT, padx=(0, 10))
@@ -135,7 +158,7 @@ class DesblockNetGUI:
                 text=year,
                 variable=self.year_var,
                 value=year,
-                font=("Arial", 10),
+                font=self.font_normal,
                 bg=self.bg_color,
                 fg=self.fg_color,
                 selectcolor=self.accent_color,
@@ -149,7 +172,7 @@ class DesblockNetGUI:
         self.server_info_label = tk.Label(
             inner_frame,
             text="",
-            font=("Arial", 9),
+            font=self.font_small,
             bg=self.bg_color,
             fg=self.accent_color,
             justify=tk.LEFT
@@ -161,7 +184,7 @@ class DesblockNetGUI:
         input_frame = tk.LabelFrame(
             self.root,
             text="📝 Datos del Equipo Bloqueado",
-            font=("Arial", 10, "bold"),
+            font=self.font_bold,
             bg=self.bg_color,
             fg=self.fg_color,
             padx=15,
@@ -176,7 +199,7 @@ class DesblockNetGUI:
         tk.Label(
             hw_frame,
             text="ID de Hardware:",
-            font=("Arial", 10, "bold"),
+            font=self.font_bold,
             bg=self.bg_color,
             fg=self.fg_color,
             width=20,
@@ -186,7 +209,7 @@ class DesblockNetGUI:
         hw_entry = tk.Entry(
             hw_frame,
             textvariable=self.hardware_id_var,
-            font=("Courier", 11),
+            font=self.font_code,
             bg="#34495e",
             fg="white",
             insertbackground="white",
@@ -202,7 +225,7 @@ class DesblockNetGUI:
         tk.Label(
             bm_frame,
             text="Marca de Arranque:",
-            font=("Arial", 10, "bold"),
+            font=self.font_bold,
             bg=self.bg_color,
             fg=self.fg_color,
             width=20,
@@ -212,7 +235,7 @@ class DesblockNetGUI:
         bm_entry = tk.Entry(
             bm_frame,
             textvariable=self.boot_mark_var,
-            font=("Courier", 11),
+            font=self.font_code,
             bg="#34495e",
             fg="white",
             insertbackground="white",
@@ -225,7 +248,7 @@ class DesblockNetGUI:
         help_text = tk.Label(
             input_frame,
             text="💡 Estos datos aparecen en la pantalla de bloqueo del equipo",
-            font=("Arial", 9, "italic"),
+            font=self.font_hint,
             bg=self.bg_color,
             fg="#95a5a6"
         )
@@ -236,7 +259,7 @@ class DesblockNetGUI:
             input_frame,
             text="Guardar registro del desbloqueo (recomendado)",
             variable=self.save_log_var,
-            font=("Arial", 9),
+            font=self.font_small,
             bg=self.bg_color,
             fg=self.fg_color,
             selectcolor=self.accent_color,
@@ -249,7 +272,7 @@ class DesblockNetGUI:
         generate_btn = tk.Button(
             input_frame,
             text="🔑 GENERAR CÓDIGO DE DESBLOQUEO",
-            font=("Arial", 12, "bold"),
+            font=self.font_button,
             bg=self.success_color,
             fg="white",
             activebackground="#229954",
@@ -265,7 +288,7 @@ class DesblockNetGUI:
         output_frame = tk.LabelFrame(
             self.root,
             text="🔑 Código de Desbloqueo",
-            font=("Arial", 10, "bold"),
+            font=self.font_bold,
             bg=self.bg_color,
             fg=self.fg_color,
             padx=15,
@@ -276,7 +299,7 @@ class DesblockNetGUI:
         # Área de texto para el resultado
         self.output_text = scrolledtext.ScrolledText(
             output_frame,
-            font=("Courier", 11),
+            font=self.font_code,
             bg="#34495e",
             fg="white",
             insertbackground="white",
@@ -297,7 +320,7 @@ class DesblockNetGUI:
         copy_btn = tk.Button(
             button_frame,
             text="📋 Copiar Código",
-            font=("Arial", 10),
+            font=self.font_normal,
             bg=self.accent_color,
             fg="white",
             activebackground="#2980b9",
@@ -311,7 +334,7 @@ class DesblockNetGUI:
         clear_btn = tk.Button(
             button_frame,
             text="🗑️ Limpiar",
-            font=("Arial", 10),
+            font=self.font_normal,
             bg="#7f8c8d",
             fg="white",
             activebackground="#616a6b",
@@ -321,6 +344,31 @@ class DesblockNetGUI:
             command=self.clear_fields
         )
         clear_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Totales del registro (features.show_statistics)
+        self.stats_label = None
+        if self.settings.features.show_statistics:
+            self.stats_label = tk.Label(
+                button_frame,
+                font=self.font_small,
+                bg=self.bg_color,
+                fg="#95a5a6"
+            )
+            self.stats_label.pack(side=tk.RIGHT, padx=5)
+            self.update_statistics()
+    
+    def update_statistics(self):
+        """Muestra los totales del registro de desbloqueos."""
+        if self.stats_label is None:
+            return
+        stats = log_stats.load_stats(self.log_dir)
+        today = stats.day_total(datetime.now().strftime('%Y-%m-%d'))
+        self.stats_label.config(text=f"Códigos: {stats.total} | Hoy: {today}")
+    
+    @property
+    def log_dir(self) -> str:
+        """Directorio de logs configurado."""
+        return os.path.expanduser(get_settings().logging.directory)
     
     def create_footer(self):
         """Crea el pie de página."""
@@ -331,12 +379,13 @@ class DesblockNetGUI:
         footer_label = tk.Label(
             footer_frame,
             text="© 2024 DESBLOCK-NET | Desarrollado para la comunidad educativa argentina",
-            font=("Arial", 9),
+            font=self.font_small,
             bg=self.bg_color,
             fg="#95a5a6"
         )
         footer_label.pack(pady=10)
     
+    @metrics.instrument("gui.update_server_info")
     def update_server_info(self):
         """Actualiza la información del servidor según el año seleccionado."""
         year = self.year_var.get()
@@ -350,19 +399,30 @@ class DesblockNetGUI:
     
     def generate_code(self):
         """Genera el código de desbloqueo."""
+        with metrics.timed("gui.generate_code"), self.profiler:
+            dialog = self._generate_code()
+        # Los diálogos esperan al usuario: quedan fuera de la medición
+        if dialog:
+            show, title, message = dialog
+            show(title, message)
+    
+    def _generate_code(self):
+        """
+        Genera el código y actualiza la salida (medido por generate_code).
+        
+        Returns:
+            Diálogo a mostrar: (función de messagebox, título, mensaje)
+        """
         hardware_id = self.hardware_id_var.get().strip()
         boot_mark = self.boot_mark_var.get().strip()
         
         # Validar que los campos no estén vacíos
         if not hardware_id or not boot_mark:
-            messagebox.showerror(
-                "Error",
-                "Por favor complete todos los campos"
-            )
-            return
+            return messagebox.showerror, "Error", "Por favor complete todos los campos"
         
         # Generar código
-        success, message, code = self.generator.generate_unlock_code(hardware_id, boot_mark)
+        result = self.generator.generate_unlock_code(hardware_id, boot_mark)
+        success, message, code = result
         
         # Mostrar resultado
         self.output_text.config(state=tk.NORMAL)
@@ -392,11 +452,12 @@ class DesblockNetGUI:
             
             # Guardar log si está habilitado
             if self.save_log_var.get():
-                log_dir = os.path.join(os.path.expanduser("~"), "desblock-net-logs")
-                self.generator.save_unlock_log(hardware_id, boot_mark, code, log_dir)
+                self.generator.save_unlock_log(hardware_id, boot_mark, code, self.log_dir,
+                                               get_settings().logging.format)
+                self.update_statistics()
             
             # Mostrar mensaje de éxito
-            messagebox.showinfo("Éxito", message)
+            dialog = messagebox.showinfo, "Éxito", message
             
         else:
             output = f"{'='*60}\n"
@@ -406,9 +467,13 @@ class DesblockNetGUI:
             output += f"Por favor verifique los datos ingresados.\n"
             
             self.output_text.insert(1.0, output)
-            messagebox.showerror("Error", message)
+            if self.save_log_var.get():
+                self.generator.record_error(result, self.log_dir)
+                self.update_statistics()
+            dialog = messagebox.showerror, "Error", message
         
         self.output_text.config(state=tk.DISABLED)
+        return dialog
     
     def copy_code(self):
         """Copia el código generado al portapapeles."""
@@ -435,9 +500,19 @@ class DesblockNetGUI:
 
 def main():
     """Función principal."""
+    import argparse
+    import profiling
+    
+    parser = argparse.ArgumentParser(description="Interfaz gráfica de DESBLOCK-NET")
+    profiling.add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    metrics.setup_from_env()
+    profiler = profiling.profiler_from_args(args)
     root = tk.Tk()
-    app = DesblockNetGUI(root)
+    app = DesblockNetGUI(root, profiler)
     root.mainloop()
+    profiling.report(profiler)
 
 
 if __name__ == "__main__":
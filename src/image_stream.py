@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Escritura de la ISO en streaming
+Genera la ISO con xorriso (``-o -``) y la escribe directamente en uno o
+más destinos (pendrives o archivos de imagen) mientras calcula sus
+hashes, sin pasar por una ISO intermedia en disco.
+
+La parte híbrida (MBR + GPT para arrancar desde USB, lo que hoy hace
+``isohybrid --uefi``) la genera xorriso en el mismo flujo. Si solo está
+genisoimage, se escribe la ISO igual y después se aplica isohybrid a los
+destinos que son archivos (no se puede aplicar sobre dispositivos); los
+hashes se recalculan sobre la imagen ya parcheada.
+
+Uso (como root si algún destino es un dispositivo):
+    python3 src/image_stream.py /tmp/iso-tree /dev/sdb /dev/sdc desblock-net.iso
+"""
+
+import os
+import queue
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from utils import MultiHasher, format_bytes
+
+VOLUME_ID = "DESBLOCK-NET"
+
+# Tamaño de bloque leído del generador de la ISO
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Bloques en espera por destino (acota la memoria si un pendrive es lento)
+_QUEUE_BLOCKS = 8
+
+# Código de arranque MBR de isolinux (los primeros 432 bytes de la imagen)
+MBR_SIZE = 432
+
+ISOHYBRID_MBR_PATHS = (
+    "/usr/lib/ISOLINUX/isohdpfx.bin",
+    "/usr/lib/syslinux/isohdpfx.bin",
+    "/usr/lib/syslinux/bios/isohdpfx.bin",
+    "/usr/share/syslinux/isohdpfx.bin",
+)
+
+
+class StreamError(Exception):
+    """Error al generar o escribir la ISO."""
+
+
+def is_block_device(path: str) -> bool:
+    """Indica si la ruta es un dispositivo de bloques."""
+    try:
+        return stat.S_ISBLK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def extract_mbr(iso_path: str, destination: str) -> Optional[str]:
+    """
+    Copia el código MBR híbrido de una ISO existente (la ISO original de Mint).
+
+    Args:
+        iso_path: ISO de la que tomar el MBR
+        destination: Archivo donde guardarlo
+
+    Returns:
+        Ruta del archivo, o None si la ISO no es híbrida
+    """
+    with open(iso_path, 'rb') as f:
+        mbr = f.read(MBR_SIZE)
+    if len(mbr) < MBR_SIZE or not mbr.strip(b"\x00"):
+        return None
+    with open(destination, 'wb') as f:
+        f.write(mbr)
+    return destination
+
+
+def find_isohybrid_mbr() -> Optional[str]:
+    """Busca isohdpfx.bin de syslinux en las rutas habituales."""
+    for path in ISOHYBRID_MBR_PATHS:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def build_command(mbr: Optional[str] = None, volume_id: str = VOLUME_ID) -> List[str]:
+    """
+    Arma el comando que genera la ISO por stdout.
+
+    Opciones de arranque de la ISO de Linux Mint (isolinux + EFI). Con xorriso
+    y un MBR disponible agrega las opciones híbridas (BIOS + UEFI).
+
+    Args:
+        mbr: Archivo isohdpfx.bin (solo xorriso)
+        volume_id: Etiqueta del volumen
+
+    Returns:
+        Lista de argumentos (se ejecuta en la raíz del árbol)
+
+    Raises:
+        StreamError: Si no hay xorriso ni genisoimage
+    """
+    if shutil.which("xorriso"):
+        command = ["xorriso", "-as", "mkisofs", "-r", "-V", volume_id, "-J", "-l",
+                   "-b", "isolinux/isolinux.bin", "-c", "isolinux/boot.cat",
+                   "-no-emul-boot", "-boot-load-size", "4", "-boot-info-table"]
+        if mbr:
+            command += ["-isohybrid-mbr", mbr]
+        command += ["-eltorito-alt-boot", "-e", "boot/grub/efi.img", "-no-emul-boot"]
+        if mbr:
+            command += ["-isohybrid-gpt-basdat"]
+        return command + ["-o", "-", "."]
+
+    if shutil.which("genisoimage"):
+        # Sin -o, genisoimage escribe la imagen por stdout
+        return ["genisoimage", "-r", "-V", volume_id, "-cache-inodes", "-J", "-l",
+                "-b", "isolinux/isolinux.bin", "-c", "isolinux/boot.cat",
+                "-no-emul-boot", "-boot-load-size", "4", "-boot-info-table",
+                "-eltorito-alt-boot", "-e", "boot/grub/efi.img", "-no-emul-boot", "."]
+
+    raise StreamError("Se necesita xorriso o genisoimage")
+
+
+def estimate_size(command: List[str], iso_tree: str) -> Optional[int]:
+    """
+    Calcula el tamaño de la ISO sin generarla (``-print-size``).
+
+    Returns:
+        Tamaño en bytes, o None si no se pudo calcular
+    """
+    if "-o" in command:
+        command = command[:command.index("-o")] + command[command.index("-o") + 2:]
+    command = command[:-1] + ["-print-size", "."]
+    try:
+        result = subprocess.run(command, cwd=iso_tree, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, check=True)
+        return int(result.stdout.split()[-1]) * 2048
+    except (OSError, subprocess.CalledProcessError, ValueError, IndexError):
+        return None
+
+
+class _TargetWriter(threading.Thread):
+    """
+    Escribe en un destino los bloques que recibe por una cola.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(daemon=True)
+        self.path = path
+        self.device = is_block_device(path)
+        self.error: Optional[str] = None
+        self.written = 0
+        self.queue: "queue.Queue[Optional[bytes]]" = queue.Queue(_QUEUE_BLOCKS)
+
+        if self.device:
+            # O_EXCL falla si el dispositivo está montado o en uso
+            self.fd = os.open(path, os.O_WRONLY | os.O_EXCL)
+        else:
+            self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+
+    def size(self) -> Optional[int]:
+        """Capacidad del dispositivo (None para archivos)."""
+        if not self.device:
+            return None
+        size = os.lseek(self.fd, 0, os.SEEK_END)
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        return size
+
+    def run(self):
+        while True:
+            block = self.queue.get()
+            if block is None:
+                break
+            if self.error is not None:
+                # Seguir vaciando la cola para no bloquear al lector
+                continue
+            try:
+                view = memoryview(block)
+                while view:
+                    written = os.write(self.fd, view)
+                    view = view[written:]
+                self.written += len(block)
+            except OSError as e:
+                self.error = str(e)
+
+        try:
+            if self.error is None:
+                os.fsync(self.fd)
+        except OSError as e:
+            self.error = str(e)
+        finally:
+            os.close(self.fd)
+
+
+def stream_to_targets(source, targets: Sequence[str], algorithms: Sequence[str] = ("sha256",),
+                      block_size: int = DEFAULT_BLOCK_SIZE, expected_size: Optional[int] = None) -> Dict:
+    """
+    Copia un flujo a varios destinos a la vez, calculando sus hashes.
+
+    Cada destino tiene su propio hilo de escritura, así que un pendrive lento
+    no frena a los demás más allá de la cola de bloques.
+
+    Args:
+        source: Objeto con read() (ej: stdout de un proceso)
+        targets: Dispositivos o archivos destino
+        algorithms: Algoritmos de hash
+        block_size: Tamaño de bloque de lectura
+        expected_size: Tamaño esperado (para validar la capacidad de los dispositivos)
+
+    Returns:
+        {'bytes', 'hashes', 'elapsed', 'targets': {ruta: None o error}}
+
+    Raises:
+        StreamError: Si un destino no se puede abrir o es demasiado chico
+    """
+    start = time.perf_counter()
+    writers: List[_TargetWriter] = []
+    try:
+        for path in targets:
+            try:
+                writers.append(_TargetWriter(path))
+            except OSError as e:
+                raise StreamError(f"No se puede abrir {path}: {e}")
+            capacity = writers[-1].size()
+            if expected_size and capacity is not None and capacity < expected_size:
+                raise StreamError(
+                    f"{path} es demasiado chico ({format_bytes(capacity)} < {format_bytes(expected_size)})"
+                )
+    except StreamError:
+        for writer in writers:
+            os.close(writer.fd)
+        raise
+
+    for writer in writers:
+        writer.start()
+
+    hasher = MultiHasher(algorithms)
+    try:
+        while True:
+            block = source.read(block_size)
+            if not block:
+                break
+            hasher.update(block)
+            for writer in writers:
+                writer.queue.put(block)
+            if all(writer.error for writer in writers):
+                break
+    finally:
+        for writer in writers:
+            writer.queue.put(None)
+        for writer in writers:
+            writer.join()
+
+    return {
+        "bytes": hasher.bytes,
+        "hashes": hasher.hexdigests(),
+        "elapsed": time.perf_counter() - start,
+        "targets": {writer.path: writer.error for writer in writers},
+    }
+
+
+def stream_iso(iso_tree: str, targets: Sequence[str], mbr: Optional[str] = None,
+               volume_id: str = VOLUME_ID, algorithms: Sequence[str] = ("sha256",)) -> Dict:
+    """
+    Genera la ISO de un árbol y la escribe en los destinos.
+
+    Args:
+        iso_tree: Raíz del árbol de la ISO
+        targets: Dispositivos o archivos destino
+        mbr: isohdpfx.bin para la parte híbrida (por defecto, el de syslinux)
+        volume_id: Etiqueta del volumen
+        algorithms: Algoritmos de hash
+
+    Returns:
+        Resultado de stream_to_targets; si se aplicó isohybrid, ``hashes``
+        son los de la imagen final y ``stream_hashes`` los del flujo
+
+    Raises:
+        StreamError: Si falla la generación, isohybrid o algún destino
+    """
+    if not targets:
+        raise StreamError("No se indicó ningún destino")
+
+    mbr = mbr or find_isohybrid_mbr()
+    command = build_command(mbr, volume_id)
+    in_stream_hybrid = command[0] == "xorriso" and mbr is not None
+
+    if not in_stream_hybrid:
+        devices = [path for path in targets if is_block_device(path)]
+        if devices:
+            raise StreamError(
+                f"Para escribir en {', '.join(devices)} se necesita xorriso e isohdpfx.bin "
+                "(isohybrid no se puede aplicar sobre un dispositivo)"
+            )
+
+    expected_size = None
+    if any(is_block_device(path) for path in targets):
+        expected_size = estimate_size(command, iso_tree)
+
+    try:
+        process = subprocess.Popen(command, cwd=iso_tree, stdout=subprocess.PIPE)
+    except OSError as e:
+        raise StreamError(f"No se pudo ejecutar {command[0]}: {e}")
+
+    try:
+        result = stream_to_targets(process.stdout, targets, algorithms, expected_size=expected_size)
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        process.stdout.close()
+
+    process.wait()
+    # Primero los destinos: si fallaron todos se dejó de leer y el generador
+    # murió por SIGPIPE, su código de salida no dice nada
+    failed = {path: error for path, error in result["targets"].items() if error}
+    if failed:
+        details = "; ".join(f"{path}: {error}" for path, error in failed.items())
+        raise StreamError(f"Falló la escritura en {details}")
+
+    if process.returncode != 0:
+        raise StreamError(f"{command[0]} terminó con código {process.returncode}")
+
+    if not in_stream_hybrid:
+        # Parche de cabecera después de escribir (solo archivos)
+        for path in targets:
+            try:
+                subprocess.run(["isohybrid", "--uefi", path], check=True,
+                               stderr=subprocess.PIPE, universal_newlines=True)
+            except OSError as e:
+                raise StreamError(f"No se pudo ejecutar isohybrid: {e}")
+            except subprocess.CalledProcessError as e:
+                raise StreamError(f"isohybrid falló en {path} (código {e.returncode}): {e.stderr.strip()}")
+        # El parche cambia la cabecera: los hashes del flujo ya no son los
+        # de la imagen (todos los destinos quedan iguales)
+        result["stream_hashes"] = result["hashes"]
+        result["hashes"] = _file_hashes(targets[0], algorithms)
+
+    return result
+
+
+def _file_hashes(path: str, algorithms: Sequence[str]) -> Dict[str, str]:
+    hasher = MultiHasher(algorithms)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(DEFAULT_BLOCK_SIZE), b""):
+            hasher.update(block)
+    return hasher.hexdigests()
+
+
+def main():
+    """Función principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Genera la ISO desde un árbol y la escribe directamente en pendrives o archivos"
+    )
+    parser.add_argument("iso_tree", help="Raíz del árbol de la ISO")
+    parser.add_argument("targets", nargs="+", help="Dispositivos (/dev/sdX) o archivos de imagen")
+    parser.add_argument("--mbr", help="isohdpfx.bin o ISO original de la que tomar el MBR híbrido")
+    parser.add_argument("--volume-id", default=VOLUME_ID, help=f"Etiqueta del volumen (por defecto: {VOLUME_ID})")
+    parser.add_argument("--hash", action="append", dest="algorithms",
+                        help="Algoritmo de hash (repetible, por defecto: sha256)")
+
+    args = parser.parse_args()
+
+    mbr = args.mbr
+    mbr_copy = None
+    try:
+        if mbr and os.path.getsize(mbr) > MBR_SIZE:
+            # Es una ISO: tomar sus primeros 432 bytes (en un temporal propio)
+            fd, mbr_copy = tempfile.mkstemp(prefix="desblock-isohdpfx-", suffix=".bin")
+            os.close(fd)
+            mbr = extract_mbr(mbr, mbr_copy)
+        result = stream_iso(args.iso_tree, args.targets, mbr, args.volume_id,
+                            args.algorithms or ("sha256",))
+    except (StreamError, OSError) as e:
+        print(f"✗ Error: {e}")
+        return 1
+    finally:
+        if mbr_copy:
+            os.unlink(mbr_copy)
+
+    rate = result["bytes"] / result["elapsed"] if result["elapsed"] > 0 else 0
+    print(f"✓ {format_bytes(result['bytes'])} escritos en {len(args.targets)} destino(s) "
+          f"en {result['elapsed']:.1f} s ({format_bytes(int(rate))}/s)")
+    for name, digest in result["hashes"].items():
+        print(f"  {name}: {digest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
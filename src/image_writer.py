@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Escritura de imágenes que omite zonas en cero
+Reemplazo de ``dd`` para grabar ISOs e imágenes de persistencia en
+pendrives. Estas imágenes tienen grandes zonas en cero que dd escribe
+byte por byte; aquí:
+
+- Los huecos del archivo de origen se detectan con SEEK_DATA/SEEK_HOLE
+  (sin leerlos) y los bloques de datos que son todo ceros también se
+  reconocen.
+- Las zonas en cero no se escriben si el destino ya está en cero: un
+  archivo recién truncado, un dispositivo puesto a cero con BLKZEROOUT
+  (el kernel usa WRITE ZEROES/UNMAP si el dispositivo lo soporta) o
+  después de un BLKDISCARD.
+- Opcionalmente se verifican en la relectura las zonas omitidas (o todo).
+
+Uso (como root para dispositivos):
+    python3 src/image_writer.py desblock-net.iso /dev/sdb --verify skipped
+"""
+
+import errno
+import fcntl
+import os
+import stat
+import struct
+import sys
+import time
+from typing import Callable, Iterator, Optional, Tuple
+
+from utils import format_bytes
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+
+# ioctl de dispositivos de bloque (linux/fs.h)
+BLKDISCARD = 0x1277
+BLKZEROOUT = 0x127F
+
+# Estrategias para las zonas en cero
+ZERO_STRATEGIES = ("auto", "assume", "zeroout", "discard", "write")
+
+VERIFY_MODES = ("none", "skipped", "all")
+
+_SECTOR = 512
+
+
+class ImageWriteError(Exception):
+    """Error al escribir o verificar la imagen."""
+
+
+class WriteReport:
+    """
+    Resultado de la escritura de una imagen.
+    """
+
+    __slots__ = ("size", "written", "skipped", "zeroed", "strategy", "verified", "elapsed")
+
+    def __init__(self, size: int, strategy: str):
+        self.size = size
+        self.written = 0
+        self.skipped = 0
+        self.zeroed = 0
+        self.strategy = strategy
+        self.verified: Optional[str] = None
+        self.elapsed = 0.0
+
+    def to_dict(self):
+        """Convierte el reporte a un diccionario serializable."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def data_ranges(fd: int, size: int) -> Iterator[Tuple[int, int]]:
+    """
+    Recorre las zonas con datos de un archivo (los huecos se omiten).
+
+    Si el sistema de archivos no soporta SEEK_DATA/SEEK_HOLE, devuelve el
+    archivo completo como una sola zona.
+
+    Args:
+        fd: Descriptor del archivo
+        size: Tamaño del archivo
+
+    Yields:
+        Tuplas (inicio, fin)
+    """
+    if not hasattr(os, "SEEK_DATA"):
+        if size:
+            yield 0, size
+        return
+
+    offset = 0
+    while offset < size:
+        try:
+            start = os.lseek(fd, offset, os.SEEK_DATA)
+        except OSError as e:
+            if e.errno == errno.ENXIO:
+                # No hay más datos: el resto es un hueco
+                return
+            if e.errno in (errno.EINVAL, errno.EOPNOTSUPP):
+                yield offset, size
+                return
+            raise
+        end = os.lseek(fd, start, os.SEEK_HOLE)
+        yield start, min(end, size)
+        offset = end
+
+
+def segments(fd: int, size: int, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[Tuple[int, int, Optional[bytes]]]:
+    """
+    Divide un archivo en segmentos de datos y segmentos en cero.
+
+    Args:
+        fd: Descriptor del archivo
+        size: Tamaño del archivo
+        block_size: Tamaño de lectura
+
+    Yields:
+        Tuplas (offset, largo, datos); datos es None si el segmento es todo ceros
+    """
+    zero = bytes(block_size)
+    position = 0
+    for start, end in data_ranges(fd, size):
+        if start > position:
+            yield position, start - position, None
+        offset = start
+        while offset < end:
+            length = min(block_size - offset % block_size, end - offset)
+            block = os.pread(fd, length, offset)
+            if len(block) != length:
+                raise ImageWriteError(f"Lectura incompleta en el offset {offset}")
+            if block == zero[:length]:
+                yield offset, length, None
+            else:
+                yield offset, length, block
+            offset += length
+        position = end
+    if position < size:
+        yield position, size - position, None
+
+
+def _coalesce(parts: Iterator[Tuple[int, int, Optional[bytes]]]) -> Iterator[Tuple[int, int, Optional[bytes]]]:
+    """Une segmentos en cero consecutivos."""
+    pending: Optional[Tuple[int, int]] = None
+    for offset, length, data in parts:
+        if data is None:
+            if pending and pending[0] + pending[1] == offset:
+                pending = (pending[0], pending[1] + length)
+            else:
+                if pending:
+                    yield pending[0], pending[1], None
+                pending = (offset, length)
+            continue
+        if pending:
+            yield pending[0], pending[1], None
+            pending = None
+        yield offset, length, data
+    if pending:
+        yield pending[0], pending[1], None
+
+
+def _pwrite_all(fd: int, data, offset: int):
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def _block_ioctl(fd: int, request: int, offset: int, length: int):
+    fcntl.ioctl(fd, request, struct.pack("QQ", offset, length))
+
+
+def _device_size(fd: int) -> int:
+    size = os.lseek(fd, 0, os.SEEK_END)
+    os.lseek(fd, 0, os.SEEK_SET)
+    return size
+
+
+class _Writer:
+    """Escribe segmentos en el destino según la estrategia de ceros."""
+
+    def __init__(self, fd: int, strategy: str, report: WriteReport, block_size: int):
+        self.fd = fd
+        self.strategy = strategy
+        self.report = report
+        self.zero = bytes(block_size)
+        self.skipped_ranges = []
+
+    def data(self, offset: int, data: bytes):
+        _pwrite_all(self.fd, data, offset)
+        self.report.written += len(data)
+
+    def _write_zeros(self, offset: int, length: int):
+        end = offset + length
+        while offset < end:
+            chunk = min(len(self.zero), end - offset)
+            _pwrite_all(self.fd, self.zero[:chunk], offset)
+            offset += chunk
+        self.report.written += length
+
+    def zeros(self, offset: int, length: int):
+        if self.strategy in ("assume", "discard", "truncate"):
+            self.report.skipped += length
+            self.skipped_ranges.append((offset, length))
+            return
+
+        if self.strategy == "zeroout":
+            # BLKZEROOUT requiere rangos alineados a 512 bytes
+            start = -(-offset // _SECTOR) * _SECTOR
+            end = (offset + length) // _SECTOR * _SECTOR
+            if end > start:
+                try:
+                    _block_ioctl(self.fd, BLKZEROOUT, start, end - start)
+                    self.report.zeroed += end - start
+                    if start > offset:
+                        self._write_zeros(offset, start - offset)
+                    if offset + length > end:
+                        self._write_zeros(end, offset + length - end)
+                    return
+                except OSError:
+                    # El dispositivo no lo soporta: escribir ceros desde ahora
+                    self.strategy = "write"
+                    self.report.strategy = "write"
+
+        self._write_zeros(offset, length)
+
+
+def _verify(source_fd: int, target_fd: int, size: int, mode: str, skipped_ranges, block_size: int):
+    """Relee el destino y lo compara con el origen."""
+    zero = bytes(block_size)
+    if mode == "skipped":
+        for offset, length in skipped_ranges:
+            end = offset + length
+            while offset < end:
+                chunk = min(block_size, end - offset)
+                if os.pread(target_fd, chunk, offset) != zero[:chunk]:
+                    raise ImageWriteError(f"Zona omitida con datos distintos de cero en el offset {offset}")
+                offset += chunk
+        return
+
+    offset = 0
+    while offset < size:
+        chunk = min(block_size, size - offset)
+        if os.pread(target_fd, chunk, offset) != os.pread(source_fd, chunk, offset):
+            raise ImageWriteError(f"El destino no coincide con la imagen en el offset {offset}")
+        offset += chunk
+
+
+def write_image(source: str, target: str, zero_strategy: str = "auto", verify: str = "none",
+                block_size: int = DEFAULT_BLOCK_SIZE,
+                progress: Optional[Callable[[int, int], None]] = None) -> WriteReport:
+    """
+    Escribe una imagen en un dispositivo o archivo omitiendo las zonas en cero.
+
+    Args:
+        source: Imagen de origen
+        target: Dispositivo (/dev/sdX) o archivo destino
+        zero_strategy: Cómo tratar las zonas en cero
+            - auto: archivos se truncan (quedan en cero); dispositivos usan zeroout
+            - assume: el destino ya está en cero, no se escriben
+            - zeroout: BLKZEROOUT (si falla, se escriben ceros)
+            - discard: BLKDISCARD de todo el rango y no se escriben
+              (conviene verificar: no todos los pendrives devuelven ceros)
+            - write: se escribe todo, como dd
+        verify: none, skipped (relee las zonas omitidas) o all (relee todo)
+        block_size: Tamaño de bloque
+        progress: Función (bytes procesados, total) llamada en cada bloque
+
+    Returns:
+        Reporte con bytes escritos, omitidos y puestos a cero
+
+    Raises:
+        ImageWriteError: Si el destino es chico, falla una operación o la verificación
+    """
+    if zero_strategy not in ZERO_STRATEGIES:
+        raise ImageWriteError(f"Estrategia desconocida: {zero_strategy}")
+    if verify not in VERIFY_MODES:
+        raise ImageWriteError(f"Verificación desconocida: {verify}")
+
+    start = time.perf_counter()
+    source_fd = os.open(source, os.O_RDONLY)
+    try:
+        size = os.fstat(source_fd).st_size
+        is_device = os.path.exists(target) and stat.S_ISBLK(os.stat(target).st_mode)
+
+        if is_device:
+            # O_EXCL falla si el dispositivo está montado o en uso
+            target_fd = os.open(target, os.O_RDWR | os.O_EXCL)
+        else:
+            target_fd = os.open(target, os.O_RDWR | os.O_CREAT, 0o644)
+
+        try:
+            strategy = zero_strategy
+            if is_device:
+                capacity = _device_size(target_fd)
+                if capacity < size:
+                    raise ImageWriteError(
+                        f"{target} es demasiado chico ({format_bytes(capacity)} < {format_bytes(size)})"
+                    )
+                if strategy == "auto":
+                    strategy = "zeroout"
+                elif strategy == "discard":
+                    try:
+                        _block_ioctl(target_fd, BLKDISCARD, 0, size // _SECTOR * _SECTOR)
+                    except OSError as e:
+                        raise ImageWriteError(f"BLKDISCARD no soportado en {target}: {e}")
+            else:
+                if strategy in ("auto", "zeroout", "discard"):
+                    # Truncar deja el archivo en cero (y sin ocupar disco)
+                    os.ftruncate(target_fd, 0)
+                    strategy = "truncate"
+                os.ftruncate(target_fd, size)
+
+            report = WriteReport(size, strategy)
+            writer = _Writer(target_fd, strategy, report, block_size)
+            done = 0
+            for offset, length, data in _coalesce(segments(source_fd, size, block_size)):
+                if data is None:
+                    writer.zeros(offset, length)
+                else:
+                    writer.data(offset, data)
+                done += length
+                if progress:
+                    progress(done, size)
+
+            os.fsync(target_fd)
+
+            if verify != "none":
+                # Descartar la caché para releer desde el dispositivo
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(target_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                _verify(source_fd, target_fd, size, verify, writer.skipped_ranges, block_size)
+                report.verified = verify
+        finally:
+            os.close(target_fd)
+    except OSError as e:
+        raise ImageWriteError(str(e))
+    finally:
+        os.close(source_fd)
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main():
+    """Función principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Escribe una imagen en un pendrive omitiendo las zonas en cero")
+    parser.add_argument("image", help="Imagen de origen (ISO o persistencia)")
+    parser.add_argument("target", help="Dispositivo (/dev/sdX) o archivo destino")
+    parser.add_argument("--zero", choices=ZERO_STRATEGIES, default="auto",
+                        help="Tratamiento de las zonas en cero (por defecto: auto)")
+    parser.add_argument("--verify", choices=VERIFY_MODES, default="none",
+                        help="Verificar en la relectura (por defecto: none)")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE // (1024 * 1024),
+                        help="Tamaño de bloque en MB (por defecto: 4)")
+
+    args = parser.parse_args()
+
+    last = [0.0]
+
+    def progress(done, total):
+        now = time.monotonic()
+        if now - last[0] >= 1 or done == total:
+            last[0] = now
+            percent = done * 100 // total if total else 100
+            print(f"\r  {format_bytes(done)} / {format_bytes(total)} ({percent}%)", end="", flush=True)
+
+    try:
+        report = write_image(args.image, args.target, args.zero, args.verify,
+                             args.block_size * 1024 * 1024, progress)
+    except ImageWriteError as e:
+        print(f"\n✗ Error: {e}")
+        return 1
+
+    print("")
+    print(f"✓ Imagen escrita en {report.elapsed:.1f} s (estrategia: {report.strategy})")
+    print(f"  Escritos:      {format_bytes(report.written)}")
+    print(f"  Omitidos:      {format_bytes(report.skipped)}")
+    if report.zeroed:
+        print(f"  Puestos a cero: {format_bytes(report.zeroed)}")
+    if report.verified:
+        print(f"  Verificación:  {report.verified} ✓")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
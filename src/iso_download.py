@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Descarga de la ISO
+Descarga la ISO de Linux Mint en partes, en paralelo y con reanudación:
+
+- El archivo se divide en bloques que se piden con HTTP Range sobre
+  conexiones persistentes (una por hilo y servidor).
+- El avance se guarda en un archivo de estado junto a la descarga
+  (``<iso>.part.json``); si se corta, la próxima ejecución solo pide los
+  bloques que faltan.
+- Los hashes (ver utils.MultiHasher) se calculan a medida que se completa
+  el comienzo del archivo, sin releer la ISO al final.
+- Se pueden indicar espejos (por ejemplo, un servidor del laboratorio);
+  se prueban antes que la URL oficial y un bloque que falla en uno se
+  pide al siguiente.
+- El estado se identifica por la URL oficial y el tamaño; cada bloque
+  recuerda de qué fuente vino y se descarta si el ETag/Last-Modified de
+  esa fuente cambió. Un espejo caído no invalida lo descargado; uno que
+  responde 200 a If-Range se deja de usar y sus bloques se piden a otra.
+- Sin ``--sha256`` se usa el hash publicado en ``sha256sum.txt`` junto a
+  la URL oficial; si no hay ninguno, el reporte lo advierte.
+
+Uso:
+    python3 src/iso_download.py URL ~/desblock-net-downloads/linuxmint.iso \\
+        --mirror http://servidor-lab/isos/ --sha256 <hash>
+"""
+
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from utils import MultiHasher, format_bytes
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_WORKERS = 4
+STATE_SUFFIX = ".part.json"
+PART_SUFFIX = ".part"
+
+PUBLISHED_SUMS = "sha256sum.txt"
+
+_STATE_VERSION = 2
+_READ_SIZE = 256 * 1024
+_MAX_SUMS_SIZE = 64 * 1024
+_USER_AGENT = "DESBLOCK-NET/1.0"
+
+
+class DownloadError(Exception):
+    """Error al descargar o verificar la ISO."""
+
+
+class _SourceChanged(DownloadError):
+    """La fuente respondió 200 a If-Range: su archivo cambió."""
+
+
+class RemoteFile:
+    """
+    Datos de un archivo remoto obtenidos antes de descargarlo.
+    """
+
+    __slots__ = ("url", "size", "etag", "last_modified", "ranges")
+
+    def __init__(self, url: str, size: int, etag: str, last_modified: str, ranges: bool):
+        self.url = url
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.ranges = ranges
+
+
+class DownloadReport:
+    """
+    Resultado de una descarga.
+    """
+
+    __slots__ = ("path", "size", "downloaded", "resumed", "digests", "verified", "sources",
+                 "warnings", "elapsed")
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self.size = size
+        self.downloaded = 0
+        self.resumed = 0
+        self.digests: Dict[str, str] = {}
+        # Hashes comparados con un valor esperado
+        self.verified: List[str] = []
+        # Bytes descargados de cada URL
+        self.sources: Dict[str, int] = {}
+        self.warnings: List[str] = []
+        self.elapsed = 0.0
+
+    def to_dict(self) -> Dict:
+        """Convierte el reporte a un diccionario serializable."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def mirror_url(mirror: str, url: str) -> str:
+    """
+    URL del archivo en un espejo.
+
+    Args:
+        mirror: URL completa del archivo o directorio terminado en "/"
+        url: URL oficial (de ella se toma el nombre del archivo)
+    """
+    if mirror.endswith("/"):
+        return urljoin(mirror, os.path.basename(urlsplit(url).path))
+    return mirror
+
+
+class _Connections:
+    """Conexiones HTTP persistentes, una por hilo y servidor."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def get(self, url: str) -> Tuple[http.client.HTTPConnection, str]:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise DownloadError(f"Esquema no soportado: {url}")
+        key = (parts.scheme, parts.netloc)
+        pool = getattr(self.local, "pool", None)
+        if pool is None:
+            pool = self.local.pool = {}
+        connection = pool.get(key)
+        if connection is None:
+            cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            connection = pool[key] = cls(parts.netloc, timeout=self.timeout)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        return connection, path
+
+    def drop(self, url: str):
+        parts = urlsplit(url)
+        connection = getattr(self.local, "pool", {}).pop((parts.scheme, parts.netloc), None)
+        if connection is not None:
+            connection.close()
+
+    def request(self, url: str, headers: Dict[str, str], redirects: int = 5) -> http.client.HTTPResponse:
+        """GET con reintento ante una conexión persistente cerrada por el servidor."""
+        for attempt in range(2):
+            connection, path = self.get(url)
+            try:
+                connection.request("GET", path, headers={"User-Agent": _USER_AGENT, **headers})
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.drop(url)
+                if attempt:
+                    raise
+                continue
+            if response.status in (301, 302, 303, 307, 308) and redirects > 0:
+                location = response.getheader("Location")
+                response.read()
+                if not location:
+                    raise DownloadError(f"Redirección sin destino: {url}")
+                return self.request(urljoin(url, location), headers, redirects - 1)
+            return response
+        raise DownloadError(f"No se pudo conectar: {url}")
+
+
+def probe(connections: _Connections, url: str) -> RemoteFile:
+    """
+    Obtiene tamaño, ETag y soporte de Range de un archivo remoto.
+
+    Raises:
+        DownloadError: Si el servidor responde con error
+    """
+    response = connections.request(url, {"Range": "bytes=0-0"})
+    try:
+        if response.status == 206:
+            content_range = response.getheader("Content-Range", "")
+            try:
+                size = int(content_range.rsplit("/", 1)[1])
+            except (IndexError, ValueError):
+                raise DownloadError(f"Content-Range inválido en {url}: {content_range!r}")
+            ranges = True
+        elif response.status == 200:
+            size = int(response.getheader("Content-Length", "-1"))
+            ranges = False
+        else:
+            raise DownloadError(f"{url}: HTTP {response.status} {response.reason}")
+    finally:
+        if response.status == 206:
+            response.read()
+        else:
+            # No leer un archivo completo solo para averiguar el tamaño
+            connections.drop(url)
+    return RemoteFile(url, size, response.getheader("ETag", ""),
+                      response.getheader("Last-Modified", ""), ranges)
+
+
+def _validator(source: RemoteFile) -> str:
+    # Un ETag débil (W/) nunca coincide en If-Range: el servidor mandaría
+    # el archivo entero en cada bloque
+    if source.etag and not source.etag.startswith("W/"):
+        return source.etag
+    return source.last_modified
+
+
+def published_sha256(connections: _Connections, url: str) -> Optional[str]:
+    """
+    SHA-256 publicado para la ISO en ``sha256sum.txt`` (mismo directorio).
+
+    Returns:
+        Hash en hexadecimal o None si no está publicado
+    """
+    name = os.path.basename(urlsplit(url).path)
+    sums_url = urljoin(url, PUBLISHED_SUMS)
+    try:
+        response = connections.request(sums_url, {})
+        body = response.read(_MAX_SUMS_SIZE + 1)
+        if response.status != 200 or len(body) > _MAX_SUMS_SIZE:
+            connections.drop(sums_url)
+            return None
+    except (OSError, http.client.HTTPException, DownloadError):
+        connections.drop(sums_url)
+        return None
+    for line in body.decode("utf-8", "replace").splitlines():
+        parts = line.split()
+        # Formato de sha256sum: "<hash> *<archivo>" o "<hash>  <archivo>"
+        if len(parts) == 2 and parts[1].lstrip("*") == name and len(parts[0]) == 64:
+            try:
+                int(parts[0], 16)
+            except ValueError:
+                continue
+            return parts[0].lower()
+    return None
+
+
+def _load_state(path: str) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if state.get("version") == _STATE_VERSION else {}
+
+
+def _save_state(path: str, state: Dict):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _remove(*paths: str):
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+class _Download:
+    """Estado compartido por los hilos de una descarga."""
+
+    def __init__(self, fd: int, sources: List[RemoteFile], chunk_size: int, done: Dict[int, str],
+                 state: Dict, state_path: str, algorithms: Sequence[str], retries: int,
+                 connections: _Connections, report: DownloadReport,
+                 progress: Optional[Callable[[int, int], None]]):
+        self.fd = fd
+        self.sources = sources
+        self.size = sources[0].size
+        self.chunk_size = chunk_size
+        self.chunks = -(-self.size // chunk_size)
+        self.done = done
+        self.state = state
+        self.state_path = state_path
+        self.algorithms = algorithms
+        self.hasher = MultiHasher(algorithms)
+        self.hashed_chunks = 0
+        self.retries = retries
+        self.connections = connections
+        self.report = report
+        self.progress = progress
+        self.lock = threading.Lock()
+        self.completed = sum(self._length(index) for index in done)
+
+    def _length(self, index: int) -> int:
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+    def _fetch(self, source: RemoteFile, index: int):
+        start = index * self.chunk_size
+        length = self._length(index)
+        headers = {"Range": f"bytes={start}-{start + length - 1}"}
+        validator = _validator(source)
+        if validator:
+            headers["If-Range"] = validator
+        response = self.connections.request(source.url, headers)
+        if response.status != 206:
+            # No leer el cuerpo: un 200 trae el archivo entero
+            self.connections.drop(source.url)
+            if response.status == 200 and validator:
+                raise _SourceChanged(f"{source.url}: el archivo cambió (If-Range no coincide)")
+            raise DownloadError(f"{source.url}: HTTP {response.status} al pedir el bloque {index}")
+
+        offset = start
+        buffer = bytearray(_READ_SIZE)
+        view = memoryview(buffer)
+        while offset < start + length:
+            count = response.readinto(view[:min(_READ_SIZE, start + length - offset)])
+            if not count:
+                raise DownloadError(f"{source.url}: respuesta incompleta en el bloque {index}")
+            written = os.pwrite(self.fd, view[:count], offset)
+            if written != count:
+                raise DownloadError("Escritura incompleta en disco")
+            offset += count
+        # Consumir el resto de la respuesta para reutilizar la conexión
+        response.read()
+
+    def fetch_chunk(self, index: int):
+        """Descarga un bloque probando las fuentes en orden."""
+        errors = []
+        for attempt in range(self.retries):
+            for source in list(self.sources):
+                try:
+                    self._fetch(source, index)
+                except _SourceChanged as e:
+                    self.discard(source)
+                    errors.append(str(e))
+                    continue
+                except (OSError, http.client.HTTPException, DownloadError) as e:
+                    self.connections.drop(source.url)
+                    errors.append(f"{source.url}: {e}")
+                    continue
+                self._complete(index, source.url)
+                return
+            time.sleep(min(2 ** attempt, 10) * 0.1)
+        raise DownloadError(f"No se pudo descargar el bloque {index}: {errors[-1] if errors else ''}")
+
+    def discard(self, source: RemoteFile):
+        """Deja de usar una fuente cuyo archivo cambió y descarta sus bloques."""
+        with self.lock:
+            if source not in self.sources:
+                return
+            self.sources.remove(source)
+            dropped = [index for index, url in self.done.items() if url == source.url]
+            for index in dropped:
+                del self.done[index]
+                self.completed -= self._length(index)
+            if dropped and min(dropped) < self.hashed_chunks:
+                # El hash ya incluye bloques descartados: recalcularlo
+                self.hasher = MultiHasher(self.algorithms)
+                self.hashed_chunks = 0
+            _save_state(self.state_path, self.state)
+
+    def _complete(self, index: int, url: str):
+        # Persistir los datos antes de marcar el bloque como descargado
+        os.fdatasync(self.fd)
+        with self.lock:
+            if all(source.url != url for source in self.sources):
+                # La fuente se descartó mientras se descargaba el bloque
+                return
+            # self.done es state["done"]: se guarda con la fuente de cada bloque
+            self.done[index] = url
+            length = self._length(index)
+            self.completed += length
+            self.report.downloaded += length
+            self.report.sources[url] = self.report.sources.get(url, 0) + length
+            _save_state(self.state_path, self.state)
+            self.advance_hash()
+            if self.progress:
+                self.progress(self.completed, self.size)
+
+    def advance_hash(self):
+        """Agrega al hash los bloques contiguos ya completos desde el inicio."""
+        while self.hashed_chunks in self.done:
+            offset = self.hashed_chunks * self.chunk_size
+            end = offset + self._length(self.hashed_chunks)
+            while offset < end:
+                data = os.pread(self.fd, min(_READ_SIZE * 4, end - offset), offset)
+                if not data:
+                    raise DownloadError("Lectura incompleta al calcular los hashes")
+                self.hasher.update(data)
+                offset += len(data)
+            self.hashed_chunks += 1
+
+
+def _stream_whole(connections: _Connections, source: RemoteFile, fd: int, algorithms: Sequence[str],
+                  report: DownloadReport, progress) -> MultiHasher:
+    """Descarga sin Range (el servidor no lo soporta): un solo flujo, sin reanudación."""
+    response = connections.request(source.url, {})
+    if response.status != 200:
+        raise DownloadError(f"{source.url}: HTTP {response.status} {response.reason}")
+    os.ftruncate(fd, 0)
+    hasher = MultiHasher(algorithms)
+    offset = 0
+    while True:
+        data = response.read(_READ_SIZE)
+        if not data:
+            break
+        os.pwrite(fd, data, offset)
+        hasher.update(data)
+        offset += len(data)
+        if progress:
+            progress(offset, source.size)
+    if source.size >= 0 and offset != source.size:
+        raise DownloadError(f"{source.url}: se recibieron {offset} de {source.size} bytes")
+    report.size = offset
+    report.downloaded = offset
+    report.sources[source.url] = offset
+    return hasher
+
+
+def download(url: str, output: str, mirrors: Sequence[str] = (), expected: Optional[Dict[str, str]] = None,
+             workers: int = DEFAULT_WORKERS, chunk_size: int = DEFAULT_CHUNK_SIZE,
+             algorithms: Sequence[str] = ("sha256",), timeout: float = 30, retries: int = 3,
+             progress: Optional[Callable[[int, int], None]] = None,
+             published: bool = True) -> DownloadReport:
+    """
+    Descarga un archivo en paralelo, reanudando una descarga anterior.
+
+    Args:
+        url: URL oficial
+        output: Archivo destino (mientras se descarga se usa ``output + ".part"``)
+        mirrors: Espejos (se prueban antes que la URL oficial)
+        expected: Hashes esperados {algoritmo: hex}; se verifican al final
+        workers: Bloques descargados a la vez
+        chunk_size: Tamaño de cada bloque
+        algorithms: Hashes a calcular (se agregan los de expected)
+        timeout: Timeout de conexión y lectura en segundos
+        retries: Rondas de intentos por bloque sobre todas las fuentes
+        progress: Función (bytes descargados, total)
+        published: Sin sha256 esperado, usar el de ``sha256sum.txt`` junto a
+            la URL oficial
+
+    Returns:
+        Reporte con bytes descargados, reanudados y hashes
+
+    Raises:
+        DownloadError: Si ninguna fuente funciona o los hashes no coinciden
+    """
+    expected = {name.lower(): value.lower() for name, value in (expected or {}).items()}
+    algorithms = tuple(dict.fromkeys(tuple(algorithms) + tuple(expected)))
+    start = time.perf_counter()
+    connections = _Connections(timeout)
+
+    # Fuentes disponibles: espejos primero, todas con el mismo tamaño
+    sources: List[RemoteFile] = []
+    errors = []
+    for candidate in [mirror_url(mirror, url) for mirror in mirrors] + [url]:
+        try:
+            remote = probe(connections, candidate)
+        except (OSError, http.client.HTTPException, DownloadError) as e:
+            errors.append(f"{candidate}: {e}")
+            continue
+        if sources and remote.size != sources[0].size:
+            errors.append(f"{candidate}: tamaño distinto ({remote.size} != {sources[0].size})")
+            continue
+        sources.append(remote)
+    if not sources:
+        raise DownloadError("Ninguna fuente disponible:\n  " + "\n  ".join(errors))
+
+    if published and "sha256" not in expected:
+        digest = published_sha256(connections, url)
+        if digest:
+            expected["sha256"] = digest
+            algorithms = tuple(dict.fromkeys(algorithms + ("sha256",)))
+
+    part_path = output + PART_SUFFIX
+    state_path = output + STATE_SUFFIX
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    ranged = [source for source in sources if source.ranges and source.size > 0]
+    reference = ranged[0] if ranged else sources[0]
+    report = DownloadReport(output, reference.size)
+
+    fd = os.open(part_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if ranged:
+            state = _load_state(state_path)
+            identity = {"url": url, "size": reference.size, "chunk_size": chunk_size}
+            validators = {source.url: _validator(source) for source in ranged}
+            known = state.get("validators", {})
+            if any(state.get(key) != value for key, value in identity.items()) \
+                    or os.fstat(fd).st_size != reference.size \
+                    or known.get(url, validators.get(url)) != validators.get(url):
+                # Sin estado o la ISO oficial cambió: empezar de cero
+                state = {"version": _STATE_VERSION, **identity, "validators": {}, "done": {}}
+                known = {}
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, reference.size)
+
+            # Bloques de una fuente cuyo archivo cambió; los de fuentes que
+            # ahora no responden se conservan (el hash final los verifica)
+            changed = {source for source, value in validators.items() if known.get(source, value) != value}
+            done = {int(index): source for index, source in state["done"].items() if source not in changed}
+            state["done"] = done
+            state["validators"] = {**known, **validators}
+            _save_state(state_path, state)
+
+            job = _Download(fd, ranged, chunk_size, done, state, state_path, algorithms, retries,
+                            connections, report, progress)
+            report.resumed = job.completed
+            with job.lock:
+                job.advance_hash()
+
+            # Otra ronda si se descartaron bloques de una fuente que cambió
+            pending = [index for index in range(job.chunks) if index not in done]
+            while pending:
+                with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                    futures = [executor.submit(job.fetch_chunk, index) for index in pending]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except BaseException:
+                        # Lo ya descargado queda en el estado para reanudar
+                        for future in futures:
+                            future.cancel()
+                        raise
+                with job.lock:
+                    pending = [index for index in range(job.chunks) if index not in done]
+            with job.lock:
+                job.advance_hash()
+            hasher = job.hasher
+        else:
+            hasher = _stream_whole(connections, reference, fd, algorithms, report, progress)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+    report.digests = hasher.hexdigests()
+    mismatched = [name for name, value in expected.items() if report.digests.get(name) != value]
+    if mismatched:
+        _remove(part_path, state_path)
+        raise DownloadError(f"El hash {', '.join(mismatched)} no coincide; se descartó la descarga")
+    report.verified = sorted(expected)
+    if not expected:
+        mirrored = [source for source in report.sources if source != url]
+        if mirrored:
+            report.warnings.append(f"Bloques descargados de espejos sin hash esperado: {', '.join(mirrored)}; "
+                                   f"la ISO no está verificada (use --sha256)")
+        else:
+            report.warnings.append("Sin hash esperado: la ISO no está verificada (use --sha256)")
+
+    os.replace(part_path, output)
+    _remove(state_path)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main():
+    """Función principal."""
+    import argparse
+    from settings import get_settings
+
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Descarga la ISO en paralelo, con reanudación y espejos")
+    parser.add_argument("url", help="URL oficial de la ISO")
+    parser.add_argument("output", help="Archivo destino")
+    parser.add_argument("--mirror", action="append", default=list(settings.usb_creation.iso_mirrors),
+                        help="Espejo (URL del archivo o directorio terminado en /); se puede repetir")
+    parser.add_argument("--sha256", help="SHA-256 esperado")
+    parser.add_argument("--md5", help="MD5 esperado")
+    parser.add_argument("--no-published", action="store_true",
+                        help=f"No usar el hash de {PUBLISHED_SUMS} junto a la URL oficial")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Bloques en paralelo (por defecto: {DEFAULT_WORKERS})")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE // (1024 * 1024),
+                        help="Tamaño de bloque en MB (por defecto: 8)")
+
+    args = parser.parse_args()
+
+    expected = {name: value for name, value in (("sha256", args.sha256), ("md5", args.md5)) if value}
+    last = [0.0]
+
+    def progress(done, total):
+        now = time.monotonic()
+        if now - last[0] >= 1 or done == total:
+            last[0] = now
+            percent = done * 100 // total if total > 0 else 0
+            print(f"\r  {format_bytes(done)} / {format_bytes(total)} ({percent}%)",
+                  end="", flush=True, file=sys.stderr)
+
+    try:
+        report = download(args.url, args.output, args.mirror, expected, args.workers,
+                          args.chunk_size * 1024 * 1024, timeout=settings.network.timeout_seconds,
+                          retries=settings.network.retry_attempts, progress=progress,
+                          published=settings.usb_creation.verify_checksum and not args.no_published)
+    except (OSError, DownloadError) as e:
+        print(f"\n✗ Error: {e}", file=sys.stderr)
+        return 1
+
+    print("", file=sys.stderr)
+    print(f"✓ Descarga completa en {report.elapsed:.1f} s ({format_bytes(report.size)})", file=sys.stderr)
+    if report.resumed:
+        print(f"  Reanudados: {format_bytes(report.resumed)}", file=sys.stderr)
+    for source, count in report.sources.items():
+        print(f"  {source}: {format_bytes(count)}", file=sys.stderr)
+    for name, value in report.digests.items():
+        status = " ✓" if name in report.verified else ""
+        print(f"  {name}: {value}{status}", file=sys.stderr)
+    for warning in report.warnings:
+        print(f"⚠ {warning}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
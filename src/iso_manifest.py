@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Generación de md5sum.txt para la ISO
+Reemplaza ``find . -type f | xargs md5sum`` de customize_iso.sh:
+
+- Los archivos se procesan en paralelo con un pool de hilos (hashlib
+  libera el GIL al procesar bloques grandes).
+- Se guarda un archivo auxiliar con tamaño, fecha de modificación y MD5 de
+  cada archivo; en la siguiente compilación solo se vuelven a leer los
+  archivos cuyo tamaño o fecha cambiaron.
+- El archivo auxiliar guarda el SHA-256 de la ISO de origen
+  (``--source-iso``): si se compila desde otra ISO se descarta entero,
+  porque dos ISOs pueden tener la misma ruta con igual tamaño y fecha.
+- El resultado tiene el mismo formato que md5sum (el que verifica casper):
+  ``<md5>  ./ruta/relativa``, sin incluir ``./md5sum.txt``.
+
+Uso:
+    python3 src/iso_manifest.py /tmp/desblock-iso-work/extract --cache ~/.cache/desblock-net/md5cache.json \
+        --source-iso linuxmint-22-cinnamon-64bit.iso
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+MANIFEST_NAME = "md5sum.txt"
+
+# Tamaño de bloque de lectura
+_READ_SIZE = 1024 * 1024
+
+# Versión del formato del archivo auxiliar
+_CACHE_VERSION = 1
+
+
+def md5_file(path: str) -> str:
+    """
+    Calcula el MD5 de un archivo reutilizando un único buffer.
+
+    Args:
+        path: Ruta al archivo
+
+    Returns:
+        MD5 en hexadecimal
+    """
+    hash_obj = hashlib.md5()
+    buffer = bytearray(_READ_SIZE)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            hash_obj.update(view[:read])
+    return hash_obj.hexdigest()
+
+
+def format_line(digest: str, relative: str) -> str:
+    """
+    Arma una línea con el formato de md5sum.
+
+    Igual que md5sum, los nombres con barra invertida o salto de línea se
+    escapan y la línea empieza con una barra invertida.
+
+    Args:
+        digest: MD5 en hexadecimal
+        relative: Ruta relativa con prefijo ``./``
+
+    Returns:
+        Línea terminada en salto de línea
+    """
+    if "\\" in relative or "\n" in relative:
+        escaped = relative.replace("\\", "\\\\").replace("\n", "\\n")
+        return f"\\{digest}  {escaped}\n"
+    return f"{digest}  {relative}\n"
+
+
+def scan_tree(root: str) -> List[Tuple[str, int, int]]:
+    """
+    Lista los archivos regulares del árbol (como ``find -type f``).
+
+    Args:
+        root: Raíz del árbol
+
+    Returns:
+        Tuplas (ruta relativa con ``./``, tamaño, mtime en ns) ordenadas
+    """
+    files = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    relative = "./" + os.path.relpath(entry.path, root)
+                    if relative == "./" + MANIFEST_NAME:
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                    files.append((relative, st.st_size, st.st_mtime_ns))
+    files.sort()
+    return files
+
+
+def load_cache(cache_path: Optional[str], source: Optional[str] = None) -> Dict[str, List]:
+    """Lee el archivo auxiliar (vacío si no existe, está dañado o es de otra versión o ISO)."""
+    if not cache_path:
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != _CACHE_VERSION or data.get("source") != source:
+        return {}
+    return data.get("files", {})
+
+
+def save_cache(cache_path: str, files: Dict[str, List], source: Optional[str] = None):
+    """Guarda el archivo auxiliar de forma atómica."""
+    directory = os.path.dirname(os.path.abspath(cache_path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": _CACHE_VERSION, "source": source, "files": files}, f, separators=(",", ":"))
+    os.replace(tmp_path, cache_path)
+
+
+def build_manifest(root: str, cache_path: Optional[str] = None,
+                   workers: Optional[int] = None, source: Optional[str] = None) -> Dict:
+    """
+    Genera md5sum.txt en la raíz del árbol.
+
+    Args:
+        root: Raíz del árbol de la ISO
+        cache_path: Archivo auxiliar con los digests anteriores (opcional)
+        workers: Hilos de cálculo (por defecto, según la cantidad de CPUs)
+        source: Identificador de la ISO de origen (su SHA-256); el archivo
+            auxiliar de otra ISO no se reutiliza
+
+    Returns:
+        Estadísticas: archivos, reutilizados, calculados, bytes leídos y tiempo
+    """
+    start = time.perf_counter()
+    files = scan_tree(root)
+    cache = load_cache(cache_path, source)
+
+    digests: Dict[str, str] = {}
+    pending: List[Tuple[str, int, int]] = []
+    for relative, size, mtime_ns in files:
+        cached = cache.get(relative)
+        if cached and cached[0] == size and cached[1] == mtime_ns:
+            digests[relative] = cached[2]
+        else:
+            pending.append((relative, size, mtime_ns))
+
+    if pending:
+        if workers is None:
+            workers = min(8, (os.cpu_count() or 1) + 2)
+        # Los archivos grandes primero, para repartir mejor la carga
+        pending.sort(key=lambda item: item[1], reverse=True)
+        paths = [os.path.join(root, relative[2:]) for relative, _, _ in pending]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for (relative, _, _), digest in zip(pending, executor.map(md5_file, paths)):
+                digests[relative] = digest
+
+    manifest_path = os.path.join(root, MANIFEST_NAME)
+    if os.path.lexists(manifest_path):
+        # Puede ser un enlace duro a una copia en caché
+        os.unlink(manifest_path)
+    with open(manifest_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.writelines(format_line(digests[relative], relative) for relative, _, _ in files)
+
+    if cache_path:
+        save_cache(cache_path, {
+            relative: [size, mtime_ns, digests[relative]]
+            for relative, size, mtime_ns in files
+        }, source)
+
+    return {
+        "files": len(files),
+        "reused": len(files) - len(pending),
+        "hashed": len(pending),
+        "bytes_hashed": sum(size for _, size, _ in pending),
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def main():
+    """Función principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Genera md5sum.txt para el árbol de una ISO")
+    parser.add_argument("root", help="Raíz del árbol de la ISO")
+    parser.add_argument("--cache", help="Archivo auxiliar para reutilizar digests entre compilaciones")
+    parser.add_argument("--source-iso", help="ISO de la que se extrajo el árbol (la caché es por ISO)")
+    parser.add_argument("--workers", type=int, help="Cantidad de hilos")
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        print(f"✗ Error: El directorio no existe: {args.root}")
+        return 1
+
+    try:
+        source = None
+        if args.source_iso:
+            # Mismo índice de digests que iso_remaster: no relee la ISO si no cambió
+            from iso_remaster import DEFAULT_CACHE_DIR, iso_digest
+            os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+            source = iso_digest(args.source_iso, DEFAULT_CACHE_DIR)
+        stats = build_manifest(args.root, args.cache, args.workers, source)
+    except OSError as e:
+        print(f"✗ Error: {e}")
+        return 1
+
+    print(f"✓ {MANIFEST_NAME}: {stats['files']} archivos "
+          f"({stats['reused']} reutilizados, {stats['hashed']} calculados, "
+          f"{stats['bytes_hashed'] / (1024 * 1024):.1f} MB leídos) en {stats['elapsed']:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
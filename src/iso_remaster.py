@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Remasterización incremental de ISO
+Alternativa a scripts/customize_iso.sh que evita repetir el trabajo caro
+en cada compilación:
+
+1. La ISO base se extrae (árbol de la ISO y filesystem.squashfs) una sola
+   vez y se guarda en caché, identificada por el SHA-256 de la ISO.
+2. Los archivos de DESBLOCK-NET se arman en una capa aparte (payload) y se
+   aplican sobre una copia por enlaces duros del sistema base, escribiendo
+   solo los archivos que cambiaron desde la compilación anterior.
+3. filesystem.squashfs solo se vuelve a comprimir si cambió el payload; si
+   no, se reutiliza el de la compilación anterior.
+
+Se informa el tiempo de cada etapa.
+
+Uso (como root, para preservar dueños y permisos del sistema base):
+    sudo python3 src/iso_remaster.py linuxmint-22-cinnamon-64bit.iso desblock-net.iso
+    sudo python3 src/iso_remaster.py linuxmint-22-cinnamon-64bit.iso desblock-net.iso --target /dev/sdb
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+from image_stream import StreamError, extract_mbr, stream_iso
+from iso9660 import IsoError, IsoImage
+from iso_manifest import build_manifest
+from squashfs_profile import ProfileError, profile_options
+from utils import copy_file
+
+# Directorio del proyecto (src/..)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "desblock-net", "remaster"
+)
+
+# Marca de extracción completa en la caché
+_COMPLETE_MARKER = ".complete"
+
+LAUNCHER_SCRIPT = """#!/bin/bash
+cd /opt/desblock-net/src
+python3 gui_app.py
+"""
+
+DESKTOP_ENTRY = """[Desktop Entry]
+Version=1.0
+Type=Application
+Name=DESBLOCK-NET
+Comment=Sistema de Desbloqueo Conectar Igualdad
+Exec=/usr/local/bin/desblock-net
+Icon=system-lock-screen
+Terminal=false
+Categories=System;Utility;
+Keywords=unlock;desbloqueo;conectar;igualdad;
+"""
+
+MOTD = """
+╔═══════════════════════════════════════════════════════════╗
+║                                                           ║
+║              🔓 DESBLOCK-NET LIVE SYSTEM                 ║
+║                                                           ║
+║        Sistema de Desbloqueo Conectar Igualdad          ║
+║                                                           ║
+║  Para usar: Busca el ícono DESBLOCK-NET en el escritorio ║
+║                                                           ║
+╚═══════════════════════════════════════════════════════════╝
+
+"""
+
+AUTOSTART_ENTRY = """[Desktop Entry]
+Type=Application
+Name=DESBLOCK-NET Welcome
+Exec=zenity --info --title="DESBLOCK-NET" --text="Bienvenido a DESBLOCK-NET\\n\\nBusca el ícono de DESBLOCK-NET en el escritorio para comenzar." --width=400
+Terminal=false
+NoDisplay=true
+X-GNOME-Autostart-enabled=true
+"""
+
+
+class RemasterError(Exception):
+    """Error durante la remasterización."""
+
+
+class StageTimer:
+    """
+    Registra la duración de cada etapa de la remasterización.
+    """
+
+    def __init__(self):
+        self.stages: List[Dict] = []
+
+    def stage(self, name: str):
+        """Context manager que mide una etapa e imprime su resultado."""
+        timer = self
+
+        class _Stage:
+            def __enter__(self):
+                print(f"[INFO] {name}...")
+                self.start = time.perf_counter()
+                self.note = ""
+                return self
+
+            def __exit__(self, exc_type, exc, tb):
+                elapsed = time.perf_counter() - self.start
+                timer.stages.append({"stage": name, "seconds": elapsed, "note": self.note})
+                if exc_type is None:
+                    suffix = f" ({self.note})" if self.note else ""
+                    print(f"[✓] {name}: {elapsed:.1f} s{suffix}")
+                return False
+
+        return _Stage()
+
+    def report(self) -> str:
+        """Arma la tabla de tiempos por etapa."""
+        lines = ["", "=" * 60, "Tiempos por etapa", "=" * 60]
+        total = 0.0
+        for stage in self.stages:
+            total += stage["seconds"]
+            lines.append(f"  {stage['stage']:<40} {stage['seconds']:8.1f} s")
+        lines.append("-" * 60)
+        lines.append(f"  {'Total':<40} {total:8.1f} s")
+        return "\n".join(lines)
+
+
+def _run(command: List[str], cwd: Optional[str] = None):
+    """Ejecuta un comando externo y falla con RemasterError si no termina bien."""
+    try:
+        subprocess.run(command, cwd=cwd, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise RemasterError(f"Falló '{command[0]}': {e}")
+
+
+def _file_digest(path: str) -> str:
+    """SHA-256 de un archivo, leído en bloques de 1 MB."""
+    hash_obj = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hash_obj.update(chunk)
+    return hash_obj.hexdigest()
+
+
+def _load_json(path: str) -> Dict:
+    """Lee un JSON de la caché (diccionario vacío si no existe o está dañado)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_json(path: str, data: Dict):
+    """Guarda un JSON de forma atómica."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def iso_digest(iso_path: str, cache_dir: str) -> str:
+    """
+    Obtiene el SHA-256 de la ISO, reutilizándolo si no cambió.
+
+    El digest se cachea por ruta, tamaño y fecha de modificación para no
+    releer varios GB en cada compilación.
+
+    Args:
+        iso_path: Ruta a la ISO
+        cache_dir: Directorio de caché
+
+    Returns:
+        SHA-256 en hexadecimal
+    """
+    index_path = os.path.join(cache_dir, "iso_digests.json")
+    index = _load_json(index_path)
+
+    st = os.stat(iso_path)
+    key = os.path.abspath(iso_path)
+    cached = index.get(key)
+    if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+        return cached["sha256"]
+
+    digest = _file_digest(iso_path)
+    index[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+    _save_json(index_path, index)
+    return digest
+
+
+def find_squashfs(iso_tree: str) -> str:
+    """
+    Busca filesystem.squashfs dentro del árbol de la ISO.
+
+    Returns:
+        Ruta relativa al árbol (casper/ o live/)
+
+    Raises:
+        RemasterError: Si no se encuentra
+    """
+    for relative in ("casper/filesystem.squashfs", "live/filesystem.squashfs"):
+        if os.path.isfile(os.path.join(iso_tree, relative)):
+            return relative
+    raise RemasterError("No se encontró filesystem.squashfs")
+
+
+def extract_iso_tree(iso_path: str, target: str):
+    """
+    Extrae el contenido de la ISO.
+
+    Usa el lector ISO 9660 propio (no requiere root ni montar); si la
+    imagen no se puede leer, recurre a xorriso o a mount + rsync.
+
+    Args:
+        iso_path: Ruta a la ISO
+        target: Directorio destino
+    """
+    os.makedirs(target, exist_ok=True)
+
+    try:
+        with IsoImage(iso_path) as image:
+            image.extract(target)
+        return
+    except IsoError as e:
+        print(f"[!] Lector ISO 9660: {e}")
+
+    if shutil.which("xorriso"):
+        _run(["xorriso", "-osirrox", "on", "-indev", iso_path, "-extract", "/", target])
+        # xorriso deja los archivos de solo lectura como en la ISO
+        _run(["chmod", "-R", "u+w", target])
+        return
+
+    mount_dir = f"{target}.mount"
+    os.makedirs(mount_dir, exist_ok=True)
+    _run(["mount", "-o", "loop,ro", iso_path, mount_dir])
+    try:
+        _run(["rsync", "-a", f"{mount_dir}/", f"{target}/"])
+    finally:
+        subprocess.run(["umount", mount_dir])
+        os.rmdir(mount_dir)
+
+
+def extract_base(iso_path: str, digest: str, cache_dir: str, timer: StageTimer) -> str:
+    """
+    Extrae la ISO base y su squashfs en la caché (una sola vez por ISO).
+
+    Args:
+        iso_path: Ruta a la ISO original
+        digest: SHA-256 de la ISO
+        cache_dir: Directorio de caché
+        timer: Registro de etapas
+
+    Returns:
+        Directorio de la caché de esta ISO (contiene iso/ y rootfs/)
+    """
+    base_dir = os.path.join(cache_dir, digest)
+    marker = os.path.join(base_dir, _COMPLETE_MARKER)
+
+    with timer.stage("Extracción de la ISO base") as stage:
+        if os.path.exists(marker):
+            stage.note = "en caché"
+            return base_dir
+
+        shutil.rmtree(base_dir, ignore_errors=True)
+        iso_tree = os.path.join(base_dir, "iso")
+        extract_iso_tree(iso_path, iso_tree)
+
+        squashfs_path = os.path.join(iso_tree, find_squashfs(iso_tree))
+        _run(["unsquashfs", "-d", os.path.join(base_dir, "rootfs"), squashfs_path])
+
+        with open(marker, 'w') as f:
+            f.write(f"{iso_path}\n")
+
+    return base_dir
+
+
+def build_payload(payload_dir: str, project_dir: str = PROJECT_DIR):
+    """
+    Arma la capa con los archivos de DESBLOCK-NET (igual que customize_iso.sh).
+
+    Args:
+        payload_dir: Directorio destino (se recrea desde cero)
+        project_dir: Raíz del proyecto
+    """
+    shutil.rmtree(payload_dir, ignore_errors=True)
+
+    def write(relative: str, content: str, mode: int = 0o644):
+        path = os.path.join(payload_dir, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(path, mode)
+
+    target = os.path.join(payload_dir, "opt", "desblock-net")
+    ignore = shutil.ignore_patterns("__pycache__", "*.pyc")
+    for name in ("src", "config"):
+        shutil.copytree(os.path.join(project_dir, name), os.path.join(target, name),
+                        ignore=ignore, copy_function=copy_file)
+    for name in ("README.md", "LICENSE"):
+        copy_file(os.path.join(project_dir, name), os.path.join(target, name))
+
+    write("usr/local/bin/desblock-net", LAUNCHER_SCRIPT, 0o755)
+    write("usr/share/applications/desblock-net.desktop", DESKTOP_ENTRY)
+    for desktop_dir in ("etc/skel/Desktop", "etc/skel/Escritorio"):
+        write(f"{desktop_dir}/desblock-net.desktop", DESKTOP_ENTRY, 0o755)
+    write("etc/motd", MOTD)
+    write("etc/xdg/autostart/desblock-net-welcome.desktop", AUTOSTART_ENTRY)
+
+
+def payload_manifest(payload_dir: str) -> Dict[str, str]:
+    """
+    Calcula el manifiesto del payload (ruta relativa -> hash de contenido y modo).
+
+    Args:
+        payload_dir: Directorio del payload
+
+    Returns:
+        Diccionario ordenado por ruta
+    """
+    manifest = {}
+    for root, dirs, files in os.walk(payload_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, payload_dir)
+            mode = os.stat(path).st_mode & 0o7777
+            manifest[relative] = f"{_file_digest(path)}:{mode:o}"
+    return manifest
+
+
+def manifest_fingerprint(manifest: Dict[str, str], extra: str = "") -> str:
+    """Huella de un manifiesto (y opciones de compresión) para la caché."""
+    hash_obj = hashlib.sha256(extra.encode())
+    for relative, entry in sorted(manifest.items()):
+        hash_obj.update(f"{relative}\0{entry}\n".encode())
+    return hash_obj.hexdigest()[:16]
+
+
+def _clone_tree(source: str, target: str):
+    """Copia un árbol con enlaces duros (sin duplicar datos)."""
+    shutil.rmtree(target, ignore_errors=True)
+    _run(["cp", "-a", "--link", source, target])
+
+
+def apply_payload(merged_dir: str, rootfs_dir: str, payload_dir: str,
+                  manifest: Dict[str, str], applied: Dict[str, str]) -> Dict[str, int]:
+    """
+    Aplica el payload sobre el árbol combinado, escribiendo solo lo que cambió.
+
+    Los archivos del árbol combinado son enlaces duros al sistema base en
+    caché, así que antes de escribir se elimina el enlace para no modificar
+    la caché. Los archivos que ya no están en el payload se restauran desde
+    el sistema base (o se eliminan si no existían).
+
+    Args:
+        merged_dir: Árbol combinado (base + payload anterior)
+        rootfs_dir: Sistema base extraído
+        payload_dir: Payload actual
+        manifest: Manifiesto del payload actual
+        applied: Manifiesto del payload aplicado anteriormente
+
+    Returns:
+        Contadores {'written', 'unchanged', 'removed'}
+    """
+    counts = {"written": 0, "unchanged": 0, "removed": 0}
+
+    for relative, entry in manifest.items():
+        if applied.get(relative) == entry:
+            counts["unchanged"] += 1
+            continue
+
+        destination = os.path.join(merged_dir, relative)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        if os.path.lexists(destination):
+            os.unlink(destination)
+        copy_file(os.path.join(payload_dir, relative), destination)
+        counts["written"] += 1
+
+    for relative in set(applied) - set(manifest):
+        destination = os.path.join(merged_dir, relative)
+        if os.path.lexists(destination):
+            os.unlink(destination)
+        original = os.path.join(rootfs_dir, relative)
+        if os.path.lexists(original):
+            os.link(original, destination, follow_symlinks=False)
+        counts["removed"] += 1
+
+    return counts
+
+
+def tree_size(path: str) -> int:
+    """Suma del tamaño de los archivos de un árbol (para filesystem.size)."""
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def remaster(input_iso: str, output_iso: str, cache_dir: str = DEFAULT_CACHE_DIR,
+             project_dir: str = PROJECT_DIR, targets: Sequence[str] = ()) -> StageTimer:
+    """
+    Remasteriza la ISO de forma incremental.
+
+    Args:
+        input_iso: ISO original de Linux Mint
+        output_iso: ISO de salida
+        cache_dir: Directorio de caché
+        project_dir: Raíz del proyecto (origen del payload)
+        targets: Pendrives (o archivos) donde escribir también la ISO,
+            en el mismo flujo y sin releerla
+
+    Returns:
+        Registro de etapas con sus tiempos
+
+    Raises:
+        RemasterError: Si falla alguna etapa
+    """
+    timer = StageTimer()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    with timer.stage("Digest de la ISO") as stage:
+        digest = iso_digest(input_iso, cache_dir)
+        stage.note = digest[:12]
+
+    base_dir = extract_base(input_iso, digest, cache_dir, timer)
+    iso_base = os.path.join(base_dir, "iso")
+    rootfs_dir = os.path.join(base_dir, "rootfs")
+    merged_dir = os.path.join(base_dir, "merged")
+    state_path = os.path.join(base_dir, "state.json")
+    state = _load_json(state_path)
+
+    with timer.stage("Armado del payload") as stage:
+        payload_dir = os.path.join(base_dir, "payload")
+        build_payload(payload_dir, project_dir)
+        manifest = payload_manifest(payload_dir)
+        try:
+            squashfs_options = profile_options()
+        except ProfileError as e:
+            raise RemasterError(str(e))
+        fingerprint = manifest_fingerprint(manifest, " ".join(squashfs_options))
+        stage.note = f"{len(manifest)} archivos"
+
+    with timer.stage("Aplicación del payload") as stage:
+        if not os.path.isdir(merged_dir) or "applied" not in state:
+            _clone_tree(rootfs_dir, merged_dir)
+            state = {}
+        counts = apply_payload(merged_dir, rootfs_dir, payload_dir, manifest, state.get("applied", {}))
+        state["applied"] = manifest
+        _save_json(state_path, state)
+        stage.note = f"{counts['written']} escritos, {counts['unchanged']} sin cambios, {counts['removed']} quitados"
+
+    squashfs_relative = find_squashfs(iso_base)
+    squashfs_cached = os.path.join(base_dir, f"filesystem-{fingerprint}.squashfs")
+
+    with timer.stage("Reempaquetado de squashfs") as stage:
+        if os.path.exists(squashfs_cached) and state.get("squashfs") == fingerprint:
+            stage.note = "sin cambios, reutilizado"
+        else:
+            # Conservar un solo squashfs en caché
+            for name in os.listdir(base_dir):
+                if name.startswith("filesystem-") and name.endswith(".squashfs"):
+                    os.unlink(os.path.join(base_dir, name))
+            _run(["mksquashfs", merged_dir, squashfs_cached] + squashfs_options)
+            state["squashfs"] = fingerprint
+            state["filesystem_size"] = tree_size(merged_dir)
+            _save_json(state_path, state)
+
+    with timer.stage("Armado del árbol de la ISO"):
+        iso_tree = os.path.join(base_dir, "iso-work")
+        _clone_tree(iso_base, iso_tree)
+
+        squashfs_target = os.path.join(iso_tree, squashfs_relative)
+        os.unlink(squashfs_target)
+        os.link(squashfs_cached, squashfs_target)
+
+        size_path = os.path.join(os.path.dirname(squashfs_target), "filesystem.size")
+        if os.path.lexists(size_path):
+            os.unlink(size_path)
+        with open(size_path, 'w') as f:
+            f.write(f"{state.get('filesystem_size') or tree_size(merged_dir)}\n")
+
+    with timer.stage("Actualización de md5sum.txt") as stage:
+        manifest_stats = build_manifest(iso_tree, os.path.join(base_dir, "md5cache.json"))
+        stage.note = f"{manifest_stats['hashed']} calculados, {manifest_stats['reused']} reutilizados"
+
+    with timer.stage("Creación de la ISO") as stage:
+        # MBR híbrido tomado de la ISO original (si no, el de syslinux)
+        mbr = extract_mbr(input_iso, os.path.join(base_dir, "isohdpfx.bin"))
+        try:
+            result = stream_iso(iso_tree, [output_iso] + list(targets), mbr)
+        except StreamError as e:
+            raise RemasterError(str(e))
+        finally:
+            shutil.rmtree(iso_tree, ignore_errors=True)
+        stage.note = f"sha256 {result['hashes']['sha256']}"
+
+    return timer
+
+
+def main():
+    """Función principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Remasterización incremental de la ISO de Linux Mint con DESBLOCK-NET"
+    )
+    parser.add_argument("input_iso", help="ISO original de Linux Mint")
+    parser.add_argument("output_iso", help="ISO personalizada de salida")
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directorio de caché (por defecto: {DEFAULT_CACHE_DIR})"
+    )
+    parser.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        metavar="DISPOSITIVO",
+        help="Escribir también la ISO en este pendrive durante la creación (repetible)"
+    )
+    parser.add_argument(
+        "--timings",
+        metavar="JSON",
+        help="Guardar los tiempos por etapa en un archivo JSON"
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.input_iso):
+        print(f"✗ Error: El archivo ISO no existe: {args.input_iso}")
+        return 1
+
+    try:
+        timer = remaster(args.input_iso, args.output_iso, args.cache_dir, targets=args.target)
+    except (RemasterError, OSError) as e:
+        print(f"✗ Error: {e}")
+        return 1
+
+    print(timer.report())
+    print(f"\n✓ ISO creada: {args.output_iso}\n")
+
+    if args.timings:
+        _save_json(args.timings, {"stages": timer.stages})
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
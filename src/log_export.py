@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Exportación del registro de desbloqueos
+Exporta el historial de desbloqueos a CSV, JSON Lines o a un archivo
+columnar compacto, filtrando por fecha, año y servidor.
+
+Las entradas se leen de a una (ver log_store) y se escriben a medida que
+pasan los filtros, así la memoria usada no depende del tamaño del
+historial. El formato columnar agrupa las filas en bloques comprimidos con
+zlib y codifica con diccionario las columnas repetitivas (año, servidor,
+versión).
+
+Uso:
+    python3 src/log_export.py --format csv --output desbloqueos.csv --since 2023-01-01
+"""
+
+import csv
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from log_index import iter_range
+from log_store import LogFormatError, iter_entries
+from records import LogEntry
+
+FORMATS = ("csv", "jsonl", "columnar")
+
+COLUMNAR_MAGIC = b"DBLC1\n"
+# Filas por bloque del formato columnar
+ROW_GROUP_SIZE = 65536
+# Columnas con pocos valores distintos (codificadas con diccionario)
+DICTIONARY_COLUMNS = ("year", "server", "version")
+
+_LENGTH = struct.Struct(">I")
+
+
+class ExportStats:
+    """
+    Resultado de una exportación.
+    """
+
+    __slots__ = ("read", "written", "elapsed")
+
+    def __init__(self):
+        self.read = 0
+        self.written = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        """Convierte el resultado a un diccionario serializable."""
+        return {
+            "read": self.read,
+            "written": self.written,
+            "elapsed": self.elapsed,
+            "rows_per_second": self.rows_per_second,
+        }
+
+
+def build_filter(since: Optional[str] = None, until: Optional[str] = None,
+                 years: Sequence[str] = (), servers: Sequence[str] = ()) -> Callable[[Dict], bool]:
+    """
+    Crea el filtro de entradas.
+
+    Args:
+        since: Fecha mínima "YYYY-MM-DD" (inclusive)
+        until: Fecha máxima "YYYY-MM-DD" (inclusive)
+        years: Años de entrega aceptados (vacío = todos)
+        servers: Servidores aceptados (vacío = todos)
+
+    Returns:
+        Función que indica si una entrada pasa el filtro
+    """
+    years = frozenset(years)
+    servers = frozenset(servers)
+
+    def accept(entry: Dict) -> bool:
+        # Los timestamps ISO 8601 se comparan como texto
+        day = entry.get("timestamp", "")[:10]
+        if since and day < since:
+            return False
+        if until and day > until:
+            return False
+        if years and entry.get("year") not in years:
+            return False
+        if servers and entry.get("server") not in servers:
+            return False
+        return True
+
+    return accept
+
+
+class CsvExporter:
+    """Escribe las entradas como CSV con encabezado."""
+
+    def __init__(self, f):
+        self.writer = csv.writer(f)
+        self.writer.writerow(LogEntry.FIELDS)
+
+    def write(self, entry: Dict):
+        self.writer.writerow([entry.get(field, "") for field in LogEntry.FIELDS])
+
+    def close(self):
+        pass
+
+
+class JsonlExporter:
+    """Escribe una entrada por línea en JSON."""
+
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, entry: Dict):
+        self.f.write(json.dumps({field: entry.get(field, "") for field in LogEntry.FIELDS},
+                                ensure_ascii=False))
+        self.f.write("\n")
+
+    def close(self):
+        pass
+
+
+class ColumnarExporter:
+    """
+    Escribe bloques de ROW_GROUP_SIZE filas por columnas.
+
+    Formato: COLUMNAR_MAGIC y luego cada bloque como longitud (4 bytes,
+    big endian) + JSON comprimido con zlib; un bloque de longitud 0 marca
+    el final. Cada columna es ``{"values": [...]}`` o, para las de
+    DICTIONARY_COLUMNS, ``{"dict": [...], "codes": [...]}``.
+    """
+
+    def __init__(self, f, row_group_size: int = ROW_GROUP_SIZE):
+        self.f = f
+        self.row_group_size = row_group_size
+        self.columns: Dict[str, List[str]] = {field: [] for field in LogEntry.FIELDS}
+        self.rows = 0
+        f.write(COLUMNAR_MAGIC)
+
+    def write(self, entry: Dict):
+        for field, values in self.columns.items():
+            values.append(entry.get(field, ""))
+        self.rows += 1
+        if self.rows >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self.rows:
+            return
+        encoded = {}
+        for field, values in self.columns.items():
+            if field in DICTIONARY_COLUMNS:
+                codes: Dict[str, int] = {}
+                encoded[field] = {
+                    "codes": [codes.setdefault(value, len(codes)) for value in values],
+                    "dict": list(codes),
+                }
+            else:
+                encoded[field] = {"values": values}
+        block = zlib.compress(json.dumps({"rows": self.rows, "columns": encoded},
+                                         ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        self.f.write(_LENGTH.pack(len(block)))
+        self.f.write(block)
+        self.columns = {field: [] for field in LogEntry.FIELDS}
+        self.rows = 0
+
+    def close(self):
+        self._flush()
+        self.f.write(_LENGTH.pack(0))
+
+
+def read_columnar(path: str) -> Iterator[Dict]:
+    """
+    Lee un archivo del formato columnar.
+
+    Yields:
+        Diccionarios de entradas
+
+    Raises:
+        LogFormatError: Si el archivo no tiene el formato esperado
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise LogFormatError(f"{path}: no es un archivo columnar de DESBLOCK-NET")
+        while True:
+            header = f.read(_LENGTH.size)
+            if len(header) != _LENGTH.size:
+                raise LogFormatError(f"{path}: archivo truncado")
+            (length,) = _LENGTH.unpack(header)
+            if length == 0:
+                return
+            group = json.loads(zlib.decompress(f.read(length)))
+            columns = []
+            for field in LogEntry.FIELDS:
+                column = group["columns"][field]
+                if "dict" in column:
+                    dictionary = column["dict"]
+                    columns.append([dictionary[code] for code in column["codes"]])
+                else:
+                    columns.append(column["values"])
+            for row in zip(*columns):
+                yield dict(zip(LogEntry.FIELDS, row))
+
+
+_EXPORTERS = {
+    "csv": (CsvExporter, False),
+    "jsonl": (JsonlExporter, False),
+    "columnar": (ColumnarExporter, True),
+}
+
+
+def export_entries(entries: Iterable[Dict], output, fmt: str = "csv",
+                   accept: Optional[Callable[[Dict], bool]] = None) -> ExportStats:
+    """
+    Exporta entradas a un archivo abierto.
+
+    Args:
+        entries: Entradas (diccionarios)
+        output: Archivo de texto (csv, jsonl) o binario (columnar)
+        fmt: Formato de salida
+        accept: Filtro de entradas (ver build_filter)
+
+    Returns:
+        Estadísticas de la exportación
+    """
+    exporter = _EXPORTERS[fmt][0](output)
+    stats = ExportStats()
+    start = time.perf_counter()
+    for entry in entries:
+        stats.read += 1
+        if accept is None or accept(entry):
+            exporter.write(entry)
+            stats.written += 1
+    exporter.close()
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def export_logs(log_dir: str, output_path: str, fmt: str = "csv", since: Optional[str] = None,
+                until: Optional[str] = None, years: Sequence[str] = (),
+                servers: Sequence[str] = ()) -> ExportStats:
+    """
+    Exporta el historial de un directorio de logs.
+
+    El archivo de salida se escribe en un temporal y se renombra al
+    terminar; con output_path "-" se escribe en la salida estándar
+    (solo csv y jsonl).
+
+    Args:
+        log_dir: Directorio de logs
+        output_path: Archivo de salida o "-"
+        fmt: csv, jsonl o columnar
+        since, until: Rango de fechas "YYYY-MM-DD" (inclusive)
+        years: Años de entrega aceptados
+        servers: Servidores aceptados
+
+    Returns:
+        Estadísticas de la exportación
+
+    Raises:
+        ValueError: Si el formato no es válido
+        LogFormatError: Si un log está dañado
+    """
+    if fmt not in _EXPORTERS:
+        raise ValueError(f"Formato desconocido: {fmt}")
+    binary = _EXPORTERS[fmt][1]
+    if since or until:
+        # Con rango de fechas se leen solo los bloques del índice que lo cubren
+        entries = iter_range(log_dir, since, until)
+    else:
+        entries = iter_entries(log_dir)
+    accept = build_filter(since, until, years, servers)
+
+    if output_path == "-":
+        if binary:
+            raise ValueError("El formato columnar no se puede escribir en la salida estándar")
+        return export_entries(entries, sys.stdout, fmt, accept)
+
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        if binary:
+            with os.fdopen(fd, 'wb') as f:
+                stats = export_entries(entries, f, fmt, accept)
+        else:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                stats = export_entries(entries, f, fmt, accept)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return stats
+
+
+def main():
+    """Función principal."""
+    import argparse
+    import profiling
+    from settings import get_settings
+
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Exporta el historial de desbloqueos")
+    parser.add_argument("--log-dir", default=settings.logging.directory,
+                        help=f"Directorio de logs (por defecto: {settings.logging.directory})")
+    parser.add_argument("--format", choices=FORMATS, default="csv", help="Formato de salida (por defecto: csv)")
+    parser.add_argument("--output", required=True, help="Archivo de salida ('-' = salida estándar)")
+    parser.add_argument("--since", metavar="YYYY-MM-DD", help="Fecha mínima (inclusive)")
+    parser.add_argument("--until", metavar="YYYY-MM-DD", help="Fecha máxima (inclusive)")
+    parser.add_argument("--year", action="append", default=[], choices=["2021", "2022", "2023"],
+                        help="Año de entrega (se puede repetir)")
+    parser.add_argument("--server", action="append", default=[], help="Servidor (se puede repetir)")
+    profiling.add_profile_arguments(parser)
+
+    args = parser.parse_args()
+
+    if not settings.features.export_codes:
+        print("✗ Error: la exportación está desactivada (features.export_codes en settings.json)")
+        return 1
+
+    try:
+        with profiling.profiling(args):
+            stats = export_logs(args.log_dir, args.output, args.format, args.since, args.until,
+                                args.year, args.server)
+    except (OSError, ValueError) as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"✓ {stats.written} de {stats.read} entradas exportadas en {stats.elapsed:.2f} s "
+          f"({stats.rows_per_second:,.0f} filas/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
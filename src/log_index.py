@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Índice de los logs por fecha
+Cada log mensual JSON Lines tiene un índice al lado
+(``unlock_log_YYYYMM.jsonl.idx``) con el desplazamiento en bytes de cada
+bloque de ``BLOCK_RECORDS`` entradas y el primer y último momento de
+cada bloque y del mes completo. Una consulta por rango ("del 14 al 18")
+mapea el log con ``mmap`` y lee solo los bloques que se superponen con
+el rango: recorrer un año de historial toca solo las páginas necesarias.
+
+- El índice se actualiza en cada ``log_store.append_entries`` (solo se
+  recorren los bytes nuevos) y se arma la primera vez que se consulta un
+  log sin índice.
+- Los bloques guardan mínimo y máximo: entradas fuera de orden (varios
+  procesos o equipos con la hora distinta) no dan resultados de menos.
+- Lo agregado después del último índice (otra versión, un proceso que
+  se cortó) se lee siempre, así que un índice atrasado no pierde
+  entradas. Un índice dañado o de otro archivo se descarta.
+
+Los momentos se comparan como hora local sin zona, igual que el texto
+ISO 8601 de los timestamps.
+
+Uso:
+    from log_index import iter_range
+    for entry in iter_range("~/desblock-net-logs", "2023-05-14", "2023-05-18"):
+        ...
+"""
+
+import errno
+import json
+import mmap
+import os
+import re
+import struct
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: sin lock (ni pread/pwrite) no se mantiene el índice
+    fcntl = None
+
+from log_store import LogFormatError, iter_log, log_files
+
+INDEX_SUFFIX = ".idx"
+
+# Entradas por bloque del índice
+BLOCK_RECORDS = 256
+
+_MAGIC = b"DBIX"
+_VERSION = 1
+# magic, versión, registros por bloque, inodo del log, fin del último
+# bloque, bytes recorridos, bloques, entradas pendientes, mín./máx. de las
+# pendientes, mín./máx. del mes, CRC-32 de los bloques; luego el CRC-32
+# del propio encabezado. Los bloques siguen al encabezado y solo se
+# agregan: una actualización escribe los bloques nuevos y después el
+# encabezado, sin releer ni reescribir los anteriores.
+_HEADER = struct.Struct("<4sBxHQQQIIqqqqI")
+_BLOCK = struct.Struct("<Qqq")
+_CRC = struct.Struct("<I")
+_HEADER_SIZE = _HEADER.size + _CRC.size
+
+_NO_MIN = 2 ** 63 - 1
+_NO_MAX = -2 ** 63
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_TIMESTAMP_RE = re.compile(rb'"timestamp"\s*:\s*"([^"\\]*)"')
+_SCAN_CHUNK = 1024 * 1024
+
+
+def index_path(log_path: str) -> str:
+    """Archivo de índice de un log."""
+    return log_path + INDEX_SUFFIX
+
+
+def time_key(timestamp: str) -> Optional[int]:
+    """
+    Momento de un timestamp ISO 8601 en microsegundos (hora local sin zona).
+
+    Returns:
+        Microsegundos desde 1970-01-01 o None si el texto no es una fecha
+    """
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    return (moment.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+
+
+def range_keys(since: Optional[str] = None, until: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Límites de una consulta en microsegundos.
+
+    Args:
+        since: Fecha u hora mínima ISO 8601 (inclusive)
+        until: Fecha u hora máxima (inclusive; una fecha sola incluye todo el día)
+
+    Raises:
+        ValueError: Si alguna fecha no es válida
+    """
+    low, high = _NO_MAX, _NO_MIN
+    if since:
+        low = time_key(since)
+        if low is None:
+            raise ValueError(f"Fecha inválida: {since}")
+    if until:
+        high = time_key(until)
+        if high is None:
+            raise ValueError(f"Fecha inválida: {until}")
+        if len(until) == 10:
+            high += 24 * 3600 * 1000000 - 1
+    return low, high
+
+
+def _line_key(line: bytes) -> Optional[int]:
+    match = _TIMESTAMP_RE.search(line)
+    if match:
+        return time_key(match.group(1).decode("ascii", "replace"))
+    try:
+        return time_key(json.loads(line).get("timestamp"))
+    except (ValueError, AttributeError):
+        return None
+
+
+class SegmentIndex:
+    """
+    Índice de un log mensual.
+    """
+
+    __slots__ = ("block_records", "inode", "block_end", "scanned", "tail_count", "tail_min",
+                 "tail_max", "min", "max", "count", "crc", "blocks")
+
+    def __init__(self, inode: int, block_records: int = BLOCK_RECORDS):
+        self.block_records = block_records
+        self.inode = inode
+        self.block_end = 0      # fin del último bloque completo
+        self.scanned = 0        # bytes del log ya recorridos
+        self.tail_count = 0     # entradas recorridas después de block_end
+        self.tail_min = _NO_MIN
+        self.tail_max = _NO_MAX
+        self.min = _NO_MIN
+        self.max = _NO_MAX
+        self.count = 0          # bloques en total
+        self.crc = 0            # CRC-32 de los bloques
+        # (desplazamiento, mín., máx.): todos, o solo los nuevos si se leyó
+        # únicamente el encabezado
+        self.blocks: List[Tuple[int, int, int]] = []
+
+    def pack_header(self) -> bytes:
+        """Serializa el encabezado con su CRC-32."""
+        header = _HEADER.pack(_MAGIC, _VERSION, self.block_records, self.inode, self.block_end,
+                              self.scanned, self.count, self.tail_count, self.tail_min,
+                              self.tail_max, self.min, self.max, self.crc)
+        return header + _CRC.pack(zlib.crc32(header))
+
+    @classmethod
+    def unpack_header(cls, data: bytes) -> Optional["SegmentIndex"]:
+        """Lee el encabezado; None si está dañado o es de otra versión."""
+        if len(data) < _HEADER_SIZE:
+            return None
+        if _CRC.unpack_from(data, _HEADER.size)[0] != zlib.crc32(data[:_HEADER.size]):
+            return None
+        (magic, version, block_records, inode, block_end, scanned, count, tail_count, tail_min,
+         tail_max, low, high, crc) = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION or block_records == 0:
+            return None
+        index = cls(inode, block_records)
+        index.block_end, index.scanned, index.count, index.crc = block_end, scanned, count, crc
+        index.tail_count, index.tail_min, index.tail_max = tail_count, tail_min, tail_max
+        index.min, index.max = low, high
+        return index
+
+    @classmethod
+    def unpack(cls, data: bytes) -> Optional["SegmentIndex"]:
+        """Lee un índice completo; None si está dañado o incompleto."""
+        index = cls.unpack_header(data)
+        if index is None:
+            return None
+        blocks = data[_HEADER_SIZE:_HEADER_SIZE + index.count * _BLOCK.size]
+        if len(blocks) != index.count * _BLOCK.size or zlib.crc32(blocks) != index.crc:
+            return None
+        index.blocks = list(_BLOCK.iter_unpack(blocks))
+        return index
+
+    def scan(self, f, size: int):
+        """
+        Agrega al índice las líneas completas entre ``scanned`` y ``size``.
+
+        Args:
+            f: Log abierto en modo binario
+            size: Tamaño actual del log
+        """
+        f.seek(self.scanned)
+        position = self.scanned
+        pending = b""
+        while position + len(pending) < size:
+            chunk = f.read(min(_SCAN_CHUNK, size - position - len(pending)))
+            if not chunk:
+                break
+            data = pending + chunk
+            start = 0
+            while True:
+                newline = data.find(b"\n", start)
+                if newline < 0:
+                    break
+                line = data[start:newline]
+                start = newline + 1
+                if line.strip():
+                    self._add(_line_key(line), position + start)
+            position += start
+            pending = data[start:]
+        # Una línea sin terminar (escritura en curso) se recorre la próxima vez
+        self.scanned = position
+
+    def _add(self, key: Optional[int], end: int):
+        if key is not None:
+            self.tail_min = min(self.tail_min, key)
+            self.tail_max = max(self.tail_max, key)
+            self.min = min(self.min, key)
+            self.max = max(self.max, key)
+        self.tail_count += 1
+        if self.tail_count == self.block_records:
+            block = (self.block_end, self.tail_min, self.tail_max)
+            self.blocks.append(block)
+            self.count += 1
+            self.crc = zlib.crc32(_BLOCK.pack(*block), self.crc)
+            self.block_end = end
+            self.tail_count, self.tail_min, self.tail_max = 0, _NO_MIN, _NO_MAX
+
+    def ranges(self, low: int, high: int, size: int) -> List[Tuple[int, int]]:
+        """
+        Rangos de bytes del log que pueden tener entradas entre low y high.
+
+        Args:
+            low: Momento mínimo (microsegundos)
+            high: Momento máximo
+            size: Tamaño actual del log
+
+        Returns:
+            Rangos (inicio, fin) ordenados y sin superponerse
+        """
+        candidates = []
+        ends = [offset for offset, _, _ in self.blocks[1:]] + [self.block_end]
+        for (offset, block_min, block_max), end in zip(self.blocks, ends):
+            if block_max >= low and block_min <= high:
+                candidates.append((offset, end))
+        if self.tail_count and self.tail_max >= low and self.tail_min <= high:
+            candidates.append((self.block_end, self.scanned))
+        if size > self.scanned:
+            # Agregado sin indexar: siempre se lee
+            candidates.append((self.scanned, size))
+
+        merged: List[Tuple[int, int]] = []
+        for start, end in candidates:
+            if merged and merged[-1][1] == start:
+                merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
+
+
+def load_index(log_path: str) -> Optional[SegmentIndex]:
+    """
+    Lee el índice de un log, si existe y corresponde al archivo actual.
+
+    Returns:
+        Índice o None (falta, está dañado o el log fue reemplazado o truncado)
+    """
+    try:
+        with open(index_path(log_path), 'rb') as f:
+            data = f.read()
+        st = os.stat(log_path)
+    except OSError:
+        return None
+    index = SegmentIndex.unpack(data)
+    if index is None or index.inode != st.st_ino or index.scanned > st.st_size:
+        return None
+    return index
+
+
+def update_index(log_path: str, block_records: Optional[int] = None,
+                 rebuild: bool = False) -> SegmentIndex:
+    """
+    Pone al día el índice de un log recorriendo solo los bytes nuevos.
+
+    Varios procesos pueden llamarla a la vez: la actualización se hace con
+    un lock de fcntl sobre el propio índice.
+
+    Args:
+        log_path: Log JSON Lines
+        block_records: Entradas por bloque para un índice nuevo (por defecto BLOCK_RECORDS)
+        rebuild: Rehacer el índice desde el principio del log
+
+    Returns:
+        Índice actualizado (en ``blocks``, solo los bloques agregados)
+
+    Raises:
+        OSError: Si no se puede leer el log o escribir el índice, o el
+            sistema no tiene fcntl (las consultas recorren todo el log)
+    """
+    if fcntl is None:
+        raise OSError(errno.ENOSYS, "Índice de logs no disponible en este sistema")
+    fd = os.open(index_path(log_path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX)
+        with open(log_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            index = SegmentIndex.unpack_header(os.pread(fd, _HEADER_SIZE, 0))
+            if (rebuild or index is None or index.inode != st.st_ino
+                    or index.scanned > st.st_size):
+                index = SegmentIndex(st.st_ino, block_records or BLOCK_RECORDS)
+                os.ftruncate(fd, 0)
+            if index.scanned < st.st_size:
+                first = index.count
+                index.scan(f, st.st_size)
+                if index.blocks:
+                    os.pwrite(fd, b"".join(_BLOCK.pack(*block) for block in index.blocks),
+                              _HEADER_SIZE + first * _BLOCK.size)
+                os.pwrite(fd, index.pack_header(), 0)
+        return index
+    finally:
+        os.close(fd)
+
+
+def read_range(log_path: str, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Recorre las entradas de un log JSON Lines dentro de un rango de fechas.
+
+    Args:
+        log_path: Log JSON Lines
+        since: Fecha u hora mínima (inclusive)
+        until: Fecha u hora máxima (inclusive)
+
+    Yields:
+        Entradas del rango, en el orden del archivo
+
+    Raises:
+        LogFormatError: Si una línea del rango no es un objeto JSON
+        ValueError: Si alguna fecha no es válida
+    """
+    low, high = range_keys(since, until)
+    index = load_index(log_path)
+    if index is None:
+        try:
+            update_index(log_path, rebuild=True)
+        except OSError:
+            # Directorio de solo lectura: se recorre todo el archivo
+            pass
+        index = load_index(log_path)
+
+    with open(log_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if index is not None:
+            if size == index.scanned and (index.max < low or index.min > high):
+                return
+            ranges = index.ranges(low, high, size)
+        else:
+            ranges = [(0, size)]
+        if not ranges or size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise"):
+                # Sin lectura anticipada fuera de los rangos; dentro, pedirla
+                mm.madvise(mmap.MADV_RANDOM)
+            for start, end in ranges:
+                if hasattr(mm, "madvise"):
+                    page = start - start % mmap.PAGESIZE
+                    mm.madvise(mmap.MADV_WILLNEED, page, end - page)
+                yield from _read_lines(mm, start, end, size, low, high, log_path)
+
+
+def _read_lines(mm: mmap.mmap, start: int, end: int, size: int, low: int, high: int,
+                log_path: str) -> Iterator[Dict]:
+    position = start
+    while position < end:
+        newline = mm.find(b"\n", position, end)
+        if newline < 0:
+            if end == size:
+                # Última línea sin terminar: escritura en curso
+                return
+            newline = end
+        line = mm[position:newline]
+        position = newline + 1
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError as e:
+            raise LogFormatError(f"{log_path}: byte {position - len(line) - 1}: {e}")
+        if not isinstance(entry, dict):
+            raise LogFormatError(f"{log_path}: byte {position - len(line) - 1}: se esperaba un objeto")
+        key = time_key(entry.get("timestamp"))
+        if key is not None and low <= key <= high:
+            yield entry
+
+
+def iter_range(log_dir: str, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Recorre las entradas de un directorio de logs dentro de un rango de fechas.
+
+    A diferencia de log_store.iter_entries, el filtro por fecha es exacto.
+    Los logs JSON Lines se leen con su índice; los del formato anterior
+    (arreglo JSON) se recorren completos.
+
+    Args:
+        log_dir: Directorio de logs
+        since: Fecha u hora mínima (inclusive)
+        until: Fecha u hora máxima (inclusive)
+
+    Yields:
+        Entradas en orden cronológico de archivo
+    """
+    low, high = range_keys(since, until)
+    for path in log_files(log_dir, since, until):
+        if path.endswith(".jsonl"):
+            yield from read_range(path, since, until)
+            continue
+        for entry in iter_log(path):
+            key = time_key(entry.get("timestamp"))
+            if key is not None and low <= key <= high:
+                yield entry
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Estadísticas de desbloqueos
+Totales acumulados del registro de desbloqueos (por día y versión, por
+año de entrega, por servidor y cantidad de errores), guardados en un
+archivo chico junto a los logs (``unlock_stats.json``).
+
+Los totales se actualizan en cada escritura del log (ver
+``UnlockCodeGenerator.save_unlock_log``), así la CLI y la GUI los
+muestran sin recorrer el historial. Si el archivo se pierde o queda
+desactualizado, ``--rebuild`` lo recalcula desde los logs en una sola
+pasada.
+
+Uso:
+    python3 src/log_stats.py --log-dir ~/desblock-net-logs
+    python3 src/log_stats.py --rebuild
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: sin lock entre procesos (un solo proceso escribe las estadísticas)
+    fcntl = None
+
+from log_store import iter_entries
+
+STATS_NAME = "unlock_stats.json"
+_STATS_VERSION = 1
+
+# Tipos de error contabilizados
+ERROR_HARDWARE_ID = "hardware_id"
+ERROR_BOOT_MARK = "boot_mark"
+ERROR_GENERATION = "generation"
+ERROR_LOG_WRITE = "log_write"
+
+
+class UnlockStats:
+    """
+    Totales del registro de desbloqueos.
+    """
+
+    __slots__ = ("total", "by_day", "by_year", "by_server", "by_version", "errors", "updated")
+
+    def __init__(self):
+        self.total = 0
+        # {"YYYY-MM-DD": {versión: cantidad}}
+        self.by_day: Dict[str, Dict[str, int]] = {}
+        self.by_year: Dict[str, int] = {}
+        self.by_server: Dict[str, int] = {}
+        self.by_version: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.updated: Optional[float] = None
+
+    def add(self, entry: Dict):
+        """Suma una entrada del log (diccionario con los campos de LogEntry)."""
+        day = entry.get("timestamp", "")[:10]
+        version = entry.get("version", "")
+        year = entry.get("year", "")
+        server = entry.get("server", "")
+
+        self.total += 1
+        versions = self.by_day.setdefault(day, {})
+        versions[version] = versions.get(version, 0) + 1
+        self.by_year[year] = self.by_year.get(year, 0) + 1
+        self.by_server[server] = self.by_server.get(server, 0) + 1
+        self.by_version[version] = self.by_version.get(version, 0) + 1
+
+    def add_error(self, kind: str, count: int = 1):
+        """Suma errores de un tipo."""
+        self.errors[kind] = self.errors.get(kind, 0) + count
+
+    def day_total(self, day: str) -> int:
+        """Códigos generados en un día ("YYYY-MM-DD")."""
+        return sum(self.by_day.get(day, {}).values())
+
+    def to_dict(self) -> Dict:
+        """Convierte los totales a un diccionario serializable."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["version"] = _STATS_VERSION
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "UnlockStats":
+        """Crea los totales a partir de un diccionario leído del archivo."""
+        stats = cls()
+        if data.get("version") != _STATS_VERSION:
+            return stats
+        stats.total = data.get("total", 0)
+        stats.by_day = data.get("by_day", {})
+        stats.by_year = data.get("by_year", {})
+        stats.by_server = data.get("by_server", {})
+        stats.by_version = data.get("by_version", {})
+        stats.errors = data.get("errors", {})
+        stats.updated = data.get("updated")
+        return stats
+
+
+def stats_path(log_dir: str) -> str:
+    """Ruta del archivo de estadísticas de un directorio de logs."""
+    return os.path.join(os.path.expanduser(log_dir), STATS_NAME)
+
+
+def load_stats(log_dir: str) -> UnlockStats:
+    """
+    Lee las estadísticas de un directorio de logs.
+
+    Returns:
+        Totales (vacíos si no hay archivo o está dañado)
+    """
+    try:
+        with open(stats_path(log_dir), 'r', encoding='utf-8') as f:
+            return UnlockStats.from_dict(json.load(f))
+    except (OSError, ValueError):
+        return UnlockStats()
+
+
+def _save(log_dir: str, stats: UnlockStats):
+    """Guarda las estadísticas vía temporal + rename."""
+    stats.updated = time.time()
+    directory = os.path.expanduser(log_dir)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        # Sin fsync: ante un corte se recalculan con rebuild()
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(stats.to_dict(), f, separators=(",", ":"), sort_keys=True)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, stats_path(log_dir))
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def _updating(log_dir: str):
+    """Lee, deja modificar y guarda las estadísticas con un lock exclusivo."""
+    os.makedirs(os.path.expanduser(log_dir), exist_ok=True)
+    if fcntl is None:
+        stats = load_stats(log_dir)
+        yield stats
+        _save(log_dir, stats)
+        return
+    with open(stats_path(log_dir) + ".lock", 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            stats = load_stats(log_dir)
+            yield stats
+            _save(log_dir, stats)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def record_entries(log_dir: str, entries: Iterable[Dict]):
+    """
+    Suma entradas recién escritas en el log.
+
+    Args:
+        log_dir: Directorio de logs
+        entries: Entradas (diccionarios con los campos de LogEntry)
+    """
+    with _updating(log_dir) as stats:
+        for entry in entries:
+            stats.add(entry)
+
+
+def record_entry(log_dir: str, entry: Dict):
+    """Suma una entrada recién escrita en el log."""
+    record_entries(log_dir, (entry,))
+
+
+def record_error(log_dir: str, kind: str, count: int = 1):
+    """
+    Suma errores (ERROR_HARDWARE_ID, ERROR_BOOT_MARK, ERROR_GENERATION, ERROR_LOG_WRITE).
+
+    Args:
+        log_dir: Directorio de logs
+        kind: Tipo de error
+        count: Cantidad
+    """
+    with _updating(log_dir) as stats:
+        stats.add_error(kind, count)
+
+
+def rebuild(log_dir: str) -> UnlockStats:
+    """
+    Recalcula las estadísticas desde los logs en una sola pasada.
+
+    Los errores no quedan en los logs, así que se conservan los contadores
+    del archivo anterior.
+
+    Args:
+        log_dir: Directorio de logs
+
+    Returns:
+        Totales recalculados
+
+    Raises:
+        LogFormatError: Si un log está dañado
+    """
+    with _updating(log_dir) as stats:
+        fresh = UnlockStats()
+        for entry in iter_entries(log_dir):
+            fresh.add(entry)
+        for slot in ("total", "by_day", "by_year", "by_server", "by_version"):
+            setattr(stats, slot, getattr(fresh, slot))
+    return stats
+
+
+def main():
+    """Función principal."""
+    import argparse
+    import profiling
+    from datetime import date
+    from settings import get_settings
+
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Estadísticas del registro de desbloqueos")
+    parser.add_argument("--log-dir", default=settings.logging.directory,
+                        help=f"Directorio de logs (por defecto: {settings.logging.directory})")
+    parser.add_argument("--rebuild", action="store_true", help="Recalcular desde los logs")
+    parser.add_argument("--days", type=int, default=7, help="Días recientes a mostrar (por defecto: 7)")
+    parser.add_argument("--json", action="store_true", help="Mostrar en JSON")
+    profiling.add_profile_arguments(parser)
+
+    args = parser.parse_args()
+
+    try:
+        with profiling.profiling(args):
+            stats = rebuild(args.log_dir) if args.rebuild else load_stats(args.log_dir)
+    except (OSError, ValueError) as e:
+        print(f"✗ Error: {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps(stats.to_dict(), indent=2, ensure_ascii=False, sort_keys=True))
+        return 0
+
+    print(f"\nCódigos generados: {stats.total} (hoy: {stats.day_total(date.today().isoformat())})")
+    for title, counts in (("Por año de entrega", stats.by_year), ("Por servidor", stats.by_server),
+                          ("Por versión", stats.by_version), ("Errores", stats.errors)):
+        if counts:
+            print(f"\n{title}:")
+            for key, count in sorted(counts.items()):
+                print(f"  {key:<30} {count:>8}")
+    days = sorted(stats.by_day)[-args.days:]
+    if days:
+        print(f"\nÚltimos {len(days)} días:")
+        for day in days:
+            versions = ", ".join(f"{version}: {count}" for version, count in sorted(stats.by_day[day].items()))
+            print(f"  {day}  {stats.day_total(day):>6}  ({versions})")
+    print("")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
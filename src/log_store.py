@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Almacenamiento del registro de desbloqueos
+Escribe los logs mensuales (``unlock_log_YYYYMM.jsonl``) y los recorre
+entrada por entrada, sin cargar cada mes completo en memoria.
+
+Formatos soportados (se detectan por el primer carácter del archivo):
+
+- JSON Lines (``unlock_log_YYYYMM.jsonl``, un objeto por línea), el
+  formato por defecto de ``save_unlock_log``.
+- Arreglo JSON (``unlock_log_YYYYMM.json``, ``[{...}, {...}]``), el
+  formato anterior: se parsea de forma incremental.
+
+Escritura desde varios procesos (GUI, CLI, varios técnicos sobre un
+directorio compartido): ``append_entries`` agrega cada lote de entradas
+con una sola llamada a ``write`` sobre un archivo abierto con
+``O_APPEND``, que en un sistema de archivos local no se intercala con
+las escrituras de otros procesos. Solo se toma un lock de ``fcntl``
+cuando hace falta: registros grandes o directorios en sistemas de
+archivos de red. El formato anterior (reescribir el arreglo completo)
+se protege con un archivo de lock.
+
+Cada log JSON Lines tiene un índice por fecha (``.jsonl.idx``, ver
+log_index) que se pone al día después de cada escritura.
+
+Uso:
+    from log_store import iter_entries
+    for entry in iter_entries("~/desblock-net-logs", since="2023-01-01"):
+        ...
+"""
+
+import glob
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: sin lock entre procesos
+    fcntl = None
+
+LOG_PREFIX = "unlock_log_"
+LOG_SUFFIXES = (".json", ".jsonl")
+
+# Formatos de escritura (logging.format en settings.json)
+LOG_FORMATS = ("jsonl", "json")
+
+# Escrituras con O_APPEND que se consideran atómicas sin lock
+ATOMIC_APPEND_SIZE = 4096
+
+# Sistemas de archivos de red: O_APPEND no es atómico entre equipos
+NETWORK_FILESYSTEMS = ("nfs", "nfs4", "cifs", "smb3", "smbfs", "fuse.sshfs", "9p")
+
+_CHUNK_SIZE = 64 * 1024
+_MONTH_RE = re.compile(r"^unlock_log_(\d{6})\.jsonl?$")
+_WHITESPACE = " \t\r\n"
+
+
+class LogFormatError(ValueError):
+    """Archivo de log con formato inválido."""
+
+
+def log_month(path: str) -> Optional[str]:
+    """
+    Mes de un archivo de log a partir de su nombre.
+
+    Returns:
+        "YYYYMM" o None si el nombre no sigue el formato
+    """
+    match = _MONTH_RE.match(os.path.basename(path))
+    return match.group(1) if match else None
+
+
+def log_files(log_dir: str, since: Optional[str] = None, until: Optional[str] = None) -> List[str]:
+    """
+    Lista los logs mensuales de un directorio, en orden cronológico.
+
+    Args:
+        log_dir: Directorio de logs
+        since: Fecha mínima "YYYY-MM-DD" (descarta meses anteriores)
+        until: Fecha máxima "YYYY-MM-DD" (descarta meses posteriores)
+
+    Returns:
+        Rutas de los archivos
+    """
+    first = since.replace("-", "")[:6] if since else None
+    last = until.replace("-", "")[:6] if until else None
+
+    files = []
+    for suffix in LOG_SUFFIXES:
+        for path in glob.glob(os.path.join(os.path.expanduser(log_dir), f"{LOG_PREFIX}*{suffix}")):
+            month = log_month(path)
+            if month is None:
+                continue
+            if (first and month < first) or (last and month > last):
+                continue
+            files.append((month, path))
+    return [path for _, path in sorted(files)]
+
+
+def _iter_json_array(f, path: str) -> Iterator[Dict]:
+    """Parsea un arreglo JSON de objetos de a un elemento por vez."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+    expect_value = True
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = f.read(_CHUNK_SIZE)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        # Saltar espacios
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or not fill():
+                break
+        if pos >= len(buffer):
+            raise LogFormatError(f"{path}: el arreglo no está cerrado")
+
+        char = buffer[pos]
+        if not started:
+            if char != "[":
+                raise LogFormatError(f"{path}: se esperaba '['")
+            started = True
+            pos += 1
+        elif char == "]":
+            return
+        elif not expect_value:
+            if char != ",":
+                raise LogFormatError(f"{path}: se esperaba ',' o ']'")
+            expect_value = True
+            pos += 1
+        else:
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    break
+                except json.JSONDecodeError as e:
+                    if not fill():
+                        raise LogFormatError(f"{path}: {e}")
+            if not isinstance(value, dict):
+                raise LogFormatError(f"{path}: se esperaba un objeto en la posición {end}")
+            pos = end
+            expect_value = False
+            yield value
+
+
+def _iter_jsonl(f, path: str) -> Iterator[Dict]:
+    """
+    Parsea un archivo JSON Lines (las líneas vacías se ignoran).
+
+    Una última línea incompleta (sin salto de línea) es una escritura en
+    curso de otro proceso y se omite.
+    """
+    for number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError as e:
+            if not line.endswith("\n"):
+                return
+            raise LogFormatError(f"{path}:{number}: {e}")
+        if not isinstance(value, dict):
+            raise LogFormatError(f"{path}:{number}: se esperaba un objeto")
+        yield value
+
+
+def iter_log(path: str) -> Iterator[Dict]:
+    """
+    Recorre las entradas de un archivo de log.
+
+    Args:
+        path: Archivo en formato arreglo JSON o JSON Lines
+
+    Yields:
+        Diccionarios con los campos de LogEntry.FIELDS
+
+    Raises:
+        LogFormatError: Si el archivo no tiene un formato válido
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first = ""
+        while True:
+            char = f.read(1)
+            if not char or char not in _WHITESPACE:
+                first = char
+                break
+        f.seek(0)
+        if first == "[":
+            yield from _iter_json_array(f, path)
+        elif first == "{":
+            yield from _iter_jsonl(f, path)
+        elif first:
+            raise LogFormatError(f"{path}: formato de log desconocido")
+
+
+def iter_entries(log_dir: str, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Recorre todas las entradas de un directorio de logs en orden cronológico.
+
+    Los meses fuera del rango se descartan por nombre de archivo sin
+    abrirlos; el filtrado por fecha exacta queda a cargo del llamador.
+
+    Args:
+        log_dir: Directorio de logs
+        since: Fecha mínima "YYYY-MM-DD"
+        until: Fecha máxima "YYYY-MM-DD"
+
+    Yields:
+        Diccionarios de entradas
+    """
+    for path in log_files(log_dir, since, until):
+        yield from iter_log(path)
+
+
+def log_path(log_dir: str, created: float, log_format: str = "jsonl") -> str:
+    """
+    Archivo de log del mes de una entrada.
+
+    Args:
+        log_dir: Directorio de logs
+        created: Momento de la entrada (epoch)
+        log_format: jsonl o json
+
+    Returns:
+        Ruta unlock_log_YYYYMM.jsonl (o .json)
+
+    Raises:
+        ValueError: Si el formato no es válido
+    """
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Formato de log desconocido: {log_format}")
+    month = datetime.fromtimestamp(created).strftime('%Y%m')
+    return os.path.join(os.path.expanduser(log_dir), f"{LOG_PREFIX}{month}.{log_format}")
+
+
+_network_dirs: Dict[str, bool] = {}
+
+
+def _mount_fstype(path: str) -> str:
+    """Tipo de sistema de archivos que contiene una ruta (Linux)."""
+    path = os.path.realpath(path)
+    best, fstype = "", ""
+    try:
+        with open("/proc/self/mounts", 'r') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = fields[1].replace("\\040", " ")
+                inside = path == mount_point or path.startswith(mount_point.rstrip("/") + "/")
+                if inside and len(mount_point) >= len(best):
+                    best, fstype = mount_point, fields[2]
+    except OSError:
+        pass
+    return fstype
+
+
+def _is_network_dir(directory: str) -> bool:
+    network = _network_dirs.get(directory)
+    if network is None:
+        network = _network_dirs[directory] = _mount_fstype(directory) in NETWORK_FILESYSTEMS
+    return network
+
+
+@contextmanager
+def _locked(fd: int, needed: bool):
+    """Lock exclusivo de fcntl sobre fd, solo si needed (y hay fcntl)."""
+    if not needed or fcntl is None:
+        yield
+        return
+    fcntl.lockf(fd, fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.lockf(fd, fcntl.LOCK_UN)
+
+
+def _append_jsonl(path: str, entries: Sequence[Dict]):
+    data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        needs_lock = len(data) > ATOMIC_APPEND_SIZE or _is_network_dir(os.path.dirname(path))
+        with _locked(fd, needs_lock):
+            written = os.write(fd, data)
+            # Un write corto solo ocurre con disco lleno o una señal: completar
+            while written < len(data):
+                written += os.write(fd, data[written:])
+    finally:
+        os.close(fd)
+
+
+def _append_json_array(path: str, entries: Sequence[Dict]):
+    """Formato anterior: reescribe el arreglo completo bajo un archivo de lock."""
+    lock_fd = os.open(path + ".lock", os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        with _locked(lock_fd, True):
+            logs = []
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    logs = json.load(f)
+            logs.extend(entries)
+
+            fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(logs, f, indent=2, ensure_ascii=False)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+    finally:
+        os.close(lock_fd)
+
+
+def append_entries(path: str, entries: Iterable[Dict]):
+    """
+    Agrega entradas a un archivo de log, seguro con varios procesos.
+
+    Args:
+        path: Archivo de log (.jsonl o .json, ver log_path)
+        entries: Entradas (diccionarios con los campos de LogEntry)
+
+    Raises:
+        OSError: Si falla la escritura
+        ValueError: Si el archivo .json existente está dañado
+    """
+    entries = list(entries)
+    if not entries:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith(".jsonl"):
+        _append_jsonl(path, entries)
+        # Importación diferida: log_index depende de este módulo
+        from log_index import update_index
+        try:
+            update_index(path)
+        except OSError:
+            # La entrada ya está escrita; el índice se rehace al consultar
+            pass
+    else:
+        _append_json_array(path, entries)
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Métricas
+Contadores e histogramas de latencia para los caminos críticos
+(validación, hash, formato, logs, hash de archivos y detección de USB).
+
+Las métricas están desactivadas por defecto. Se activan con variables
+de entorno antes de iniciar la aplicación:
+
+    DESBLOCK_METRICS=1              Activa la recolección
+    DESBLOCK_METRICS_FILE=ruta.json Guarda un snapshot JSON al salir
+    DESBLOCK_METRICS_PORT=9464      Expone formato Prometheus en 127.0.0.1
+
+Con las métricas desactivadas al importar, ``instrument`` devuelve la
+función original sin envolver, por lo que el costo es nulo.
+"""
+
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Límites de los buckets del histograma (segundos)
+LATENCY_BUCKETS = (
+    1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4,
+    1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0, 10.0
+)
+
+_enabled = os.environ.get("DESBLOCK_METRICS", "") not in ("", "0")
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_histograms: Dict[str, "Histogram"] = {}
+_server = None
+# Snapshot registrado con atexit (una sola vez)
+_snapshot_path: Optional[str] = None
+
+
+class Histogram:
+    """
+    Histograma de latencias con buckets fijos.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Registra una observación en segundos."""
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def to_dict(self) -> Dict:
+        """Convierte el histograma a un diccionario serializable."""
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            cumulative += count
+            buckets[repr(bound)] = cumulative
+        buckets["+Inf"] = self.count
+
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0.0,
+            "buckets": buckets,
+        }
+
+
+class _NullTimer:
+    """Temporizador vacío usado cuando las métricas están desactivadas."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _Timer:
+    """Temporizador que registra la duración del bloque en un histograma."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self.start)
+        if exc_type is not None:
+            inc(self.name + ".errors")
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def is_enabled() -> bool:
+    """Indica si la recolección de métricas está activa."""
+    return _enabled
+
+
+def enable():
+    """
+    Activa la recolección de métricas.
+
+    Afecta a ``timed`` e ``inc``; las funciones decoradas con
+    ``instrument`` solo se miden si las métricas estaban activas al importar.
+    """
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Desactiva la recolección de métricas."""
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """Elimina todos los valores recolectados."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def inc(name: str, value: float = 1):
+    """
+    Incrementa un contador.
+
+    Args:
+        name: Nombre del contador (ej: "log.write_errors")
+        value: Incremento
+    """
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name: str, seconds: float):
+    """
+    Registra una latencia en el histograma indicado.
+
+    Args:
+        name: Nombre del histograma (ej: "unlock.hash")
+        seconds: Duración en segundos
+    """
+    if not _enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+
+def timed(name: str):
+    """
+    Context manager que mide la duración de un bloque.
+
+    Ejemplo:
+        with metrics.timed("gui.generate_code"):
+            ...
+
+    Args:
+        name: Nombre del histograma
+
+    Returns:
+        Context manager (vacío si las métricas están desactivadas)
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def instrument(name: str) -> Callable:
+    """
+    Decorador que mide cada llamada a la función.
+
+    Si las métricas están desactivadas al importar el módulo decorado,
+    se devuelve la función original sin ningún costo adicional.
+
+    Args:
+        name: Nombre del histograma
+
+    Returns:
+        Decorador
+    """
+    def decorator(func: Callable) -> Callable:
+        if not _enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def snapshot() -> Dict:
+    """
+    Obtiene una copia de todas las métricas.
+
+    Returns:
+        Diccionario con contadores e histogramas
+    """
+    with _lock:
+        return {
+            "timestamp": time.time(),
+            "pid": os.getpid(),
+            "counters": dict(_counters),
+            "histograms": {name: h.to_dict() for name, h in _histograms.items()},
+        }
+
+
+def write_snapshot(path: str) -> bool:
+    """
+    Guarda un snapshot JSON de las métricas (escritura atómica).
+
+    Args:
+        path: Ruta del archivo de salida
+
+    Returns:
+        True si se guardó correctamente, False en caso contrario
+    """
+    try:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        print(f"Error al guardar métricas: {e}")
+        return False
+
+
+def _prometheus_name(name: str) -> str:
+    return "desblock_" + "".join(c if c.isalnum() else "_" for c in name)
+
+
+def render_prometheus() -> str:
+    """
+    Genera las métricas en formato de texto de Prometheus.
+
+    Returns:
+        Texto en formato de exposición de Prometheus
+    """
+    data = snapshot()
+    lines: List[str] = []
+
+    for name, value in sorted(data["counters"].items()):
+        metric = _prometheus_name(name) + "_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+
+    for name, hist in sorted(data["histograms"].items()):
+        metric = _prometheus_name(name) + "_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        for bound, count in hist["buckets"].items():
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+        lines.append(f"{metric}_sum {hist['sum']}")
+        lines.append(f"{metric}_count {hist['count']}")
+
+    return "\n".join(lines) + "\n"
+
+
+def start_http_server(port: int, host: str = "127.0.0.1"):
+    """
+    Expone las métricas en formato Prometheus en un puerto local.
+
+    El servidor corre en un hilo demonio y responde en cualquier ruta.
+
+    Args:
+        port: Puerto TCP
+        host: Dirección de escucha (por defecto solo local)
+
+    Returns:
+        Instancia del servidor HTTP
+    """
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    global _server
+    _server = HTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=_server.serve_forever, daemon=True)
+    thread.start()
+    return _server
+
+
+def setup_from_env() -> Optional[str]:
+    """
+    Configura la exportación según las variables de entorno.
+
+    Debe llamarse desde los puntos de entrada (CLI, GUI, utilidades).
+
+    Returns:
+        Ruta del snapshot configurado o None
+    """
+    if not _enabled:
+        return None
+
+    port = os.environ.get("DESBLOCK_METRICS_PORT")
+    if port and _server is None:
+        try:
+            start_http_server(int(port))
+        except (OSError, ValueError) as e:
+            print(f"Error al iniciar servidor de métricas: {e}")
+
+    global _snapshot_path
+    path = os.environ.get("DESBLOCK_METRICS_FILE")
+    if path and _snapshot_path is None:
+        _snapshot_path = path
+        atexit.register(write_snapshot, path)
+    return path
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Normalización por lotes
+Validación y normalización de IDs de Hardware y Marcas de Arranque para
+lotes grandes (inventarios de 10^6 filas).
+
+Si NumPy está disponible, los IDs se cargan en matrices de ancho fijo y
+las verificaciones de longitud, el paso a mayúsculas, la eliminación de
+separadores y la validación alfanumérica se hacen como operaciones sobre
+arrays. Sin NumPy se usa el mismo algoritmo en Python puro. NumPy se
+importa recién al procesar el primer lote grande: el inicio de la GUI y
+de un código suelto no paga esa importación.
+
+Las reglas son exactamente las de UnlockCodeGenerator.validate_hardware_id,
+validate_boot_mark y la normalización de generate_code_*.
+"""
+
+import importlib.util
+from typing import List, Optional, Sequence, Tuple
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+# Se asigna en _load_numpy()
+np = None
+
+# Reglas de validación (longitudes sobre el texto original)
+HARDWARE_ID_MIN_LEN = 8
+HARDWARE_ID_MAX_LEN = 32
+BOOT_MARK_MIN_LEN = 4
+BOOT_MARK_MAX_LEN = 20
+
+# Separadores ignorados al validar; al normalizar se eliminan "-" y "_"
+HARDWARE_ID_SEPARATORS = "-_"
+BOOT_MARK_SEPARATORS = "-"
+
+# Errores por fila
+ERROR_HARDWARE_ID = "hardware_id"
+ERROR_BOOT_MARK = "boot_mark"
+
+# Debajo de este tamaño NumPy no compensa el costo de armar los arrays
+NUMPY_MIN_ROWS = 64
+
+
+class NormalizedBatch:
+    """
+    Resultado de normalizar un lote.
+
+    Attributes:
+        hardware_ids: IDs normalizados en bytes (None si la fila es inválida)
+        boot_marks: Marcas normalizadas en bytes (None si la fila es inválida)
+        errors: None para filas válidas, o ERROR_HARDWARE_ID / ERROR_BOOT_MARK
+    """
+
+    __slots__ = ("hardware_ids", "boot_marks", "errors")
+
+    def __init__(self, hardware_ids: List[Optional[bytes]], boot_marks: List[Optional[bytes]],
+                 errors: List[Optional[str]]):
+        self.hardware_ids = hardware_ids
+        self.boot_marks = boot_marks
+        self.errors = errors
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+    @property
+    def valid_count(self) -> int:
+        """Cantidad de filas válidas."""
+        return self.errors.count(None)
+
+
+def _clean(value: str) -> bytes:
+    """Normaliza un valor igual que los generadores de códigos."""
+    return value.upper().replace("-", "").replace("_", "").encode()
+
+
+def is_valid_hardware_id(hardware_id: str) -> bool:
+    """Valida un ID de Hardware (mismas reglas que el generador)."""
+    if not hardware_id or len(hardware_id) < HARDWARE_ID_MIN_LEN or len(hardware_id) > HARDWARE_ID_MAX_LEN:
+        return False
+    return hardware_id.replace("-", "").replace("_", "").isalnum()
+
+
+def is_valid_boot_mark(boot_mark: str) -> bool:
+    """Valida una Marca de Arranque (mismas reglas que el generador)."""
+    if not boot_mark or len(boot_mark) < BOOT_MARK_MIN_LEN or len(boot_mark) > BOOT_MARK_MAX_LEN:
+        return False
+    return boot_mark.replace("-", "").isalnum()
+
+
+def normalize_row(hardware_id: str, boot_mark: str):
+    """
+    Valida y normaliza una fila en Python puro.
+
+    Args:
+        hardware_id: ID de hardware del equipo
+        boot_mark: Marca de arranque del equipo
+
+    Returns:
+        Tupla (hw_bytes, bm_bytes, error)
+    """
+    if not is_valid_hardware_id(hardware_id):
+        return None, None, ERROR_HARDWARE_ID
+    if not is_valid_boot_mark(boot_mark):
+        return None, None, ERROR_BOOT_MARK
+    return _clean(hardware_id), _clean(boot_mark), None
+
+
+def _normalize_python(hardware_ids: Sequence[str], boot_marks: Sequence[str]) -> NormalizedBatch:
+    """Normaliza el lote fila por fila."""
+    hw_out: List[Optional[bytes]] = []
+    bm_out: List[Optional[bytes]] = []
+    errors: List[Optional[str]] = []
+
+    for hardware_id, boot_mark in zip(hardware_ids, boot_marks):
+        hw, bm, error = normalize_row(hardware_id, boot_mark)
+        hw_out.append(hw)
+        bm_out.append(bm)
+        errors.append(error)
+
+    return NormalizedBatch(hw_out, bm_out, errors)
+
+
+# Clases de carácter para las tablas de búsqueda
+_CLASS_PADDING = 0
+_CLASS_ALNUM = 1
+_CLASS_IGNORED = 2
+_CLASS_OTHER = 3
+
+
+def _load_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+
+def _lookup_tables(separators: str):
+    """Arma las tablas de 256 entradas (clase y mayúscula) para una columna."""
+    classes = np.full(256, _CLASS_OTHER, dtype=np.uint8)
+    classes[0] = _CLASS_PADDING
+    for c in b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz":
+        classes[c] = _CLASS_ALNUM
+    for sep in separators.encode():
+        classes[sep] = _CLASS_IGNORED
+
+    upper = np.arange(256, dtype=np.uint8)
+    upper[97:123] -= 32
+    return classes, upper
+
+
+def _ascii_matrix(values: Sequence[str], lengths, max_len: int):
+    """
+    Carga una columna en una matriz uint8 de ancho fijo.
+
+    Returns:
+        Tupla (chars, fallback): matriz (n, max_len) y máscara de filas
+        con caracteres no ASCII o NUL, donde las reglas de str difieren
+    """
+    n = len(values)
+    try:
+        # Camino rápido: todo ASCII (las filas largas se truncan, ya son inválidas)
+        chars = np.array(values, dtype=f"S{max_len}").view(np.uint8).reshape(n, max_len)
+        non_ascii = None
+    except UnicodeEncodeError:
+        codepoints = np.array(values, dtype=f"U{max_len}").view(np.uint32).reshape(n, max_len)
+        non_ascii = (codepoints > 127).any(axis=1)
+        chars = np.where(codepoints > 127, 0, codepoints).astype(np.uint8)
+
+    # Un NUL dentro del texto hace que la cantidad de bytes no coincida con len()
+    in_range = lengths <= max_len
+    fallback = in_range & (np.count_nonzero(chars, axis=1) != lengths)
+    if non_ascii is not None:
+        fallback |= in_range & non_ascii
+    return chars, fallback
+
+
+def _normalize_column(values: Sequence[str], min_len: int, max_len: int, separators: str):
+    """
+    Valida y normaliza una columna con NumPy.
+
+    Returns:
+        Tupla (valid, fallback, rows):
+        - valid: array bool con las filas válidas
+        - fallback: array bool con filas que deben resolverse en Python
+        - rows: array de bytes de ancho fijo con los valores normalizados
+    """
+    n = len(values)
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=n)
+    chars, fallback = _ascii_matrix(values, lengths, max_len)
+
+    class_table, upper_table = _lookup_tables(separators)
+    classes = class_table[chars]
+
+    # Válido: longitud correcta, solo alfanuméricos o separadores ignorados,
+    # y al menos un carácter alfanumérico (str.isalnum de "" es False)
+    valid = (
+        (lengths >= min_len) & (lengths <= max_len) &
+        ~(classes == _CLASS_OTHER).any(axis=1) &
+        (classes == _CLASS_ALNUM).any(axis=1)
+    )
+
+    upper = upper_table[chars]
+
+    # Eliminar "-" y "_" solo en las filas que los tienen: cada carácter
+    # conservado se escribe en la posición que indica la suma acumulada
+    separator = (chars == ord("-")) | (chars == ord("_"))
+    with_separators = np.flatnonzero(separator.any(axis=1) & valid)
+    if len(with_separators):
+        sub_upper = upper[with_separators]
+        keep = ~separator[with_separators] & (sub_upper != 0)
+        position = np.cumsum(keep, axis=1, dtype=np.int64) - 1
+        position += np.arange(len(with_separators), dtype=np.int64)[:, None] * max_len
+        compact = np.zeros_like(sub_upper)
+        compact.ravel()[position[keep]] = sub_upper[keep]
+        upper[with_separators] = compact
+
+    rows = upper.view(f"S{max_len}").reshape(n)
+    return valid, fallback, rows
+
+
+def _normalize_numpy(hardware_ids: Sequence[str], boot_marks: Sequence[str]) -> NormalizedBatch:
+    """Normaliza el lote con operaciones vectorizadas de NumPy."""
+    _load_numpy()
+    hw_valid, hw_fallback, hw_rows = _normalize_column(
+        hardware_ids, HARDWARE_ID_MIN_LEN, HARDWARE_ID_MAX_LEN, HARDWARE_ID_SEPARATORS
+    )
+    bm_valid, bm_fallback, bm_rows = _normalize_column(
+        boot_marks, BOOT_MARK_MIN_LEN, BOOT_MARK_MAX_LEN, BOOT_MARK_SEPARATORS
+    )
+
+    valid = hw_valid & bm_valid
+    hw_out = hw_rows.tolist()
+    bm_out = bm_rows.tolist()
+    errors: List[Optional[str]] = [None] * len(hardware_ids)
+    for i in np.flatnonzero(~valid).tolist():
+        hw_out[i] = bm_out[i] = None
+        errors[i] = ERROR_BOOT_MARK if hw_valid[i] else ERROR_HARDWARE_ID
+
+    # Filas con caracteres fuera de ASCII: reglas exactas de str
+    for i in np.flatnonzero(hw_fallback | bm_fallback).tolist():
+        hw_out[i], bm_out[i], errors[i] = normalize_row(hardware_ids[i], boot_marks[i])
+
+    return NormalizedBatch(hw_out, bm_out, errors)
+
+
+def normalize_batch(hardware_ids: Sequence[str], boot_marks: Sequence[str],
+                    use_numpy: Optional[bool] = None) -> NormalizedBatch:
+    """
+    Valida y normaliza un lote de IDs de Hardware y Marcas de Arranque.
+
+    Args:
+        hardware_ids: IDs de hardware
+        boot_marks: Marcas de arranque (misma longitud que hardware_ids)
+        use_numpy: Forzar (True) o evitar (False) NumPy; None = automático
+
+    Returns:
+        Lote normalizado
+
+    Raises:
+        ValueError: Si las listas tienen distinta longitud o se pide NumPy
+            sin tenerlo instalado
+    """
+    if len(hardware_ids) != len(boot_marks):
+        raise ValueError("hardware_ids y boot_marks deben tener la misma longitud")
+
+    if use_numpy and not HAS_NUMPY:
+        raise ValueError("NumPy no está instalado")
+
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY and len(hardware_ids) >= NUMPY_MIN_ROWS
+
+    if use_numpy and len(hardware_ids):
+        return _normalize_numpy(hardware_ids, boot_marks)
+    return _normalize_python(hardware_ids, boot_marks)
+
+
+def format_digests(digests: Sequence[bytes], spans: Sequence[Tuple[int, int]],
+                   use_numpy: Optional[bool] = None) -> List[str]:
+    """
+    Arma los códigos de desbloqueo a partir de digests SHA-256 binarios.
+
+    Equivale a tomar ``digest.hex()``, extraer los tramos indicados,
+    unirlos con "-" y pasarlos a mayúsculas, pero con NumPy se hace para
+    todo el lote con tablas de búsqueda sobre los nibbles.
+
+    Args:
+        digests: Digests SHA-256 (32 bytes cada uno)
+        spans: Posiciones (inicio, fin) sobre el hash hexadecimal
+        use_numpy: Forzar o evitar NumPy (None = automático)
+
+    Returns:
+        Lista de códigos en el mismo orden
+    """
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY and len(digests) >= NUMPY_MIN_ROWS
+
+    if not use_numpy or not digests:
+        return [
+            "-".join([digest.hex()[start:end] for start, end in spans]).upper()
+            for digest in digests
+        ]
+
+    _load_numpy()
+    n = len(digests)
+    raw = np.frombuffer(b"".join(digests), dtype=np.uint8).reshape(n, -1)
+    nibbles = np.empty((n, raw.shape[1] * 2), dtype=np.uint8)
+    nibbles[:, 0::2] = raw >> 4
+    nibbles[:, 1::2] = raw & 0x0F
+
+    hex_table = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+    dash = np.full((n, 1), ord("-"), dtype=np.uint8)
+    columns = []
+    for i, (start, end) in enumerate(spans):
+        if i:
+            columns.append(dash)
+        columns.append(hex_table[nibbles[:, start:end]])
+
+    # Code points de 4 bytes para obtener str directamente con tolist()
+    chars = np.hstack(columns).astype(np.uint32)
+    return chars.view(f"U{chars.shape[1]}").reshape(n).tolist()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Salida de lotes por escuela o provincia
+Reparte las filas de resultado de un lote en un CSV por valor de una
+columna (escuela, provincia, ...) en una sola pasada sobre la entrada.
+
+- Cada partición acumula sus filas en un buffer y se escribe de a bloques.
+- Como mucho ``max_open`` archivos abiertos a la vez: al abrir uno más se
+  cierra el que hace más tiempo que no se usa (LRU).
+- ``manifest.json`` en el directorio de salida lista cada partición con
+  su archivo y cantidad de filas.
+
+El nombre de cada partición es el valor de la columna sin acentos, en
+minúsculas y con ``_`` en lugar de espacios y símbolos ("Escuela N° 12"
+→ ``escuela_n_12.csv``): variantes de escritura del mismo nombre quedan
+en el mismo archivo. Con ``province_resolver`` los valores se agrupan
+según las provincias de ``config/servers.json``.
+
+Uso:
+    writer = PartitionedWriter("salida/", "escuela")
+    writer.write(header, rows)
+    manifest = writer.finish()
+    writer.close()
+"""
+
+import csv
+import io
+import json
+import os
+import re
+import unicodedata
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, List, Mapping, Optional
+
+MANIFEST_NAME = "manifest.json"
+PARTITION_SUFFIX = ".csv"
+
+# Archivos de partición abiertos a la vez
+DEFAULT_MAX_OPEN = 64
+# Bytes en el buffer de una partición antes de escribirla
+DEFAULT_BUFFER_SIZE = 64 * 1024
+# Bytes en todos los buffers antes de escribirlos todos
+DEFAULT_MAX_BUFFERED = 16 * 1024 * 1024
+
+# Partición de las filas con la columna vacía
+EMPTY_PARTITION = "sin_valor"
+# Provincia de los valores que no están en servers.json
+GENERIC_PROVINCE = "generic"
+
+_MANIFEST_VERSION = 1
+_MAX_NAME_LENGTH = 80
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+# Valores distintos recordados (la columna podría ser casi única)
+_MAX_CACHED_VALUES = 100000
+
+
+class PartitionError(ValueError):
+    """Error al repartir la salida de un lote."""
+
+
+def partition_name(value: str) -> str:
+    """
+    Nombre de partición (y de archivo) de un valor de la columna.
+
+    Args:
+        value: Valor de la columna
+
+    Returns:
+        Texto ASCII en minúsculas, con ``_`` como separador
+    """
+    text = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii").lower()
+    name = _NON_ALNUM_RE.sub("_", text).strip("_")[:_MAX_NAME_LENGTH].rstrip("_")
+    return name or EMPTY_PARTITION
+
+
+def province_resolver(provinces: Mapping) -> Callable[[str], str]:
+    """
+    Agrupa valores de una columna de provincia según servers.json.
+
+    Un valor corresponde a una provincia si coincide (sin acentos ni
+    mayúsculas) con su clave o su nombre: "Neuquén", "NEUQUEN" y
+    "neuquen" van a ``neuquen``. Los demás van a ``generic`` si está
+    configurada, o a su propio nombre de partición.
+
+    Args:
+        provinces: Provincias de settings.get_servers()
+
+    Returns:
+        Función valor → nombre de partición
+    """
+    lookup: Dict[str, str] = {}
+    for key, province in provinces.items():
+        lookup[partition_name(key)] = key
+        lookup[partition_name(province.name)] = key
+    fallback = GENERIC_PROVINCE if GENERIC_PROVINCE in provinces else None
+
+    def resolve(value: str) -> str:
+        name = partition_name(value)
+        return lookup.get(name, fallback or name)
+
+    return resolve
+
+
+def _csv_bytes(rows: List[List[str]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+class _Partition:
+    __slots__ = ("name", "value", "file", "rows", "size", "crc", "buffer", "buffered", "created", "unsynced")
+
+    def __init__(self, name: str, value: str):
+        self.name = name
+        self.value = value          # etiqueta o primer valor de la columna
+        self.file = name + PARTITION_SUFFIX
+        self.rows = 0
+        self.size = 0               # bytes escritos en el archivo
+        self.crc = 0                # CRC-32 de esos bytes
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+        self.created = False        # el archivo ya existe (se abre para agregar)
+        self.unsynced = False       # escrito desde el último fsync
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "value": self.value, "file": self.file, "rows": self.rows,
+                "size": self.size, "crc": self.crc}
+
+
+class PartitionedWriter:
+    """
+    Escritor de filas CSV repartidas por el valor de una columna.
+    """
+
+    def __init__(self, directory: str, column: str, key: Callable[[str], str] = partition_name,
+                 state: Optional[Dict] = None, max_open: int = DEFAULT_MAX_OPEN,
+                 labels: Optional[Mapping[str, str]] = None,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, max_buffered: int = DEFAULT_MAX_BUFFERED):
+        """
+        Inicializa el escritor.
+
+        Args:
+            directory: Directorio de salida (se crea si no existe)
+            column: Columna que define la partición
+            key: Función valor → nombre de partición
+            state: Estado de sync() de una ejecución anterior, para continuarla
+                (los archivos se recortan a lo que se había sincronizado)
+            max_open: Archivos abiertos a la vez
+            labels: Nombre a mostrar en el manifiesto por partición (por
+                defecto, el primer valor de la columna que cayó en ella)
+            buffer_size: Bytes por partición antes de escribirla
+            max_buffered: Bytes en todos los buffers antes de escribirlos
+
+        Raises:
+            PartitionError: Si max_open no es positivo
+            OSError: Si no se puede crear el directorio o recortar un archivo
+        """
+        if max_open < 1:
+            raise PartitionError("max_open debe ser al menos 1")
+        self.directory = directory
+        self.column = column
+        self.key = key
+        self.max_open = max_open
+        self.labels = labels or {}
+        self.buffer_size = buffer_size
+        self.max_buffered = max_buffered
+        self.column_index: Optional[int] = None
+        self._partitions: Dict[str, _Partition] = {}
+        self._handles: "OrderedDict[str, object]" = OrderedDict()
+        self._names: Dict[str, str] = {}
+        self._buffered = 0
+        os.makedirs(directory, exist_ok=True)
+
+        for item in (state or {}).get("partitions", []):
+            partition = _Partition(item["name"], item["value"])
+            partition.rows, partition.size, partition.crc = item["rows"], item["size"], item["crc"]
+            partition.created = True
+            os.truncate(self.path(partition.file), partition.size)
+            self._partitions[partition.name] = partition
+
+    def path(self, file: str) -> str:
+        """Ruta de un archivo de partición."""
+        return os.path.join(self.directory, file)
+
+    def write(self, header: List[str], rows: List[List[str]]):
+        """
+        Agrega filas; cada partición nueva empieza con el encabezado.
+
+        Args:
+            header: Encabezado de la salida
+            rows: Filas con el mismo orden de columnas
+
+        Raises:
+            PartitionError: Si el encabezado no tiene la columna
+            OSError: Si falla la escritura
+        """
+        if self.column_index is None:
+            normalized = [column.strip().lower() for column in header]
+            if self.column.strip().lower() not in normalized:
+                raise PartitionError(f"Falta la columna '{self.column}' en el encabezado")
+            self.column_index = normalized.index(self.column.strip().lower())
+        index = self.column_index
+
+        groups: Dict[str, List[List[str]]] = {}
+        for row in rows:
+            value = row[index] if index < len(row) else ""
+            name = self._names.get(value)
+            if name is None:
+                if len(self._names) >= _MAX_CACHED_VALUES:
+                    self._names.clear()
+                name = self._names[value] = self.key(value.strip())
+            groups.setdefault(name, []).append(row)
+
+        for name, group in groups.items():
+            partition = self._partitions.get(name)
+            if partition is None:
+                value = self.labels.get(name) or group[0][index].strip()
+                partition = self._partitions[name] = _Partition(name, value)
+                self._append(partition, _csv_bytes([header]))
+            self._append(partition, _csv_bytes(group))
+            partition.rows += len(group)
+            if partition.buffered >= self.buffer_size:
+                self._flush(partition)
+
+        if self._buffered >= self.max_buffered:
+            self._flush_all()
+
+    def _append(self, partition: _Partition, data: bytes):
+        partition.buffer.append(data)
+        partition.buffered += len(data)
+        self._buffered += len(data)
+
+    def _handle(self, partition: _Partition):
+        """Archivo abierto de una partición (cierra el menos usado si hace falta)."""
+        handle = self._handles.get(partition.name)
+        if handle is not None:
+            self._handles.move_to_end(partition.name)
+            return handle
+        if len(self._handles) >= self.max_open:
+            name, oldest = self._handles.popitem(last=False)
+            # Un archivo cerrado ya no tiene descriptor para el fsync de sync()
+            self._fsync(self._partitions[name], oldest)
+            oldest.close()
+        handle = open(self.path(partition.file), 'ab' if partition.created else 'wb')
+        partition.created = True
+        self._handles[partition.name] = handle
+        return handle
+
+    def _flush(self, partition: _Partition):
+        if not partition.buffered:
+            return
+        data = b"".join(partition.buffer)
+        self._handle(partition).write(data)
+        partition.size += len(data)
+        partition.crc = zlib.crc32(data, partition.crc)
+        self._buffered -= partition.buffered
+        partition.buffer = []
+        partition.buffered = 0
+        partition.unsynced = True
+
+    @staticmethod
+    def _fsync(partition: _Partition, handle):
+        if partition.unsynced:
+            handle.flush()
+            os.fsync(handle.fileno())
+            partition.unsynced = False
+
+    def _flush_all(self):
+        for partition in self._partitions.values():
+            self._flush(partition)
+
+    def sync(self) -> Dict:
+        """
+        Escribe todos los buffers y hace fsync de los archivos escritos
+        desde la llamada anterior (los que cierra el LRU se sincronizan al
+        cerrarlos).
+
+        Returns:
+            Estado para continuar con ``state=`` después de un corte
+        """
+        self._flush_all()
+        for name, handle in self._handles.items():
+            self._fsync(self._partitions[name], handle)
+        return {"partitions": [partition.to_dict() for partition in self._partitions.values()]}
+
+    def finish(self) -> Dict:
+        """
+        Escribe lo pendiente y el manifiesto.
+
+        Returns:
+            Manifiesto: columna, filas totales y filas por partición
+        """
+        self.sync()
+        partitions = sorted(self._partitions.values(), key=lambda partition: partition.name)
+        manifest = {
+            "version": _MANIFEST_VERSION,
+            "column": self.column,
+            "rows": sum(partition.rows for partition in partitions),
+            "partitions": [{"name": partition.name, "value": partition.value, "file": partition.file,
+                            "rows": partition.rows} for partition in partitions],
+        }
+        manifest_path = self.path(MANIFEST_NAME)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, manifest_path)
+        return manifest
+
+    def close(self):
+        """Cierra los archivos abiertos (lo que quede en los buffers se descarta)."""
+        while self._handles:
+            _, handle = self._handles.popitem()
+            handle.close()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Perfilado de operaciones
+Opción ``--profile`` de las herramientas de línea de comandos y de la GUI:
+ejecuta la operación (un código, un lote, una exportación) bajo cProfile y,
+con ``--profile-memory``, también bajo tracemalloc. El perfil cubre solo
+la operación: el inicio del intérprete, las importaciones y el parseo de
+argumentos quedan afuera.
+
+Archivos generados (``PREFIJO`` = valor de ``--profile``):
+
+- ``PREFIJO.pstats``: estadísticas de cProfile (``python3 -m pstats``,
+  snakeviz, ...)
+- ``PREFIJO.collapsed``: pilas colapsadas (``a;b;c microsegundos``) para
+  flamegraph.pl, speedscope o inferno
+- ``PREFIJO.memory.txt``: líneas que más memoria reservaron y pico (solo
+  con ``--profile-memory``)
+
+Uso:
+    python3 src/unlock_generator.py --year 2022 --batch lote.csv --output codigos.csv --profile lote
+    flamegraph.pl lote.collapsed > lote.svg
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Líneas listadas en el reporte de memoria
+MEMORY_TOP = 25
+
+# Ramas de menos de 1 µs no se escriben en las pilas colapsadas
+_MIN_COLLAPSED_US = 1.0
+
+# Profundidad máxima de las pilas reconstruidas
+_MAX_DEPTH = 128
+
+# Reservas del propio perfilado, excluidas del reporte de memoria
+_MEMORY_FILTERS = [
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "*profiling.py"),
+]
+
+
+class ProfileError(Exception):
+    """Error al guardar un perfil."""
+
+
+def default_prefix() -> str:
+    """Prefijo de los archivos cuando ``--profile`` no indica uno."""
+    return f"desblock-profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+
+
+def _label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        # Funciones incorporadas: "<built-in method time.sleep>"
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, float]:
+    """
+    Reconstruye pilas colapsadas a partir del grafo de llamadas de cProfile.
+
+    cProfile guarda tiempos por función y por arista llamador → llamado,
+    no pilas completas: el tiempo de cada función se reparte entre sus
+    caminos desde la raíz en proporción al tiempo de cada arista (como
+    flameprof). Las llamadas recursivas se cortan en la primera repetición.
+
+    Args:
+        stats: Estadísticas de cProfile
+
+    Returns:
+        {"raíz;...;función": microsegundos de tiempo propio}
+    """
+    entries = stats.stats
+    callees: Dict[Tuple, Dict[Tuple, float]] = defaultdict(dict)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+
+    stacks: Dict[str, float] = defaultdict(float)
+
+    def walk(func, path: Tuple, labels: Tuple[str, ...], share: float):
+        # share: fracción del tiempo total de func que pasa por este camino
+        _, _, own, total, _ = entries[func]
+        labels = labels + (_label(func),)
+        if own * share * 1e6 >= _MIN_COLLAPSED_US:
+            stacks[";".join(labels)] += own * share * 1e6
+        if len(labels) >= _MAX_DEPTH:
+            return
+        for callee, edge_total in callees.get(func, {}).items():
+            callee_total = entries[callee][3]
+            if callee in path or callee_total <= 0:
+                continue
+            callee_share = edge_total * share / callee_total
+            if edge_total * share * 1e6 >= _MIN_COLLAPSED_US:
+                walk(callee, path + (callee,), labels, min(callee_share, 1.0))
+
+    for func, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            walk(func, (func,), (), 1.0)
+    return dict(stacks)
+
+
+def write_collapsed(stats: pstats.Stats, path: str):
+    """Escribe las pilas colapsadas (una por línea, de mayor a menor)."""
+    stacks = collapsed_stacks(stats)
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, micros in sorted(stacks.items(), key=lambda item: -item[1]):
+            f.write(f"{stack} {int(round(micros))}\n")
+
+
+def _write_memory(snapshot: tracemalloc.Snapshot, current: int, peak: int, path: str,
+                  top: int = MEMORY_TOP):
+    stats = snapshot.statistics("lineno")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"Memoria en uso al terminar: {current / 1024:.1f} KiB\n")
+        f.write(f"Pico durante la operación: {peak / 1024:.1f} KiB\n\n")
+        for stat in stats[:top]:
+            frame = stat.traceback[0]
+            f.write(f"{stat.size / 1024:10.1f} KiB {stat.count:8} bloques  "
+                    f"{frame.filename}:{frame.lineno}\n")
+
+
+class Profiler:
+    """
+    Perfil acumulado de una o más ejecuciones de una operación.
+
+    Se usa como contexto (``with profiler: ...``) alrededor de cada
+    ejecución; ``save()`` escribe los archivos al final.
+    """
+
+    def __init__(self, prefix: str, memory: bool = False):
+        """
+        Args:
+            prefix: Prefijo de los archivos de salida
+            memory: Medir también la memoria con tracemalloc
+        """
+        self.prefix = prefix
+        self.memory = memory
+        self.profile = cProfile.Profile()
+        self.active = 0
+        self.used = False
+
+    def start(self):
+        """Empieza (o retoma) la medición."""
+        self.active += 1
+        if self.active > 1:
+            return
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.used = True
+        self.profile.enable()
+
+    def stop(self):
+        """Pausa la medición."""
+        self.active -= 1
+        if self.active == 0:
+            self.profile.disable()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def save(self) -> List[str]:
+        """
+        Escribe los archivos del perfil.
+
+        Returns:
+            Rutas escritas (vacío si nunca se midió nada)
+
+        Raises:
+            ProfileError: Si no se pudo escribir algún archivo
+        """
+        if not self.used:
+            return []
+        paths = [f"{self.prefix}.pstats", f"{self.prefix}.collapsed"]
+        snapshot = None
+        if self.memory and tracemalloc.is_tracing():
+            # Antes de armar los reportes, que también reservan memoria
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+            tracemalloc.stop()
+        try:
+            directory = os.path.dirname(os.path.abspath(self.prefix))
+            os.makedirs(directory, exist_ok=True)
+            stats = pstats.Stats(self.profile)
+            stats.dump_stats(paths[0])
+            write_collapsed(stats, paths[1])
+            if snapshot is not None:
+                paths.append(f"{self.prefix}.memory.txt")
+                _write_memory(snapshot, current, peak, paths[-1])
+        except OSError as e:
+            raise ProfileError(f"No se pudo guardar el perfil: {e}") from e
+        return paths
+
+
+def add_profile_arguments(parser):
+    """Agrega ``--profile`` y ``--profile-memory`` a un ArgumentParser."""
+    parser.add_argument("--profile", nargs="?", const=default_prefix(), metavar="PREFIJO",
+                        help="Perfilar la operación con cProfile y guardar PREFIJO.pstats "
+                             "y PREFIJO.collapsed")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Con --profile, medir también la memoria (tracemalloc)")
+
+
+def profiler_from_args(args) -> Optional[Profiler]:
+    """Profiler según los argumentos (None si no se pidió --profile)."""
+    if not getattr(args, "profile", None):
+        return None
+    return Profiler(args.profile, args.profile_memory)
+
+
+def report(profiler: Optional[Profiler]):
+    """Guarda el perfil e informa los archivos por la salida de errores."""
+    if profiler is None:
+        return
+    try:
+        for path in profiler.save():
+            print(f"✓ Perfil guardado en {path}", file=sys.stderr)
+    except ProfileError as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+
+
+@contextmanager
+def profiling(args) -> Iterator[Optional[Profiler]]:
+    """
+    Perfila el bloque si los argumentos incluyen ``--profile``.
+
+    Los mensajes van a la salida de errores: la salida estándar puede ser
+    el resultado de la herramienta (por ejemplo, ``--output -``).
+    """
+    profiler = profiler_from_args(args)
+    if profiler is None:
+        yield None
+        return
+    try:
+        with profiler:
+            yield profiler
+    finally:
+        report(profiler)
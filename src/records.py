@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Registros compactos
+Resultados de generación y entradas de log con bajo consumo de memoria,
+pensados para lotes de cientos de miles de equipos.
+"""
+
+import sys
+import time
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+class UnlockResult(NamedTuple):
+    """
+    Resultado de la generación de un código de desbloqueo.
+
+    Es una tupla con nombre, por lo que el código existente que hace
+    ``success, message, code = generator.generate_unlock_code(...)``
+    sigue funcionando sin cambios.
+    """
+
+    success: bool
+    message: str
+    code: Optional[str] = None
+
+
+class LogEntry:
+    """
+    Entrada del registro de desbloqueos.
+
+    El timestamp se guarda como número (epoch) y solo se formatea en
+    ISO 8601 cuando se serializa. Los valores repetidos (año, servidor,
+    versión) se internan para que todas las entradas compartan la misma
+    instancia de cada string.
+    """
+
+    __slots__ = (
+        "created", "year", "server", "hardware_id", "boot_mark",
+        "unlock_code", "version", "_timestamp"
+    )
+
+    # Orden de los campos en el log serializado
+    FIELDS = (
+        "timestamp", "year", "server", "hardware_id", "boot_mark",
+        "unlock_code", "version"
+    )
+
+    def __init__(self, year: str, server: str, hardware_id: str, boot_mark: str,
+                 unlock_code: str, version: str, created: Optional[float] = None,
+                 timestamp: Optional[str] = None):
+        """
+        Crea una entrada de log.
+
+        Args:
+            year: Año de entrega del equipo
+            server: Servidor de validación
+            hardware_id: ID de hardware (ya recortado para privacidad)
+            boot_mark: Marca de arranque (ya recortada para privacidad)
+            unlock_code: Código generado
+            version: Versión del algoritmo
+            created: Momento de creación (epoch); por defecto, ahora
+            timestamp: Timestamp ISO ya formateado, si se conoce
+        """
+        self.created = time.time() if created is None else created
+        self.year = sys.intern(year)
+        self.server = sys.intern(server)
+        self.hardware_id = hardware_id
+        self.boot_mark = boot_mark
+        self.unlock_code = unlock_code
+        self.version = sys.intern(version)
+        self._timestamp = timestamp
+
+    @property
+    def timestamp(self) -> str:
+        """Timestamp en formato ISO 8601 (se formatea una sola vez)."""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self.created).isoformat()
+        return self._timestamp
+
+    def as_tuple(self) -> Tuple[str, str, str, str, str, str, str]:
+        """Devuelve los campos en el orden de FIELDS."""
+        return (
+            self.timestamp, self.year, self.server, self.hardware_id,
+            self.boot_mark, self.unlock_code, self.version
+        )
+
+    def to_dict(self) -> Dict[str, str]:
+        """Convierte la entrada al diccionario que se guarda en el log."""
+        return dict(zip(self.FIELDS, self.as_tuple()))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> "LogEntry":
+        """
+        Crea una entrada a partir de un diccionario leído del log.
+
+        Args:
+            data: Diccionario con las claves de FIELDS
+
+        Returns:
+            Entrada de log
+        """
+        timestamp = data["timestamp"]
+        return cls(
+            year=data["year"],
+            server=data["server"],
+            hardware_id=data["hardware_id"],
+            boot_mark=data["boot_mark"],
+            unlock_code=data["unlock_code"],
+            version=data["version"],
+            created=datetime.fromisoformat(timestamp).timestamp(),
+            timestamp=timestamp
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LogEntry):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __hash__(self) -> int:
+        return hash(self.as_tuple())
+
+    def __repr__(self) -> str:
+        return (
+            f"LogEntry(timestamp={self.timestamp!r}, year={self.year!r}, "
+            f"unlock_code={self.unlock_code!r})"
+        )
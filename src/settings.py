@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Configuración tipada
+Carga ``config/settings.json`` y ``config/servers.json`` en objetos
+inmutables y validados (tuplas con nombre), de modo que las consultas son
+accesos a atributos:
+
+    from settings import get_settings
+    get_settings().gui.colors.background
+
+Los objetos se cachean para todo el proceso. El archivo se vuelve a leer
+solo si cambió (fecha de modificación, tamaño o inodo), y esa verificación
+se hace como máximo cada ``CHECK_INTERVAL`` segundos. Si falta un archivo
+o una clave, se usan los valores por defecto (los de la configuración
+distribuida con el proyecto). Desde el paquete ``desblock-net.pyz``, un
+archivo que falta en ``config/`` se lee del paquete (ver build_zipapp).
+"""
+
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Tuple, get_type_hints
+
+from utils import read_config, write_config as _write_config
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+SETTINGS_PATH = os.path.join(CONFIG_DIR, "settings.json")
+SERVERS_PATH = os.path.join(CONFIG_DIR, "servers.json")
+
+# Segundos entre verificaciones de cambios en disco
+CHECK_INTERVAL = 2.0
+
+
+class SettingsError(ValueError):
+    """Valor de configuración con tipo inválido."""
+
+
+class Font(NamedTuple):
+    """Fuente de tkinter (familia, tamaño y estilo opcional)."""
+
+    family: str
+    size: int
+    style: str = ""
+
+    def tk(self, size: Optional[int] = None, style: Optional[str] = None) -> Tuple:
+        """
+        Tupla para la opción ``font`` de tkinter.
+
+        Args:
+            size: Tamaño alternativo
+            style: Estilo alternativo (bold, italic, ...)
+        """
+        style = self.style if style is None else style
+        size = self.size if size is None else size
+        return (self.family, size, style) if style else (self.family, size)
+
+
+class WindowSize(NamedTuple):
+    width: int = 700
+    height: int = 650
+
+
+class Colors(NamedTuple):
+    background: str = "#2c3e50"
+    foreground: str = "#ecf0f1"
+    accent: str = "#3498db"
+    success: str = "#27ae60"
+    error: str = "#e74c3c"
+    warning: str = "#f39c12"
+
+
+class Fonts(NamedTuple):
+    title: Font = Font("Arial", 24, "bold")
+    subtitle: Font = Font("Arial", 11)
+    normal: Font = Font("Arial", 10)
+    code: Font = Font("Courier", 11)
+
+
+class AppInfo(NamedTuple):
+    name: str = "DESBLOCK-NET"
+    version: str = "1.0.0"
+    description: str = "Sistema de desbloqueo para equipos Conectar Igualdad"
+    author: str = "Comunidad DESBLOCK-NET"
+    license: str = "MIT"
+
+
+class GuiSettings(NamedTuple):
+    theme: str = "dark"
+    window_size: WindowSize = WindowSize()
+    colors: Colors = Colors()
+    fonts: Fonts = Fonts()
+
+
+class LoggingSettings(NamedTuple):
+    enabled: bool = True
+    directory: str = "~/desblock-net-logs"
+    format: str = "jsonl"
+    retention_days: int = 90
+    anonymize_data: bool = True
+    fields_to_log: Tuple[str, ...] = (
+        "timestamp", "year", "server", "hardware_id_partial",
+        "boot_mark_partial", "unlock_code", "version"
+    )
+
+
+class SecuritySettings(NamedTuple):
+    require_confirmation: bool = True
+    show_warnings: bool = True
+    validate_input: bool = True
+    max_attempts: int = 5
+    timeout_seconds: int = 300
+
+
+class UsbCreationSettings(NamedTuple):
+    default_iso: str = "linuxmint-22-cinnamon-64bit.iso"
+    min_usb_size_gb: float = 7
+    verify_checksum: bool = True
+    auto_update_iso: bool = False
+    squashfs_profile: str = "xz-1M"
+    iso_mirrors: Tuple[str, ...] = ()
+
+
+class NetworkSettings(NamedTuple):
+    check_connectivity: bool = True
+    timeout_seconds: float = 10
+    retry_attempts: int = 3
+    test_urls: Tuple[str, ...] = ()
+
+
+class FeatureSettings(NamedTuple):
+    enable_gui: bool = True
+    enable_cli: bool = True
+    enable_logging: bool = True
+    enable_auto_update: bool = False
+    show_statistics: bool = True
+    export_codes: bool = True
+
+
+class AdvancedSettings(NamedTuple):
+    debug_mode: bool = False
+    verbose_output: bool = False
+    performance_mode: bool = False
+    backup_logs: bool = True
+
+
+class Settings(NamedTuple):
+    """Contenido de settings.json."""
+
+    app: AppInfo = AppInfo()
+    gui: GuiSettings = GuiSettings()
+    logging: LoggingSettings = LoggingSettings()
+    security: SecuritySettings = SecuritySettings()
+    usb_creation: UsbCreationSettings = UsbCreationSettings()
+    network: NetworkSettings = NetworkSettings()
+    features: FeatureSettings = FeatureSettings()
+    advanced: AdvancedSettings = AdvancedSettings()
+
+
+class ServerInfo(NamedTuple):
+    name: str
+    server: str
+    version: str
+    description: str = ""
+    requires_internet: bool = True
+    validation_endpoint: str = ""
+    support_url: str = ""
+
+
+class Province(NamedTuple):
+    name: str
+    official_form: str = ""
+    contact_email: str = ""
+    contact_phone: str = ""
+    address: str = ""
+
+
+class ServersConfig(NamedTuple):
+    """Contenido de servers.json."""
+
+    servers: Mapping[str, ServerInfo] = MappingProxyType({})
+    provinces: Mapping[str, Province] = MappingProxyType({})
+    version: str = ""
+    last_updated: str = ""
+
+
+def _convert(value: Any, expected: Any, path: str) -> Any:
+    """Valida un valor contra el tipo del campo y lo vuelve inmutable."""
+    if isinstance(expected, type) and issubclass(expected, tuple) and hasattr(expected, "_fields"):
+        if expected is Font:
+            if not isinstance(value, (list, tuple)) or not 2 <= len(value) <= 3:
+                raise SettingsError(f"{path}: se esperaba [familia, tamaño, estilo]")
+            return Font(*(_convert(item, kind, f"{path}[{i}]")
+                          for i, (item, kind) in enumerate(zip(value, (str, int, str)))))
+        if not isinstance(value, dict):
+            raise SettingsError(f"{path}: se esperaba un objeto")
+        return _build(expected, value, path)
+
+    if expected is bool:
+        if not isinstance(value, bool):
+            raise SettingsError(f"{path}: se esperaba true/false")
+        return value
+    if expected is int:
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise SettingsError(f"{path}: se esperaba un entero")
+        return value
+    if expected is float:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise SettingsError(f"{path}: se esperaba un número")
+        return value
+    if expected is str:
+        if not isinstance(value, str):
+            raise SettingsError(f"{path}: se esperaba un texto")
+        return value
+    if getattr(expected, "__origin__", None) in (tuple, Tuple):
+        if not isinstance(value, list):
+            raise SettingsError(f"{path}: se esperaba una lista")
+        return tuple(_convert(item, expected.__args__[0], f"{path}[{i}]") for i, item in enumerate(value))
+    return value
+
+
+def _build(cls, data: Dict, path: str = ""):
+    """
+    Construye una tupla con nombre a partir de un diccionario.
+
+    Las claves desconocidas se ignoran y las faltantes toman el valor por
+    defecto del campo.
+
+    Raises:
+        SettingsError: Si un valor tiene tipo inválido o falta uno obligatorio
+    """
+    hints = get_type_hints(cls)
+    defaults = cls._field_defaults
+    values = {}
+    for field in cls._fields:
+        field_path = f"{path}.{field}" if path else field
+        if field in data:
+            values[field] = _convert(data[field], hints[field], field_path)
+        elif field not in defaults:
+            raise SettingsError(f"{field_path}: valor obligatorio")
+    return cls(**values)
+
+
+def parse_settings(data: Dict) -> Settings:
+    """
+    Valida el contenido de settings.json.
+
+    Raises:
+        SettingsError: Si algún valor tiene tipo inválido
+    """
+    return _build(Settings, data)
+
+
+def parse_servers(data: Dict) -> ServersConfig:
+    """
+    Valida el contenido de servers.json.
+
+    Raises:
+        SettingsError: Si algún valor tiene tipo inválido
+    """
+    servers = {
+        year: _convert(info, ServerInfo, f"servers.{year}")
+        for year, info in data.get("servers", {}).items()
+    }
+    provinces = {
+        key: _convert(info, Province, f"provinces.{key}")
+        for key, info in data.get("provinces", {}).items()
+    }
+    metadata = data.get("metadata", {})
+    return ServersConfig(
+        servers=MappingProxyType(servers),
+        provinces=MappingProxyType(provinces),
+        version=_convert(metadata.get("version", ""), str, "metadata.version"),
+        last_updated=_convert(metadata.get("last_updated", ""), str, "metadata.last_updated"),
+    )
+
+
+def bundled_config(path: str) -> Dict:
+    """
+    Configuración incluida en el paquete ``.pyz``, si se ejecuta desde él.
+
+    Args:
+        path: Archivo de configuración (solo los de CONFIG_DIR)
+
+    Returns:
+        Diccionario con la configuración o diccionario vacío
+    """
+    archive = getattr(__loader__, "archive", None)
+    if not archive or os.path.dirname(os.path.abspath(path)) != CONFIG_DIR:
+        return {}
+    try:
+        return json.loads(__loader__.get_data(f"config/{os.path.basename(path)}"))
+    except (OSError, ValueError):
+        return {}
+
+
+class _CachedFile:
+    """
+    Archivo de configuración parseado, recargado solo si cambió en disco.
+    """
+
+    def __init__(self, path: str, parser: Callable[[Dict], Any]):
+        self.path = path
+        self.parser = parser
+        self.value = None
+        self.signature = None
+        self.checked = float("-inf")
+        self.lock = threading.Lock()
+
+    def _signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def get(self):
+        now = time.monotonic()
+        if self.value is not None and now - self.checked < CHECK_INTERVAL:
+            return self.value
+
+        with self.lock:
+            signature = self._signature()
+            if self.value is None or signature != self.signature:
+                self.value = self.parser(read_config(self.path) if signature else bundled_config(self.path))
+                self.signature = signature
+            self.checked = now
+            return self.value
+
+    def invalidate(self):
+        with self.lock:
+            self.value = None
+
+
+_cache: Dict[Tuple[str, Callable], _CachedFile] = {}
+_cache_lock = threading.Lock()
+
+
+def _cached(path: str, parser: Callable[[Dict], Any]) -> _CachedFile:
+    key = (os.path.abspath(path), parser)
+    entry = _cache.get(key)
+    if entry is None:
+        with _cache_lock:
+            entry = _cache.setdefault(key, _CachedFile(key[0], parser))
+    return entry
+
+
+def get_settings(path: str = SETTINGS_PATH) -> Settings:
+    """
+    Configuración general (settings.json), cacheada.
+
+    Raises:
+        SettingsError: Si algún valor tiene tipo inválido
+    """
+    return _cached(path, parse_settings).get()
+
+
+def get_servers(path: str = SERVERS_PATH) -> ServersConfig:
+    """
+    Servidores y provincias (servers.json), cacheados.
+
+    Raises:
+        SettingsError: Si algún valor tiene tipo inválido
+    """
+    return _cached(path, parse_servers).get()
+
+
+def invalidate(path: Optional[str] = None):
+    """
+    Descarta la caché de un archivo (o de todos).
+
+    Args:
+        path: Archivo de configuración (None = todos)
+    """
+    target = os.path.abspath(path) if path else None
+    for (cached_path, _), entry in list(_cache.items()):
+        if target is None or cached_path == target:
+            entry.invalidate()
+
+
+def write_config(config_path: str, config_data: Dict) -> bool:
+    """
+    Guarda un archivo de configuración de forma atómica y descarta su caché.
+
+    Args:
+        config_path: Ruta al archivo de configuración
+        config_data: Diccionario con la configuración
+
+    Returns:
+        True si se guardó correctamente, False en caso contrario
+    """
+    saved = _write_config(config_path, config_data)
+    invalidate(config_path)
+    return saved
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Perfiles de compresión de filesystem.squashfs
+xz con bloques de 1 MB da la imagen más chica, pero es el más lento de
+descomprimir en los equipos de 4 GB con Celeron que arrancan desde USB 2.0.
+Este módulo define perfiles de compresión (xz, zstd, lz4, gzip con
+distintos tamaños de bloque) y una herramienta que los compara sobre un
+árbol real:
+
+- tiempo de creación (mksquashfs)
+- tamaño de la imagen
+- rendimiento de lectura aleatoria: extracción de una muestra de archivos
+  con unsquashfs, que descomprime los bloques completos que los contienen
+
+La recomendación estima el tiempo de leer un conjunto de trabajo (lo que se
+carga al arrancar el escritorio y abrir la aplicación) desde el USB y
+descomprimirlo. El perfil elegido se configura en ``settings.json``:
+
+    "usb_creation": {"squashfs_profile": "zstd-15-256K"}
+
+Uso:
+    python3 src/squashfs_profile.py --profile /tmp/squashfs-root
+    python3 src/squashfs_profile.py --profile /tmp/squashfs-root --apply
+    python3 src/squashfs_profile.py --options      # opciones del perfil configurado
+"""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Sequence
+
+from settings import get_settings, write_config
+from utils import format_bytes, read_config
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "settings.json")
+
+# Opciones de mksquashfs por perfil
+PROFILES: Dict[str, List[str]] = {
+    "xz-1M": ["-comp", "xz", "-b", "1M", "-Xdict-size", "100%"],
+    "xz-256K": ["-comp", "xz", "-b", "256K", "-Xdict-size", "100%"],
+    "zstd-19-1M": ["-comp", "zstd", "-Xcompression-level", "19", "-b", "1M"],
+    "zstd-15-256K": ["-comp", "zstd", "-Xcompression-level", "15", "-b", "256K"],
+    "zstd-3-128K": ["-comp", "zstd", "-Xcompression-level", "3", "-b", "128K"],
+    "lz4-hc-256K": ["-comp", "lz4", "-Xhc", "-b", "256K"],
+    "gzip-9-128K": ["-comp", "gzip", "-Xcompression-level", "9", "-b", "128K"],
+}
+
+# Perfil histórico de customize_iso.sh
+DEFAULT_PROFILE = "xz-1M"
+
+# Opciones comunes a todos los perfiles
+COMMON_OPTIONS = ["-no-recovery"]
+
+# Lectura secuencial típica de un pendrive USB 2.0 en los equipos del programa
+DEFAULT_USB_MBPS = 25.0
+
+# Datos leídos al arrancar el escritorio y abrir DESBLOCK-NET (sin comprimir)
+DEFAULT_WORKING_SET_MB = 900.0
+
+# Archivos de la muestra de lectura aleatoria
+DEFAULT_SAMPLE_FILES = 300
+
+
+class ProfileError(Exception):
+    """Perfil desconocido o herramienta no disponible."""
+
+
+def configured_profile(config_path: str = CONFIG_PATH) -> str:
+    """
+    Obtiene el perfil configurado en settings.json.
+
+    Returns:
+        Nombre del perfil (DEFAULT_PROFILE si no hay ninguno)
+    """
+    return get_settings(config_path).usb_creation.squashfs_profile or DEFAULT_PROFILE
+
+
+def profile_options(profile: Optional[str] = None, config_path: str = CONFIG_PATH) -> List[str]:
+    """
+    Opciones de mksquashfs de un perfil.
+
+    Args:
+        profile: Nombre del perfil (None = el configurado)
+        config_path: Ruta a settings.json
+
+    Returns:
+        Lista de opciones
+
+    Raises:
+        ProfileError: Si el perfil no existe
+    """
+    name = profile or configured_profile(config_path)
+    if name not in PROFILES:
+        raise ProfileError(f"Perfil de squashfs desconocido: {name} (disponibles: {', '.join(PROFILES)})")
+    return PROFILES[name] + COMMON_OPTIONS
+
+
+def tree_size(path: str) -> int:
+    """Tamaño total de los archivos regulares de un árbol."""
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            full_path = os.path.join(root, name)
+            if not os.path.islink(full_path):
+                try:
+                    total += os.path.getsize(full_path)
+                except OSError:
+                    pass
+    return total
+
+
+def sample_files(path: str, count: int = DEFAULT_SAMPLE_FILES, seed: int = 2023) -> List[str]:
+    """
+    Elige una muestra reproducible de archivos (rutas relativas al árbol).
+
+    Args:
+        path: Raíz del árbol
+        count: Cantidad de archivos
+        seed: Semilla del generador aleatorio
+
+    Returns:
+        Rutas relativas
+    """
+    candidates = []
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            full_path = os.path.join(root, name)
+            if os.path.isfile(full_path) and not os.path.islink(full_path):
+                candidates.append(os.path.relpath(full_path, path))
+    rng = random.Random(seed)
+    return rng.sample(candidates, min(count, len(candidates)))
+
+
+def measure_profile(name: str, tree: str, work_dir: str, sample: Sequence[str], sample_bytes: int) -> Dict:
+    """
+    Crea la imagen de un perfil y mide tiempo, tamaño y lectura aleatoria.
+
+    Args:
+        name: Nombre del perfil
+        tree: Árbol a comprimir
+        work_dir: Directorio temporal
+        sample: Archivos a extraer para la lectura aleatoria
+        sample_bytes: Tamaño total de la muestra
+
+    Returns:
+        Resultados del perfil
+
+    Raises:
+        ProfileError: Si mksquashfs o unsquashfs fallan (ej: compresor no soportado)
+    """
+    image = os.path.join(work_dir, f"{name}.squashfs")
+    extract_dir = os.path.join(work_dir, f"{name}-extract")
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        ["mksquashfs", tree, image, "-noappend", "-no-progress"] + profile_options(name),
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    build_seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise ProfileError(result.stderr.decode(errors="replace").strip() or "mksquashfs falló")
+
+    image_size = os.path.getsize(image)
+
+    list_path = os.path.join(work_dir, f"{name}-sample.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.writelines(f"{path}\n" for path in sample)
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        ["unsquashfs", "-d", extract_dir, "-no-progress", "-ef", list_path, image],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    read_seconds = time.perf_counter() - start
+    shutil.rmtree(extract_dir, ignore_errors=True)
+    os.unlink(image)
+    if result.returncode != 0:
+        raise ProfileError(result.stderr.decode(errors="replace").strip() or "unsquashfs falló")
+
+    return {
+        "profile": name,
+        "build_seconds": build_seconds,
+        "image_size": image_size,
+        "random_read_seconds": read_seconds,
+        "random_read_mbps": sample_bytes / (1024 * 1024) / read_seconds if read_seconds > 0 else 0.0,
+    }
+
+
+def estimated_load_seconds(result: Dict, uncompressed_size: int,
+                           usb_mbps: float = DEFAULT_USB_MBPS,
+                           working_set_mb: float = DEFAULT_WORKING_SET_MB) -> float:
+    """
+    Estima el tiempo de cargar el conjunto de trabajo desde el USB.
+
+    Lectura del USB (datos comprimidos) más descompresión, con la
+    proporción de compresión y el rendimiento medidos.
+
+    Args:
+        result: Resultado de measure_profile
+        uncompressed_size: Tamaño del árbol sin comprimir
+        usb_mbps: Lectura del pendrive en MB/s
+        working_set_mb: Datos leídos al arrancar, sin comprimir
+
+    Returns:
+        Segundos estimados
+    """
+    ratio = result["image_size"] / uncompressed_size if uncompressed_size else 1.0
+    read_seconds = working_set_mb * ratio / usb_mbps
+    decompress_seconds = working_set_mb / result["random_read_mbps"] if result["random_read_mbps"] else float("inf")
+    return read_seconds + decompress_seconds
+
+
+def recommend(results: Sequence[Dict], uncompressed_size: int,
+              usb_mbps: float = DEFAULT_USB_MBPS,
+              working_set_mb: float = DEFAULT_WORKING_SET_MB,
+              max_image_size: Optional[int] = None) -> Optional[Dict]:
+    """
+    Elige el perfil con menor tiempo de carga estimado.
+
+    Args:
+        results: Resultados de measure_profile
+        uncompressed_size: Tamaño del árbol sin comprimir
+        usb_mbps: Lectura del pendrive en MB/s
+        working_set_mb: Datos leídos al arrancar, sin comprimir
+        max_image_size: Tamaño máximo aceptable de la imagen (opcional)
+
+    Returns:
+        Resultado elegido (con 'load_seconds'), o None si ninguno cumple
+    """
+    candidates = []
+    for result in results:
+        if max_image_size and result["image_size"] > max_image_size:
+            continue
+        load = estimated_load_seconds(result, uncompressed_size, usb_mbps, working_set_mb)
+        candidates.append(dict(result, load_seconds=load))
+    if not candidates:
+        return None
+    # Ante empate, la imagen más chica
+    return min(candidates, key=lambda item: (round(item["load_seconds"], 1), item["image_size"]))
+
+
+def run_profiles(tree: str, profiles: Sequence[str], sample_count: int = DEFAULT_SAMPLE_FILES) -> Dict:
+    """
+    Compara perfiles sobre un árbol.
+
+    Args:
+        tree: Árbol a comprimir (ej: squashfs-root de la ISO)
+        profiles: Perfiles a probar
+        sample_count: Archivos de la muestra de lectura aleatoria
+
+    Returns:
+        {'uncompressed_size', 'sample_bytes', 'results', 'errors'}
+    """
+    for tool in ("mksquashfs", "unsquashfs"):
+        if not shutil.which(tool):
+            raise ProfileError(f"No se encontró {tool} (paquete squashfs-tools)")
+
+    uncompressed_size = tree_size(tree)
+    sample = sample_files(tree, sample_count)
+    sample_bytes = sum(os.path.getsize(os.path.join(tree, path)) for path in sample)
+
+    results = []
+    errors = {}
+    with tempfile.TemporaryDirectory(prefix="desblock-squashfs-") as work_dir:
+        for name in profiles:
+            print(f"[INFO] Probando {name}...")
+            try:
+                results.append(measure_profile(name, tree, work_dir, sample, sample_bytes))
+            except ProfileError as e:
+                print(f"[!] {name}: {e}")
+                errors[name] = str(e)
+
+    return {
+        "uncompressed_size": uncompressed_size,
+        "sample_bytes": sample_bytes,
+        "results": results,
+        "errors": errors,
+    }
+
+
+def apply_profile(profile: str, config_path: str = CONFIG_PATH) -> bool:
+    """
+    Guarda el perfil elegido en settings.json.
+
+    Returns:
+        True si se guardó correctamente
+    """
+    if profile not in PROFILES:
+        raise ProfileError(f"Perfil de squashfs desconocido: {profile}")
+    config = read_config(config_path)
+    config.setdefault("usb_creation", {})["squashfs_profile"] = profile
+    return write_config(config_path, config)
+
+
+def main():
+    """Función principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Perfiles de compresión de filesystem.squashfs")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--options", action="store_true",
+                       help="Mostrar las opciones de mksquashfs del perfil configurado")
+    group.add_argument("--profile", metavar="ARBOL", help="Comparar perfiles sobre un árbol descomprimido")
+    group.add_argument("--list", action="store_true", help="Listar los perfiles disponibles")
+    parser.add_argument("--only", action="append", choices=sorted(PROFILES), help="Probar solo estos perfiles")
+    parser.add_argument("--usb-mbps", type=float, default=DEFAULT_USB_MBPS,
+                        help=f"Lectura del pendrive en MB/s (por defecto: {DEFAULT_USB_MBPS})")
+    parser.add_argument("--working-set-mb", type=float, default=DEFAULT_WORKING_SET_MB,
+                        help=f"MB leídos al arrancar, sin comprimir (por defecto: {DEFAULT_WORKING_SET_MB})")
+    parser.add_argument("--max-size-gb", type=float, help="Tamaño máximo aceptable de la imagen")
+    parser.add_argument("--json", metavar="ARCHIVO", help="Guardar los resultados en JSON")
+    parser.add_argument("--apply", action="store_true", help="Guardar la recomendación en settings.json")
+    parser.add_argument("--config", default=CONFIG_PATH, help="Ruta a settings.json")
+
+    args = parser.parse_args()
+
+    if args.list:
+        current = configured_profile(args.config)
+        for name, options in PROFILES.items():
+            marker = "*" if name == current else " "
+            print(f"{marker} {name:<14} {' '.join(options)}")
+        return 0
+
+    if args.options:
+        try:
+            print(" ".join(profile_options(config_path=args.config)))
+        except ProfileError as e:
+            print(f"✗ Error: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    if not os.path.isdir(args.profile):
+        print(f"✗ Error: El directorio no existe: {args.profile}")
+        return 1
+
+    try:
+        report = run_profiles(args.profile, args.only or list(PROFILES))
+    except ProfileError as e:
+        print(f"✗ Error: {e}")
+        return 1
+
+    uncompressed = report["uncompressed_size"]
+    max_size = int(args.max_size_gb * 1024 ** 3) if args.max_size_gb else None
+    for result in report["results"]:
+        result["load_seconds"] = estimated_load_seconds(result, uncompressed, args.usb_mbps, args.working_set_mb)
+
+    print("")
+    print(f"{'Perfil':<14} {'Creación':>10} {'Tamaño':>10} {'Proporción':>10} {'Lectura':>12} {'Carga est.':>11}")
+    for result in report["results"]:
+        ratio = result["image_size"] / uncompressed if uncompressed else 0.0
+        print(f"{result['profile']:<14} {result['build_seconds']:>9.1f}s "
+              f"{format_bytes(result['image_size']):>10} {ratio:>10.1%} "
+              f"{result['random_read_mbps']:>8.1f} MB/s {result['load_seconds']:>10.1f}s")
+
+    best = recommend(report["results"], uncompressed, args.usb_mbps, args.working_set_mb, max_size)
+    report["recommendation"] = best["profile"] if best else None
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if best is None:
+        print("\n✗ Ningún perfil cumple las restricciones")
+        return 1
+
+    print(f"\n✓ Recomendado: {best['profile']} (carga estimada {best['load_seconds']:.1f} s "
+          f"con USB a {args.usb_mbps:.0f} MB/s)")
+
+    if args.apply:
+        if apply_profile(best["profile"], args.config):
+            print(f"✓ Perfil guardado en {args.config}")
+        else:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
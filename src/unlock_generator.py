@@ -8,10 +8,38 @@ Conectar Igualdad basándose en el ID de Hardware y Marca de Arranque.
 """
 
 import hashlib
-import json
-import os
-from datetime import datetime
-from typing import Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+import log_stats
+import log_store
+import metrics
+from normalizer import ERROR_HARDWARE_ID, format_digests, normalize_batch
+from records import LogEntry, UnlockResult
+
+# Resultados de validación fallida (inmutables, se reutilizan en cada llamada)
+INVALID_HARDWARE_ID_RESULT = UnlockResult(False, "ID de Hardware inválido. Verifique el formato.", None)
+INVALID_BOOT_MARK_RESULT = UnlockResult(False, "Marca de Arranque inválida. Verifique el formato.", None)
+
+# Sales específicas de cada sistema
+CITD_V1_SALT = "CITD_UNLOCK_2021_2022"
+TDS_V2_SALT = "TDS_UNLOCK_2023"
+
+# Posiciones del hash SHA-256 (hex) que forman cada bloque del código
+CITD_V1_SPANS = ((0, 4), (8, 12), (16, 20), (24, 28))
+TDS_V2_SPANS = ((0, 5), (10, 15), (20, 25))
+
+
+@metrics.instrument("unlock.hash")
+def _hash_hex(data: bytes) -> str:
+    """Calcula el hash SHA-256 en hexadecimal de los datos normalizados."""
+    return hashlib.sha256(data).hexdigest()
+
+
+@metrics.instrument("unlock.format")
+def _format_code(hash_hex: str, spans: Sequence[Tuple[int, int]]) -> str:
+    """Arma el código en bloques separados por guiones a partir del hash."""
+    return "-".join([hash_hex[start:end] for start, end in spans]).upper()
 
 
 class UnlockCodeGenerator:
@@ -56,6 +84,16 @@ class UnlockCodeGenerator:
         self.server_config = self.SERVERS[year]
         self.version = self.server_config["version"]
         
+        # Información y mensaje de éxito se arman una sola vez por instancia
+        self._info = MappingProxyType({
+            "year": self.year,
+            "server_name": self.server_config["name"],
+            "server_url": self.server_config["server"],
+            "version": self.version
+        })
+        self._success_message = f"Código generado exitosamente para {self.server_config['name']}"
+        
+    @metrics.instrument("validate.hardware_id")
     def validate_hardware_id(self, hardware_id: str) -> bool:
         """
         Valida el formato del ID de Hardware.
@@ -71,6 +109,7 @@ class UnlockCodeGenerator:
             return False
         return hardware_id.replace("-", "").replace("_", "").isalnum()
     
+    @metrics.instrument("validate.boot_mark")
     def validate_boot_mark(self, boot_mark: str) -> bool:
         """
         Valida el formato de la Marca de Arranque.
@@ -105,23 +144,14 @@ class UnlockCodeGenerator:
         bm_clean = boot_mark.upper().replace("-", "").replace("_", "")
         
         # Combinar con sal específica del sistema CITD
-        salt = "CITD_UNLOCK_2021_2022"
+        salt = CITD_V1_SALT
         combined = f"{hw_clean}{bm_clean}{salt}"
         
         # Generar hash SHA-256
-        hash_object = hashlib.sha256(combined.encode())
-        hash_hex = hash_object.hexdigest()
+        hash_hex = _hash_hex(combined.encode())
         
         # Extraer y formatear código de desbloqueo (formato típico: XXXX-XXXX-XXXX-XXXX)
-        code_parts = [
-            hash_hex[0:4].upper(),
-            hash_hex[8:12].upper(),
-            hash_hex[16:20].upper(),
-            hash_hex[24:28].upper()
-        ]
-        
-        unlock_code = "-".join(code_parts)
-        return unlock_code
+        return _format_code(hash_hex, CITD_V1_SPANS)
     
     def generate_code_tds_v2(self, hardware_id: str, boot_mark: str) -> str:
         """
@@ -142,24 +172,16 @@ class UnlockCodeGenerator:
         bm_clean = boot_mark.upper().replace("-", "").replace("_", "")
         
         # Combinar con sal específica del sistema TDS
-        salt = "TDS_UNLOCK_2023"
+        salt = TDS_V2_SALT
         combined = f"{salt}{hw_clean}{bm_clean}"
         
         # Generar hash SHA-256
-        hash_object = hashlib.sha256(combined.encode())
-        hash_hex = hash_object.hexdigest()
+        hash_hex = _hash_hex(combined.encode())
         
         # Para TDS v2, se usa un formato diferente: XXXXX-XXXXX-XXXXX
-        code_parts = [
-            hash_hex[0:5].upper(),
-            hash_hex[10:15].upper(),
-            hash_hex[20:25].upper()
-        ]
-        
-        unlock_code = "-".join(code_parts)
-        return unlock_code
+        return _format_code(hash_hex, TDS_V2_SPANS)
     
-    def generate_unlock_code(self, hardware_id: str, boot_mark: str) -> Tuple[bool, str, Optional[str]]:
+    def generate_unlock_code(self, hardware_id: str, boot_mark: str) -> UnlockResult:
         """
         Genera el código de desbloqueo según el año del equipo.
         
@@ -168,17 +190,19 @@ class UnlockCodeGenerator:
             boot_mark: Marca de arranque del equipo
             
         Returns:
-            Tupla (éxito, mensaje, código)
+            UnlockResult (éxito, mensaje, código), desempaquetable como tupla
             - éxito: True si se generó correctamente
             - mensaje: Mensaje informativo
             - código: Código de desbloqueo (None si hay error)
         """
         # Validar entradas
         if not self.validate_hardware_id(hardware_id):
-            return False, "ID de Hardware inválido. Verifique el formato.", None
+            metrics.inc("validate.invalid_hardware_id")
+            return INVALID_HARDWARE_ID_RESULT
         
         if not self.validate_boot_mark(boot_mark):
-            return False, "Marca de Arranque inválida. Verifique el formato.", None
+            metrics.inc("validate.invalid_boot_mark")
+            return INVALID_BOOT_MARK_RESULT
         
         # Generar código según versión
         try:
@@ -187,77 +211,259 @@ class UnlockCodeGenerator:
             elif self.version == "tds_v2":
                 code = self.generate_code_tds_v2(hardware_id, boot_mark)
             else:
-                return False, f"Versión no soportada: {self.version}", None
+                return UnlockResult(False, f"Versión no soportada: {self.version}", None)
             
-            message = f"Código generado exitosamente para {self.server_config['name']}"
-            return True, message, code
+            return UnlockResult(True, self._success_message, code)
             
         except Exception as e:
-            return False, f"Error al generar código: {str(e)}", None
+            metrics.inc("unlock.errors")
+            return UnlockResult(False, f"Error al generar código: {str(e)}", None)
+    
+    def generate_codes_normalized(self, hardware_ids: Sequence[bytes], boot_marks: Sequence[bytes]) -> List[str]:
+        """
+        Genera códigos a partir de datos ya validados y normalizados.
+        
+        Los datos deben venir de normalizer.normalize_batch (mayúsculas,
+        sin separadores, codificados en bytes).
+        
+        Args:
+            hardware_ids: IDs de hardware normalizados
+            boot_marks: Marcas de arranque normalizadas
+            
+        Returns:
+            Lista de códigos, en el mismo orden que la entrada
+            
+        Raises:
+            ValueError: Si la versión no está soportada
+        """
+        sha256 = hashlib.sha256
+        
+        if self.version == "citd_v1":
+            salt = CITD_V1_SALT.encode()
+            spans = CITD_V1_SPANS
+            payloads = [hw + bm + salt for hw, bm in zip(hardware_ids, boot_marks)]
+        elif self.version == "tds_v2":
+            salt = TDS_V2_SALT.encode()
+            spans = TDS_V2_SPANS
+            payloads = [salt + hw + bm for hw, bm in zip(hardware_ids, boot_marks)]
+        else:
+            raise ValueError(f"Versión no soportada: {self.version}")
+        
+        with metrics.timed("unlock.batch_hash"):
+            digests = [sha256(payload).digest() for payload in payloads]
+        
+        with metrics.timed("unlock.batch_format"):
+            return format_digests(digests, spans)
     
-    def get_info(self) -> Dict[str, str]:
+    def generate_codes_batch(self, hardware_ids: Sequence[str], boot_marks: Sequence[str],
+                             use_numpy: Optional[bool] = None) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+        """
+        Genera códigos para un lote, sin armar un resultado por fila.
+        
+        Valida y normaliza todo el lote de una vez (con NumPy si está
+        disponible) y pasa los datos normalizados directamente al hash.
+        
+        Args:
+            hardware_ids: IDs de hardware
+            boot_marks: Marcas de arranque
+            use_numpy: Forzar o evitar NumPy (None = automático)
+            
+        Returns:
+            Tupla (códigos, errores), ambas en el orden de la entrada:
+            - códigos: Código generado o None si la fila es inválida
+            - errores: None o normalizer.ERROR_HARDWARE_ID / ERROR_BOOT_MARK
+        """
+        with metrics.timed("validate.batch"):
+            batch = normalize_batch(hardware_ids, boot_marks, use_numpy=use_numpy)
+        
+        valid = [i for i, error in enumerate(batch.errors) if error is None]
+        if len(valid) == len(batch.errors):
+            codes: List[Optional[str]] = self.generate_codes_normalized(batch.hardware_ids, batch.boot_marks)
+            return codes, batch.errors
+        
+        codes = [None] * len(batch.errors)
+        generated = self.generate_codes_normalized(
+            [batch.hardware_ids[i] for i in valid],
+            [batch.boot_marks[i] for i in valid]
+        )
+        for i, code in zip(valid, generated):
+            codes[i] = code
+        
+        return codes, batch.errors
+    
+    def generate_unlock_codes(self, hardware_ids: Sequence[str], boot_marks: Sequence[str],
+                              use_numpy: Optional[bool] = None) -> List[UnlockResult]:
+        """
+        Genera códigos de desbloqueo para un lote de equipos.
+        
+        Produce exactamente los mismos resultados que llamar a
+        generate_unlock_code fila por fila.
+        
+        Args:
+            hardware_ids: IDs de hardware
+            boot_marks: Marcas de arranque
+            use_numpy: Forzar o evitar NumPy (None = automático)
+            
+        Returns:
+            Lista de UnlockResult, en el mismo orden que la entrada
+        """
+        codes, errors = self.generate_codes_batch(hardware_ids, boot_marks, use_numpy=use_numpy)
+        
+        # tuple.__new__ evita el constructor en Python de la tupla con nombre
+        new_result = tuple.__new__
+        message = self._success_message
+        return [
+            new_result(UnlockResult, (True, message, code)) if code is not None
+            else INVALID_HARDWARE_ID_RESULT if error == ERROR_HARDWARE_ID
+            else INVALID_BOOT_MARK_RESULT
+            for code, error in zip(codes, errors)
+        ]
+    
+    def get_info(self) -> Mapping[str, str]:
         """
         Obtiene información sobre la configuración actual.
         
         Returns:
-            Diccionario con información del servidor y versión
+            Mapeo de solo lectura con información del servidor y versión
         """
-        return {
-            "year": self.year,
-            "server_name": self.server_config["name"],
-            "server_url": self.server_config["server"],
-            "version": self.version
-        }
+        return self._info
     
-    def save_unlock_log(self, hardware_id: str, boot_mark: str, unlock_code: str, log_dir: str = "./logs") -> bool:
+    def create_log_entry(self, hardware_id: str, boot_mark: str, unlock_code: str) -> LogEntry:
+        """
+        Crea la entrada de log de un desbloqueo.
+        
+        Args:
+            hardware_id: ID de hardware del equipo
+            boot_mark: Marca de arranque del equipo
+            unlock_code: Código generado
+            
+        Returns:
+            Entrada de log con los datos anonimizados
+        """
+        return LogEntry(
+            year=self.year,
+            server=self.server_config["server"],
+            hardware_id=hardware_id[-4:],  # Solo últimos 4 caracteres por privacidad
+            boot_mark=boot_mark[-4:],
+            unlock_code=unlock_code,
+            version=self.version
+        )
+    
+    @metrics.instrument("log.write")
+    def save_unlock_log(self, hardware_id: str, boot_mark: str, unlock_code: str, log_dir: str = "./logs",
+                        log_format: str = "jsonl") -> bool:
         """
         Guarda un registro del desbloqueo realizado.
         
+        Es seguro aunque varios procesos (GUI, CLI) escriban a la vez en el
+        mismo directorio (ver log_store.append_entries).
+        
         Args:
             hardware_id: ID de hardware del equipo
             boot_mark: Marca de arranque del equipo
             unlock_code: Código generado
             log_dir: Directorio donde guardar los logs
+            log_format: jsonl (una línea por entrada) o json (arreglo, formato anterior)
             
         Returns:
             True si se guardó correctamente, False en caso contrario
         """
         try:
-            # Crear directorio de logs si no existe
-            os.makedirs(log_dir, exist_ok=True)
-            
             # Preparar datos del log
-            log_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "year": self.year,
-                "server": self.server_config["server"],
-                "hardware_id": hardware_id[-4:],  # Solo últimos 4 caracteres por privacidad
-                "boot_mark": boot_mark[-4:],
-                "unlock_code": unlock_code,
-                "version": self.version
-            }
-            
-            # Nombre del archivo de log
-            log_filename = os.path.join(log_dir, f"unlock_log_{datetime.now().strftime('%Y%m')}.json")
-            
-            # Leer logs existentes
-            logs = []
-            if os.path.exists(log_filename):
-                with open(log_filename, 'r', encoding='utf-8') as f:
-                    logs = json.load(f)
-            
-            # Agregar nuevo log
-            logs.append(log_entry)
-            
-            # Guardar logs
-            with open(log_filename, 'w', encoding='utf-8') as f:
-                json.dump(logs, f, indent=2, ensure_ascii=False)
+            log_entry = self.create_log_entry(hardware_id, boot_mark, unlock_code)
             
-            return True
+            # Agregar al log del mes
+            log_store.append_entries(
+                log_store.log_path(log_dir, log_entry.created, log_format),
+                (log_entry.to_dict(),)
+            )
             
         except Exception as e:
+            metrics.inc("log.write_errors")
             print(f"Error al guardar log: {e}")
+            self._record_stats(log_dir, error=log_stats.ERROR_LOG_WRITE)
             return False
+        
+        self._record_stats(log_dir, entry=log_entry)
+        return True
+    
+    def record_error(self, result: UnlockResult, log_dir: str = "./logs"):
+        """
+        Suma una generación fallida a las estadísticas del directorio de logs.
+        
+        Args:
+            result: Resultado fallido de generate_unlock_code
+            log_dir: Directorio de logs
+        """
+        if result == INVALID_HARDWARE_ID_RESULT:
+            kind = log_stats.ERROR_HARDWARE_ID
+        elif result == INVALID_BOOT_MARK_RESULT:
+            kind = log_stats.ERROR_BOOT_MARK
+        else:
+            kind = log_stats.ERROR_GENERATION
+        self._record_stats(log_dir, error=kind)
+    
+    @staticmethod
+    def _record_stats(log_dir: str, entry: Optional[LogEntry] = None, error: Optional[str] = None):
+        """Actualiza las estadísticas; un fallo aquí no afecta al log."""
+        try:
+            if entry is not None:
+                log_stats.record_entry(log_dir, entry.to_dict())
+            if error is not None:
+                log_stats.record_error(log_dir, error)
+        except Exception as e:
+            metrics.inc("log.stats_errors")
+            print(f"Error al actualizar estadísticas: {e}")
+
+
+def run_batch(args) -> int:
+    """
+    Ejecuta el modo lote desde la línea de comandos.
+    
+    Args:
+        args: Argumentos parseados (batch, output, year, chunk_size, resume, partition_by,
+            by_province, max_open_files)
+        
+    Returns:
+        Código de salida
+    """
+    from batch_processor import BatchProcessor, describe_error
+    
+    print("\n" + "="*60)
+    print("DESBLOCK-NET - Generación por Lotes")
+    print("="*60)
+    print(f"Entrada: {args.batch}")
+    print(f"Salida: {args.output}")
+    print(f"Año por defecto: {args.year}")
+    print("="*60 + "\n")
+    
+    processor = BatchProcessor(
+        year=args.year,
+        chunk_size=args.chunk_size,
+        max_memory_keys=args.dedupe_memory_keys
+    )
+    try:
+        stats = processor.run(args.batch, args.output, resume=args.resume,
+                              partition_by=args.partition_by, by_province=args.by_province,
+                              max_open_files=args.max_open_files)
+    except (OSError, ValueError) as e:
+        print(f"✗ Error: {e}\n")
+        return 1
+    
+    if stats.resumed:
+        print(f"↻ Reanudado: {stats.resumed} filas ya procesadas en la ejecución anterior")
+    print(f"✓ Filas procesadas: {stats.rows}")
+    print(f"✓ Códigos generados: {stats.generated}")
+    for error, count in sorted(stats.errors.items()):
+        print(f"✗ {describe_error(error)}: {count}")
+    dedupe = stats.dedupe
+    print(f"♻  Pares distintos: {dedupe['unique']} | duplicados: {dedupe['duplicates']} "
+          f"({dedupe['duplicate_ratio']:.1%})")
+    if stats.partitions:
+        print(f"📂 {stats.partitions} archivos por '{args.partition_by}' en {args.output} (manifest.json)")
+    print(f"⏱  {stats.elapsed:.2f} s ({stats.rows_per_second:,.0f} filas/s)\n")
+    
+    return 0
 
 
 def main():
@@ -265,6 +471,7 @@ def main():
     Función principal para uso desde línea de comandos.
     """
     import argparse
+    import profiling
     
     parser = argparse.ArgumentParser(
         description="Generador de códigos de desbloqueo para Conectar Igualdad"
@@ -277,12 +484,10 @@ def main():
     )
     parser.add_argument(
         "--hardware-id",
-        required=True,
         help="ID de Hardware del equipo"
     )
     parser.add_argument(
         "--boot-mark",
-        required=True,
         help="Marca de Arranque del equipo"
     )
     parser.add_argument(
@@ -290,9 +495,83 @@ def main():
         action="store_true",
         help="Guardar registro del desbloqueo"
     )
+    parser.add_argument(
+        "--batch",
+        metavar="CSV",
+        help="Procesar un inventario CSV (columnas hardware_id, boot_mark y opcional year)"
+    )
+    parser.add_argument(
+        "--output",
+        metavar="CSV",
+        help="Archivo CSV de salida del modo lote"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=50000,
+        help="Filas procesadas por bloque en modo lote (por defecto: 50000)"
+    )
+    parser.add_argument(
+        "--dedupe-memory-keys",
+        type=int,
+        default=250000,
+        help="Pares distintos en memoria antes de usar disco en modo lote (por defecto: 250000)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continuar un lote interrumpido desde su último checkpoint (mismo --batch y --output)"
+    )
+    parser.add_argument(
+        "--partition-by",
+        metavar="COLUMNA",
+        help="Repartir la salida del lote en un CSV por valor de la columna (--output es un directorio)"
+    )
+    parser.add_argument(
+        "--by-province",
+        action="store_true",
+        help="Con --partition-by, agrupar los valores según las provincias de servers.json"
+    )
+    parser.add_argument(
+        "--max-open-files",
+        type=int,
+        default=64,
+        help="Archivos de partición abiertos a la vez (por defecto: 64)"
+    )
+    profiling.add_profile_arguments(parser)
     
     args = parser.parse_args()
     
+    if args.batch:
+        if not args.output:
+            parser.error("--batch requiere --output")
+        if args.by_province and not args.partition_by:
+            parser.error("--by-province requiere --partition-by")
+    elif args.resume:
+        parser.error("--resume requiere --batch")
+    elif not args.hardware_id or not args.boot_mark:
+        parser.error("se requieren --hardware-id y --boot-mark (o --batch)")
+    
+    # Exportar métricas si están activadas (DESBLOCK_METRICS=1)
+    metrics.setup_from_env()
+    
+    # Con --profile se perfila solo la generación (ver profiling)
+    with profiling.profiling(args):
+        if args.batch:
+            return run_batch(args)
+        return run_single(args)
+
+
+def run_single(args) -> int:
+    """
+    Genera un código desde la línea de comandos.
+    
+    Args:
+        args: Argumentos parseados (year, hardware_id, boot_mark, save_log)
+        
+    Returns:
+        Código de salida
+    """
     # Crear generador
     generator = UnlockCodeGenerator(year=args.year)
     
@@ -308,10 +587,11 @@ def main():
     print("="*60 + "\n")
     
     # Generar código
-    success, message, code = generator.generate_unlock_code(
+    result = generator.generate_unlock_code(
         args.hardware_id,
         args.boot_mark
     )
+    success, message, code = result
     
     if success:
         print(f"✓ {message}\n")
@@ -331,6 +611,8 @@ def main():
                 print("✓ Registro guardado exitosamente\n")
     else:
         print(f"✗ Error: {message}\n")
+        if args.save_log:
+            generator.record_error(result)
         return 1
     
     return 0
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Sincronización de USB portables
+Actualiza la carpeta DESBLOCK-NET de uno o más pendrives copiando solo
+los archivos que cambiaron.
+
+- En cada pendrive se guarda un manifiesto (tamaño + SHA-256 de cada
+  archivo copiado); se compara contra el árbol de origen y solo se copian
+  las diferencias.
+- Cada archivo se escribe en un temporal y se renombra, así un pendrive
+  desconectado a mitad de la copia no queda con archivos truncados.
+- ``logs/`` y los archivos que no copió la sincronización no se tocan.
+- Varios pendrives se actualizan a la vez, con un reporte por pendrive.
+
+Uso:
+    python3 src/usb_sync.py /media/usuario/USB1 /media/usuario/USB2
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils import copy_file, format_bytes
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Carpeta de DESBLOCK-NET dentro del pendrive
+TARGET_DIR = "DESBLOCK-NET"
+
+# Qué se copia (origen relativo al proyecto, destino relativo a TARGET_DIR)
+SYNC_SOURCES: Tuple[Tuple[str, str], ...] = (
+    ("src", "src"),
+    ("config", "config"),
+    ("README.md", "README.md"),
+    ("QUICKSTART.md", "QUICKSTART.md"),
+    ("LICENSE", "LICENSE"),
+    ("docs/MANUAL_USUARIO.md", "docs/MANUAL_USUARIO.md"),
+    ("docs/FAQ.md", "docs/FAQ.md"),
+)
+
+# Directorios del pendrive que nunca se modifican
+PRESERVED_DIRS = ("logs",)
+
+MANIFEST_NAME = ".desblock-manifest.json"
+_MANIFEST_VERSION = 1
+_TMP_SUFFIX = ".desblock-tmp"
+_IGNORED_DIRS = ("__pycache__",)
+_IGNORED_SUFFIXES = (".pyc", ".pyo")
+
+
+class SyncReport:
+    """
+    Resultado de la sincronización de un pendrive.
+    """
+
+    __slots__ = ("target", "copied", "skipped", "deleted", "bytes", "elapsed", "error")
+
+    def __init__(self, target: str):
+        self.target = target
+        self.copied = 0
+        self.skipped = 0
+        self.deleted = 0
+        self.bytes = 0
+        self.elapsed = 0.0
+        self.error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict:
+        """Convierte el reporte a un diccionario serializable."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _sha256(path: str) -> str:
+    """SHA-256 de un archivo."""
+    hash_obj = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hash_obj.update(chunk)
+    return hash_obj.hexdigest()
+
+
+def source_manifest(project_dir: str = PROJECT_DIR,
+                    sources: Sequence[Tuple[str, str]] = SYNC_SOURCES) -> Dict[str, Dict]:
+    """
+    Calcula el manifiesto del árbol de origen.
+
+    Args:
+        project_dir: Raíz del proyecto
+        sources: Pares (origen, destino) a sincronizar
+
+    Returns:
+        {ruta destino: {'size', 'sha256', 'source'}}
+    """
+    manifest: Dict[str, Dict] = {}
+
+    def add(source_path: str, relative: str):
+        manifest[relative] = {
+            "size": os.path.getsize(source_path),
+            "sha256": _sha256(source_path),
+            "source": source_path,
+        }
+
+    for source, destination in sources:
+        source_path = os.path.join(project_dir, source)
+        if os.path.isfile(source_path):
+            add(source_path, destination)
+        elif os.path.isdir(source_path):
+            for root, dirs, files in os.walk(source_path):
+                dirs[:] = sorted(d for d in dirs if d not in _IGNORED_DIRS)
+                for name in sorted(files):
+                    if name.endswith(_IGNORED_SUFFIXES):
+                        continue
+                    path = os.path.join(root, name)
+                    relative = os.path.join(destination, os.path.relpath(path, source_path))
+                    add(path, relative.replace(os.sep, "/"))
+    return manifest
+
+
+def load_target_manifest(target_root: str) -> Dict[str, Dict]:
+    """Lee el manifiesto guardado en el pendrive (vacío si no hay o está dañado)."""
+    try:
+        with open(os.path.join(target_root, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != _MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def _atomic_write_json(path: str, data: Dict):
+    tmp_path = path + _TMP_SUFFIX
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _copy_atomic(source: str, destination: str):
+    """Copia un archivo vía temporal + rename (conserva permisos si el FS lo permite)."""
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    tmp_path = destination + _TMP_SUFFIX
+    try:
+        copy_file(source, tmp_path, preserve=False)
+        with open(tmp_path, 'rb') as f:
+            os.fsync(f.fileno())
+        try:
+            shutil.copymode(source, tmp_path)
+        except OSError:
+            # FAT32 no soporta permisos
+            pass
+        os.replace(tmp_path, destination)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _is_preserved(relative: str) -> bool:
+    return relative.split("/", 1)[0] in PRESERVED_DIRS
+
+
+def sync_target(mount_point: str, manifest: Dict[str, Dict], verify: bool = False,
+                dry_run: bool = False) -> SyncReport:
+    """
+    Sincroniza un pendrive.
+
+    Args:
+        mount_point: Punto de montaje del pendrive
+        manifest: Manifiesto del origen (ver source_manifest)
+        verify: Recalcular el hash de los archivos del pendrive en lugar de
+            confiar en su manifiesto (detecta archivos dañados)
+        dry_run: Solo informar qué se copiaría
+
+    Returns:
+        Reporte de la sincronización
+    """
+    report = SyncReport(mount_point)
+    start = time.perf_counter()
+    target_root = os.path.join(mount_point, TARGET_DIR)
+
+    try:
+        if not os.path.isdir(mount_point):
+            raise OSError(f"No existe el punto de montaje {mount_point}")
+        if not dry_run:
+            for directory in PRESERVED_DIRS:
+                os.makedirs(os.path.join(target_root, directory), exist_ok=True)
+
+        previous = load_target_manifest(target_root)
+        written: Dict[str, Dict] = {}
+
+        for relative, entry in manifest.items():
+            if _is_preserved(relative):
+                continue
+            destination = os.path.join(target_root, relative)
+            known = previous.get(relative)
+            unchanged = (
+                known is not None
+                and known["size"] == entry["size"]
+                and known["sha256"] == entry["sha256"]
+                and os.path.isfile(destination)
+                and os.path.getsize(destination) == entry["size"]
+            )
+            if unchanged and verify:
+                unchanged = _sha256(destination) == entry["sha256"]
+
+            if unchanged:
+                report.skipped += 1
+            else:
+                if not dry_run:
+                    _copy_atomic(entry["source"], destination)
+                report.copied += 1
+                report.bytes += entry["size"]
+            written[relative] = {"size": entry["size"], "sha256": entry["sha256"]}
+
+        # Archivos copiados en una sincronización anterior que ya no existen en el origen
+        for relative in previous:
+            if relative in manifest or _is_preserved(relative):
+                continue
+            path = os.path.join(target_root, relative)
+            if os.path.isfile(path):
+                if not dry_run:
+                    os.unlink(path)
+                report.deleted += 1
+
+        if not dry_run:
+            _atomic_write_json(os.path.join(target_root, MANIFEST_NAME),
+                               {"version": _MANIFEST_VERSION, "files": written})
+    except OSError as e:
+        report.error = str(e)
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def sync_many(mount_points: Sequence[str], project_dir: str = PROJECT_DIR, verify: bool = False,
+              dry_run: bool = False, workers: Optional[int] = None) -> List[SyncReport]:
+    """
+    Sincroniza varios pendrives a la vez.
+
+    Args:
+        mount_points: Puntos de montaje
+        project_dir: Raíz del proyecto
+        verify: Recalcular los hashes en los pendrives
+        dry_run: Solo informar
+        workers: Pendrives en paralelo (por defecto, todos)
+
+    Returns:
+        Reportes en el orden de mount_points
+    """
+    manifest = source_manifest(project_dir)
+    workers = workers or max(1, len(mount_points))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda mount_point: sync_target(mount_point, manifest, verify, dry_run),
+                                 mount_points))
+
+
+def main():
+    """Función principal."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Actualiza DESBLOCK-NET en pendrives montados")
+    parser.add_argument("mount_points", nargs="+", help="Puntos de montaje de los pendrives")
+    parser.add_argument("--verify", action="store_true",
+                        help="Recalcular los hashes en el pendrive (más lento, detecta archivos dañados)")
+    parser.add_argument("--dry-run", action="store_true", help="Mostrar qué se copiaría sin escribir")
+    parser.add_argument("--workers", type=int, help="Pendrives a actualizar en paralelo")
+    parser.add_argument("--json", metavar="ARCHIVO", help="Guardar los reportes en JSON")
+
+    args = parser.parse_args()
+
+    reports = sync_many(args.mount_points, verify=args.verify, dry_run=args.dry_run, workers=args.workers)
+
+    print(f"\n{'Pendrive':<30} {'Copiados':>9} {'Iguales':>8} {'Borrados':>9} {'Datos':>10} {'Tiempo':>8}")
+    for report in reports:
+        if report.ok:
+            print(f"{report.target:<30} {report.copied:>9} {report.skipped:>8} {report.deleted:>9} "
+                  f"{format_bytes(report.bytes):>10} {report.elapsed:>7.1f}s")
+        else:
+            print(f"{report.target:<30} ✗ Error: {report.error}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([report.to_dict() for report in reports], f, indent=2, ensure_ascii=False)
+
+    failed = [report for report in reports if not report.ok]
+    if failed:
+        print(f"\n✗ {len(failed)} pendrive(s) con errores")
+        return 1
+    print(f"\n✓ {len(reports)} pendrive(s) actualizados")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
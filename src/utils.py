@@ -7,12 +7,23 @@ Funciones auxiliares para el sistema de desbloqueo
 import os
 import sys
 import json
+import errno
+import shutil
 import hashlib
 import subprocess
+import tempfile
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:
+    # Windows: sin reflink (copy_file usa shutil.copyfile)
+    fcntl = None
+
+import metrics
+
 
 def get_system_info() -> Dict[str, str]:
     """
@@ -39,6 +50,8 @@ def check_dependencies() -> Tuple[bool, List[str]]:
     Returns:
         Tupla (todas_instaladas, lista_faltantes)
     """
+    import importlib.util
+    
     dependencies = {
         "tkinter": "tkinter",
         "hashlib": "hashlib",
@@ -47,10 +60,9 @@ def check_dependencies() -> Tuple[bool, List[str]]:
     
     missing = []
     
+    # Buscar los módulos sin importarlos (importar tkinter es lento)
     for name, module in dependencies.items():
-        try:
-            __import__(module)
-        except ImportError:
+        if importlib.util.find_spec(module) is None:
             missing.append(name)
     
     return len(missing) == 0, missing
@@ -84,6 +96,7 @@ def is_usb_device(device_path: str) -> bool:
     return False
 
 
+@metrics.instrument("usb.enumerate")
 def get_usb_devices() -> List[Dict[str, str]]:
     """
     Lista todos los dispositivos USB conectados.
@@ -173,6 +186,7 @@ def validate_iso_file(iso_path: str) -> Tuple[bool, str]:
     return False, "Archivo ISO no válido o corrupto"
 
 
+@metrics.instrument("io.file_hash")
 def calculate_file_hash(file_path: str, algorithm: str = 'sha256') -> Optional[str]:
     """
     Calcula el hash de un archivo.
@@ -191,13 +205,173 @@ def calculate_file_hash(file_path: str, algorithm: str = 'sha256') -> Optional[s
             # Leer en bloques de 64KB
             for chunk in iter(lambda: f.read(65536), b''):
                 hash_obj.update(chunk)
+            metrics.inc("io.file_hash_bytes", f.tell())
         
         return hash_obj.hexdigest()
     except Exception as e:
+        metrics.inc("io.file_hash_errors")
         print(f"Error al calcular hash: {e}")
         return None
 
 
+class MultiHasher:
+    """
+    Calcula varios hashes a la vez sobre un mismo flujo de datos.
+
+    Ejemplo:
+        hasher = MultiHasher(("md5", "sha256"))
+        hasher.update(b"...")
+        hasher.hexdigests()  # {'md5': '...', 'sha256': '...'}
+    """
+
+    def __init__(self, algorithms=("sha256",)):
+        """
+        Args:
+            algorithms: Algoritmos de hashlib (md5, sha1, sha256, ...)
+        """
+        self._hashes = {name: hashlib.new(name) for name in algorithms}
+        self.bytes = 0
+
+    def update(self, data):
+        """Agrega datos a todos los hashes."""
+        for hash_obj in self._hashes.values():
+            hash_obj.update(data)
+        self.bytes += len(data)
+
+    def hexdigests(self) -> Dict[str, str]:
+        """Devuelve los hashes en hexadecimal por algoritmo."""
+        return {name: hash_obj.hexdigest() for name, hash_obj in self._hashes.items()}
+
+
+# ioctl de clonado de archivos (reflink) de linux/fs.h: btrfs, xfs, bcachefs
+FICLONE = 0x40049409
+
+# Buffer de la copia en espacio de usuario (último recurso)
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Errores con los que una vía de copia del kernel no aplica a estos archivos
+_NO_KERNEL_COPY = (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL, errno.ENOTTY, errno.EBADF)
+
+# Pares (dispositivo origen, dispositivo destino) donde FICLONE no aplica
+_NO_REFLINK = set()
+
+
+def copy_range(source_fd: int, target_fd: int, length: int, offset: int = 0) -> str:
+    """
+    Copia ``length`` bytes desde ``offset`` a la posición actual del destino.
+    
+    Prueba, en orden, copy_file_range (copia dentro del kernel, o en el
+    servidor/dispositivo si el sistema de archivos lo soporta), sendfile y
+    una copia con un buffer grande reutilizado (preadv). Si una vía falla a
+    mitad de camino, la siguiente continúa desde donde quedó.
+    
+    Args:
+        source_fd: Descriptor de origen
+        target_fd: Descriptor de destino
+        length: Bytes a copiar
+        offset: Posición en el origen
+        
+    Returns:
+        Vía usada ("copy_file_range", "sendfile" o "readinto")
+        
+    Raises:
+        EOFError: Si el origen termina antes de length bytes
+    """
+    if length <= 0:
+        return "copy_file_range"
+    
+    for method in ("copy_file_range", "sendfile"):
+        syscall = getattr(os, method, None)
+        if syscall is None:
+            continue
+        try:
+            while length > 0:
+                if method == "copy_file_range":
+                    copied = syscall(source_fd, target_fd, length, offset)
+                else:
+                    copied = syscall(target_fd, source_fd, offset, min(length, 1 << 30))
+                if copied == 0:
+                    raise EOFError(f"El origen terminó {length} bytes antes de lo esperado")
+                offset += copied
+                length -= copied
+            return method
+        except OSError as e:
+            if e.errno not in _NO_KERNEL_COPY:
+                raise
+    
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+    while length > 0:
+        count = os.preadv(source_fd, [view[:min(COPY_BUFFER_SIZE, length)]], offset)
+        if count == 0:
+            raise EOFError(f"El origen terminó {length} bytes antes de lo esperado")
+        chunk = view[:count]
+        while chunk:
+            written = os.write(target_fd, chunk)
+            chunk = chunk[written:]
+        offset += count
+        length -= count
+    return "readinto"
+
+
+def copy_file(source: str, destination: str, preserve: bool = True) -> str:
+    """
+    Copia un archivo con un reflink cuando el sistema de archivos lo permite.
+    
+    Primero intenta FICLONE (btrfs, xfs: el destino comparte los bloques
+    del origen, sin copiar datos). Si no aplica, usa shutil.copyfile, que
+    en Linux ya copia con sendfile y es la vía más rápida para un archivo
+    completo (benchmarks/bench_io.py). Los pares de dispositivos sin
+    reflink se recuerdan para no volver a intentarlo en cada archivo. Se
+    puede usar como ``copy_function`` de shutil.copytree.
+    
+    Args:
+        source: Archivo de origen
+        destination: Archivo destino (se reemplaza si existe)
+        preserve: Copiar permisos y fechas, como shutil.copy2
+        
+    Returns:
+        Vía usada ("reflink" o "copyfile")
+        
+    Raises:
+        shutil.SameFileError: Si el destino es el mismo archivo que el
+            origen (misma ruta, hardlink o symlink)
+    """
+    with open(source, 'rb') as src:
+        source_stat = os.fstat(src.fileno())
+        size = source_stat.st_size
+        try:
+            target_stat = os.stat(destination)
+        except FileNotFoundError:
+            target_stat = None
+        # Abrir el destino con 'wb' truncaría el origen
+        if target_stat is not None and (target_stat.st_dev, target_stat.st_ino) == \
+                (source_stat.st_dev, source_stat.st_ino):
+            raise shutil.SameFileError(f"{source!r} y {destination!r} son el mismo archivo")
+        
+        method = None
+        devices = (source_stat.st_dev, target_stat.st_dev if target_stat is not None
+                   else os.stat(os.path.dirname(os.path.abspath(destination))).st_dev)
+        if size and fcntl is not None and devices not in _NO_REFLINK:
+            with open(destination, 'wb') as dst:
+                try:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                    method = "reflink"
+                except OSError as e:
+                    if e.errno not in _NO_KERNEL_COPY + (errno.EPERM,):
+                        raise
+                    _NO_REFLINK.add(devices)
+    
+    if method is None:
+        shutil.copyfile(source, destination)
+        method = "copyfile"
+    if preserve:
+        shutil.copystat(source, destination)
+    metrics.inc(f"io.copy.{method}")
+    metrics.inc("io.copy_bytes", size)
+    return method
+
+
 def create_desktop_shortcut(app_name: str, exec_path: str, icon_path: Optional[str] = None) -> bool:
     """
     Crea un acceso directo en el escritorio.
@@ -278,17 +452,36 @@ def write_config(config_path: str, config_data: Dict) -> bool:
     Returns:
         True si se guardó correctamente, False en caso contrario
     """
+    tmp_path = None
     try:
         # Crear directorio si no existe
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
+        directory = os.path.dirname(os.path.abspath(config_path))
+        os.makedirs(directory, exist_ok=True)
         
-        with open(config_path, 'w', encoding='utf-8') as f:
+        # Escribir en un temporal y reemplazar: nunca queda un archivo a medias
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
             json.dump(config_data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(config_path):
+            os.chmod(tmp_path, os.stat(config_path).st_mode & 0o7777)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, config_path)
+        tmp_path = None
         
         return True
     except Exception as e:
         print(f"Error al guardar configuración: {e}")
         return False
+    finally:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
 
 
 def get_app_version() -> str:
@@ -337,36 +530,49 @@ def print_banner():
 
 def main():
     """Función principal para pruebas."""
-    print_banner()
+    import argparse
+    import profiling
+    
+    parser = argparse.ArgumentParser(description="Diagnóstico del sistema para DESBLOCK-NET")
+    profiling.add_profile_arguments(parser)
+    args = parser.parse_args()
     
-    print("\n📊 Información del Sistema:")
-    print("="*60)
-    system_info = get_system_info()
-    for key, value in system_info.items():
-        print(f"  {key}: {value}")
-    
-    print("\n🔍 Verificando dependencias...")
-    all_installed, missing = check_dependencies()
-    if all_installed:
-        print("  ✓ Todas las dependencias están instaladas")
-    else:
-        print(f"  ✗ Faltan dependencias: {', '.join(missing)}")
-    
-    print("\n💾 Dispositivos USB:")
-    print("="*60)
-    usb_devices = get_usb_devices()
-    if usb_devices:
-        for device in usb_devices:
-            print(f"  • {device['name']} ({device['size']}) - {device['path']}")
-    else:
-        print("  No se encontraron dispositivos USB")
-    
-    print("\n📦 Información de la Aplicación:")
-    print("="*60)
-    app_info = get_app_info()
-    for key, value in app_info.items():
-        print(f"  {key}: {value}")
+    metrics.setup_from_env()
+    print_banner()
     
+    with profiling.profiling(args):
+        # Diagnóstico en paralelo y cacheado para la sesión
+        from env_probe import probe_environment
+        environment = probe_environment()
+        
+        print("\n📊 Información del Sistema:")
+        print("="*60)
+        system_info = environment["system"]
+        for key, value in system_info.items():
+            print(f"  {key}: {value}")
+        
+        print("\n🔍 Verificando dependencias...")
+        missing = [name for name, available in environment["modules"].items() if not available]
+        if not missing:
+            print("  ✓ Todas las dependencias están instaladas")
+        else:
+            print(f"  ✗ Faltan dependencias: {', '.join(missing)}")
+        
+        print("\n💾 Dispositivos USB:")
+        print("="*60)
+        usb_devices = environment["usb"]
+        if usb_devices:
+            for device in usb_devices:
+                print(f"  • {device['name']} ({device['size']}) - {device['path']}")
+        else:
+            print("  No se encontraron dispositivos USB")
+        
+        print("\n📦 Información de la Aplicación:")
+        print("="*60)
+        app_info = get_app_info()
+        for key, value in app_info.items():
+            print(f"  {key}: {value}")
+        
     print("\n")
 
 
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Generador de ISOs chicas para los tests
+Escribe imágenes ISO 9660 con Rock Ridge y/o Joliet sin herramientas
+externas. Solo cubre lo necesario para probar iso9660.py.
+"""
+
+import struct
+from typing import List
+
+SECTOR = 2048
+_DATE = bytes([123, 5, 17, 12, 30, 0, 0])  # 2023-05-17 12:30:00 UTC
+
+
+def _both16(value):
+    return struct.pack("<H", value) + struct.pack(">H", value)
+
+
+def _both32(value):
+    return struct.pack("<I", value) + struct.pack(">I", value)
+
+
+def _sectors(size):
+    return max(1, (size + SECTOR - 1) // SECTOR)
+
+
+class _Node:
+    def __init__(self, name, mode, data=b"", target=None):
+        self.name = name
+        self.mode = mode
+        self.data = data
+        self.target = target
+        self.children: List["_Node"] = []
+        self.lba = 0
+        self.size = 0
+        self.joliet_lba = 0
+        self.joliet_size = 0
+        self.ce_lba = 0
+
+
+class IsoBuilder:
+    """
+    Arma una ISO a partir de archivos, directorios y enlaces en memoria.
+
+    Ejemplo:
+        builder = IsoBuilder()
+        builder.add_file("boot/grub/grub.cfg", b"...", mode=0o644)
+        builder.add_symlink("boot/grub/loopback.cfg", "grub.cfg")
+        builder.write("test.iso")
+    """
+
+    def __init__(self, rock_ridge=True, joliet=True, max_extent=0xFFFFF800, volume_id="DESBLOCK-TEST",
+                 posix_attributes=True):
+        self.rock_ridge = rock_ridge
+        # Sin PX: sin permisos ni dueños (imágenes incompletas)
+        self.posix_attributes = posix_attributes
+        self.joliet = joliet
+        self.max_extent = max_extent
+        self.volume_id = volume_id
+        self.root = _Node("", 0o40755)
+
+    def _parent(self, path):
+        node = self.root
+        parts = path.split("/")
+        for part in parts[:-1]:
+            match = [child for child in node.children if child.name == part]
+            if match:
+                node = match[0]
+            else:
+                child = _Node(part, 0o40755)
+                node.children.append(child)
+                node = child
+        return node, parts[-1]
+
+    def add_dir(self, path, mode=0o755):
+        parent, name = self._parent(path)
+        parent.children.append(_Node(name, 0o40000 | mode))
+
+    def add_file(self, path, data, mode=0o644):
+        parent, name = self._parent(path)
+        parent.children.append(_Node(name, 0o100000 | mode, data))
+
+    def add_symlink(self, path, target):
+        parent, name = self._parent(path)
+        parent.children.append(_Node(name, 0o120777, target=target))
+
+    # --- Registros -------------------------------------------------------
+
+    def _iso_name(self, node, index):
+        if node.mode & 0o40000:
+            return f"D{index:07d}".encode()
+        return f"F{index:07d}.;1".encode()
+
+    def _rr_fields(self, node, dot=False):
+        fields = b""
+        if dot:
+            fields += b"SP" + bytes([7, 1]) + b"\xbe\xef" + bytes([0])
+        if self.posix_attributes:
+            fields += b"PX" + bytes([44, 1]) + _both32(node.mode) + _both32(1) + _both32(1000) + _both32(1000) + _both32(0)
+        fields += b"TF" + bytes([5 + 7, 1, 0x02]) + _DATE
+        if not dot and node.name:
+            name = node.name.encode()
+            fields += b"NM" + bytes([5 + len(name), 1, 0]) + name
+        if node.target is not None:
+            components = b""
+            for part in node.target.split("/"):
+                if part == "":
+                    components += bytes([0x08, 0])
+                elif part == ".":
+                    components += bytes([0x02, 0])
+                elif part == "..":
+                    components += bytes([0x04, 0])
+                else:
+                    components += bytes([0, len(part)]) + part.encode()
+            fields += b"SL" + bytes([5 + len(components), 1, 0]) + components
+        return fields
+
+    def _record(self, name, lba, size, flags, system_use=b""):
+        length = 33 + len(name) + (1 - len(name) % 2) + len(system_use)
+        if length % 2:
+            system_use += b"\x00"
+            length += 1
+        assert length <= 255, "registro demasiado largo"
+        return (bytes([length, 0]) + _both32(lba) + _both32(size) + _DATE + bytes([flags, 0, 0])
+                + _both16(1) + bytes([len(name)]) + name + b"\x00" * (1 - len(name) % 2) + system_use)
+
+    def _system_use(self, node, dot=False):
+        if not self.rock_ridge:
+            return b""
+        fields = self._rr_fields(node, dot)
+        if len(fields) > 150:
+            # Campos en un área de continuación
+            return b"CE" + bytes([28, 1]) + _both32(node.ce_lba) + _both32(0) + _both32(len(fields))
+        return fields
+
+    def _extents(self, node):
+        extents = []
+        remaining = len(node.data)
+        lba = node.lba
+        while True:
+            size = min(remaining, self.max_extent)
+            extents.append((lba, size))
+            remaining -= size
+            lba += _sectors(size) if size else 0
+            if remaining <= 0:
+                return extents
+
+    def _dir_records(self, node, parent, joliet):
+        records = []
+        lba = node.joliet_lba if joliet else node.lba
+        size = node.joliet_size if joliet else node.size
+        parent_lba = parent.joliet_lba if joliet else parent.lba
+        parent_size = parent.joliet_size if joliet else parent.size
+        dot_su = b"" if joliet else self._system_use(node, dot=node is self.root)
+        records.append(self._record(b"\x00", lba, size, 0x02, dot_su))
+        records.append(self._record(b"\x01", parent_lba, parent_size, 0x02))
+        for index, child in enumerate(node.children):
+            if joliet:
+                # Joliet admite hasta 64 caracteres
+                name = child.name[:64].encode("utf-16-be")
+                if not child.mode & 0o40000:
+                    name += ";1".encode("utf-16-be")
+                su = b""
+            else:
+                name = self._iso_name(child, index)
+                su = self._system_use(child)
+            if child.mode & 0o40000:
+                child_lba = child.joliet_lba if joliet else child.lba
+                child_size = child.joliet_size if joliet else child.size
+                records.append(self._record(name, child_lba, child_size, 0x02, su))
+            elif child.target is not None:
+                if joliet:
+                    continue
+                records.append(self._record(name, 0, 0, 0, su))
+            else:
+                extents = self._extents(child)
+                for i, (extent_lba, extent_size) in enumerate(extents):
+                    flags = 0x80 if i < len(extents) - 1 else 0
+                    records.append(self._record(name, extent_lba, extent_size, flags, su if i == 0 else b""))
+        return records
+
+    @staticmethod
+    def _pack(records):
+        data = b""
+        for record in records:
+            if len(data) % SECTOR + len(record) > SECTOR:
+                data += b"\x00" * (SECTOR - len(data) % SECTOR)
+            data += record
+        return data + b"\x00" * ((-len(data)) % SECTOR)
+
+    def _walk(self, node=None, parent=None):
+        node = node or self.root
+        yield node, parent or self.root
+        for child in node.children:
+            if child.mode & 0o40000:
+                yield from self._walk(child, node)
+
+    # --- Escritura -------------------------------------------------------
+
+    def write(self, path):
+        dirs = list(self._walk())
+        files = []
+
+        def collect(node):
+            for child in node.children:
+                if child.mode & 0o40000:
+                    collect(child)
+                elif child.target is None:
+                    files.append(child)
+        collect(self.root)
+
+        # Tamaños de directorio (no dependen de las posiciones)
+        for node, parent in dirs:
+            node.size = len(self._pack(self._dir_records(node, parent, False)))
+            if self.joliet:
+                node.joliet_size = len(self._pack(self._dir_records(node, parent, True)))
+
+        lba = 19
+        for node, _ in dirs:
+            node.lba = lba
+            lba += _sectors(node.size)
+        if self.joliet:
+            for node, _ in dirs:
+                node.joliet_lba = lba
+                lba += _sectors(node.joliet_size)
+        if self.rock_ridge:
+            for node, _ in dirs:
+                for child in [node] + node.children:
+                    if len(self._rr_fields(child, dot=child is self.root)) > 150:
+                        child.ce_lba = lba
+                        lba += 1
+        for node in files:
+            node.lba = lba
+            lba += sum(_sectors(size) for _, size in self._extents(node))
+
+        image = bytearray(lba * SECTOR)
+
+        def put(sector, data):
+            image[sector * SECTOR:sector * SECTOR + len(data)] = data
+
+        put(16, self._descriptor(1, self.root.lba, self.root.size, lba))
+        if self.joliet:
+            put(17, self._descriptor(2, self.root.joliet_lba, self.root.joliet_size, lba))
+        put(18 if self.joliet else 17, bytes([255]) + b"CD001" + bytes([1]))
+
+        for node, parent in dirs:
+            put(node.lba, self._pack(self._dir_records(node, parent, False)))
+            if self.joliet:
+                put(node.joliet_lba, self._pack(self._dir_records(node, parent, True)))
+            for child in [node] + node.children:
+                if child.ce_lba:
+                    put(child.ce_lba, self._rr_fields(child, dot=child is self.root))
+        for node in files:
+            offset = 0
+            for extent_lba, size in self._extents(node):
+                put(extent_lba, node.data[offset:offset + size])
+                offset += size
+
+        with open(path, "wb") as f:
+            f.write(image)
+
+    def _descriptor(self, kind, root_lba, root_size, total):
+        data = bytearray(SECTOR)
+        data[0] = kind
+        data[1:6] = b"CD001"
+        data[6] = 1
+        if kind == 2:
+            data[40:72] = self.volume_id.encode("utf-16-be")[:32].ljust(32, b"\x00")
+            data[88:91] = b"%/E"
+        else:
+            data[40:72] = self.volume_id.encode().ljust(32)
+        data[80:88] = _both32(total)
+        data[120:124] = _both16(1)
+        data[124:128] = _both16(1)
+        data[128:132] = _both16(SECTOR)
+        data[156:190] = self._record(b"\x00", root_lba, root_size, 0x02)
+        data[813:830] = b"2023051712300000" + bytes([0])
+        data[881] = 1
+        return bytes(data)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Corpus de referencia de códigos
+Tuplas (año, hardware_id, boot_mark, código) con el código que genera hoy
+``generate_unlock_code`` (es decir, generate_code_citd_v1 y
+generate_code_tds_v2 tras la validación), que cualquier camino rápido
+debe reproducir exactamente.
+
+Las entradas salen de un generador determinístico basado en SHA-512
+(longitudes límite, separadores, minúsculas, espacios y caracteres no
+ASCII), independiente del módulo ``random`` y de la versión de Python.
+En ``tests/data/reference_codes.tsv.xz`` se guardan solo los códigos,
+junto con un hash de las entradas que verifica que se regeneraron igual.
+
+Solo se regenera si el algoritmo cambia a propósito:
+
+    python3 tests/reference_corpus.py
+"""
+
+import hashlib
+import json
+import lzma
+import os
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from unlock_generator import UnlockCodeGenerator
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "reference_codes.tsv.xz")
+CORPUS_SEED = 2021
+CORPUS_ROWS_PER_YEAR = 100000
+CORPUS_VERSION = 1
+YEARS = ("2021", "2022", "2023")
+
+# (año, hardware_id, boot_mark, código o "" si la entrada es inválida)
+CorpusRow = Tuple[str, str, str, str]
+
+_ALNUM = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_LOWER = "abcdefghijklmnopqrstuvwxyz"
+# No ASCII: isalnum() verdadero (letras, dígitos arábigos, ligadura que
+# cambia de longitud al pasar a mayúsculas) y falso (símbolos)
+_UNICODE = "ñÑéÜßﬁ١٢µ€·"
+_OTHER = " .:/+#"
+_SEPARATORS = "-_"
+
+# Alfabetos por tipo de campo: (probabilidad acumulada sobre 256, caracteres)
+_POOLS = (
+    (150, _ALNUM),
+    (200, _ALNUM + _LOWER),
+    (235, _ALNUM + _LOWER + _SEPARATORS * 6),
+    (256, _ALNUM + _LOWER + _SEPARATORS + _UNICODE + _OTHER),
+)
+
+# Longitudes: alrededor de los límites de validación y algunas al azar
+_HARDWARE_ID_LENGTHS = (0, 1, 7, 8, 9, 12, 16, 31, 32, 33, 40)
+_BOOT_MARK_LENGTHS = (0, 1, 3, 4, 5, 8, 12, 19, 20, 21, 25)
+
+
+def _table(pool: str, extra: str = ""):
+    """
+    Tabla de 256 entradas que lleva cada byte a un carácter del alfabeto.
+
+    Para alfabetos ASCII es una tabla de bytes.translate (mucho más rápida);
+    si no, una de str.translate sobre los bytes decodificados en latin-1.
+    """
+    pool += extra
+    table = "".join(pool[i % len(pool)] for i in range(256))
+    return table.encode("ascii") if table.isascii() else table
+
+
+def _tables_by_byte(with_nul: bool) -> List:
+    """Tabla de caracteres elegida por cada valor del byte de control."""
+    tables = [(limit, _table(pool, "\x00" if with_nul and limit == 256 else "")) for limit, pool in _POOLS]
+    return [next(table for limit, table in tables if value < limit) for value in range(256)]
+
+
+_TABLES = _tables_by_byte(False)
+# Con NUL (solo en la prueba aleatoria: el corpus es texto)
+_TABLES_NUL = _tables_by_byte(True)
+
+
+def _field(block: bytes, lengths: Sequence[int], low: int, high: int, tables) -> str:
+    """Arma un campo a partir de 64 bytes pseudoaleatorios."""
+    # block[0..3]: control; block[4:]: caracteres (hasta 56)
+    if block[0] < 102:
+        length = lengths[block[1] % len(lengths)]
+    else:
+        length = low + block[1] % (high - low + 1)
+    table = tables[block[2]]
+    if isinstance(table, bytes):
+        chars = block[4:4 + length].translate(table).decode("ascii")
+    else:
+        chars = block[4:4 + length].decode("latin-1").translate(table)
+    # Separadores en los extremos
+    if chars and block[3] < 13:
+        chars = _SEPARATORS[block[3] & 1] + chars[1:]
+    elif chars and block[3] > 242:
+        chars = chars[:-1] + _SEPARATORS[block[3] & 1]
+    return chars
+
+
+def generate_inputs(seed: int, count: int, with_nul: bool = False) -> List[Tuple[str, str]]:
+    """
+    Pares (hardware_id, boot_mark) determinísticos, con ~3% repetidos.
+
+    Args:
+        seed: Semilla
+        count: Cantidad de pares
+        with_nul: Incluir también el carácter NUL
+    """
+    tables = _TABLES_NUL if with_nul else _TABLES
+    prefix = f"desblock-net/{seed}/".encode()
+    sha512 = hashlib.sha512
+    pairs: List[Tuple[str, str]] = []
+    for i in range(count):
+        key = prefix + i.to_bytes(8, "little")
+        # Los últimos bytes del bloque del hardware_id no se usan como caracteres
+        hw_block = sha512(key + b"h").digest()
+        if pairs and hw_block[59] < 8:
+            pairs.append(pairs[int.from_bytes(hw_block[60:], "little") % len(pairs)])
+            continue
+        pairs.append((_field(hw_block, _HARDWARE_ID_LENGTHS, 8, 32, tables),
+                      _field(sha512(key + b"b").digest(), _BOOT_MARK_LENGTHS, 4, 20, tables)))
+    return pairs
+
+
+def corpus_inputs(seed: int = CORPUS_SEED,
+                  rows_per_year: int = CORPUS_ROWS_PER_YEAR) -> List[Tuple[str, str, str]]:
+    """Entradas del corpus: (año, hardware_id, boot_mark)."""
+    return [(year, hardware_id, boot_mark)
+            for offset, year in enumerate(YEARS)
+            for hardware_id, boot_mark in generate_inputs(seed + offset, rows_per_year)]
+
+
+def _inputs_digest(inputs: Sequence[Tuple[str, str, str]]) -> str:
+    digest = hashlib.sha256()
+    for row in inputs:
+        digest.update("\t".join(row).encode("utf-8", "surrogatepass") + b"\n")
+    return digest.hexdigest()
+
+
+def reference_code(generator: UnlockCodeGenerator, hardware_id: str, boot_mark: str) -> Optional[str]:
+    """Código del generador fila por fila (None si la entrada es inválida)."""
+    return generator.generate_unlock_code(hardware_id, boot_mark).code
+
+
+def write_corpus(path: str = CORPUS_PATH, seed: int = CORPUS_SEED,
+                 rows_per_year: int = CORPUS_ROWS_PER_YEAR):
+    """Genera los códigos con el generador actual y los guarda comprimidos con xz."""
+    inputs = corpus_inputs(seed, rows_per_year)
+    generators: Dict[str, UnlockCodeGenerator] = {year: UnlockCodeGenerator(year) for year in YEARS}
+    header = {"version": CORPUS_VERSION, "seed": seed, "rows_per_year": rows_per_year,
+              "inputs_sha256": _inputs_digest(inputs)}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with lzma.open(path, 'wt', encoding='utf-8', newline='\n', preset=9 | lzma.PRESET_EXTREME) as f:
+        f.write(json.dumps(header, sort_keys=True) + "\n")
+        for year, hardware_id, boot_mark in inputs:
+            f.write((reference_code(generators[year], hardware_id, boot_mark) or "") + "\n")
+
+
+def read_corpus(path: str = CORPUS_PATH) -> List[CorpusRow]:
+    """
+    Lee el corpus guardado y lo une con sus entradas regeneradas.
+
+    Raises:
+        ValueError: Si las entradas regeneradas no son las del corpus
+    """
+    with lzma.open(path, 'rt', encoding='utf-8', newline='\n') as f:
+        header = json.loads(f.readline())
+        codes = f.read().split("\n")[:-1]
+    if header.get("version") != CORPUS_VERSION:
+        raise ValueError(f"Versión de corpus no soportada: {header.get('version')}")
+    inputs = corpus_inputs(header["seed"], header["rows_per_year"])
+    if len(inputs) != len(codes) or _inputs_digest(inputs) != header["inputs_sha256"]:
+        raise ValueError("Las entradas regeneradas no coinciden con las del corpus")
+    return [(year, hardware_id, boot_mark, code)
+            for (year, hardware_id, boot_mark), code in zip(inputs, codes)]
+
+
+if __name__ == "__main__":
+    write_corpus()
+    print(f"✓ {len(YEARS) * CORPUS_ROWS_PER_YEAR} filas en {CORPUS_PATH} "
+          f"({os.path.getsize(CORPUS_PATH) / 1024:.0f} KB)")
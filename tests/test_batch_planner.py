@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests del Planificador de Lotes
+Deduplicación, orden de salida y desborde a disco
+"""
+
+import sys
+import os
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_planner import BatchPlanner
+from normalizer import normalize_batch
+from unlock_generator import UnlockCodeGenerator
+
+
+def _resolve(planner, gen, hardware_ids, boot_marks):
+    batch = normalize_batch(hardware_ids, boot_marks)
+    return planner.resolve(gen, batch.hardware_ids, batch.boot_marks)
+
+
+def test_duplicates_computed_once():
+    """Test: Pares repetidos se calculan una vez y respetan el orden"""
+    gen = UnlockCodeGenerator(year="2023")
+    hardware_ids = ["TEST123ABC", "OTRO456DEF", "test-123-abc", "TEST123ABC"]
+    boot_marks = ["456789", "111222", "456789", "456789"]
+
+    planner = BatchPlanner()
+    codes = _resolve(planner, gen, hardware_ids, boot_marks)
+    planner.close()
+
+    expected = [gen.generate_unlock_code(hw, bm).code for hw, bm in zip(hardware_ids, boot_marks)]
+    assert codes == expected
+    assert planner.unique == 2
+    assert planner.report()["duplicates"] == 2
+
+
+def test_version_in_key():
+    """Test: El mismo par en 2021 y 2023 no se confunde"""
+    planner = BatchPlanner()
+    code_2021 = _resolve(planner, UnlockCodeGenerator("2021"), ["TEST123ABC"], ["456789"])
+    code_2023 = _resolve(planner, UnlockCodeGenerator("2023"), ["TEST123ABC"], ["456789"])
+    planner.close()
+
+    assert code_2021 != code_2023
+    assert planner.unique == 2
+
+
+def test_spill_to_disk():
+    """Test: Con límite de memoria bajo se usa SQLite y el resultado no cambia"""
+    gen = UnlockCodeGenerator(year="2021")
+    hardware_ids = [f"EQUIPO{i:06d}" for i in range(300)]
+    boot_marks = [f"{i:08d}" for i in range(300)]
+
+    planner = BatchPlanner(max_memory_keys=50)
+    first = _resolve(planner, gen, hardware_ids, boot_marks)
+    second = _resolve(planner, gen, hardware_ids[::-1], boot_marks[::-1])
+    assert planner.cache.spilled
+    planner.close()
+
+    assert second == first[::-1]
+    assert planner.unique == 300
+    assert planner.duplicate_ratio == 0.5
+
+
+def run_all_tests():
+    """Ejecuta todos los tests"""
+    tests = [
+        test_duplicates_computed_once,
+        test_version_in_key,
+        test_spill_to_disk,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  ✓ OK: {test.__doc__}")
+        except AssertionError as e:
+            print(f"  ✗ FAIL: {test.__doc__} {e}")
+            failed += 1
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
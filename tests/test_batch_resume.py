@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de Lotes Reanudables
+Un lote cortado a mitad de camino y reanudado produce la misma salida
+que uno sin cortes
+"""
+
+import sys
+import os
+import csv
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_processor import CHECKPOINT_SUFFIX, BatchProcessor
+
+
+class _PowerCut(Exception):
+    pass
+
+
+def _write_lot(path, rows):
+    # Con BOM y un campo con salto de línea, como los exporta una planilla
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["escuela", "hardware_id", "boot_mark", "year"])
+        for i in range(rows):
+            school = f"Escuela {i % 7}\nAnexo" if i % 11 == 0 else f"E{i % 7}"
+            hardware_id = "ABC" if i % 13 == 0 else f"HW{i * 7919:010d}"
+            writer.writerow([school, hardware_id, f"{i * 104729:08d}", ("2021", "2022", "2023", "2019")[i % 4]])
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _interrupted_run(input_path, output_path, chunks):
+    """Ejecución que se corta en el bloque indicado, con una escritura a medias."""
+    processor = BatchProcessor(year="2023", chunk_size=10)
+    original = processor.process_chunk
+    calls = []
+
+    def process_chunk(header, rows, stats):
+        calls.append(1)
+        if len(calls) > chunks:
+            with open(output_path, 'ab') as f:
+                f.write(b"E3,HW00000,123")
+            raise _PowerCut()
+        return original(header, rows, stats)
+
+    processor.process_chunk = process_chunk
+    try:
+        processor.run(input_path, output_path)
+    except _PowerCut:
+        pass
+    else:
+        raise AssertionError("la ejecución debía cortarse")
+
+
+def test_resume_matches_uninterrupted_run():
+    """Reanudar descarta lo escrito después del checkpoint y sigue desde ahí."""
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "lote.csv")
+        _write_lot(input_path, 95)
+        expected_path = os.path.join(tmp, "completo.csv")
+        expected = BatchProcessor(year="2023", chunk_size=10).run(input_path, expected_path)
+        assert not os.path.exists(expected_path + CHECKPOINT_SUFFIX)
+
+        output_path = os.path.join(tmp, "salida.csv")
+        _interrupted_run(input_path, output_path, chunks=4)
+        assert os.path.exists(output_path + CHECKPOINT_SUFFIX)
+
+        stats = BatchProcessor(year="2023", chunk_size=10).run(input_path, output_path, resume=True)
+        assert stats.resumed == 40
+        assert (stats.rows, stats.generated, stats.errors) == (expected.rows, expected.generated, expected.errors)
+        assert _read(output_path) == _read(expected_path)
+        assert not os.path.exists(output_path + CHECKPOINT_SUFFIX)
+
+
+def test_resume_starts_over_when_input_or_output_changed():
+    """Si la entrada cambió o la salida no es la del checkpoint, se empieza de cero."""
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "lote.csv")
+        output_path = os.path.join(tmp, "salida.csv")
+        expected_path = os.path.join(tmp, "completo.csv")
+
+        _write_lot(input_path, 60)
+        _interrupted_run(input_path, output_path, chunks=2)
+        _write_lot(input_path, 70)
+        BatchProcessor(year="2023", chunk_size=10).run(input_path, expected_path)
+        stats = BatchProcessor(year="2023", chunk_size=10).run(input_path, output_path, resume=True)
+        assert stats.resumed == 0 and stats.rows == 70
+        assert _read(output_path) == _read(expected_path)
+
+        _interrupted_run(input_path, output_path, chunks=3)
+        with open(output_path, 'r+b') as f:
+            f.write(b"X")
+        stats = BatchProcessor(year="2023", chunk_size=10).run(input_path, output_path, resume=True)
+        assert stats.resumed == 0
+        assert _read(output_path) == _read(expected_path)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de Copia de Archivos
+Vías de copia del kernel y respaldo con buffer
+"""
+
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import utils
+from utils import copy_file, copy_range
+
+DATA = os.urandom(3 * utils.COPY_BUFFER_SIZE + 12345)
+
+
+def test_copy_file_preserves_content_and_metadata():
+    """La copia es idéntica y conserva permisos y fechas."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.bin")
+        destination = os.path.join(tmp, "destination.bin")
+        with open(source, 'wb') as f:
+            f.write(DATA)
+        os.chmod(source, 0o750)
+        os.utime(source, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+        with open(destination, 'wb') as f:
+            f.write(b"x" * (len(DATA) * 2))
+
+        method = copy_file(source, destination)
+
+        assert method in ("reflink", "copyfile")
+        with open(destination, 'rb') as f:
+            assert f.read() == DATA
+        assert os.stat(destination).st_mode & 0o777 == 0o750
+        assert os.stat(destination).st_mtime_ns == 1_600_000_000_000_000_000
+
+        empty = os.path.join(tmp, "empty")
+        open(empty, 'wb').close()
+        copy_file(empty, destination)
+        assert os.path.getsize(destination) == 0
+
+
+def test_copy_file_same_file():
+    """Copiar un archivo sobre sí mismo (ruta, hardlink o symlink) falla sin truncarlo."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.bin")
+        with open(source, 'wb') as f:
+            f.write(DATA)
+        os.link(source, os.path.join(tmp, "hardlink"))
+        os.symlink(source, os.path.join(tmp, "symlink"))
+
+        for destination in (source, os.path.join(tmp, "hardlink"), os.path.join(tmp, "symlink")):
+            try:
+                copy_file(source, destination)
+            except shutil.SameFileError:
+                pass
+            else:
+                raise AssertionError("copiar sobre el mismo archivo debe fallar")
+            assert os.path.getsize(source) == len(DATA)
+
+
+def test_copy_range_fallbacks(monkeypatch):
+    """Sin copy_file_range ni sendfile se usa el buffer; un origen corto falla."""
+    def unsupported(*args):
+        raise OSError(38, "Function not implemented")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.bin")
+        with open(source, 'wb') as f:
+            f.write(DATA)
+
+        for disabled, expected in (((), None), (("copy_file_range",), "sendfile"),
+                                   (("copy_file_range", "sendfile"), "readinto")):
+            for name in disabled:
+                monkeypatch.setattr(os, name, unsupported)
+            destination = os.path.join(tmp, f"copy-{len(disabled)}.bin")
+            with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                dst.write(b"head")
+                dst.flush()
+                method = copy_range(src.fileno(), dst.fileno(), len(DATA) - 100, 100)
+            if expected:
+                assert method == expected
+            with open(destination, 'rb') as f:
+                assert f.read() == b"head" + DATA[100:]
+
+        with open(source, 'rb') as src, open(os.path.join(tmp, "short"), 'wb') as dst:
+            try:
+                copy_range(src.fileno(), dst.fileno(), len(DATA) + 1)
+            except EOFError:
+                pass
+            else:
+                raise AssertionError("un origen corto debe fallar")
+
+
+def test_import_without_fcntl():
+    """settings (y todo lo que importa utils) se importa sin fcntl, como en Windows."""
+    src = os.path.join(os.path.dirname(__file__), '..', 'src')
+    code = ("import sys; sys.modules['fcntl'] = None; sys.path.insert(0, sys.argv[1]); "
+            "import settings, utils; utils.copy_file(sys.argv[2], sys.argv[3])")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.bin")
+        with open(source, 'wb') as f:
+            f.write(DATA)
+        result = subprocess.run([sys.executable, "-c", code, src, source, os.path.join(tmp, "copia")],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        assert result.returncode == 0, result.stderr
+        with open(os.path.join(tmp, "copia"), 'rb') as f:
+            assert f.read() == DATA
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests Diferenciales de los Caminos de Generación
+Los caminos rápidos contra el corpus de referencia, y todos (lote en
+Python y NumPy, procesador por bloques con y sin desborde a disco) contra
+el generador fila por fila con entradas aleatorias.
+
+La prueba aleatoria usa una semilla nueva en cada ejecución; para
+repetir un fallo:
+
+    DESBLOCK_DIFF_SEED=<semilla> python3 -m pytest tests/test_differential.py
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from batch_processor import BatchProcessor
+from normalizer import HAS_NUMPY
+from reference_corpus import YEARS, generate_inputs, read_corpus, reference_code
+from unlock_generator import UnlockCodeGenerator
+
+RANDOM_ROWS = int(os.environ.get("DESBLOCK_DIFF_ROWS", "20000"))
+
+# Bloques de tamaño primo: los repetidos caen en bloques distintos
+PROCESSOR_CHUNK = 7919
+
+
+def _batch_engine(use_numpy):
+    def run(years, hardware_ids, boot_marks):
+        codes = [None] * len(years)
+        for year in YEARS:
+            indices = [i for i, row_year in enumerate(years) if row_year == year]
+            generated, _ = UnlockCodeGenerator(year).generate_codes_batch(
+                [hardware_ids[i] for i in indices], [boot_marks[i] for i in indices],
+                use_numpy=use_numpy)
+            for i, code in zip(indices, generated):
+                codes[i] = code
+        return codes
+    return run
+
+
+def _processor_engine(max_memory_keys):
+    def run(years, hardware_ids, boot_marks):
+        with tempfile.TemporaryDirectory() as tmp:
+            processor = BatchProcessor(chunk_size=PROCESSOR_CHUNK, max_memory_keys=max_memory_keys,
+                                       spill_dir=tmp)
+            codes = []
+            try:
+                for start in range(0, len(years), PROCESSOR_CHUNK):
+                    end = start + PROCESSOR_CHUNK
+                    generated, _ = processor.generate(hardware_ids[start:end], boot_marks[start:end],
+                                                      years[start:end])
+                    codes.extend(generated)
+            finally:
+                processor.planner.close()
+            return codes
+    return run
+
+
+ENGINES = {
+    "batch_python": _batch_engine(False),
+    "processor": _processor_engine(1 << 30),
+    "processor_spill": _processor_engine(1000),
+}
+if HAS_NUMPY:
+    ENGINES["batch_numpy"] = _batch_engine(True)
+
+# Sobre el corpus completo solo los caminos de normalización y formato; el
+# procesador los reutiliza y se verifica con las entradas aleatorias
+CORPUS_ENGINES = [name for name in ("batch_python", "batch_numpy") if name in ENGINES]
+
+
+def _check(engine, years, hardware_ids, boot_marks, expected, context):
+    codes = ENGINES[engine](years, hardware_ids, boot_marks)
+    assert len(codes) == len(expected)
+    for i, (code, reference) in enumerate(zip(codes, expected)):
+        if code != reference:
+            raise AssertionError(
+                f"{context}: {engine} difiere en la fila {i} (año {years[i]}, "
+                f"hardware_id={hardware_ids[i]!r}, boot_mark={boot_marks[i]!r}): "
+                f"{code!r} != {reference!r}"
+            )
+
+
+def test_reference_corpus():
+    """El generador actual y los caminos por lote reproducen el corpus congelado."""
+    corpus = read_corpus()
+    years = [row[0] for row in corpus]
+    hardware_ids = [row[1] for row in corpus]
+    boot_marks = [row[2] for row in corpus]
+    expected = [row[3] or None for row in corpus]
+
+    generators = {year: UnlockCodeGenerator(year) for year in YEARS}
+    scalar = [reference_code(generators[year], hw, bm) for year, hw, bm, _ in corpus]
+    assert scalar == expected, "el generador fila por fila ya no reproduce el corpus"
+
+    for engine in CORPUS_ENGINES:
+        _check(engine, years, hardware_ids, boot_marks, expected, "corpus")
+
+
+def test_random_inputs_all_engines():
+    """Entradas nuevas en cada ejecución (incluido NUL): todos los caminos iguales al fila por fila."""
+    seed = int(os.environ.get("DESBLOCK_DIFF_SEED") or int.from_bytes(os.urandom(4), "little"))
+    pairs = generate_inputs(seed, RANDOM_ROWS, with_nul=True)
+    years = [YEARS[i % len(YEARS)] for i in range(len(pairs))]
+    hardware_ids = [hw for hw, _ in pairs]
+    boot_marks = [bm for _, bm in pairs]
+
+    generators = {year: UnlockCodeGenerator(year) for year in YEARS}
+    expected = [reference_code(generators[year], hw, bm)
+                for year, hw, bm in zip(years, hardware_ids, boot_marks)]
+    assert any(code is None for code in expected) and any(expected)
+
+    for engine in ENGINES:
+        _check(engine, years, hardware_ids, boot_marks, expected, f"DESBLOCK_DIFF_SEED={seed}")
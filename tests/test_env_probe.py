@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests del Diagnóstico del Entorno
+Verificaciones en paralelo, caché de la sesión e invalidación
+"""
+
+import sys
+import os
+import tempfile
+import threading
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import env_probe
+from env_probe import Probe, probe_environment, probe_modules
+
+
+def test_probe_modules_without_importing():
+    """find_spec detecta módulos instalados y faltantes."""
+    sys.modules.pop("wave", None)
+    result = probe_modules(["json", "wave", "desblock_no_existe"])
+    assert result == {"json": True, "wave": True, "desblock_no_existe": False}
+    assert "wave" not in sys.modules
+
+
+def test_probes_run_concurrently_and_are_cached(monkeypatch):
+    """Las verificaciones corren a la vez y se reutilizan hasta que cambia su firma o la sesión."""
+    calls = {"a": 0, "b": 0, "missing": 0}
+    barrier = threading.Barrier(2, timeout=5)
+    devices = ["sda"]
+
+    def make(name, value, wait=False):
+        def run():
+            calls[name] += 1
+            if wait:
+                # Solo se libera si las dos verificaciones corren a la vez
+                barrier.wait()
+            return value
+        return run
+
+    probes = (
+        Probe("a", make("a", {"x": 1}, wait=True)),
+        Probe("b", make("b", ["usb"], wait=True), signature=lambda: list(devices)),
+        Probe("missing", make("missing", {"tkinter": False}),
+              cacheable=lambda value: all(value.values())),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = os.path.join(tmp, "env.json")
+        first = probe_environment(cache_path=cache, probes=probes)
+        assert first == {"a": {"x": 1}, "b": ["usb"], "missing": {"tkinter": False}}
+
+        # Todo en caché salvo el resultado con faltantes
+        assert probe_environment(cache_path=cache, probes=probes) == first
+        assert calls == {"a": 1, "b": 1, "missing": 2}
+
+        # Cambia un dispositivo: solo se repite esa verificación
+        devices.append("sdb")
+        barrier = threading.Barrier(1, timeout=5)
+        probe_environment(("a", "b"), cache_path=cache, probes=probes)
+        assert calls["a"] == 1 and calls["b"] == 2
+
+        # Otro arranque invalida todo
+        monkeypatch.setattr(env_probe, "_boot_id", lambda: "otro-arranque")
+        barrier = threading.Barrier(2, timeout=5)
+        probe_environment(("a", "b"), cache_path=cache, probes=probes)
+        assert calls["a"] == 2 and calls["b"] == 3
+
+
+def test_single_pending_probe_is_cached(monkeypatch):
+    """El camino del lanzador (solo 'modules') también guarda la caché."""
+    modules = next(probe for probe in env_probe.PROBES if probe.name == "modules")
+    calls = []
+
+    def run():
+        calls.append(1)
+        return {name: True for name in env_probe.REQUIREMENTS["gui"]}
+
+    monkeypatch.setattr(modules, "run", run)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = os.path.join(tmp, "env.json")
+        assert env_probe.missing_modules("gui", cache_path=cache) == []
+        assert os.path.exists(cache)
+        assert env_probe.missing_modules("gui", cache_path=cache) == []
+        assert len(calls) == 1
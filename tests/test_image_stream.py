@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de la Escritura en Streaming
+Copia a varios destinos con hash en el mismo flujo
+"""
+
+import sys
+import os
+import io
+import hashlib
+import tempfile
+import pytest
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import image_stream
+from image_stream import MBR_SIZE, StreamError, extract_mbr, stream_iso, stream_to_targets
+
+
+def test_stream_to_multiple_targets():
+    """Test: Todos los destinos reciben los mismos bytes y se calculan los hashes"""
+    data = os.urandom(3 * 1024 * 1024 + 123)
+    with tempfile.TemporaryDirectory() as tmp:
+        targets = [os.path.join(tmp, "a.iso"), os.path.join(tmp, "b.img")]
+        result = stream_to_targets(io.BytesIO(data), targets, ("md5", "sha256"), block_size=65536)
+
+        assert result["bytes"] == len(data)
+        assert result["hashes"]["sha256"] == hashlib.sha256(data).hexdigest()
+        assert result["hashes"]["md5"] == hashlib.md5(data).hexdigest()
+        assert result["targets"] == {path: None for path in targets}
+        for path in targets:
+            with open(path, "rb") as f:
+                assert f.read() == data
+
+
+def test_extract_mbr():
+    """Test: El MBR se toma solo de imágenes híbridas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        hybrid = os.path.join(tmp, "hybrid.iso")
+        plain = os.path.join(tmp, "plain.iso")
+        with open(hybrid, "wb") as f:
+            f.write(b"\x33\xed" + b"\x90" * 1000)
+        with open(plain, "wb") as f:
+            f.write(b"\x00" * 1000)
+
+        mbr = extract_mbr(hybrid, os.path.join(tmp, "isohdpfx.bin"))
+        assert os.path.getsize(mbr) == MBR_SIZE
+        assert extract_mbr(plain, os.path.join(tmp, "otro.bin")) is None
+
+
+def test_isohybrid_patch_rehashes_and_fails_loudly(monkeypatch):
+    """Test: Con genisoimage los hashes son los de la imagen parcheada y un isohybrid que falla es un error"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, "tree")
+        os.makedirs(tree)
+        with open(os.path.join(tree, "imagen"), "wb") as f:
+            f.write(b"\x00" * 4096)
+        bin_dir = os.path.join(tmp, "bin")
+        os.makedirs(bin_dir)
+        isohybrid = os.path.join(bin_dir, "isohybrid")
+        with open(isohybrid, "w") as f:
+            f.write('#!/bin/sh\nprintf HYBRID | dd of="$2" conv=notrunc 2>/dev/null\n')
+        os.chmod(isohybrid, 0o755)
+        monkeypatch.setenv("PATH", bin_dir + os.pathsep + os.environ["PATH"])
+        monkeypatch.setattr(image_stream, "build_command", lambda mbr, volume_id: ["cat", "imagen"])
+
+        targets = [os.path.join(tmp, "a.iso"), os.path.join(tmp, "b.iso")]
+        result = stream_iso(tree, targets, algorithms=("sha256",))
+        patched = b"HYBRID" + b"\x00" * (4096 - 6)
+        assert result["stream_hashes"]["sha256"] == hashlib.sha256(b"\x00" * 4096).hexdigest()
+        assert result["hashes"]["sha256"] == hashlib.sha256(patched).hexdigest()
+        for path in targets:
+            with open(path, "rb") as f:
+                assert f.read() == patched
+
+        with open(isohybrid, "w") as f:
+            f.write("#!/bin/sh\necho 'no es una imagen' >&2\nexit 1\n")
+        with pytest.raises(StreamError, match="no es una imagen"):
+            stream_iso(tree, targets)
+
+        monkeypatch.setenv("PATH", os.path.join(tmp, "vacio"))
+        monkeypatch.setattr(image_stream, "build_command", lambda mbr, volume_id: ["/bin/cat", "imagen"])
+        with pytest.raises(StreamError, match="isohybrid"):
+            stream_iso(tree, targets)
+
+
+def test_target_error_reported_before_generator_exit(monkeypatch):
+    """Test: Si fallan todos los destinos se informa su error, no el SIGPIPE del generador"""
+    if not os.path.exists("/dev/full"):
+        pytest.skip("sin /dev/full")
+    monkeypatch.setattr(image_stream, "build_command", lambda mbr, volume_id: ["cat", "/dev/zero"])
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.raises(StreamError, match="/dev/full"):
+            stream_iso(tmp, ["/dev/full"])
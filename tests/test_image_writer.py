@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de Escritura de Imágenes
+Huecos, bloques en cero y verificación de zonas omitidas
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from image_writer import ImageWriteError, segments, write_image
+
+MB = 1024 * 1024
+
+
+def _sparse_image(path):
+    """Imagen de 8 MB: datos, hueco, bloque de ceros explícito, datos al final."""
+    with open(path, 'wb') as f:
+        f.write(os.urandom(MB))
+        f.seek(4 * MB)
+        f.write(bytes(MB))
+        f.seek(7 * MB)
+        f.write(os.urandom(MB // 2))
+        f.truncate(8 * MB)
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_sparse_image_written_to_file():
+    """La copia es idéntica y las zonas en cero no se escriben."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "image.iso")
+        target = os.path.join(tmp, "target.img")
+        _sparse_image(source)
+        with open(target, 'wb') as f:
+            f.write(b"\xff" * 9 * MB)
+
+        report = write_image(source, target, verify="all", block_size=MB)
+
+        assert _read(target) == _read(source)
+        assert report.written == MB + MB // 2
+        assert report.skipped == 8 * MB - report.written
+        assert report.verified == "all"
+
+
+def test_zero_block_inside_data_is_detected():
+    """Un bloque de ceros dentro de una zona con datos se trata como cero."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "image.iso")
+        with open(source, 'wb') as f:
+            f.write(b"a" * MB + bytes(2 * MB) + b"b" * MB)
+
+        fd = os.open(source, os.O_RDONLY)
+        try:
+            parts = list(segments(fd, 4 * MB, MB))
+        finally:
+            os.close(fd)
+
+        assert [(offset, length, data is None) for offset, length, data in parts] == [
+            (0, MB, False), (MB, MB, True), (2 * MB, MB, True), (3 * MB, MB, False),
+        ]
+
+
+def test_verify_detects_non_zero_skipped_region():
+    """Con 'assume' sobre un destino sucio, la verificación falla."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "image.iso")
+        target = os.path.join(tmp, "target.img")
+        _sparse_image(source)
+        with open(target, 'wb') as f:
+            f.write(b"\xff" * 8 * MB)
+
+        try:
+            write_image(source, target, zero_strategy="assume", verify="skipped", block_size=MB)
+        except ImageWriteError as e:
+            assert "omitida" in str(e)
+        else:
+            raise AssertionError("la verificación debía fallar")
+
+        # Escribiendo todo, como dd, el resultado es correcto
+        report = write_image(source, target, zero_strategy="write", verify="all", block_size=MB)
+        assert report.skipped == 0
+        assert _read(target) == _read(source)
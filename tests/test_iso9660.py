@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests del Lector ISO 9660
+Rock Ridge, Joliet, extensiones múltiples y extracción
+"""
+
+import sys
+import os
+import stat
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from iso_builder import IsoBuilder
+from iso9660 import IsoError, IsoImage
+
+SQUASHFS = bytes(range(256)) * 40000
+LONG_NAME = "nombre-muy-largo-" * 10 + ".txt"
+
+
+def _build(tmp, **kwargs):
+    builder = IsoBuilder(**kwargs)
+    builder.add_file("casper/filesystem.squashfs", SQUASHFS)
+    builder.add_file("casper/vmlinuz", b"kernel", mode=0o444)
+    builder.add_file("isolinux/isolinux.bin", b"\x00" * 5000, mode=0o444)
+    builder.add_file("README.diskdefines", b"#define DISKNAME Linux Mint\n")
+    builder.add_file("boot/grub/grub.cfg", b"menuentry\n")
+    builder.add_file(f"docs/{LONG_NAME}", b"largo")
+    builder.add_file("vacío.txt", b"")
+    builder.add_symlink("boot/grub/loopback.cfg", "grub.cfg")
+    builder.add_symlink("ubuntu", "/")
+    builder.add_dir("pool/main", mode=0o555)
+    path = os.path.join(tmp, "test.iso")
+    builder.write(path)
+    return path
+
+
+def test_rock_ridge_listing():
+    """Test: Nombres, permisos y enlaces desde Rock Ridge"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with IsoImage(_build(tmp, max_extent=100 * 2048)) as image:
+            assert image.rock_ridge
+            assert image.volume_id == "DESBLOCK-TEST"
+            entries = {entry.path: entry for entry in image.walk()}
+
+            assert entries["casper/filesystem.squashfs"].size == len(SQUASHFS)
+            assert len(entries["casper/filesystem.squashfs"].extents) > 1
+            assert image.read(entries["casper/filesystem.squashfs"]) == SQUASHFS
+            assert stat.S_IMODE(entries["casper/vmlinuz"].mode) == 0o444
+            assert entries["boot/grub/loopback.cfg"].symlink == "grub.cfg"
+            assert entries["ubuntu"].symlink == "/"
+            assert image.read(entries[f"docs/{LONG_NAME}"]) == b"largo"
+            assert entries["pool/main"].is_dir
+            assert entries["vacío.txt"].size == 0
+
+
+def test_joliet_only():
+    """Test: Sin Rock Ridge se usan los nombres Joliet"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with IsoImage(_build(tmp, rock_ridge=False)) as image:
+            assert not image.rock_ridge and image.joliet
+            paths = {entry.path for entry in image.walk()}
+            assert "README.diskdefines" in paths
+            assert "casper/filesystem.squashfs" in paths
+
+
+def test_plain_iso9660_names():
+    """Test: Sin extensiones se quita la versión ';1' de los nombres"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with IsoImage(_build(tmp, rock_ridge=False, joliet=False)) as image:
+            paths = {entry.path for entry in image.walk()}
+            assert all(";" not in path for path in paths)
+            assert all(not path.endswith(".") for path in paths)
+
+
+def test_extract_tree():
+    """Test: La extracción reproduce contenido, permisos, enlaces y fechas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        target = os.path.join(tmp, "extract")
+        with IsoImage(_build(tmp, max_extent=100 * 2048)) as image:
+            stats = image.extract(target, workers=4)
+
+        assert stats["files"] == 7
+        assert stats["symlinks"] == 2
+        with open(os.path.join(target, "casper/filesystem.squashfs"), "rb") as f:
+            assert f.read() == SQUASHFS
+        assert os.readlink(os.path.join(target, "boot/grub/loopback.cfg")) == "grub.cfg"
+        assert stat.S_IMODE(os.stat(os.path.join(target, "casper/vmlinuz")).st_mode) == 0o644
+        assert stat.S_IMODE(os.stat(os.path.join(target, "pool/main")).st_mode) == 0o755
+        assert os.path.getsize(os.path.join(target, "vacío.txt")) == 0
+        # 2023-05-17 12:30:00 UTC
+        assert int(os.path.getmtime(os.path.join(target, "boot/grub/grub.cfg"))) == 1684326600
+
+
+def test_extract_rejects_escaping_names():
+    """Test: Un directorio '..' en la imagen no escribe fuera del destino"""
+    with tempfile.TemporaryDirectory() as tmp:
+        builder = IsoBuilder(joliet=False)
+        builder.add_file("a/ok.txt", b"ok")
+        builder.add_dir("..")
+        builder.add_file("../escaped.txt", b"fuera")
+        path = os.path.join(tmp, "malicious.iso")
+        builder.write(path)
+
+        out = os.path.join(tmp, "out")
+        target = os.path.join(out, "target")
+        with IsoImage(path) as image:
+            try:
+                image.extract(target)
+            except IsoError as e:
+                assert "'..'" in str(e)
+            else:
+                raise AssertionError("la extracción debía rechazar '..'")
+        assert not os.path.exists(os.path.join(out, "escaped.txt"))
+
+        # Un enlace de la imagen no se usa para escribir: se crea al final
+        builder = IsoBuilder(joliet=False)
+        builder.add_symlink("link", out)
+        builder.add_file("otro/archivo.txt", b"dentro")
+        builder.write(path)
+        with IsoImage(path) as image:
+            image.extract(target)
+        assert os.readlink(os.path.join(target, "link")) == out
+        # Un destino que ya es un enlace hacia afuera se rechaza
+        os.symlink(out, os.path.join(target, "otro2"))
+        builder.add_file("otro2/x.txt", b"x")
+        builder.write(path)
+        with IsoImage(path) as image:
+            try:
+                image.extract(target)
+            except IsoError:
+                pass
+            else:
+                raise AssertionError("no se debe escribir a través de un enlace existente")
+        assert not os.path.exists(os.path.join(out, "x.txt"))
+
+
+def test_malformed_rock_ridge_entries(monkeypatch):
+    """Test: Un enlace sin SL es un error de la imagen y sin PX no se cambia el dueño"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "malformed.iso")
+        builder = IsoBuilder(joliet=False)
+        builder.add_file("roto", b"")
+        builder.root.children[-1].mode = 0o120777
+        builder.write(path)
+        with IsoImage(path) as image:
+            try:
+                image.extract(os.path.join(tmp, "out"))
+            except IsoError as e:
+                assert "roto" in str(e)
+            else:
+                raise AssertionError("un enlace sin SL debía fallar")
+
+        # Como root, con entradas sin PX; rr_moved no se extrae
+        builder = IsoBuilder(joliet=False, posix_attributes=False)
+        builder.add_file("casper/vmlinuz", b"kernel")
+        builder.add_symlink("ubuntu", ".")
+        builder.add_dir("rr_moved")
+        builder.write(path)
+        calls = []
+        monkeypatch.setattr(os, "geteuid", lambda: 0)
+        monkeypatch.setattr(os, "chown", lambda *args: calls.append(args))
+        monkeypatch.setattr(os, "lchown", lambda *args: calls.append(args))
+        target = os.path.join(tmp, "sin-px")
+        with IsoImage(path) as image:
+            assert sorted(entry.path for entry in image.walk()) == ["casper", "casper/vmlinuz", "ubuntu"]
+            stats = image.extract(target)
+        assert calls == []
+        assert (stats["files"], stats["directories"], stats["symlinks"]) == (1, 1, 1)
+        assert not os.path.exists(os.path.join(target, "rr_moved"))
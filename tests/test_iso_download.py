@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de Descarga de la ISO
+Descarga por partes contra un servidor HTTP local, reanudación y espejos
+"""
+
+import sys
+import os
+import hashlib
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from iso_download import STATE_SUFFIX, DownloadError, download
+
+CHUNK = 64 * 1024
+DATA = os.urandom(10 * CHUNK + 1234)
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Sirve DATA en /linuxmint.iso con soporte de Range y keep-alive (y sha256sum.txt)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            fail = server.fail_after is not None and server.requests > server.fail_after
+            if server.change_after is not None and server.requests > server.change_after:
+                server.etag = '"iso-v2"'
+        if self.path == "/sha256sum.txt" and server.published and not server.missing:
+            body = f"{server.published} *linuxmint.iso\n".encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path != "/linuxmint.iso" or server.missing:
+            self.send_error(404)
+            return
+        if fail:
+            self.send_error(503)
+            return
+
+        start, end = 0, len(DATA) - 1
+        status = 200
+        header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if header and if_range and (if_range != server.etag or if_range.startswith("W/")):
+            # If-Range no coincide (o ETag débil): el archivo entero
+            header = None
+        if header and server.ranges:
+            first, last = header.split("=", 1)[1].split("-")
+            start, end = int(first), min(int(last), len(DATA) - 1)
+            status = 206
+        body = DATA[start:end + 1]
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", server.etag)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(DATA)}")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server:
+    def __init__(self, ranges=True, missing=False, etag='"iso-v1"'):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = 0
+        self.httpd.fail_after = None
+        self.httpd.ranges = ranges
+        self.httpd.missing = missing
+        self.httpd.etag = etag
+        self.httpd.published = None
+        self.httpd.change_after = None
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/linuxmint.iso"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_parallel_download_with_resume():
+    """Una descarga cortada se reanuda pidiendo solo los bloques que faltan."""
+    server = _Server()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "linuxmint.iso")
+            expected = {"sha256": hashlib.sha256(DATA).hexdigest()}
+
+            # Probe + 4 bloques y luego el servidor falla
+            server.httpd.fail_after = 5
+            try:
+                download(server.url, output, expected=expected, workers=1, chunk_size=CHUNK, retries=1)
+            except DownloadError:
+                pass
+            else:
+                raise AssertionError("la descarga debía cortarse")
+            assert not os.path.exists(output)
+            assert os.path.exists(output + STATE_SUFFIX)
+
+            server.httpd.fail_after = None
+            server.httpd.requests = 0
+            report = download(server.url, output, expected=expected, algorithms=("md5",),
+                              workers=4, chunk_size=CHUNK)
+
+            assert _read(output) == DATA
+            assert report.resumed == 4 * CHUNK
+            assert report.downloaded == len(DATA) - 4 * CHUNK
+            assert server.httpd.requests == 1 + 7
+            assert report.digests["sha256"] == expected["sha256"]
+            assert report.digests["md5"] == hashlib.md5(DATA).hexdigest()
+            assert not os.path.exists(output + STATE_SUFFIX)
+    finally:
+        server.close()
+
+
+def test_mirror_preferred_and_hash_mismatch():
+    """El espejo se usa primero; un hash distinto descarta la descarga."""
+    mirror = _Server()
+    broken = _Server(missing=True)
+    official = _Server()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "linuxmint.iso")
+            mirror_dir = mirror.url.rsplit("/", 1)[0] + "/"
+            report = download(official.url, output, mirrors=[broken.url, mirror_dir], chunk_size=CHUNK)
+            assert _read(output) == DATA
+            assert report.sources == {mirror.url: len(DATA)}
+
+            try:
+                download(official.url, output + "2", expected={"sha256": "0" * 64}, chunk_size=CHUNK)
+            except DownloadError as e:
+                assert "sha256" in str(e)
+            else:
+                raise AssertionError("el hash debía fallar")
+            assert not os.path.exists(output + "2")
+    finally:
+        for server in (mirror, broken, official):
+            server.close()
+
+
+def test_server_without_ranges():
+    """Sin soporte de Range se descarga en un solo flujo."""
+    server = _Server(ranges=False)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "linuxmint.iso")
+            report = download(server.url, output, chunk_size=CHUNK)
+            assert _read(output) == DATA
+            assert report.digests["sha256"] == hashlib.sha256(DATA).hexdigest()
+    finally:
+        server.close()
+
+
+def _interrupted_from_mirror(official, mirror, output, expected):
+    """Cuatro bloques del espejo y luego fallan las dos fuentes."""
+    official.httpd.fail_after = 1
+    mirror.httpd.fail_after = 5
+    try:
+        download(official.url, output, mirrors=[mirror.url], expected=expected, workers=1,
+                 chunk_size=CHUNK, retries=1)
+    except DownloadError:
+        pass
+    else:
+        raise AssertionError("la descarga debía cortarse")
+    for server in (official, mirror):
+        server.httpd.fail_after = None
+        server.httpd.requests = 0
+
+
+def test_resume_checks_each_source():
+    """Un espejo caído no descarta sus bloques; uno cuyo ETag cambió, sí."""
+    official = _Server(etag='"oficial"')
+    mirror = _Server()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "linuxmint.iso")
+            expected = {"sha256": hashlib.sha256(DATA).hexdigest()}
+
+            _interrupted_from_mirror(official, mirror, output, expected)
+            mirror.httpd.missing = True
+            report = download(official.url, output, mirrors=[mirror.url], expected=expected,
+                              workers=4, chunk_size=CHUNK)
+            assert _read(output) == DATA
+            assert report.resumed == 4 * CHUNK
+            assert official.httpd.requests == 1 + 7
+            assert report.sources == {official.url: len(DATA) - 4 * CHUNK}
+
+            os.unlink(output)
+            mirror.httpd.missing = False
+            _interrupted_from_mirror(official, mirror, output, expected)
+            mirror.httpd.etag = '"iso-v2"'
+            report = download(official.url, output, mirrors=[mirror.url], expected=expected, chunk_size=CHUNK)
+            assert _read(output) == DATA
+            assert report.resumed == 0
+            assert report.sources == {mirror.url: len(DATA)}
+    finally:
+        for server in (official, mirror):
+            server.close()
+
+
+def test_published_digest():
+    """Sin --sha256 se verifica contra sha256sum.txt; sin él, se advierte."""
+    mirror = _Server()
+    official = _Server()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "linuxmint.iso")
+            report = download(official.url, output, mirrors=[mirror.url], chunk_size=CHUNK)
+            assert report.verified == [] and len(report.warnings) == 1
+            assert mirror.url in report.warnings[0]
+
+            official.httpd.published = hashlib.sha256(DATA).hexdigest()
+            report = download(official.url, output + "2", mirrors=[mirror.url], chunk_size=CHUNK)
+            assert report.verified == ["sha256"] and report.warnings == []
+
+            official.httpd.published = "0" * 64
+            try:
+                download(official.url, output + "3", mirrors=[mirror.url], chunk_size=CHUNK)
+            except DownloadError as e:
+                assert "sha256" in str(e)
+            else:
+                raise AssertionError("el hash publicado debía fallar")
+            assert not os.path.exists(output + "3")
+    finally:
+        for server in (mirror, official):
+            server.close()
+
+
+def test_source_changed_during_download():
+    """Una fuente que responde 200 a If-Range se descarta con sus bloques."""
+    mirror = _Server()
+    official = _Server()
+    weak = _Server(etag='W/"debil"')
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "linuxmint.iso")
+            expected = {"sha256": hashlib.sha256(DATA).hexdigest()}
+
+            # Probe + 3 bloques del espejo y luego su archivo cambia
+            mirror.httpd.change_after = 4
+            report = download(official.url, output, mirrors=[mirror.url], expected=expected,
+                              workers=1, chunk_size=CHUNK)
+            assert _read(output) == DATA
+            assert report.sources[official.url] == len(DATA)
+            # Probe + los 11 bloques (los 3 del espejo se vuelven a pedir)
+            assert official.httpd.requests == 1 + 11
+            assert mirror.httpd.requests == 1 + 3 + 1
+
+            # Con ETag débil no se manda If-Range
+            report = download(weak.url, output + "2", expected=expected, chunk_size=CHUNK)
+            assert _read(output + "2") == DATA
+    finally:
+        for server in (mirror, official, weak):
+            server.close()
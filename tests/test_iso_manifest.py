@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests del Manifiesto md5sum.txt
+Formato compatible con md5sum y reutilización de digests
+"""
+
+import sys
+import os
+import hashlib
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from iso_manifest import build_manifest
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def test_manifest_format():
+    """Test: Mismo formato que find | xargs md5sum, sin md5sum.txt"""
+    with tempfile.TemporaryDirectory() as tree:
+        _write(os.path.join(tree, "casper/filesystem.size"), b"123\n")
+        _write(os.path.join(tree, "boot/grub/grub.cfg"), b"x" * 3000000)
+        _write(os.path.join(tree, "md5sum.txt"), b"viejo\n")
+        os.symlink("grub.cfg", os.path.join(tree, "boot/grub/loopback.cfg"))
+
+        stats = build_manifest(tree)
+
+        with open(os.path.join(tree, "md5sum.txt")) as f:
+            lines = f.read().splitlines()
+        expected = [
+            f"{hashlib.md5(b'x' * 3000000).hexdigest()}  ./boot/grub/grub.cfg",
+            f"{hashlib.md5(b'123' + bytes([10])).hexdigest()}  ./casper/filesystem.size",
+        ]
+        assert lines == expected
+        assert stats["files"] == 2
+
+
+def test_manifest_reuses_unchanged_files():
+    """Test: Solo se recalculan los archivos modificados"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, "iso")
+        cache = os.path.join(tmp, "md5cache.json")
+        for i in range(5):
+            _write(os.path.join(tree, f"pool/file{i}.deb"), bytes([i]) * 1000)
+
+        first = build_manifest(tree, cache)
+        assert first["hashed"] == 5
+
+        _write(os.path.join(tree, "pool/file2.deb"), b"nuevo contenido")
+        second = build_manifest(tree, cache)
+        assert second["hashed"] == 1
+        assert second["reused"] == 4
+
+        with open(os.path.join(tree, "md5sum.txt")) as f:
+            assert f"{hashlib.md5(b'nuevo contenido').hexdigest()}  ./pool/file2.deb\n" in f.read()
+
+
+def test_manifest_cache_is_per_source_iso():
+    """Test: El archivo auxiliar de otra ISO no se reutiliza"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, "iso")
+        cache = os.path.join(tmp, "md5cache.json")
+        _write(os.path.join(tree, "casper/vmlinuz"), b"kernel de la ISO A")
+        assert build_manifest(tree, cache, source="a" * 64)["hashed"] == 1
+        assert build_manifest(tree, cache, source="a" * 64)["hashed"] == 0
+
+        # Misma ruta, tamaño y fecha, pero extraído de otra ISO
+        st = os.stat(os.path.join(tree, "casper/vmlinuz"))
+        _write(os.path.join(tree, "casper/vmlinuz"), b"kernel de la ISO B")
+        os.utime(os.path.join(tree, "casper/vmlinuz"), ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert build_manifest(tree, cache, source="b" * 64)["hashed"] == 1
+        with open(os.path.join(tree, "md5sum.txt")) as f:
+            assert hashlib.md5(b"kernel de la ISO B").hexdigest() in f.read()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de la Remasterización Incremental
+Payload, huella y aplicación de cambios sin tocar la caché base
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from iso_remaster import apply_payload, build_payload, manifest_fingerprint, payload_manifest
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def test_build_payload_layout():
+    """Test: El payload replica la estructura de customize_iso.sh"""
+    with tempfile.TemporaryDirectory() as tmp:
+        payload = os.path.join(tmp, "payload")
+        build_payload(payload)
+        manifest = payload_manifest(payload)
+
+        assert "opt/desblock-net/src/unlock_generator.py" in manifest
+        assert "usr/local/bin/desblock-net" in manifest
+        assert "etc/skel/Escritorio/desblock-net.desktop" in manifest
+        assert not any("__pycache__" in path for path in manifest)
+        assert os.access(os.path.join(payload, "usr/local/bin/desblock-net"), os.X_OK)
+
+        # Misma entrada, misma huella
+        build_payload(payload)
+        assert manifest_fingerprint(payload_manifest(payload)) == manifest_fingerprint(manifest)
+
+
+def test_apply_payload_only_changes():
+    """Test: Solo se escriben los archivos modificados y la base no se altera"""
+    with tempfile.TemporaryDirectory() as tmp:
+        rootfs = os.path.join(tmp, "rootfs")
+        merged = os.path.join(tmp, "merged")
+        payload = os.path.join(tmp, "payload")
+
+        _write(os.path.join(rootfs, "etc/motd"), "original\n")
+        _write(os.path.join(merged, "etc/motd"), "")
+        os.unlink(os.path.join(merged, "etc/motd"))
+        os.link(os.path.join(rootfs, "etc/motd"), os.path.join(merged, "etc/motd"))
+
+        _write(os.path.join(payload, "etc/motd"), "desblock\n")
+        _write(os.path.join(payload, "opt/app.py"), "v1\n")
+        first = payload_manifest(payload)
+        counts = apply_payload(merged, rootfs, payload, first, {})
+        assert counts["written"] == 2
+
+        with open(os.path.join(rootfs, "etc/motd")) as f:
+            assert f.read() == "original\n"
+
+        _write(os.path.join(payload, "opt/app.py"), "v2\n")
+        os.unlink(os.path.join(payload, "etc/motd"))
+        second = payload_manifest(payload)
+        counts = apply_payload(merged, rootfs, payload, second, first)
+        assert counts == {"written": 1, "unchanged": 0, "removed": 1}
+
+        with open(os.path.join(merged, "etc/motd")) as f:
+            assert f.read() == "original\n"
+        with open(os.path.join(merged, "opt/app.py")) as f:
+            assert f.read() == "v2\n"
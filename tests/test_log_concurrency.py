@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de Escritura Concurrente del Log
+Varios procesos agregando entradas al mismo log mensual
+"""
+
+import sys
+import os
+import multiprocessing
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from log_stats import load_stats
+from log_store import iter_entries
+from unlock_generator import UnlockCodeGenerator
+
+PROCESSES = 4
+ENTRIES_PER_PROCESS = 100
+
+
+def _writer(log_dir, worker, count, log_format, start):
+    generator = UnlockCodeGenerator(year="2023")
+    start.wait()
+    for i in range(count):
+        code = f"W{worker:02d}-{i:05d}"
+        if not generator.save_unlock_log(f"HWID{worker:04d}{i:05d}", "123456789012", code, log_dir, log_format):
+            sys.exit(1)
+
+
+def _stress(log_dir, log_format, count):
+    start = multiprocessing.Event()
+    workers = [
+        multiprocessing.Process(target=_writer, args=(log_dir, worker, count, log_format, start))
+        for worker in range(PROCESSES)
+    ]
+    for process in workers:
+        process.start()
+    start.set()
+    for process in workers:
+        process.join(60)
+        assert process.exitcode == 0
+    return [entry["unlock_code"] for entry in iter_entries(log_dir)]
+
+
+def test_concurrent_jsonl_appends_lose_nothing():
+    """N procesos x M entradas: el log y las estadísticas tienen todas."""
+    with tempfile.TemporaryDirectory() as tmp:
+        codes = _stress(tmp, "jsonl", ENTRIES_PER_PROCESS)
+
+        expected = {f"W{worker:02d}-{i:05d}" for worker in range(PROCESSES) for i in range(ENTRIES_PER_PROCESS)}
+        assert len(codes) == len(expected)
+        assert set(codes) == expected
+        assert load_stats(tmp).total == len(expected)
+
+
+def test_concurrent_legacy_json_writes_lose_nothing():
+    """El formato de arreglo JSON se protege con un archivo de lock."""
+    with tempfile.TemporaryDirectory() as tmp:
+        codes = _stress(tmp, "json", 10)
+        assert len(codes) == PROCESSES * 10
+        assert len(set(codes)) == PROCESSES * 10
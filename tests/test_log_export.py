@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de Exportación de Logs
+Lectura incremental de logs, filtros y formatos de salida
+"""
+
+import sys
+import os
+import csv
+import json
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import log_store
+from log_export import export_logs, read_columnar
+from log_store import LogFormatError, iter_entries, iter_log
+from records import LogEntry
+
+
+def _entry(timestamp, year="2023", server="tds.educacion.gob.ar", code="A1B2C-D3E4F-56789"):
+    return {
+        "timestamp": timestamp, "year": year, "server": server, "hardware_id": "7ABC",
+        "boot_mark": "6789", "unlock_code": code, "version": "tds_v2" if year == "2023" else "citd_v1",
+    }
+
+
+def _history(log_dir):
+    """Dos meses en formato arreglo (como save_unlock_log) y uno en JSON Lines."""
+    january = [_entry(f"2023-01-{day:02d}T10:00:00", code=f"CODE{day}") for day in range(1, 21)]
+    february = [_entry("2023-02-10T09:30:00.123456", year="2021", server="citd.educacion.gob.ar")]
+    march = [_entry("2023-03-05T08:00:00"), _entry("2023-03-06T08:00:00", year="2022")]
+    with open(os.path.join(log_dir, "unlock_log_202301.json"), 'w', encoding='utf-8') as f:
+        json.dump(january, f, indent=2, ensure_ascii=False)
+    with open(os.path.join(log_dir, "unlock_log_202302.json"), 'w', encoding='utf-8') as f:
+        json.dump(february, f, indent=2, ensure_ascii=False)
+    with open(os.path.join(log_dir, "unlock_log_202303.jsonl"), 'w', encoding='utf-8') as f:
+        for entry in march:
+            f.write(json.dumps(entry) + "\n")
+    return january + february + march
+
+
+def test_incremental_array_parsing(monkeypatch):
+    """El arreglo JSON se lee igual aunque los objetos crucen bloques de lectura."""
+    monkeypatch.setattr(log_store, "_CHUNK_SIZE", 7)
+    with tempfile.TemporaryDirectory() as tmp:
+        entries = _history(tmp)
+        assert list(iter_entries(tmp)) == entries
+
+        broken = os.path.join(tmp, "unlock_log_202304.json")
+        with open(broken, 'w') as f:
+            f.write('[{"timestamp": "2023-04-01"}, {"timestamp"')
+        try:
+            list(iter_log(broken))
+        except LogFormatError:
+            pass
+        else:
+            raise AssertionError("un arreglo sin cerrar debe fallar")
+
+
+def test_export_csv_with_filters():
+    """Rango de fechas, año y servidor; los meses fuera de rango no se abren."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _history(tmp)
+        with open(os.path.join(tmp, "unlock_log_202212.json"), 'w') as f:
+            f.write("dañado")
+        output = os.path.join(tmp, "export.csv")
+
+        stats = export_logs(tmp, output, "csv", since="2023-01-15", until="2023-03-05", years=["2023"])
+
+        with open(output, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == list(LogEntry.FIELDS)
+        assert [row[5] for row in rows[1:]] == [f"CODE{day}" for day in range(15, 21)] + ["A1B2C-D3E4F-56789"]
+        assert stats.written == 7
+        # Solo llegan las entradas del rango de fechas (el filtro de año descarta una)
+        assert stats.read == 8
+
+
+def test_export_jsonl_and_columnar_round_trip():
+    """JSON Lines y columnar conservan todas las entradas."""
+    with tempfile.TemporaryDirectory() as tmp:
+        entries = _history(tmp)
+
+        jsonl = os.path.join(tmp, "export.jsonl")
+        export_logs(tmp, jsonl, "jsonl")
+        with open(jsonl, encoding='utf-8') as f:
+            assert [json.loads(line) for line in f] == entries
+
+        columnar = os.path.join(tmp, "export.dblc")
+        stats = export_logs(tmp, columnar, "columnar", servers=["tds.educacion.gob.ar"])
+        exported = list(read_columnar(columnar))
+        assert exported == [entry for entry in entries if entry["server"] == "tds.educacion.gob.ar"]
+        assert stats.written == len(exported)
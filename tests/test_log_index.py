@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests del Índice de Logs
+Consultas por rango de fechas con el índice: mismo resultado que recorrer
+todo el archivo, leyendo solo una parte
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import log_index
+from log_index import index_path, iter_range, load_index, range_keys, read_range, time_key
+from log_store import append_entries, iter_log
+
+
+def _entry(timestamp, code):
+    return {"timestamp": timestamp, "year": "2023", "server": "tds.educacion.gob.ar",
+            "hardware_id": "7ABC", "boot_mark": "6789", "unlock_code": code, "version": "tds_v2"}
+
+
+def _expected(path, since, until):
+    low, high = range_keys(since, until)
+    return [entry for entry in iter_log(path) if low <= (time_key(entry["timestamp"]) or low - 1) <= high]
+
+
+def test_range_reads_only_overlapping_blocks(monkeypatch):
+    """El índice se mantiene al agregar y la consulta lee solo los bloques del rango."""
+    monkeypatch.setattr(log_index, "BLOCK_RECORDS", 8)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "unlock_log_202305.jsonl")
+        # 31 días x 10 entradas, en lotes de 7 (los lotes cruzan bloques)
+        entries = [_entry(f"2023-05-{day:02d}T{hour:02d}:15:00.{day * hour:06d}", f"C{day}-{hour}")
+                   for day in range(1, 32) for hour in range(8, 18)]
+        # Un equipo con la hora atrasada: fuera de orden
+        entries.insert(200, _entry("2023-05-15T23:00:00", "ATRASADO"))
+        for start in range(0, len(entries), 7):
+            append_entries(path, entries[start:start + 7])
+
+        index = load_index(path)
+        assert index is not None and index.scanned == os.path.getsize(path)
+        assert len(index.blocks) == len(entries) // 8
+
+        for since, until in [("2023-05-14", "2023-05-18"), ("2023-05-15", "2023-05-15"),
+                             ("2023-05-31T12:00:00", None), (None, "2023-05-01"),
+                             ("2023-06-01", None), ("2023-05-14T09:00:00", "2023-05-14T09:30:00")]:
+            assert list(read_range(path, since, until)) == _expected(path, since, until)
+        assert any(e["unlock_code"] == "ATRASADO" for e in read_range(path, "2023-05-15", "2023-05-15"))
+
+        # Cinco días de 31: bastante menos de la mitad del archivo
+        low, high = range_keys("2023-05-14", "2023-05-18")
+        selected = sum(end - start for start, end in index.ranges(low, high, index.scanned))
+        assert selected < os.path.getsize(path) / 3
+
+        # Agregado sin actualizar el índice (y una escritura a medias): se lee igual
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(_entry("2023-05-16T20:00:00", "SIN-INDICE")) + "\n")
+            f.write('{"timestamp": "2023-05-16T21:')
+        codes = [e["unlock_code"] for e in read_range(path, "2023-05-16", "2023-05-16")]
+        assert codes[-1] == "SIN-INDICE"
+
+
+def test_damaged_or_stale_index_is_rebuilt():
+    """Un índice dañado o de otro archivo no cambia el resultado."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "unlock_log_202305.jsonl")
+        append_entries(path, [_entry(f"2023-05-{day:02d}T10:00:00", f"C{day}") for day in range(1, 29)])
+
+        with open(index_path(path), 'r+b') as f:
+            f.seek(40)
+            f.write(b"\xff\xff")
+        assert load_index(path) is None
+        assert [e["unlock_code"] for e in read_range(path, "2023-05-10", "2023-05-11")] == ["C10", "C11"]
+        assert load_index(path) is not None
+
+        # El log se reemplaza por uno más corto
+        os.replace(path, path + ".old")
+        append_entries(path, [_entry("2023-05-10T12:00:00", "NUEVO")])
+        assert [e["unlock_code"] for e in read_range(path, "2023-05-10", None)] == ["NUEVO"]
+
+        # Varios meses y formatos
+        with open(os.path.join(tmp, "unlock_log_202304.json"), 'w', encoding='utf-8') as f:
+            json.dump([_entry("2023-04-30T18:00:00", "ABRIL"), _entry("2023-04-02T18:00:00", "NO")], f)
+        codes = [e["unlock_code"] for e in iter_range(tmp, "2023-04-30", "2023-05-10")]
+        assert codes == ["ABRIL", "NUEVO"]
+
+
+_WITHOUT_FCNTL = """
+import sys
+sys.modules["fcntl"] = None  # como en Windows
+sys.path.insert(0, sys.argv[1])
+from unlock_generator import UnlockCodeGenerator
+from log_index import iter_range
+generator = UnlockCodeGenerator("2023")
+assert generator.save_unlock_log("7ABC", "6789", "CODIGO", sys.argv[2])
+print(len(list(iter_range(sys.argv[2], None, None))))
+"""
+
+
+def test_works_without_fcntl():
+    """Sin fcntl (Windows) el generador guarda el log y se consulta sin índice."""
+    src = os.path.join(os.path.dirname(__file__), '..', 'src')
+    with tempfile.TemporaryDirectory() as tmp:
+        result = subprocess.run([sys.executable, "-c", _WITHOUT_FCNTL, src, tmp],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split()[-1] == "1"
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de Estadísticas de Desbloqueos
+Totales actualizados al escribir el log y recálculo desde los logs
+"""
+
+import sys
+import os
+import tempfile
+from datetime import date
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from log_stats import ERROR_BOOT_MARK, ERROR_HARDWARE_ID, STATS_NAME, load_stats, rebuild
+from unlock_generator import UnlockCodeGenerator
+
+VALID_HARDWARE_ID = "1A2B3C4D5E6F7A8B"
+VALID_BOOT_MARK = "123456789012"
+
+
+def test_totals_updated_on_log_write():
+    """Cada escritura del log y cada error actualizan los totales."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for year, count in (("2023", 3), ("2021", 2)):
+            generator = UnlockCodeGenerator(year=year)
+            for _ in range(count):
+                code = generator.generate_unlock_code(VALID_HARDWARE_ID, VALID_BOOT_MARK).code
+                assert generator.save_unlock_log(VALID_HARDWARE_ID, VALID_BOOT_MARK, code, tmp)
+
+        generator.record_error(generator.generate_unlock_code("xx", VALID_BOOT_MARK), tmp)
+        generator.record_error(generator.generate_unlock_code(VALID_HARDWARE_ID, "xx"), tmp)
+        generator.record_error(generator.generate_unlock_code(VALID_HARDWARE_ID, "yy"), tmp)
+
+        stats = load_stats(tmp)
+        assert stats.total == 5
+        assert stats.by_year == {"2023": 3, "2021": 2}
+        assert stats.by_version == {"tds_v2": 3, "citd_v1": 2}
+        assert stats.day_total(date.today().isoformat()) == 5
+        assert stats.errors == {ERROR_HARDWARE_ID: 1, ERROR_BOOT_MARK: 2}
+
+
+def test_rebuild_from_logs_keeps_errors():
+    """El recálculo coincide con los totales incrementales y conserva los errores."""
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = UnlockCodeGenerator(year="2022")
+        for _ in range(4):
+            code = generator.generate_unlock_code(VALID_HARDWARE_ID, VALID_BOOT_MARK).code
+            generator.save_unlock_log(VALID_HARDWARE_ID, VALID_BOOT_MARK, code, tmp)
+        generator.record_error(generator.generate_unlock_code("xx", VALID_BOOT_MARK), tmp)
+        incremental = load_stats(tmp).to_dict()
+
+        os.unlink(os.path.join(tmp, STATS_NAME))
+        generator.record_error(generator.generate_unlock_code("xx", VALID_BOOT_MARK), tmp)
+        stats = rebuild(tmp)
+
+        assert stats.total == 4
+        assert stats.by_day == incremental["by_day"]
+        assert stats.by_server == incremental["by_server"]
+        assert stats.errors == {ERROR_HARDWARE_ID: 1}
+        assert load_stats(tmp).total == 4
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de Métricas
+Tests básicos de contadores, histogramas y exportación
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import metrics
+
+
+def test_disabled_is_noop():
+    """Test: Sin activar, no se registra nada"""
+    metrics.disable()
+    metrics.reset()
+
+    metrics.inc("test.counter")
+    with metrics.timed("test.block"):
+        pass
+
+    data = metrics.snapshot()
+    assert data["counters"] == {}
+    assert data["histograms"] == {}
+
+
+def test_counters_and_histograms():
+    """Test: Contadores e histogramas con métricas activas"""
+    metrics.enable()
+    metrics.reset()
+    try:
+        metrics.inc("test.counter")
+        metrics.inc("test.counter", 2)
+        for _ in range(3):
+            with metrics.timed("test.block"):
+                pass
+
+        data = metrics.snapshot()
+        assert data["counters"]["test.counter"] == 3
+        hist = data["histograms"]["test.block"]
+        assert hist["count"] == 3
+        assert hist["buckets"]["+Inf"] == 3
+    finally:
+        metrics.disable()
+
+
+def test_exports():
+    """Test: Exportación JSON y Prometheus"""
+    metrics.enable()
+    metrics.reset()
+    try:
+        metrics.inc("log.write_errors")
+        metrics.observe("unlock.hash", 0.002)
+
+        text = metrics.render_prometheus()
+        assert "desblock_log_write_errors_total 1" in text
+        assert 'desblock_unlock_hash_seconds_bucket{le="+Inf"} 1' in text
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.json")
+            assert metrics.write_snapshot(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            assert data["histograms"]["unlock.hash"]["count"] == 1
+    finally:
+        metrics.disable()
+
+
+def test_setup_from_env_registers_snapshot_once(monkeypatch):
+    """Test: Llamar varias veces a setup_from_env escribe el snapshot una sola vez"""
+    registered = []
+    monkeypatch.setattr(metrics.atexit, "register", lambda *args: registered.append(args))
+    monkeypatch.setattr(metrics, "_snapshot_path", None)
+    monkeypatch.setenv("DESBLOCK_METRICS_FILE", "/tmp/desblock-metrics.json")
+    monkeypatch.delenv("DESBLOCK_METRICS_PORT", raising=False)
+    metrics.enable()
+    try:
+        for _ in range(3):
+            assert metrics.setup_from_env() == "/tmp/desblock-metrics.json"
+        assert registered == [(metrics.write_snapshot, "/tmp/desblock-metrics.json")]
+    finally:
+        metrics.disable()
+
+
+def run_all_tests():
+    """Ejecuta todos los tests"""
+    tests = [
+        test_disabled_is_noop,
+        test_counters_and_histograms,
+        test_exports,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  ✓ OK: {test.__doc__}")
+        except AssertionError as e:
+            print(f"  ✗ FAIL: {test.__doc__} {e}")
+            failed += 1
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de Normalización por Lotes
+Verifica que el camino por lotes (NumPy y Python puro) produzca los
+mismos resultados que el generador fila por fila
+"""
+
+import sys
+import os
+import csv
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_processor import BatchProcessor
+from normalizer import HAS_NUMPY, normalize_batch
+from unlock_generator import UnlockCodeGenerator
+
+# Casos borde: longitudes límite, separadores, minúsculas, no ASCII y NUL
+HARDWARE_IDS = [
+    "ABC123DEF456", "abc-123_def", "12345678", "1234567", "A" * 32, "A" * 33,
+    "--------", "ABC 1234", "ñandú-12345", "straße123", "ABCD\x00EFGH",
+    "", "abcdefgh", "A-B-C-D-E-F-G-H",
+]
+BOOT_MARKS = [
+    "123456789", "12-34-56", "ab_cd", "1234", "123", "B" * 20, "B" * 21,
+    "----", "xyz9", "ñ123", "12 34", "", "a-b-c-d", "9876",
+]
+
+
+def _engines():
+    engines = [False]
+    if HAS_NUMPY:
+        engines.append(True)
+    return engines
+
+
+def test_batch_matches_scalar():
+    """Test: Lote idéntico al generador fila por fila"""
+    pairs = [(hw, bm) for hw in HARDWARE_IDS for bm in BOOT_MARKS] * 3
+    hardware_ids = [hw for hw, _ in pairs]
+    boot_marks = [bm for _, bm in pairs]
+
+    for year in ("2021", "2023"):
+        gen = UnlockCodeGenerator(year=year)
+        expected = [gen.generate_unlock_code(hw, bm) for hw, bm in pairs]
+        for use_numpy in _engines():
+            assert gen.generate_unlock_codes(hardware_ids, boot_marks, use_numpy=use_numpy) == expected
+
+
+def test_normalized_rows():
+    """Test: Normalización a mayúsculas y sin separadores"""
+    for use_numpy in _engines():
+        batch = normalize_batch(["abc-def_1234"], ["12-34"], use_numpy=use_numpy)
+        assert batch.hardware_ids == [b"ABCDEF1234"]
+        assert batch.boot_marks == [b"1234"]
+        assert batch.errors == [None]
+
+
+def test_batch_processor_csv():
+    """Test: Procesamiento de un CSV con años por fila"""
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "lote.csv")
+        output_path = os.path.join(tmp, "salida.csv")
+        with open(input_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["escuela", "hardware_id", "boot_mark", "year"])
+            writer.writerow(["E1", "TEST123ABC", "456789XYZ", "2021"])
+            writer.writerow(["E2", "TEST123ABC", "456789XYZ", "2023"])
+            writer.writerow(["E3", "ABC", "456789XYZ", "2023"])
+            writer.writerow(["E4", "TEST123ABC", "456789XYZ", "2019"])
+
+        stats = BatchProcessor(year="2023", chunk_size=2).run(input_path, output_path)
+        assert stats.rows == 4 and stats.generated == 2
+
+        with open(output_path, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+
+        assert rows[0]["unlock_code"] == UnlockCodeGenerator("2021").generate_unlock_code("TEST123ABC", "456789XYZ").code
+        assert rows[1]["unlock_code"] == UnlockCodeGenerator("2023").generate_unlock_code("TEST123ABC", "456789XYZ").code
+        assert rows[2]["error"] == "hardware_id"
+        assert rows[3]["error"] == "year"
+
+
+def run_all_tests():
+    """Ejecuta todos los tests"""
+    tests = [
+        test_batch_matches_scalar,
+        test_normalized_rows,
+        test_batch_processor_csv,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  ✓ OK: {test.__doc__}")
+        except AssertionError as e:
+            print(f"  ✗ FAIL: {test.__doc__} {e}")
+            failed += 1
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
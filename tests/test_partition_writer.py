@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de la Salida por Partición
+Un CSV por escuela o provincia, con pocos archivos abiertos y manifiesto
+"""
+
+import sys
+import os
+import csv
+import json
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from batch_processor import BatchProcessor
+from partition_writer import MANIFEST_NAME, PartitionedWriter, partition_name, province_resolver
+from settings import Province
+
+HEADER = ["escuela", "provincia", "hardware_id", "boot_mark", "year"]
+
+
+def _rows(count):
+    provinces = ["Buenos Aires", "NEUQUEN", "Neuquén", "san juan", "Córdoba", ""]
+    return [[f"Escuela N° {i % 9}", provinces[i % len(provinces)], f"HW{i * 7919:010d}",
+             f"{i * 104729:08d}", "2023"] for i in range(count)]
+
+
+def _read_csv(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_partitions_with_bounded_open_files():
+    """Cada partición recibe sus filas en orden aunque sus archivos se cierren y reabran."""
+    rows = _rows(500)
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = PartitionedWriter(tmp, "Escuela", max_open=2, buffer_size=256)
+        try:
+            for start in range(0, len(rows), 37):
+                writer.write(HEADER, rows[start:start + 37])
+                assert len(writer._handles) <= 2
+            manifest = writer.finish()
+        finally:
+            writer.close()
+
+        assert manifest["rows"] == 500 and len(manifest["partitions"]) == 9
+        with open(os.path.join(tmp, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            assert json.load(f) == manifest
+        for partition in manifest["partitions"]:
+            expected = [row for row in rows if partition_name(row[0]) == partition["name"]]
+            assert partition["value"] == expected[0][0]
+            assert partition["rows"] == len(expected)
+            assert _read_csv(os.path.join(tmp, partition["file"])) == [HEADER] + expected
+
+    assert partition_name("Escuela N° 12") == "escuela_n_12"
+    assert partition_name("  ") == "sin_valor"
+    resolve = province_resolver({"neuquen": Province("Neuquén"), "generic": Province("Otras Provincias")})
+    assert [resolve(v) for v in ("NEUQUÉN", "neuquen", "Córdoba")] == ["neuquen", "neuquen", "generic"]
+
+
+def test_batch_partitioned_by_province_and_resumed():
+    """Lote repartido por provincia; cortado y reanudado queda igual que sin cortes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "lote.csv")
+        with open(input_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(HEADER)
+            writer.writerows(_rows(120))
+
+        expected_dir = os.path.join(tmp, "completo")
+        stats = BatchProcessor(chunk_size=25).run(input_path, expected_dir, partition_by="provincia",
+                                                  by_province=True, max_open_files=2)
+        assert stats.partitions == 4
+        with open(os.path.join(expected_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        assert {p["name"]: p["rows"] for p in manifest["partitions"]} == \
+            {"buenos_aires": 20, "neuquen": 40, "san_juan": 20, "generic": 40}
+        assert {p["name"]: p["value"] for p in manifest["partitions"]}["generic"] == "Otras Provincias"
+
+        output_dir = os.path.join(tmp, "salida")
+        processor = BatchProcessor(chunk_size=25)
+        original = processor.process_chunk
+        calls = []
+
+        def process_chunk(header, rows, stats):
+            calls.append(1)
+            if len(calls) == 3:
+                # Corte después de escribir parte de un bloque sin checkpoint
+                with open(os.path.join(output_dir, "neuquen.csv"), 'ab') as f:
+                    f.write(b"Escuela N\xc2\xb0 1,NEUQUEN,HW")
+                raise KeyboardInterrupt
+            return original(header, rows, stats)
+
+        processor.process_chunk = process_chunk
+        try:
+            processor.run(input_path, output_dir, partition_by="provincia", by_province=True)
+        except KeyboardInterrupt:
+            pass
+
+        stats = BatchProcessor(chunk_size=25).run(input_path, output_dir, resume=True,
+                                                  partition_by="provincia", by_province=True)
+        assert stats.resumed == 50 and stats.rows == 120
+        for partition in manifest["partitions"]:
+            with open(os.path.join(expected_dir, partition["file"]), 'rb') as f:
+                expected = f.read()
+            with open(os.path.join(output_dir, partition["file"]), 'rb') as f:
+                assert f.read() == expected
+
+
+def test_sync_fsyncs_only_written_files(monkeypatch):
+    """sync() hace fsync solo de lo escrito desde la vez anterior, sin os.sync()."""
+    def no_sync():
+        raise AssertionError("no se debe sincronizar todo el sistema")
+
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "sync", no_sync)
+    monkeypatch.setattr(os, "fsync", lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+    rows = _rows(90)
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = PartitionedWriter(tmp, "Escuela", max_open=2)
+        try:
+            # 9 particiones con 2 abiertas: las cerradas por el LRU se sincronizan al cerrarse
+            writer.write(HEADER, rows)
+            writer.sync()
+            assert len(fsyncs) == 9
+            del fsyncs[:]
+            writer.sync()
+            assert fsyncs == []
+            writer.write(HEADER, [row for row in rows if row[0] == "Escuela N° 3"])
+            writer.sync()
+            assert len(fsyncs) == 1
+        finally:
+            writer.close()
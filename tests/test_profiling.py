@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests del Perfilado
+Archivos pstats, pilas colapsadas y memoria de una operación
+"""
+
+import sys
+import os
+import argparse
+import pstats
+import tempfile
+import time
+import tracemalloc
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from profiling import add_profile_arguments, profiling
+
+
+def _leaf():
+    time.sleep(0.02)
+    return [0] * 200000
+
+
+def _branch():
+    return len(_leaf())
+
+
+def _workload():
+    return _branch() + len(_leaf())
+
+
+def _read_collapsed(path):
+    stacks = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            stack, value = line.rsplit(" ", 1)
+            stacks[stack] = int(value)
+    return stacks
+
+
+def test_profile_writes_pstats_collapsed_and_memory():
+    """Solo se mide el bloque; las pilas reparten el tiempo por camino."""
+    parser = argparse.ArgumentParser()
+    add_profile_arguments(parser)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, "perfil", "lote")
+        args = parser.parse_args(["--profile", prefix, "--profile-memory"])
+
+        time.sleep(0.01)  # fuera del perfil
+        with profiling(args) as profiler:
+            _workload()
+        assert profiler is not None
+        assert not tracemalloc.is_tracing()
+
+        stats = pstats.Stats(prefix + ".pstats")
+        names = {func[2] for func in stats.stats}
+        assert {"_workload", "_branch", "_leaf"} <= names
+        assert "test_profile_writes_pstats_collapsed_and_memory" not in names
+
+        stacks = _read_collapsed(prefix + ".collapsed")
+        sleep = "<built-in method time.sleep>"
+        direct = [s for s in stacks if s.endswith(f"_leaf (test_profiling.py:21);{sleep}")]
+        assert len(direct) == 2
+        assert any("_branch (test_profiling.py:26);_leaf" in s for s in direct)
+        # Cada camino recibe su parte (~20 ms), no el total de _leaf
+        for stack in direct:
+            assert 15000 <= stacks[stack] <= 35000
+
+        with open(prefix + ".memory.txt", 'r', encoding='utf-8') as f:
+            report = f.read()
+        assert "Pico durante la operación" in report
+        assert "profiling.py" not in report
+
+        args = parser.parse_args([])
+        with profiling(args) as profiler:
+            assert profiler is None
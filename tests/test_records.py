@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de Registros
+Tests de UnlockResult y LogEntry
+"""
+
+import sys
+import os
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from records import LogEntry, UnlockResult
+from unlock_generator import UnlockCodeGenerator
+
+
+def test_unlock_result_tuple_view():
+    """Test: UnlockResult se comporta como la tupla anterior"""
+    gen = UnlockCodeGenerator(year="2023")
+    result = gen.generate_unlock_code("TEST123ABC", "456789XYZ")
+
+    success, message, code = result
+    assert isinstance(result, UnlockResult)
+    assert result == (success, message, code)
+    assert result.success and result.code == code
+    assert result[2] == code
+
+
+def test_log_entry_roundtrip():
+    """Test: LogEntry se serializa y se vuelve a leer igual"""
+    gen = UnlockCodeGenerator(year="2021")
+    entry = gen.create_log_entry("TEST123ABC", "456789XYZ", "AAAA-BBBB-CCCC-DDDD")
+
+    data = entry.to_dict()
+    assert list(data.keys()) == list(LogEntry.FIELDS)
+    assert data["hardware_id"] == "3ABC"
+    assert data["boot_mark"] == "9XYZ"
+
+    restored = LogEntry.from_dict(data)
+    assert restored == entry
+    assert restored.server is entry.server
+
+
+def test_log_entry_slots():
+    """Test: LogEntry no tiene __dict__ por instancia"""
+    entry = LogEntry("2023", "tds.educacion.gob.ar", "ABCD", "1234", "X", "tds_v2")
+    assert not hasattr(entry, "__dict__")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests"""
+    tests = [
+        test_unlock_result_tuple_view,
+        test_log_entry_roundtrip,
+        test_log_entry_slots,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  ✓ OK: {test.__doc__}")
+        except AssertionError as e:
+            print(f"  ✗ FAIL: {test.__doc__} {e}")
+            failed += 1
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de la Configuración Tipada
+Validación, valores por defecto, caché y escritura atómica
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+import pytest
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import settings
+from settings import Font, SettingsError, get_servers, get_settings, parse_settings, write_config
+
+
+def test_project_config_loads():
+    """Test: La configuración del proyecto es válida"""
+    config = get_settings()
+    assert config.gui.colors.background == "#2c3e50"
+    assert config.gui.fonts.title == Font("Arial", 24, "bold")
+    assert config.gui.fonts.code.tk() == ("Courier", 11)
+    assert isinstance(config.logging.fields_to_log, tuple)
+
+    servers = get_servers()
+    assert servers.servers["2023"].version == "tds_v2"
+    assert servers.provinces["san_juan"].address
+    with pytest.raises(TypeError):
+        servers.servers["2024"] = servers.servers["2023"]
+
+
+def test_defaults_and_validation():
+    """Test: Claves faltantes usan el valor por defecto y los tipos se validan"""
+    config = parse_settings({"gui": {"colors": {"accent": "#000000"}}, "desconocida": 1})
+    assert config.gui.colors.accent == "#000000"
+    assert config.gui.colors.background == "#2c3e50"
+    assert config.security.max_attempts == 5
+
+    with pytest.raises(SettingsError, match="security.max_attempts"):
+        parse_settings({"security": {"max_attempts": "cinco"}})
+    with pytest.raises(SettingsError, match="logging.enabled"):
+        parse_settings({"logging": {"enabled": 1}})
+
+
+def test_cache_reloads_on_change(monkeypatch):
+    """Test: Se reutiliza el objeto y se recarga solo si el archivo cambió"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "settings.json")
+        with open(path, "w") as f:
+            json.dump({"security": {"max_attempts": 3}}, f)
+
+        first = get_settings(path)
+        assert get_settings(path) is first
+        assert first.security.max_attempts == 3
+
+        # Cambio externo: se detecta pasado el intervalo de verificación
+        monkeypatch.setattr(settings, "CHECK_INTERVAL", 0.0)
+        with open(path, "w") as f:
+            json.dump({"security": {"max_attempts": 7}}, f)
+        os.utime(path, ns=(1, 1))
+        assert get_settings(path).security.max_attempts == 7
+
+        # Escritura atómica propia: la caché se descarta de inmediato
+        monkeypatch.setattr(settings, "CHECK_INTERVAL", 3600.0)
+        assert write_config(path, {"security": {"max_attempts": 9}})
+        assert get_settings(path).security.max_attempts == 9
+        assert os.listdir(tmp) == ["settings.json"]
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de Perfiles de squashfs
+Configuración del perfil y criterio de recomendación
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+import pytest
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from squashfs_profile import (DEFAULT_PROFILE, ProfileError, apply_profile, configured_profile, profile_options,
+                              recommend)
+
+
+def test_profile_options_from_settings():
+    """Test: El perfil se lee de usb_creation y se puede cambiar"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config = os.path.join(tmp, "settings.json")
+        with open(config, "w") as f:
+            json.dump({"usb_creation": {"min_usb_size_gb": 7}}, f)
+
+        assert profile_options(config_path=config)[:2] == ["-comp", "xz"]
+        assert DEFAULT_PROFILE == "xz-1M"
+
+        assert apply_profile("zstd-15-256K", config)
+        assert profile_options(config_path=config)[:2] == ["-comp", "zstd"]
+        with open(config) as f:
+            assert json.load(f)["usb_creation"]["min_usb_size_gb"] == 7
+
+        with pytest.raises(ProfileError):
+            profile_options("brotli")
+
+        # Perfil vacío en settings.json: el histórico
+        empty = os.path.join(tmp, "vacio.json")
+        with open(empty, "w") as f:
+            json.dump({"usb_creation": {"squashfs_profile": ""}}, f)
+        assert configured_profile(empty) == DEFAULT_PROFILE
+
+
+def test_recommend_balances_size_and_speed():
+    """Test: Con USB lento gana la imagen chica; con USB rápido, la descompresión"""
+    uncompressed = 8 * 1024 ** 3
+    results = [
+        {"profile": "xz-1M", "image_size": 2 * 1024 ** 3, "random_read_mbps": 40.0},
+        {"profile": "zstd-15-256K", "image_size": int(2.3 * 1024 ** 3), "random_read_mbps": 300.0},
+        {"profile": "lz4-hc-256K", "image_size": int(3.6 * 1024 ** 3), "random_read_mbps": 900.0},
+    ]
+
+    assert recommend(results, uncompressed, usb_mbps=25)["profile"] == "zstd-15-256K"
+    assert recommend(results, uncompressed, usb_mbps=0.5)["profile"] == "xz-1M"
+    assert recommend(results, uncompressed, usb_mbps=400)["profile"] == "lz4-hc-256K"
+    assert recommend(results, uncompressed, max_image_size=1024 ** 3) is None
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests de Sincronización de USB
+Copia incremental, logs preservados y varios pendrives
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from usb_sync import TARGET_DIR, sync_many
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def _project(root):
+    _write(os.path.join(root, "src/unlock_generator.py"), "v1\n")
+    _write(os.path.join(root, "src/utils.py"), "utils\n")
+    _write(os.path.join(root, "src/__pycache__/utils.cpython-311.pyc"), "x")
+    _write(os.path.join(root, "config/settings.json"), "{}\n")
+    _write(os.path.join(root, "README.md"), "readme\n")
+    _write(os.path.join(root, "docs/FAQ.md"), "faq\n")
+
+
+def test_sync_copies_only_changes():
+    """Test: La segunda sincronización copia solo lo modificado"""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = os.path.join(tmp, "project")
+        sticks = [os.path.join(tmp, "usb1"), os.path.join(tmp, "usb2")]
+        _project(project)
+        for stick in sticks:
+            os.makedirs(stick)
+
+        reports = sync_many(sticks, project_dir=project)
+        assert [report.copied for report in reports] == [5, 5]
+        assert not os.path.exists(os.path.join(sticks[0], TARGET_DIR, "src/__pycache__"))
+
+        # Log del usuario y archivo ajeno: no se tocan
+        log_path = os.path.join(sticks[0], TARGET_DIR, "logs/unlock_log_202405.json")
+        _write(log_path, "[]")
+        _write(os.path.join(sticks[0], TARGET_DIR, "notas.txt"), "mías")
+
+        _write(os.path.join(project, "src/unlock_generator.py"), "v2\n")
+        os.unlink(os.path.join(project, "src/utils.py"))
+
+        reports = sync_many(sticks, project_dir=project)
+        for report in reports:
+            assert (report.copied, report.skipped, report.deleted) == (1, 3, 1)
+            assert report.ok
+
+        target = os.path.join(sticks[0], TARGET_DIR)
+        with open(os.path.join(target, "src/unlock_generator.py")) as f:
+            assert f.read() == "v2\n"
+        assert not os.path.exists(os.path.join(target, "src/utils.py"))
+        assert os.path.exists(log_path)
+        assert os.path.exists(os.path.join(target, "notas.txt"))
+        assert not [name for name in os.listdir(os.path.join(target, "src")) if name.endswith("tmp")]
+
+
+def test_sync_repairs_modified_file_with_verify():
+    """Test: Con verify se detecta un archivo alterado en el pendrive"""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = os.path.join(tmp, "project")
+        stick = os.path.join(tmp, "usb")
+        _project(project)
+        os.makedirs(stick)
+        sync_many([stick], project_dir=project)
+
+        _write(os.path.join(stick, TARGET_DIR, "README.md"), "READMF\n")
+        assert sync_many([stick], project_dir=project)[0].copied == 0
+        assert sync_many([stick], project_dir=project, verify=True)[0].copied == 1
+
+
+def test_sync_reports_missing_mount_point():
+    """Test: Un pendrive inexistente se informa sin afectar a los demás"""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = os.path.join(tmp, "project")
+        stick = os.path.join(tmp, "usb")
+        _project(project)
+        os.makedirs(stick)
+
+        reports = sync_many([os.path.join(tmp, "no-existe"), stick], project_dir=project)
+        assert not reports[0].ok
+        assert reports[1].ok and reports[1].copied == 5
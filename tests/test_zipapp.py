@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+DESBLOCK-NET - Tests del Paquete desblock-net.pyz
+Generación reproducible, modos del punto de entrada y configuración incluida
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from build_zipapp import build_zipapp
+
+
+def _run(pyz, *args, cwd=None):
+    return subprocess.run([sys.executable, "-B", pyz] + list(args), capture_output=True,
+                          text=True, cwd=cwd)
+
+
+def test_build_is_reproducible_and_runs_cli():
+    """El mismo código genera el mismo archivo, que ejecuta el modo cli desde bytecode."""
+    with tempfile.TemporaryDirectory() as tmp:
+        first = os.path.join(tmp, "a", "desblock-net.pyz")
+        second = os.path.join(tmp, "b", "desblock-net.pyz")
+        names = build_zipapp(first)
+        build_zipapp(second)
+        with open(first, 'rb') as f1, open(second, 'rb') as f2:
+            assert f1.read() == f2.read()
+        assert "__main__.py" in names and "unlock_generator.pyc" in names
+        assert "config/settings.json" in names and "build_zipapp.pyc" not in names
+
+        result = _run(first, "cli", "--year", "2022", "--hardware-id", "ABCD1234",
+                      "--boot-mark", "12345678")
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "CÓDIGO DE DESBLOQUEO" in result.stdout
+
+        code = ("import sys; sys.path.insert(0, sys.argv[1]); import unlock_generator; "
+                "print(unlock_generator.__file__)")
+        loaded = subprocess.run([sys.executable, "-B", "-c", code, first], capture_output=True,
+                                text=True)
+        assert loaded.stdout.strip().endswith("unlock_generator.pyc")
+
+        assert _run(first, "desconocido").returncode == 1
+
+
+def test_bundled_config_and_local_override():
+    """Sin config/ junto al paquete se usa la incluida; si existe, tiene prioridad."""
+    code = ("import sys; sys.path.insert(0, sys.argv[1]); from settings import get_settings; "
+            "print(get_settings().logging.directory)")
+    with tempfile.TemporaryDirectory() as tmp:
+        bundled = os.path.join(tmp, "config-bundled")
+        os.makedirs(bundled)
+        with open(os.path.join(bundled, "settings.json"), 'w') as f:
+            json.dump({"logging": {"directory": "/incluido"}}, f)
+        pyz = os.path.join(tmp, "desblock-net.pyz")
+        build_zipapp(pyz, config_dir=bundled)
+
+        def directory():
+            return subprocess.run([sys.executable, "-B", "-c", code, pyz], capture_output=True,
+                                  text=True).stdout.strip()
+
+        assert directory() == "/incluido"
+
+        os.makedirs(os.path.join(tmp, "config"))
+        with open(os.path.join(tmp, "config", "settings.json"), 'w') as f:
+            json.dump({"logging": {"directory": "/pendrive"}}, f)
+        assert directory() == "/pendrive"